@@ -0,0 +1,22 @@
+"""
+Run all benchmarks: PDU headers, binding, and structure marshalling.
+
+Run from the repository root with `python -m benchmarks`, e.g. `python -m benchmarks --output before.json` at one
+commit and `python -m benchmarks --compare before.json` at another. The end-to-end throughput and latency of calls over
+loopback are measured separately, with `python -m benchmarks.loopback`.
+"""
+
+from benchmarks import pdu_headers, bind, structures
+from benchmarks.common import Benchmarks, main
+
+
+def benchmarks() -> Benchmarks:
+    return {
+        **pdu_headers.benchmarks(),
+        **bind.benchmarks(),
+        **structures.benchmarks()
+    }
+
+
+if __name__ == '__main__':
+    main(benchmarks=benchmarks, description=__doc__)
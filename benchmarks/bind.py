@@ -0,0 +1,129 @@
+"""
+Measure the cost of binding: encoding and decoding the presentation context and result lists, and the round trip of a
+bind and its bind_ack through the client's and the server's handling of them, with one and with several interfaces.
+
+Run from the repository root with `python -m benchmarks.bind`.
+"""
+
+from uuid import UUID
+
+from rpc.connection import Connection
+from rpc.server import Server
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.bind import BindHeader
+from rpc.pdu_headers.bind_ack import BindAckHeader
+from rpc.structures.context_list import ContextList
+from rpc.structures.context_element import ContextElement, NDR64_AND_NDR_TRANSFER_SYNTAXES
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.structures.port_any import PortAny
+from rpc.structures.result_list import ResultList
+
+from benchmarks.common import Benchmarks, main
+from benchmarks.structures import ContextHandleRequest
+
+# The numbers of interfaces negotiated in one bind.
+NUM_CONTEXTS = (1, 8)
+
+
+async def _handle_request(request: ContextHandleRequest):
+    raise NotImplementedError
+
+
+async def _unused_reader() -> bytes:
+    raise NotImplementedError
+
+
+async def _unused_writer(data: bytes) -> int:
+    raise NotImplementedError
+
+
+def _bind_round_trip(server: Server, connection: Connection, bind_header: BindHeader) -> None:
+    """
+    Pass a bind through the client's encoding, the server's decoding, negotiation and encoding of the bind_ack, and the
+    client's decoding and recording of the accepted presentation contexts.
+
+    :param server: A server with handlers for the proposed interfaces.
+    :param connection: A connection, which need not be entered.
+    :param bind_header: The bind to send.
+    :return: None
+    """
+
+    received_bind_header: BindHeader = MSRPCHeader.from_bytes(data=bytes(bind_header))
+
+    bind_ack_bytes = bytes(
+        BindAckHeader(
+            call_id=received_bind_header.call_id,
+            max_xmit_frag=min(server.max_xmit_frag, received_bind_header.max_recv_frag),
+            max_recv_frag=min(server.max_recv_frag, received_bind_header.max_xmit_frag),
+            assoc_group_id=1,
+            sec_addr=PortAny(port_spec='49664'),
+            result_list=server._negotiate_presentation_contexts(
+                presentation_context_list=received_bind_header.presentation_context_list,
+                context_id_to_interface={}
+            )
+        )
+    )
+
+    bind_ack_header: BindAckHeader = MSRPCHeader.from_bytes(data=bind_ack_bytes)
+    connection._add_presentation_contexts(
+        presentation_context_list=bind_header.presentation_context_list,
+        result_list=bind_ack_header.result_list
+    )
+
+
+def benchmarks() -> Benchmarks:
+    name_to_statement: Benchmarks = {}
+
+    for num_contexts in NUM_CONTEXTS:
+        abstract_syntaxes = [
+            PresentationSyntax(if_uuid=UUID(int=0x6a28f1c3_0e5b_4c1d_9a0e_2f7c1e3b5d90 + i), if_version=1)
+            for i in range(num_contexts)
+        ]
+        presentation_context_list = ContextList([
+            ContextElement(
+                context_id=context_id,
+                abstract_syntax=abstract_syntax,
+                transfer_syntaxes=NDR64_AND_NDR_TRANSFER_SYNTAXES
+            )
+            for context_id, abstract_syntax in enumerate(abstract_syntaxes)
+        ])
+
+        server = Server()
+        for abstract_syntax in abstract_syntaxes:
+            server.register_handler(
+                request_class=ContextHandleRequest,
+                handler=_handle_request,
+                abstract_syntax=abstract_syntax
+            )
+
+        result_list: ResultList = server._negotiate_presentation_contexts(
+            presentation_context_list=presentation_context_list,
+            context_id_to_interface={}
+        )
+        context_list_bytes = bytes(presentation_context_list)
+        result_list_bytes = bytes(result_list)
+
+        bind_header = BindHeader(call_id=1, presentation_context_list=presentation_context_list)
+        connection = Connection(reader=_unused_reader, writer=_unused_writer)
+
+        name_to_statement[f'bind.encode.ContextList[{num_contexts}]'] = presentation_context_list.__bytes__
+        name_to_statement[f'bind.decode.ContextList[{num_contexts}]'] = (
+            lambda context_list_bytes=context_list_bytes: ContextList.from_bytes(data=context_list_bytes)
+        )
+        name_to_statement[f'bind.encode.ResultList[{num_contexts}]'] = result_list.__bytes__
+        name_to_statement[f'bind.decode.ResultList[{num_contexts}]'] = (
+            lambda result_list_bytes=result_list_bytes: ResultList.from_bytes(data=result_list_bytes)
+        )
+        name_to_statement[f'bind.round_trip[{num_contexts}]'] = (
+            lambda server=server, connection=connection, bind_header=bind_header: _bind_round_trip(
+                server=server,
+                connection=connection,
+                bind_header=bind_header
+            )
+        )
+
+    return name_to_statement
+
+
+if __name__ == '__main__':
+    main(benchmarks=benchmarks, description=__doc__)
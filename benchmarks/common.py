@@ -0,0 +1,206 @@
+"""
+The measurement, reporting and comparison shared by the benchmarks.
+
+A benchmark module provides a `benchmarks` function returning the statements to time, by name. Each statement is run
+enough times per repeat to take at least 0.2 seconds, and the timings of all repeats are kept, so that results saved
+as JSON at one commit can be compared with those of another.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, asdict
+from typing import Callable, Any
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from json import dump as json_dump, load as json_load
+from platform import python_implementation, python_version, platform
+from subprocess import run, DEVNULL
+from statistics import mean, stdev
+from timeit import Timer
+
+NUM_REPEATS = 5
+# The ratio of a benchmark's best time to that of the compared results above which it is reported as slower.
+DEFAULT_REGRESSION_THRESHOLD = 1.1
+
+Benchmarks = dict[str, Callable[[], Any]]
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    # The number of executions of the statement per repeat.
+    number: int
+    # The time per execution of the statement in each repeat, in nanoseconds.
+    timings_ns: list[float]
+
+    @property
+    def best_ns(self) -> float:
+        return min(self.timings_ns)
+
+    @property
+    def mean_ns(self) -> float:
+        return mean(self.timings_ns)
+
+    @property
+    def stdev_ns(self) -> float:
+        return stdev(self.timings_ns) if len(self.timings_ns) > 1 else 0.0
+
+
+def run_benchmark(name: str, statement: Callable[[], Any], repeat: int = NUM_REPEATS) -> BenchmarkResult:
+    """
+    Time a statement.
+
+    :param name: The name of the benchmark.
+    :param statement: The statement to be timed.
+    :param repeat: The number of times to time the statement.
+    :return: The result of the benchmark.
+    """
+
+    timer = Timer(stmt=statement)
+    number, _ = timer.autorange()
+
+    return BenchmarkResult(
+        name=name,
+        number=number,
+        timings_ns=[timing / number * 1e9 for timing in timer.repeat(repeat=repeat, number=number)]
+    )
+
+
+def _git_commit() -> str | None:
+    completed_process = run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, stdin=DEVNULL)
+    return completed_process.stdout.strip() if completed_process.returncode == 0 else None
+
+
+def environment_metadata() -> dict[str, str | None]:
+    """
+    Describe the environment in which benchmarks are run, so that saved results can be told apart.
+
+    :return: The date, the commit of the repository, the Python implementation and version, and the platform.
+    """
+
+    return {
+        'date': datetime.now(tz=timezone.utc).isoformat(),
+        'commit': _git_commit(),
+        'python_implementation': python_implementation(),
+        'python_version': python_version(),
+        'platform': platform()
+    }
+
+
+def save_results(results: list[BenchmarkResult], path: str) -> None:
+    """
+    Save benchmark results as JSON, together with a description of the environment they were obtained in.
+
+    :param results: The results to save.
+    :param path: The path of the file to write.
+    :return: None
+    """
+
+    with open(path, 'w') as file:
+        json_dump(
+            {
+                'metadata': environment_metadata(),
+                'benchmarks': {
+                    result.name: {
+                        **asdict(result),
+                        'best_ns': result.best_ns,
+                        'mean_ns': result.mean_ns,
+                        'stdev_ns': result.stdev_ns
+                    }
+                    for result in results
+                }
+            },
+            file,
+            indent=2
+        )
+
+
+def load_results(path: str) -> list[BenchmarkResult]:
+    """
+    Load benchmark results saved with `save_results`.
+
+    :param path: The path of the file to read.
+    :return: The results.
+    """
+
+    with open(path) as file:
+        return [
+            BenchmarkResult(name=name, number=result['number'], timings_ns=result['timings_ns'])
+            for name, result in json_load(file)['benchmarks'].items()
+        ]
+
+
+def compare_results(
+    baseline_results: list[BenchmarkResult],
+    results: list[BenchmarkResult],
+    regression_threshold: float = DEFAULT_REGRESSION_THRESHOLD
+) -> list[str]:
+    """
+    Compare benchmark results with those of a baseline, printing the ratio of the best times.
+
+    :param baseline_results: The results to compare with, e.g. those of the previous release.
+    :param results: The results to compare.
+    :param regression_threshold: The ratio above which a benchmark is reported as slower.
+    :return: The names of the benchmarks that are slower than in the baseline.
+    """
+
+    name_to_baseline_result = {result.name: result for result in baseline_results}
+    slower_benchmark_names: list[str] = []
+
+    for result in results:
+        if (baseline_result := name_to_baseline_result.get(result.name)) is None:
+            continue
+
+        ratio = result.best_ns / baseline_result.best_ns
+        if ratio > regression_threshold:
+            slower_benchmark_names.append(result.name)
+
+        print(
+            f'{result.name:<60} {baseline_result.best_ns:>12.0f} ns -> {result.best_ns:>12.0f} ns  {ratio:5.2f}x'
+            + ('  slower' if ratio > regression_threshold else '')
+        )
+
+    return slower_benchmark_names
+
+
+def main(benchmarks: Callable[[], Benchmarks], description: str | None = None) -> None:
+    """
+    Run benchmarks from the command line.
+
+    :param benchmarks: A function returning the statements to time, by name.
+    :param description: The description of the command.
+    :return: None
+    """
+
+    parser = ArgumentParser(description=description)
+    parser.add_argument('--output', help='The path of a JSON file to save the results in.')
+    parser.add_argument('--compare', help='The path of a JSON file of results to compare with.')
+    parser.add_argument('--filter', help='A glob pattern selecting the benchmarks to run by name.')
+    parser.add_argument('--repeat', type=int, default=NUM_REPEATS, help='The number of times to time each statement.')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help='The ratio of best times above which a benchmark is reported as slower than in the compared results.'
+    )
+    args = parser.parse_args()
+
+    results: list[BenchmarkResult] = []
+    for name, statement in benchmarks().items():
+        if args.filter is not None and not fnmatch(name, args.filter):
+            continue
+        results.append(result := run_benchmark(name=name, statement=statement, repeat=args.repeat))
+        print(f'{name:<60} {result.best_ns:>12.0f} ns  (mean {result.mean_ns:.0f} ns, stdev {result.stdev_ns:.0f} ns)')
+
+    if args.output is not None:
+        save_results(results=results, path=args.output)
+
+    if args.compare is not None:
+        print()
+        slower_benchmark_names = compare_results(
+            baseline_results=load_results(path=args.compare),
+            results=results,
+            regression_threshold=args.threshold
+        )
+        if slower_benchmark_names:
+            raise SystemExit(f'{len(slower_benchmark_names)} benchmark(s) are slower than in {args.compare}.')
@@ -0,0 +1,628 @@
+"""
+Measure the throughput and latency of calls over the full path -- `obtain_response`, `Connection.send_message`, the
+transport, the server, and `Connection._receive_message_responses` -- against a local stand-in server on loopback.
+
+Each combination of the given operations, stub sizes, connection counts and concurrencies is one run, for which the
+calls per second, the latency percentiles and histogram, and the memory high-water mark are reported. The server runs
+in worker processes of a `ServerSupervisor`, so that its work does not compete with the client's event loop, unless
+`--server-workers 0` is given or the transport is a Unix socket, in which case it runs in the client's event loop.
+
+Run from the repository root with e.g. `python -m benchmarks.loopback --concurrency 1 16 64 --response-size 64 65536`.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, asdict
+from typing import ClassVar, Type, Any, AsyncContextManager, Callable, Iterator
+from argparse import ArgumentParser
+from asyncio import run as asyncio_run, gather, sleep as asyncio_sleep
+from contextlib import AsyncExitStack
+from enum import IntEnum
+from functools import partial
+from itertools import count as itertools_count, product
+from json import dump as json_dump
+from os import path as os_path
+from resource import getrusage, RUSAGE_SELF, RUSAGE_CHILDREN
+from sys import platform as sys_platform
+from tempfile import TemporaryDirectory
+from time import perf_counter, perf_counter_ns
+from uuid import UUID
+import tracemalloc
+
+from msdsalgs.win32_error import Win32ErrorCode
+
+from rpc.connection import Connection
+from rpc.server import Server
+from rpc.server_workers import ServerSupervisor
+from rpc.transport import tcp_connection, unix_connection, install_uvloop
+from rpc.structures.context_list import ContextList
+from rpc.structures.context_element import ContextElement
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.utils.types import DWORD
+from rpc.utils.conformant_array import ConformantFixedSizeArray
+from rpc.utils.client_protocol_message import ClientProtocolRequestBase, ClientProtocolResponseBase, obtain_response
+
+from benchmarks.common import environment_metadata
+
+LOOPBACK_ABSTRACT_SYNTAX = PresentationSyntax(if_uuid=UUID('3d0c8a2e-7b1f-4e6a-9c5d-81f2a4b6c7e0'), if_version=1)
+
+BYTE_ARRAY = ConformantFixedSizeArray(element_format='<B')
+
+# The latency percentiles that are reported.
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LoopbackOperation(IntEnum):
+    NULL = 0
+    ECHO = 1
+    FETCH = 2
+
+
+@dataclass
+class NullResponse(ClientProtocolResponseBase):
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {'return_code': (DWORD, Win32ErrorCode)}
+
+
+@dataclass
+class NullRequest(ClientProtocolRequestBase):
+    """A call carrying nothing but a sequence number, measuring the overhead of a call."""
+
+    OPERATION: ClassVar[LoopbackOperation] = LoopbackOperation.NULL
+    RESPONSE_CLASS: ClassVar[Type[ClientProtocolResponseBase]] = NullResponse
+    ABSTRACT_SYNTAX: ClassVar[PresentationSyntax] = LOOPBACK_ABSTRACT_SYNTAX
+
+    sequence_number: int
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {'sequence_number': (DWORD,)}
+
+
+NullResponse.REQUEST_CLASS = NullRequest
+
+
+@dataclass
+class EchoResponse(ClientProtocolResponseBase):
+    data: Any
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {
+        'data': (BYTE_ARRAY,),
+        'return_code': (DWORD, Win32ErrorCode)
+    }
+
+
+@dataclass
+class EchoRequest(ClientProtocolRequestBase):
+    """A call whose request stub data is returned in the response."""
+
+    OPERATION: ClassVar[LoopbackOperation] = LoopbackOperation.ECHO
+    RESPONSE_CLASS: ClassVar[Type[ClientProtocolResponseBase]] = EchoResponse
+    ABSTRACT_SYNTAX: ClassVar[PresentationSyntax] = LOOPBACK_ABSTRACT_SYNTAX
+
+    data: Any
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {'data': (BYTE_ARRAY,)}
+
+
+EchoResponse.REQUEST_CLASS = EchoRequest
+
+
+@dataclass
+class FetchResponse(ClientProtocolResponseBase):
+    data: Any
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {
+        'data': (BYTE_ARRAY,),
+        'return_code': (DWORD, Win32ErrorCode)
+    }
+
+
+@dataclass
+class FetchRequest(ClientProtocolRequestBase):
+    """A small call with a response of the requested size, as when fetching data."""
+
+    OPERATION: ClassVar[LoopbackOperation] = LoopbackOperation.FETCH
+    RESPONSE_CLASS: ClassVar[Type[ClientProtocolResponseBase]] = FetchResponse
+    ABSTRACT_SYNTAX: ClassVar[PresentationSyntax] = LOOPBACK_ABSTRACT_SYNTAX
+
+    size: int
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {'size': (DWORD,)}
+
+
+FetchResponse.REQUEST_CLASS = FetchRequest
+
+
+def make_loopback_server(handler_delay: float = 0.0, max_frag: int = 4280) -> Server:
+    """
+    Create the stand-in server, with handlers for the loopback operations.
+
+    :param handler_delay: The number of seconds that each handler waits before responding, standing in for the work of
+        a real server.
+    :param max_frag: The largest fragment the server sends and accepts.
+    :return: The server.
+    """
+
+    async def handle_null(request: NullRequest) -> NullResponse:
+        if handler_delay > 0:
+            await asyncio_sleep(handler_delay)
+        return NullResponse(return_code=Win32ErrorCode.ERROR_SUCCESS)
+
+    async def handle_echo(request: EchoRequest) -> EchoResponse:
+        if handler_delay > 0:
+            await asyncio_sleep(handler_delay)
+        return EchoResponse(return_code=Win32ErrorCode.ERROR_SUCCESS, data=request.data)
+
+    async def handle_fetch(request: FetchRequest) -> FetchResponse:
+        if handler_delay > 0:
+            await asyncio_sleep(handler_delay)
+        return FetchResponse(return_code=Win32ErrorCode.ERROR_SUCCESS, data=bytes(request.size))
+
+    server = Server(max_recv_frag=max_frag, max_xmit_frag=max_frag)
+    server.register_handler(request_class=NullRequest, handler=handle_null)
+    server.register_handler(request_class=EchoRequest, handler=handle_echo)
+    server.register_handler(request_class=FetchRequest, handler=handle_fetch)
+
+    return server
+
+
+def _make_request_factory(
+    operation: LoopbackOperation,
+    request_size: int,
+    response_size: int
+) -> Callable[[int], ClientProtocolRequestBase]:
+    """
+    Make a function creating the request of each call of a run.
+
+    :param operation: The operation to call.
+    :param request_size: The number of bytes of data in the request of an echo call.
+    :param response_size: The number of bytes of data in the response of a fetch call.
+    :return: A function taking the sequence number of a call and returning its request.
+    """
+
+    if operation is LoopbackOperation.NULL:
+        return lambda sequence_number: NullRequest(sequence_number=sequence_number)
+
+    if operation is LoopbackOperation.ECHO:
+        data = bytes(request_size)
+        return lambda _: EchoRequest(data=data)
+
+    return lambda _: FetchRequest(size=response_size)
+
+
+@dataclass
+class RunConfiguration:
+    operation: str
+    # The number of bytes of data in the request of an echo call, and in the response of a fetch call.
+    request_size: int
+    response_size: int
+    num_connections: int
+    # The number of calls in flight at a time on each connection.
+    concurrency: int
+    num_calls: int
+    num_warmup_calls: int
+    transport: str
+    handler_delay: float
+    max_frag: int
+
+
+@dataclass
+class RunResult:
+    configuration: RunConfiguration
+    duration: float
+    num_calls: int
+    num_failed_calls: int
+    calls_per_second: float
+    # The number of bytes of request and response data transferred per second, excluding the PDU and NDR overhead.
+    data_bytes_per_second: float
+    latency_min_us: float
+    latency_mean_us: float
+    latency_max_us: float
+    # The latency percentiles, by percentile.
+    latency_percentiles_us: dict[str, float]
+    # The number of calls whose latency is less than each power of two number of microseconds, and at least the
+    # previous one, by the power of two.
+    latency_histogram: dict[int, int]
+    # The high-water marks of the client process's resident set size, and of its traced Python allocations during the
+    # run, if traced. The resident set size is that of the whole process, and so never decreases from one run to the
+    # next.
+    max_rss_bytes: int
+    traced_peak_bytes: int | None
+    # The highest high-water mark of the resident set size of the server processes that have exited.
+    server_max_rss_bytes: int | None
+
+
+def _data_size_per_call(configuration: RunConfiguration) -> int:
+    operation = LoopbackOperation[configuration.operation]
+    if operation is LoopbackOperation.ECHO:
+        return 2 * configuration.request_size
+    if operation is LoopbackOperation.FETCH:
+        return configuration.response_size
+    return 0
+
+
+def _max_rss_bytes(who: int) -> int:
+    # On Linux, `ru_maxrss` is in kibibytes; on macOS, in bytes.
+    max_rss: int = getrusage(who).ru_maxrss
+    return max_rss if sys_platform == 'darwin' else max_rss * 1024
+
+
+def _percentile(sorted_values: list[int], percentile: float) -> int:
+    """
+    Obtain a percentile of values with the nearest-rank method.
+
+    :param sorted_values: The values, sorted.
+    :param percentile: The percentile, between 0 and 100.
+    :return: The value at the percentile.
+    """
+
+    rank = max(1, -(-len(sorted_values) * percentile // 100))
+    return sorted_values[min(int(rank), len(sorted_values)) - 1]
+
+
+def _latency_histogram(latencies_ns: list[int]) -> dict[int, int]:
+    """
+    Count latencies in buckets whose bounds are powers of two numbers of microseconds.
+
+    :param latencies_ns: The latencies, in nanoseconds.
+    :return: The number of latencies in each bucket, by the bucket's exclusive upper bound in microseconds.
+    """
+
+    upper_bound_to_count: dict[int, int] = {}
+    for latency_ns in latencies_ns:
+        upper_bound = 1 << (latency_ns // 1000).bit_length()
+        upper_bound_to_count[upper_bound] = upper_bound_to_count.get(upper_bound, 0) + 1
+
+    return dict(sorted(upper_bound_to_count.items()))
+
+
+async def _make_calls(
+    connection: Connection,
+    make_request: Callable[[int], ClientProtocolRequestBase],
+    call_counter: Iterator[int],
+    num_calls: int,
+    latencies_ns: list[int] | None
+) -> int:
+    """
+    Make calls one after the other until the run's number of calls have been started.
+
+    :param connection: The connection with which to make the calls.
+    :param make_request: The function creating the request of a call.
+    :param call_counter: The counter of the run's started calls, shared with the other callers.
+    :param num_calls: The number of calls of the run.
+    :param latencies_ns: The list in which to record the latency of each call, in nanoseconds, or `None` if the calls
+        are warmup calls.
+    :return: The number of calls that failed.
+    """
+
+    num_failed_calls = 0
+
+    while (sequence_number := next(call_counter)) < num_calls:
+        request = make_request(sequence_number)
+        start_time_ns = perf_counter_ns()
+        try:
+            await obtain_response(rpc_connection=connection, request=request)
+        except Exception:
+            num_failed_calls += 1
+            continue
+        if latencies_ns is not None:
+            latencies_ns.append(perf_counter_ns() - start_time_ns)
+
+    return num_failed_calls
+
+
+async def _run(
+    configuration: RunConfiguration,
+    connect: Callable[[], AsyncContextManager[Connection]],
+    trace_memory: bool
+) -> RunResult:
+    """
+    Perform a run: open and bind the connections, make the warmup calls, and make and time the calls.
+
+    :param configuration: The configuration of the run.
+    :param connect: A callable returning an asynchronous context manager that yields an entered connection to the
+        server.
+    :param trace_memory: Whether to trace the Python allocations during the run, which slows it.
+    :return: The result of the run.
+    """
+
+    make_request = _make_request_factory(
+        operation=LoopbackOperation[configuration.operation],
+        request_size=configuration.request_size,
+        response_size=configuration.response_size
+    )
+
+    async with AsyncExitStack() as exit_stack:
+        connections: list[Connection] = []
+        for _ in range(configuration.num_connections):
+            connection: Connection = await exit_stack.enter_async_context(connect())
+            await connection.bind(
+                presentation_context_list=ContextList([
+                    ContextElement(context_id=0, abstract_syntax=LOOPBACK_ABSTRACT_SYNTAX)
+                ]),
+                max_xmit_frag=configuration.max_frag,
+                max_recv_frag=configuration.max_frag
+            )
+            connections.append(connection)
+
+        callers = [connection for connection in connections for _ in range(configuration.concurrency)]
+
+        warmup_call_counter = itertools_count()
+        await gather(*(
+            _make_calls(
+                connection=connection,
+                make_request=make_request,
+                call_counter=warmup_call_counter,
+                num_calls=configuration.num_warmup_calls,
+                latencies_ns=None
+            )
+            for connection in callers
+        ))
+
+        if trace_memory:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        latencies_ns: list[int] = []
+        call_counter = itertools_count()
+        start_time = perf_counter()
+        num_failed_calls = sum(
+            await gather(*(
+                _make_calls(
+                    connection=connection,
+                    make_request=make_request,
+                    call_counter=call_counter,
+                    num_calls=configuration.num_calls,
+                    latencies_ns=latencies_ns
+                )
+                for connection in callers
+            ))
+        )
+        duration = perf_counter() - start_time
+
+        traced_peak_bytes: int | None = None
+        if trace_memory:
+            traced_peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    latencies_ns.sort()
+    if not latencies_ns:
+        raise RuntimeError('No call of the run succeeded.')
+
+    return RunResult(
+        configuration=configuration,
+        duration=duration,
+        num_calls=len(latencies_ns),
+        num_failed_calls=num_failed_calls,
+        calls_per_second=len(latencies_ns) / duration,
+        data_bytes_per_second=len(latencies_ns) * _data_size_per_call(configuration=configuration) / duration,
+        latency_min_us=latencies_ns[0] / 1000,
+        latency_mean_us=sum(latencies_ns) / len(latencies_ns) / 1000,
+        latency_max_us=latencies_ns[-1] / 1000,
+        latency_percentiles_us={
+            f'p{percentile:g}': _percentile(sorted_values=latencies_ns, percentile=percentile) / 1000
+            for percentile in PERCENTILES
+        },
+        latency_histogram=_latency_histogram(latencies_ns=latencies_ns),
+        max_rss_bytes=_max_rss_bytes(who=RUSAGE_SELF),
+        traced_peak_bytes=traced_peak_bytes,
+        server_max_rss_bytes=None
+    )
+
+
+async def _run_with_inline_server(
+    configuration: RunConfiguration,
+    trace_memory: bool,
+    socket_directory: str
+) -> RunResult:
+    """
+    Perform a run against a server in the same event loop.
+
+    :param configuration: The configuration of the run.
+    :param trace_memory: Whether to trace the Python allocations during the run.
+    :param socket_directory: A directory in which to create the Unix socket, if the transport is a Unix socket.
+    :return: The result of the run.
+    """
+
+    server = make_loopback_server(handler_delay=configuration.handler_delay, max_frag=configuration.max_frag)
+
+    if configuration.transport == 'unix':
+        socket_path = os_path.join(socket_directory, 'loopback.sock')
+        asyncio_server = await server.start_unix(path=socket_path)
+        connect = partial(unix_connection, path=socket_path)
+    else:
+        asyncio_server = await server.start(host='127.0.0.1', port=0)
+        connect = partial(tcp_connection, host='127.0.0.1', port=asyncio_server.sockets[0].getsockname()[1])
+
+    async with asyncio_server:
+        return await _run(configuration=configuration, connect=connect, trace_memory=trace_memory)
+
+
+async def _run_with_started_server(configuration: RunConfiguration, port: int, trace_memory: bool) -> RunResult:
+    """
+    Perform a run against server worker processes, waiting for them to listen.
+
+    :param configuration: The configuration of the run.
+    :param port: The port on which the workers listen.
+    :param trace_memory: Whether to trace the Python allocations during the run.
+    :return: The result of the run.
+    """
+
+    connect = partial(tcp_connection, host='127.0.0.1', port=port)
+
+    for _ in range(100):
+        try:
+            async with connect():
+                break
+        except ConnectionRefusedError:
+            await asyncio_sleep(0.05)
+
+    return await _run(configuration=configuration, connect=connect, trace_memory=trace_memory)
+
+
+def _perform_run(configuration: RunConfiguration, num_server_workers: int, trace_memory: bool) -> RunResult:
+    """
+    Perform a run, with the server in worker processes or in the client's event loop.
+
+    :param configuration: The configuration of the run.
+    :param num_server_workers: The number of server worker processes. Zero means to run the server in the client's
+        event loop, as is always done with a Unix socket.
+    :param trace_memory: Whether to trace the Python allocations during the run.
+    :return: The result of the run.
+    """
+
+    if num_server_workers == 0 or configuration.transport == 'unix':
+        with TemporaryDirectory() as socket_directory:
+            return asyncio_run(
+                _run_with_inline_server(
+                    configuration=configuration,
+                    trace_memory=trace_memory,
+                    socket_directory=socket_directory
+                )
+            )
+
+    server_supervisor = ServerSupervisor(
+        make_server=partial(
+            make_loopback_server,
+            handler_delay=configuration.handler_delay,
+            max_frag=configuration.max_frag
+        ),
+        host='127.0.0.1',
+        num_workers=num_server_workers
+    )
+    server_supervisor.start()
+    try:
+        run_result = asyncio_run(
+            _run_with_started_server(
+                configuration=configuration,
+                port=server_supervisor.port,
+                trace_memory=trace_memory
+            )
+        )
+    finally:
+        server_supervisor.stop()
+
+    run_result.server_max_rss_bytes = _max_rss_bytes(who=RUSAGE_CHILDREN)
+
+    return run_result
+
+
+def _print_run_result(run_result: RunResult) -> None:
+    configuration = run_result.configuration
+
+    print(
+        f'{configuration.operation} request={configuration.request_size} response={configuration.response_size} '
+        f'connections={configuration.num_connections} concurrency={configuration.concurrency} '
+        f'transport={configuration.transport}'
+    )
+    print(
+        f'  {run_result.num_calls} calls in {run_result.duration:.3f} s: {run_result.calls_per_second:,.0f} calls/s'
+        + (
+            f', {run_result.data_bytes_per_second / 2**20:,.1f} MiB/s of data'
+            if run_result.data_bytes_per_second else ''
+        )
+        + (f', {run_result.num_failed_calls} failed' if run_result.num_failed_calls else '')
+    )
+    print(
+        '  latency (us): '
+        + ', '.join(
+            [f'min {run_result.latency_min_us:.1f}', f'mean {run_result.latency_mean_us:.1f}']
+            + [f'{name} {value:.1f}' for name, value in run_result.latency_percentiles_us.items()]
+            + [f'max {run_result.latency_max_us:.1f}']
+        )
+    )
+
+    max_count = max(run_result.latency_histogram.values())
+    for upper_bound, count in run_result.latency_histogram.items():
+        print(f'  < {upper_bound:>9} us {count:>9} {"#" * max(1, round(40 * count / max_count))}')
+
+    print(
+        f'  max RSS {run_result.max_rss_bytes / 2**20:.1f} MiB'
+        + (
+            f', traced peak {run_result.traced_peak_bytes / 2**20:.1f} MiB'
+            if run_result.traced_peak_bytes is not None else ''
+        )
+        + (
+            f', server max RSS {run_result.server_max_rss_bytes / 2**20:.1f} MiB'
+            if run_result.server_max_rss_bytes is not None else ''
+        )
+    )
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--operation',
+        nargs='+',
+        choices=[operation.name for operation in LoopbackOperation],
+        default=[LoopbackOperation.NULL.name],
+        help='The operations to call.'
+    )
+    parser.add_argument('--request-size', nargs='+', type=int, default=[64], help='The data sizes of echo requests.')
+    parser.add_argument('--response-size', nargs='+', type=int, default=[64], help='The data sizes of fetch responses.')
+    parser.add_argument('--connections', nargs='+', type=int, default=[1], help='The numbers of connections.')
+    parser.add_argument(
+        '--concurrency',
+        nargs='+',
+        type=int,
+        default=[1, 16],
+        help='The numbers of calls in flight at a time on each connection.'
+    )
+    parser.add_argument('--calls', type=int, default=10000, help='The number of timed calls per run.')
+    parser.add_argument('--warmup-calls', type=int, default=500, help='The number of untimed calls before a run.')
+    parser.add_argument('--transport', choices=['tcp', 'unix'], default='tcp')
+    parser.add_argument(
+        '--server-workers',
+        type=int,
+        default=1,
+        help='The number of server worker processes. Zero runs the server in the client\'s event loop.'
+    )
+    parser.add_argument('--handler-delay', type=float, default=0.0, help='The seconds each handler waits to respond.')
+    parser.add_argument('--max-frag', type=int, default=4280, help='The largest fragment to send and receive.')
+    parser.add_argument('--uvloop', action='store_true', help='Use uvloop\'s event loop, if installed.')
+    parser.add_argument('--trace-memory', action='store_true', help='Trace the peak of Python allocations per run.')
+    parser.add_argument('--output', help='The path of a JSON file to save the results in.')
+    args = parser.parse_args()
+
+    if args.uvloop and not install_uvloop():
+        print('uvloop is not installed; using the default event loop.')
+
+    run_results: list[RunResult] = []
+
+    for operation, request_size, response_size, num_connections, concurrency in product(
+        args.operation,
+        args.request_size,
+        args.response_size,
+        args.connections,
+        args.concurrency
+    ):
+        run_result = _perform_run(
+            configuration=RunConfiguration(
+                operation=operation,
+                request_size=request_size,
+                response_size=response_size,
+                num_connections=num_connections,
+                concurrency=concurrency,
+                num_calls=args.calls,
+                num_warmup_calls=args.warmup_calls,
+                transport=args.transport,
+                handler_delay=args.handler_delay,
+                max_frag=args.max_frag
+            ),
+            num_server_workers=args.server_workers,
+            trace_memory=args.trace_memory
+        )
+        _print_run_result(run_result=run_result)
+        run_results.append(run_result)
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json_dump(
+                {
+                    'metadata': environment_metadata(),
+                    'runs': [asdict(run_result) for run_result in run_results]
+                },
+                file,
+                indent=2
+            )
+
+
+if __name__ == '__main__':
+    main()
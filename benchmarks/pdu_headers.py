@@ -0,0 +1,110 @@
+"""
+Measure the per-PDU cost of encoding and decoding each registered PDU type, at several stub data sizes for the types
+that carry stub data.
+
+Run from the repository root with `python -m benchmarks.pdu_headers`.
+"""
+
+from uuid import UUID
+
+from rpc.pdu_headers.base import MSRPCHeader, _import_pdu_header_modules
+from rpc.pdu_headers.alter_context import AlterContextHeader
+from rpc.pdu_headers.alter_context_resp import AlterContextRespHeader
+from rpc.pdu_headers.auth3 import Auth3Header
+from rpc.pdu_headers.bind import BindHeader
+from rpc.pdu_headers.bind_ack import BindAckHeader
+from rpc.pdu_headers.bind_nak import BindNakHeader
+from rpc.pdu_headers.co_cancel import CoCancelHeader
+from rpc.pdu_headers.fault import FaultHeader
+from rpc.pdu_headers.orphaned import OrphanedHeader
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.structures.auth_level import AuthLevel
+from rpc.structures.auth_verifier import AuthVerifier
+from rpc.structures.context_list import ContextList
+from rpc.structures.context_element import ContextElement, NDR_PRESENTATION_SYNTAX
+from rpc.structures.context_negotiation_result import ContextNegotiationResult, ContDefResult, ProviderReason
+from rpc.structures.fault_status import FaultStatus
+from rpc.structures.port_any import PortAny
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.structures.result_list import ResultList
+
+from benchmarks.common import Benchmarks, main
+
+# The stub data sizes of the PDU types that carry stub data: empty, a small call, a full fragment, and a large fragment
+# as negotiated between hosts that allow them, the 16-bit `frag_length` limiting a PDU to less than 64 KiB.
+STUB_DATA_SIZES = (0, 64, 4096, 32768)
+
+_ABSTRACT_SYNTAX = PresentationSyntax(if_uuid=UUID('12345778-1234-abcd-ef00-0123456789ab'), if_version=1)
+
+
+def _sample_messages_with_stub_data(stub_data_size: int) -> list[MSRPCHeader]:
+    stub_data = bytes(stub_data_size)
+
+    return [
+        RequestHeader(call_id=1, opnum=7, alloc_hint=stub_data_size, stub_data=stub_data),
+        ResponseHeader(call_id=1, alloc_hint=stub_data_size, stub_data=stub_data),
+        FaultHeader(call_id=1, status=FaultStatus.NCA_S_FAULT_UNSPEC, stub_data=stub_data)
+    ]
+
+
+def _sample_messages_without_stub_data() -> list[MSRPCHeader]:
+    presentation_context_list = ContextList([ContextElement(context_id=0, abstract_syntax=_ABSTRACT_SYNTAX)])
+    result_list = ResultList([
+        ContextNegotiationResult(
+            result=ContDefResult.ACCEPTANCE,
+            reason=ProviderReason.REASON_NOT_SPECIFIED,
+            transfer_syntax=NDR_PRESENTATION_SYNTAX
+        )
+    ])
+
+    return [
+        BindHeader(call_id=1, presentation_context_list=presentation_context_list),
+        BindAckHeader(call_id=1, sec_addr=PortAny(port_spec='49664'), result_list=result_list),
+        BindNakHeader(call_id=1),
+        AlterContextHeader(call_id=2, presentation_context_list=presentation_context_list),
+        AlterContextRespHeader(call_id=2, sec_addr=PortAny(port_spec=''), result_list=result_list),
+        Auth3Header(
+            call_id=1,
+            auth_verifier=AuthVerifier(
+                auth_level=AuthLevel.RPC_C_AUTHN_LEVEL_PKT_PRIVACY,
+                auth_context_id=0,
+                auth_value=bytes(300)
+            )
+        ),
+        CoCancelHeader(call_id=3),
+        OrphanedHeader(call_id=3)
+    ]
+
+
+def benchmarks() -> Benchmarks:
+    named_messages: list[tuple[str, MSRPCHeader]] = [
+        (type(message).__name__, message)
+        for message in _sample_messages_without_stub_data()
+    ]
+    for stub_data_size in STUB_DATA_SIZES:
+        named_messages.extend(
+            (f'{type(message).__name__}[{stub_data_size}]', message)
+            for message in _sample_messages_with_stub_data(stub_data_size=stub_data_size)
+        )
+
+    # A registered PDU type without a sample would silently go unmeasured.
+    _import_pdu_header_modules()
+    sampled_classes = {type(message) for _, message in named_messages}
+    if missing_classes := set(MSRPCHeader.pdu_type_to_class.values()) - sampled_classes:
+        raise ValueError(f'No sample message of the PDU types {sorted(cls.__name__ for cls in missing_classes)}.')
+
+    name_to_statement: Benchmarks = {}
+    for name, message in named_messages:
+        message_bytes = bytes(message)
+        name_to_statement[f'pdu_headers.encode.{name}'] = message.__bytes__
+        name_to_statement[f'pdu_headers.buffers.{name}'] = message.buffers
+        name_to_statement[f'pdu_headers.decode.{name}'] = (
+            lambda message_bytes=message_bytes: MSRPCHeader.from_bytes(data=message_bytes)
+        )
+
+    return name_to_statement
+
+
+if __name__ == '__main__':
+    main(benchmarks=benchmarks, description=__doc__)
@@ -0,0 +1,202 @@
+"""
+Measure the cost of unpacking and packing representative `_STRUCTURE` schemas, both compiled -- as the client protocol
+messages use them -- and interpreted with `unpack_structure` and `pack_structure`, and in NDR64 where the schema
+supports it.
+
+Run from the repository root with `python -m benchmarks.structures`.
+"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import ClassVar, Type, Any
+from uuid import UUID
+
+from msdsalgs.win32_error import Win32ErrorCode
+
+from rpc.structures.context_handle import ContextHandle
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.utils import unpack_structure, pack_structure
+from rpc.utils.types import DWORD, ULONGLONG, CONTEXT_HANDLE, LPDWORD, LPBYTE, DWORD_ARRAY
+from rpc.utils.client_protocol_message import ClientProtocolMessage, ClientProtocolRequestBase, \
+    ClientProtocolResponseBase
+
+from benchmarks.common import Benchmarks, main
+
+ARRAY_LENGTHS = (16, 1024, 16384)
+BYTE_ARRAY_LENGTHS = (64, 4096, 65536)
+
+BENCHMARK_ABSTRACT_SYNTAX = PresentationSyntax(if_uuid=UUID('6a28f1c3-0e5b-4c1d-9a0e-2f7c1e3b5d90'), if_version=1)
+
+
+class BenchmarkOperation(IntEnum):
+    QUERY = 0
+
+
+@dataclass
+class FixedSizeValuesResponse(ClientProtocolResponseBase):
+    """A response of only fixed-size values, all of which are unpacked and packed as one run."""
+
+    entries_read: int
+    total_entries: int
+    flags: int
+    timestamp: int
+    resume_handle: int
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {
+        'entries_read': (DWORD,),
+        'total_entries': (DWORD,),
+        'flags': (DWORD,),
+        'timestamp': (ULONGLONG,),
+        'resume_handle': (LPDWORD,),
+        'return_code': (DWORD, Win32ErrorCode)
+    }
+
+
+@dataclass
+class ContextHandleRequest(ClientProtocolRequestBase):
+    """A request on a context handle, the most common shape of a request."""
+
+    OPERATION: ClassVar[BenchmarkOperation] = BenchmarkOperation.QUERY
+    RESPONSE_CLASS: ClassVar[Type[ClientProtocolResponseBase]] = FixedSizeValuesResponse
+    ABSTRACT_SYNTAX: ClassVar[PresentationSyntax] = BENCHMARK_ABSTRACT_SYNTAX
+
+    context_handle: ContextHandle
+    level: int
+    preferred_maximum_length: int
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {
+        'context_handle': (CONTEXT_HANDLE,),
+        'level': (DWORD,),
+        'preferred_maximum_length': (DWORD,)
+    }
+
+
+FixedSizeValuesResponse.REQUEST_CLASS = ContextHandleRequest
+
+
+@dataclass
+class DwordArrayResponse(ClientProtocolResponseBase):
+    """A response of a conformant array of DWORDs, which is decoded in one operation."""
+
+    values: Any
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {
+        'values': (DWORD_ARRAY,),
+        'return_code': (DWORD, Win32ErrorCode)
+    }
+
+
+@dataclass
+class ByteBufferResponse(ClientProtocolResponseBase):
+    """A response of a pointer to a conformant byte array of the `ndr` library, as returned by data-fetching calls."""
+
+    buffer: bytes
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {
+        'buffer': (LPBYTE,),
+        'return_code': (DWORD, Win32ErrorCode)
+    }
+
+
+def _sample_messages() -> list[tuple[str, ClientProtocolMessage, bool, bool]]:
+    """
+    Make sample messages of the schemas.
+
+    :return: The name of each sample, the sample message, whether its schema can also be interpreted by
+        `unpack_structure` and `pack_structure`, and whether it can be marshalled in NDR64.
+    """
+
+    samples: list[tuple[str, ClientProtocolMessage, bool, bool]] = [
+        (
+            'FixedSizeValuesResponse',
+            FixedSizeValuesResponse(
+                return_code=Win32ErrorCode.ERROR_SUCCESS,
+                entries_read=10,
+                total_entries=100,
+                flags=0x8000_0001,
+                timestamp=133_000_000_000_000_000,
+                resume_handle=10
+            ),
+            True,
+            True
+        ),
+        (
+            'ContextHandleRequest',
+            ContextHandleRequest(
+                context_handle=ContextHandle(0, UUID('0a1b2c3d-4e5f-6071-8293-a4b5c6d7e8f9')),
+                level=1,
+                preferred_maximum_length=0xFFFF_FFFF
+            ),
+            True,
+            True
+        )
+    ]
+
+    samples.extend(
+        (
+            f'DwordArrayResponse[{array_length}]',
+            DwordArrayResponse(return_code=Win32ErrorCode.ERROR_SUCCESS, values=list(range(array_length))),
+            True,
+            True
+        )
+        for array_length in ARRAY_LENGTHS
+    )
+
+    samples.extend(
+        (
+            f'ByteBufferResponse[{byte_array_length}]',
+            ByteBufferResponse(return_code=Win32ErrorCode.ERROR_SUCCESS, buffer=bytes(byte_array_length)),
+            True,
+            False
+        )
+        for byte_array_length in BYTE_ARRAY_LENGTHS
+    )
+
+    return samples
+
+
+def benchmarks() -> Benchmarks:
+    name_to_statement: Benchmarks = {}
+
+    for name, message, interpretable, ndr64_capable in _sample_messages():
+        message_class = type(message)
+        message_bytes = bytes(message)
+
+        name_to_statement[f'structures.compiled.pack.{name}'] = message.__bytes__
+        name_to_statement[f'structures.compiled.unpack.{name}'] = (
+            lambda message_class=message_class, message_bytes=message_bytes: message_class.from_bytes(
+                data=message_bytes
+            )
+        )
+
+        if ndr64_capable:
+            ndr64_message_bytes = message.to_bytes(ndr64=True)
+            name_to_statement[f'structures.compiled_ndr64.pack.{name}'] = (
+                lambda message=message: message.to_bytes(ndr64=True)
+            )
+            name_to_statement[f'structures.compiled_ndr64.unpack.{name}'] = (
+                lambda message_class=message_class, ndr64_message_bytes=ndr64_message_bytes: message_class.from_bytes(
+                    data=ndr64_message_bytes,
+                    ndr64=True
+                )
+            )
+
+        if interpretable:
+            structure = message_class._STRUCTURE
+            # Unlike the compiled form, the interpreted form does not align the values, so its bytes can differ.
+            interpreted_message_bytes = pack_structure(instance=message, structure=structure)
+            name_to_statement[f'structures.interpreted.pack.{name}'] = (
+                lambda message=message, structure=structure: pack_structure(instance=message, structure=structure)
+            )
+            name_to_statement[f'structures.interpreted.unpack.{name}'] = (
+                lambda interpreted_message_bytes=interpreted_message_bytes, structure=structure: unpack_structure(
+                    data=interpreted_message_bytes,
+                    structure=structure
+                )
+            )
+
+    return name_to_statement
+
+
+if __name__ == '__main__':
+    main(benchmarks=benchmarks, description=__doc__)
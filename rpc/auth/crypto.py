@@ -0,0 +1,178 @@
+from __future__ import annotations
+from struct import Struct
+from hashlib import new as hashlib_new
+
+# The primitives that NTLM needs but that `hashlib` does not always provide -- OpenSSL 3 has moved MD4 to its legacy
+# provider -- and that the standard library lacks altogether, in the case of RC4.
+
+_MD4_BLOCK_STRUCT = Struct('<16I')
+_MD4_DIGEST_STRUCT = Struct('<4I')
+_MD4_LENGTH_STRUCT = Struct('<Q')
+_MASK_32 = 0xFFFFFFFF
+
+
+def _rotate_left(value: int, num_bits: int) -> int:
+    value &= _MASK_32
+    return ((value << num_bits) | (value >> (32 - num_bits))) & _MASK_32
+
+
+def _md4(data: bytes) -> bytes:
+    """
+    Compute the MD4 digest of data, as specified in RFC 1320.
+
+    :param data: The data to digest.
+    :return: The digest.
+    """
+
+    message = b''.join([
+        data,
+        b'\x80',
+        bytes((55 - len(data)) % 64),
+        _MD4_LENGTH_STRUCT.pack((len(data) * 8) & (2**64 - 1))
+    ])
+
+    a, b, c, d = 0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476
+
+    for block_offset in range(0, len(message), 64):
+        x = _MD4_BLOCK_STRUCT.unpack_from(message, block_offset)
+        aa, bb, cc, dd = a, b, c, d
+
+        for i in (0, 4, 8, 12):
+            a = _rotate_left(a + ((b & c) | (~b & d)) + x[i], 3)
+            d = _rotate_left(d + ((a & b) | (~a & c)) + x[i + 1], 7)
+            c = _rotate_left(c + ((d & a) | (~d & b)) + x[i + 2], 11)
+            b = _rotate_left(b + ((c & d) | (~c & a)) + x[i + 3], 19)
+
+        for i in (0, 1, 2, 3):
+            a = _rotate_left(a + ((b & c) | (b & d) | (c & d)) + x[i] + 0x5A827999, 3)
+            d = _rotate_left(d + ((a & b) | (a & c) | (b & c)) + x[i + 4] + 0x5A827999, 5)
+            c = _rotate_left(c + ((d & a) | (d & b) | (a & b)) + x[i + 8] + 0x5A827999, 9)
+            b = _rotate_left(b + ((c & d) | (c & a) | (d & a)) + x[i + 12] + 0x5A827999, 13)
+
+        for i in (0, 2, 1, 3):
+            a = _rotate_left(a + (b ^ c ^ d) + x[i] + 0x6ED9EBA1, 3)
+            d = _rotate_left(d + (a ^ b ^ c) + x[i + 8] + 0x6ED9EBA1, 9)
+            c = _rotate_left(c + (d ^ a ^ b) + x[i + 4] + 0x6ED9EBA1, 11)
+            b = _rotate_left(b + (c ^ d ^ a) + x[i + 12] + 0x6ED9EBA1, 15)
+
+        a, b, c, d = (a + aa) & _MASK_32, (b + bb) & _MASK_32, (c + cc) & _MASK_32, (d + dd) & _MASK_32
+
+    return _MD4_DIGEST_STRUCT.pack(a, b, c, d)
+
+
+def md4(data: bytes) -> bytes:
+    """
+    Compute the MD4 digest of data, with `hashlib` if it supports MD4.
+
+    :param data: The data to digest.
+    :return: The digest.
+    """
+
+    try:
+        return hashlib_new('md4', data).digest()
+    except ValueError:
+        return _md4(data=data)
+
+
+def _make_arc4_encryptor(key: bytes):
+    """
+    Make an RC4 cipher with the `cryptography` package, if it is installed.
+
+    :param key: The key of the cipher.
+    :return: A `cryptography` encryption context, or `None` if the package is not available.
+    """
+
+    try:
+        from cryptography.hazmat.primitives.ciphers import Cipher
+        try:
+            from cryptography.hazmat.decrepit.ciphers.algorithms import ARC4
+        except ImportError:
+            from cryptography.hazmat.primitives.ciphers.algorithms import ARC4
+    except ImportError:
+        return None
+
+    return Cipher(ARC4(key), mode=None).encryptor()
+
+
+class RC4:
+    """
+    An RC4 cipher whose key stream continues from one call to the next.
+
+    The cipher of the `cryptography` package is used if it is installed; otherwise a pure-Python implementation, which
+    is slow for large payloads.
+    """
+
+    def __init__(self, key: bytes):
+        """
+        :param key: The key of the cipher.
+        """
+
+        self._encryptor = _make_arc4_encryptor(key=key)
+        if self._encryptor is not None:
+            return
+
+        state = bytearray(range(256))
+        j = 0
+        for i in range(256):
+            j = (j + state[i] + key[i % len(key)]) & 0xFF
+            state[i], state[j] = state[j], state[i]
+
+        self._state = state
+        self._i = 0
+        self._j = 0
+
+    def _process_into_pure(self, data: bytes | bytearray | memoryview, destination: bytearray | memoryview) -> None:
+
+        state = self._state
+        i, j = self._i, self._j
+
+        for k in range(len(data)):
+            i = (i + 1) & 0xFF
+            state_i = state[i]
+            j = (j + state_i) & 0xFF
+            state_j = state[j]
+            state[i], state[j] = state_j, state_i
+            destination[k] = data[k] ^ state[(state_i + state_j) & 0xFF]
+
+        self._i, self._j = i, j
+
+    def process_into(self, data: bytes | bytearray | memoryview, destination: bytearray | memoryview) -> None:
+        """
+        Encrypt -- or, equivalently, decrypt -- data into a buffer, without intermediate copies.
+
+        :param data: The data to process. It must not overlap with the destination, unless they are the same buffer.
+        :param destination: A writable buffer of the same length as the data, to write the result to.
+        :return: None
+        """
+
+        if self._encryptor is None:
+            self._process_into_pure(data=data, destination=destination)
+        elif data is destination:
+            destination[:] = self._encryptor.update(data)
+        else:
+            self._encryptor.update_into(data, destination)
+
+    def process_in_place(self, buffer: bytearray | memoryview) -> None:
+        """
+        Encrypt -- or, equivalently, decrypt -- a writable buffer in place.
+
+        :param buffer: The buffer to process.
+        :return: None
+        """
+
+        self.process_into(data=buffer, destination=buffer)
+
+    def process(self, data: bytes | bytearray | memoryview) -> bytes:
+        """
+        Encrypt -- or, equivalently, decrypt -- data.
+
+        :param data: The data to process.
+        :return: The result.
+        """
+
+        if self._encryptor is not None:
+            return self._encryptor.update(data)
+
+        destination = bytearray(len(data))
+        self._process_into_pure(data=data, destination=destination)
+        return bytes(destination)
@@ -0,0 +1,711 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import ClassVar, Mapping
+from enum import IntEnum, IntFlag
+from struct import Struct
+from hashlib import md5
+from hmac import new as hmac_new, compare_digest
+from os import urandom
+from time import time
+
+from rpc.auth.crypto import md4, RC4
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.structures.auth_type import AuthType
+from rpc.structures.auth_level import AuthLevel
+from rpc.structures.auth_verifier import AuthVerifier
+from rpc.exceptions import AuthenticationError, MessageIntegrityError
+
+NTLMSSP_SIGNATURE = b'NTLMSSP\x00'
+
+# The version that is reported in the messages: Windows 10, NTLM revision 15.
+_VERSION = bytes([10, 0]) + (19041).to_bytes(2, 'little') + bytes(3) + bytes([15])
+# The length, maximum length and offset of a variable-length field of a message.
+_FIELD_STRUCT = Struct('<HHI')
+_UINT32_STRUCT = Struct('<I')
+_AV_PAIR_HEADER_STRUCT = Struct('<HH')
+# The difference between the FILETIME epoch (1601-01-01) and the Unix epoch, in seconds.
+_FILETIME_EPOCH_OFFSET = 11644473600
+
+_CLIENT_SIGNING_MAGIC = b'session key to client-to-server signing key magic constant\x00'
+_SERVER_SIGNING_MAGIC = b'session key to server-to-client signing key magic constant\x00'
+_CLIENT_SEALING_MAGIC = b'session key to client-to-server sealing key magic constant\x00'
+_SERVER_SEALING_MAGIC = b'session key to server-to-client sealing key magic constant\x00'
+
+# The version, checksum and sequence number of a message signature.
+_SIGNATURE_VERSION = 1
+_SIGNATURE_LENGTH = 16
+
+
+class NTLMMessageType(IntEnum):
+    NEGOTIATE = 1
+    CHALLENGE = 2
+    AUTHENTICATE = 3
+
+
+class NegotiateFlag(IntFlag):
+    NTLMSSP_NEGOTIATE_UNICODE = 0x00000001
+    NTLM_NEGOTIATE_OEM = 0x00000002
+    NTLMSSP_REQUEST_TARGET = 0x00000004
+    NTLMSSP_NEGOTIATE_SIGN = 0x00000010
+    NTLMSSP_NEGOTIATE_SEAL = 0x00000020
+    NTLMSSP_NEGOTIATE_DATAGRAM = 0x00000040
+    NTLMSSP_NEGOTIATE_LM_KEY = 0x00000080
+    NTLMSSP_NEGOTIATE_NTLM = 0x00000200
+    NTLMSSP_ANONYMOUS = 0x00000800
+    NTLMSSP_NEGOTIATE_OEM_DOMAIN_SUPPLIED = 0x00001000
+    NTLMSSP_NEGOTIATE_OEM_WORKSTATION_SUPPLIED = 0x00002000
+    NTLMSSP_NEGOTIATE_ALWAYS_SIGN = 0x00008000
+    NTLMSSP_TARGET_TYPE_DOMAIN = 0x00010000
+    NTLMSSP_TARGET_TYPE_SERVER = 0x00020000
+    NTLMSSP_NEGOTIATE_EXTENDED_SESSIONSECURITY = 0x00080000
+    NTLMSSP_NEGOTIATE_IDENTIFY = 0x00100000
+    NTLMSSP_REQUEST_NON_NT_SESSION_KEY = 0x00400000
+    NTLMSSP_NEGOTIATE_TARGET_INFO = 0x00800000
+    NTLMSSP_NEGOTIATE_VERSION = 0x02000000
+    NTLMSSP_NEGOTIATE_128 = 0x20000000
+    NTLMSSP_NEGOTIATE_KEY_EXCH = 0x40000000
+    NTLMSSP_NEGOTIATE_56 = 0x80000000
+
+
+class AvId(IntEnum):
+    MSV_AV_EOL = 0x0000
+    MSV_AV_NB_COMPUTER_NAME = 0x0001
+    MSV_AV_NB_DOMAIN_NAME = 0x0002
+    MSV_AV_DNS_COMPUTER_NAME = 0x0003
+    MSV_AV_DNS_DOMAIN_NAME = 0x0004
+    MSV_AV_DNS_TREE_NAME = 0x0005
+    MSV_AV_FLAGS = 0x0006
+    MSV_AV_TIMESTAMP = 0x0007
+    MSV_AV_SINGLE_HOST = 0x0008
+    MSV_AV_TARGET_NAME = 0x0009
+    MSV_AV_CHANNEL_BINDINGS = 0x000A
+
+
+# The flags that the client requests: NTLMv2 session security with 128-bit keys and key exchange, which is what
+# Windows negotiates by default.
+DEFAULT_NEGOTIATE_FLAGS = (
+    NegotiateFlag.NTLMSSP_NEGOTIATE_UNICODE
+    | NegotiateFlag.NTLMSSP_REQUEST_TARGET
+    | NegotiateFlag.NTLMSSP_NEGOTIATE_SIGN
+    | NegotiateFlag.NTLMSSP_NEGOTIATE_SEAL
+    | NegotiateFlag.NTLMSSP_NEGOTIATE_NTLM
+    | NegotiateFlag.NTLMSSP_NEGOTIATE_ALWAYS_SIGN
+    | NegotiateFlag.NTLMSSP_NEGOTIATE_EXTENDED_SESSIONSECURITY
+    | NegotiateFlag.NTLMSSP_NEGOTIATE_TARGET_INFO
+    | NegotiateFlag.NTLMSSP_NEGOTIATE_VERSION
+    | NegotiateFlag.NTLMSSP_NEGOTIATE_128
+    | NegotiateFlag.NTLMSSP_NEGOTIATE_KEY_EXCH
+    | NegotiateFlag.NTLMSSP_NEGOTIATE_56
+)
+
+
+def _pack_payload(fields: list[bytes], payload_offset: int) -> tuple[bytes, bytes]:
+    """
+    Pack the variable-length fields of a message.
+
+    :param fields: The values of the fields, in the order of their descriptors.
+    :param payload_offset: The offset of the payload, i.e. the size of the fixed part of the message.
+    :return: The field descriptors, and the payload.
+    """
+
+    descriptors: list[bytes] = []
+    offset = payload_offset
+    for value in fields:
+        descriptors.append(_FIELD_STRUCT.pack(len(value), len(value), offset))
+        offset += len(value)
+
+    return b''.join(descriptors), b''.join(fields)
+
+
+def _unpack_field(data: bytes | memoryview, descriptor_offset: int) -> bytes:
+    """
+    Unpack a variable-length field of a message.
+
+    :param data: The message.
+    :param descriptor_offset: The offset of the field's descriptor in the message.
+    :return: The value of the field.
+    """
+
+    length, _, offset = _FIELD_STRUCT.unpack_from(data, descriptor_offset)
+    if offset + length > len(data):
+        raise AuthenticationError('A field of the NTLM message is out of bounds.')
+
+    return bytes(data[offset:offset+length])
+
+
+def _check_message_header(data: bytes | memoryview, message_type: NTLMMessageType, minimum_size: int) -> None:
+    if len(data) < minimum_size or bytes(data[:8]) != NTLMSSP_SIGNATURE:
+        raise AuthenticationError('The data is not an NTLM message.')
+
+    if _UINT32_STRUCT.unpack_from(data, 8)[0] != message_type:
+        raise AuthenticationError(f'The NTLM message is not of the type {message_type.name}.')
+
+
+def pack_av_pairs(av_pairs: Mapping[AvId, bytes]) -> bytes:
+    """
+    Pack attribute-value pairs into the target information of a CHALLENGE message.
+
+    :param av_pairs: The values of the attributes, other than the terminating `MSV_AV_EOL`.
+    :return: The packed pairs.
+    """
+
+    return b''.join(
+        _AV_PAIR_HEADER_STRUCT.pack(av_id, len(value)) + value
+        for av_id, value in av_pairs.items()
+    ) + _AV_PAIR_HEADER_STRUCT.pack(AvId.MSV_AV_EOL, 0)
+
+
+def unpack_av_pairs(data: bytes | memoryview) -> dict[int, bytes]:
+    """
+    Unpack the attribute-value pairs of the target information of a CHALLENGE message.
+
+    :param data: The target information.
+    :return: The values of the attributes, other than the terminating `MSV_AV_EOL`.
+    """
+
+    av_pairs: dict[int, bytes] = {}
+    offset = 0
+    while offset + _AV_PAIR_HEADER_STRUCT.size <= len(data):
+        av_id, av_len = _AV_PAIR_HEADER_STRUCT.unpack_from(data, offset)
+        offset += _AV_PAIR_HEADER_STRUCT.size
+        if av_id == AvId.MSV_AV_EOL:
+            break
+        av_pairs[av_id] = bytes(data[offset:offset+av_len])
+        offset += av_len
+
+    return av_pairs
+
+
+@dataclass
+class NegotiateMessage:
+    # The signature, message type, flags, and the descriptors of the domain name and workstation fields.
+    _STRUCT: ClassVar[Struct] = Struct('<8sII8s8s8s')
+    structure_size: ClassVar[int] = _STRUCT.size
+
+    negotiate_flags: NegotiateFlag = DEFAULT_NEGOTIATE_FLAGS
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> NegotiateMessage:
+        # The version is not present in the messages of old clients.
+        _check_message_header(data=data, message_type=NTLMMessageType.NEGOTIATE, minimum_size=32)
+        return cls(negotiate_flags=NegotiateFlag(_UINT32_STRUCT.unpack_from(data, 12)[0]))
+
+    def __bytes__(self) -> bytes:
+        # The domain name and workstation are not supplied; they are sent in the AUTHENTICATE message.
+        return self._STRUCT.pack(
+            NTLMSSP_SIGNATURE,
+            NTLMMessageType.NEGOTIATE,
+            self.negotiate_flags,
+            _FIELD_STRUCT.pack(0, 0, self.structure_size),
+            _FIELD_STRUCT.pack(0, 0, self.structure_size),
+            _VERSION
+        )
+
+
+@dataclass
+class ChallengeMessage:
+    # The signature, message type, the target name descriptor, flags, server challenge, a reserved field, the target
+    # information descriptor, and the version.
+    _STRUCT: ClassVar[Struct] = Struct('<8sI8sI8s8x8s8s')
+    structure_size: ClassVar[int] = _STRUCT.size
+
+    negotiate_flags: NegotiateFlag
+    server_challenge: bytes
+    target_name: bytes = b''
+    target_info: bytes = b''
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> ChallengeMessage:
+        _check_message_header(data=data, message_type=NTLMMessageType.CHALLENGE, minimum_size=48)
+
+        return cls(
+            negotiate_flags=NegotiateFlag(_UINT32_STRUCT.unpack_from(data, 20)[0]),
+            server_challenge=bytes(data[24:32]),
+            target_name=_unpack_field(data=data, descriptor_offset=12),
+            target_info=_unpack_field(data=data, descriptor_offset=40)
+        )
+
+    def __bytes__(self) -> bytes:
+        descriptors, payload = _pack_payload(
+            fields=[self.target_name, self.target_info],
+            payload_offset=self.structure_size
+        )
+
+        return self._STRUCT.pack(
+            NTLMSSP_SIGNATURE,
+            NTLMMessageType.CHALLENGE,
+            descriptors[:_FIELD_STRUCT.size],
+            self.negotiate_flags,
+            self.server_challenge,
+            descriptors[_FIELD_STRUCT.size:],
+            _VERSION
+        ) + payload
+
+
+@dataclass
+class AuthenticateMessage:
+    # The signature, message type, the descriptors of the LM and NT challenge responses, domain name, user name,
+    # workstation and encrypted random session key, flags, and the version. No MIC is included.
+    _STRUCT: ClassVar[Struct] = Struct('<8sI48sI8s')
+    structure_size: ClassVar[int] = _STRUCT.size
+
+    negotiate_flags: NegotiateFlag
+    lm_challenge_response: bytes
+    nt_challenge_response: bytes
+    domain_name: str
+    user_name: str
+    workstation: str = ''
+    encrypted_random_session_key: bytes = b''
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> AuthenticateMessage:
+        _check_message_header(data=data, message_type=NTLMMessageType.AUTHENTICATE, minimum_size=64)
+
+        negotiate_flags = NegotiateFlag(_UINT32_STRUCT.unpack_from(data, 60)[0])
+        encoding = 'utf-16-le' if negotiate_flags & NegotiateFlag.NTLMSSP_NEGOTIATE_UNICODE else 'cp437'
+
+        return cls(
+            negotiate_flags=negotiate_flags,
+            lm_challenge_response=_unpack_field(data=data, descriptor_offset=12),
+            nt_challenge_response=_unpack_field(data=data, descriptor_offset=20),
+            domain_name=_unpack_field(data=data, descriptor_offset=28).decode(encoding=encoding),
+            user_name=_unpack_field(data=data, descriptor_offset=36).decode(encoding=encoding),
+            workstation=_unpack_field(data=data, descriptor_offset=44).decode(encoding=encoding),
+            encrypted_random_session_key=_unpack_field(data=data, descriptor_offset=52)
+        )
+
+    def __bytes__(self) -> bytes:
+        descriptors, payload = _pack_payload(
+            fields=[
+                self.lm_challenge_response,
+                self.nt_challenge_response,
+                self.domain_name.encode(encoding='utf-16-le'),
+                self.user_name.encode(encoding='utf-16-le'),
+                self.workstation.encode(encoding='utf-16-le'),
+                self.encrypted_random_session_key
+            ],
+            payload_offset=self.structure_size
+        )
+
+        return self._STRUCT.pack(
+            NTLMSSP_SIGNATURE,
+            NTLMMessageType.AUTHENTICATE,
+            descriptors,
+            self.negotiate_flags,
+            _VERSION
+        ) + payload
+
+
+def _hmac_md5(key: bytes, data: bytes) -> bytes:
+    return hmac_new(key=key, msg=data, digestmod=md5).digest()
+
+
+def nt_owf_v2(password: str, user_name: str, domain_name: str) -> bytes:
+    """
+    Compute the NTLMv2 response key of an account (`NTOWFv2`).
+
+    :param password: The password of the account.
+    :param user_name: The user name of the account.
+    :param domain_name: The domain of the account.
+    :return: The response key.
+    """
+
+    return _hmac_md5(
+        key=md4(password.encode(encoding='utf-16-le')),
+        data=(user_name.upper() + domain_name).encode(encoding='utf-16-le')
+    )
+
+
+def _filetime_now() -> bytes:
+    return int((time() + _FILETIME_EPOCH_OFFSET) * 10_000_000).to_bytes(8, 'little')
+
+
+def _seal_key(exported_session_key: bytes, negotiate_flags: NegotiateFlag, magic: bytes) -> bytes:
+    if negotiate_flags & NegotiateFlag.NTLMSSP_NEGOTIATE_128:
+        key = exported_session_key
+    elif negotiate_flags & NegotiateFlag.NTLMSSP_NEGOTIATE_56:
+        key = exported_session_key[:7]
+    else:
+        key = exported_session_key[:5]
+
+    return md5(key + magic).digest()
+
+
+class _NTLMSecurityContext:
+    """
+    The state shared by the two ends of an NTLM security context: the signing and sealing keys and the sequence
+    numbers of the messages in each direction.
+    """
+
+    auth_type: ClassVar[AuthType] = AuthType.RPC_C_AUTHN_WINNT
+    # The most that a verifier adds to a fragment: the maximum auth padding, the security trailer, and the signature.
+    MAX_VERIFIER_LENGTH: ClassVar[int] = (
+        AuthVerifier.AUTH_PAD_ALIGNMENT - 1 + AuthVerifier.sec_trailer_size + _SIGNATURE_LENGTH
+    )
+    _IS_CLIENT: ClassVar[bool]
+
+    def __init__(self, auth_level: AuthLevel, auth_context_id: int):
+        """
+        :param auth_level: The authentication level of the association.
+        :param auth_context_id: The id of the security context within the association.
+        """
+
+        self.auth_level = auth_level
+        self.auth_context_id = auth_context_id
+        self.negotiate_flags = NegotiateFlag(0)
+
+        self._send_signing_hmac = None
+        self._receive_signing_hmac = None
+        self._send_sealing_handle: RC4 | None = None
+        self._receive_sealing_handle: RC4 | None = None
+        self._send_sequence_number = 0
+        self._receive_sequence_number = 0
+
+    @property
+    def established(self) -> bool:
+        return self._send_signing_hmac is not None
+
+    @property
+    def protects_messages(self) -> bool:
+        """Whether the request, response and fault PDUs of the association are signed, and possibly sealed."""
+        return self.established and self.auth_level >= AuthLevel.RPC_C_AUTHN_LEVEL_PKT
+
+    def _derive_keys(self, exported_session_key: bytes) -> None:
+        """
+        Derive the signing and sealing keys of the two directions from the session key.
+
+        :param exported_session_key: The session key that the client and the server have agreed on.
+        :return: None
+        """
+
+        client_signing_key = md5(exported_session_key + _CLIENT_SIGNING_MAGIC).digest()
+        server_signing_key = md5(exported_session_key + _SERVER_SIGNING_MAGIC).digest()
+        client_sealing_handle = RC4(
+            key=_seal_key(exported_session_key, negotiate_flags=self.negotiate_flags, magic=_CLIENT_SEALING_MAGIC)
+        )
+        server_sealing_handle = RC4(
+            key=_seal_key(exported_session_key, negotiate_flags=self.negotiate_flags, magic=_SERVER_SEALING_MAGIC)
+        )
+
+        # The keyed HMAC states are copied for each message, rather than the keys being processed anew.
+        client_signing_hmac = hmac_new(key=client_signing_key, digestmod=md5)
+        server_signing_hmac = hmac_new(key=server_signing_key, digestmod=md5)
+
+        if self._IS_CLIENT:
+            self._send_signing_hmac, self._receive_signing_hmac = client_signing_hmac, server_signing_hmac
+            self._send_sealing_handle, self._receive_sealing_handle = client_sealing_handle, server_sealing_handle
+        else:
+            self._send_signing_hmac, self._receive_signing_hmac = server_signing_hmac, client_signing_hmac
+            self._send_sealing_handle, self._receive_sealing_handle = server_sealing_handle, client_sealing_handle
+
+    def _signature(self, digest: bytes, sequence_number: int, sealing_handle: RC4) -> bytes:
+        checksum = digest[:8]
+        if self.negotiate_flags & NegotiateFlag.NTLMSSP_NEGOTIATE_KEY_EXCH:
+            checksum = sealing_handle.process(checksum)
+
+        return b''.join([
+            _UINT32_STRUCT.pack(_SIGNATURE_VERSION),
+            checksum,
+            _UINT32_STRUCT.pack(sequence_number)
+        ])
+
+    def protect(self, message: MSRPCHeader) -> None:
+        """
+        Sign a request, response or fault PDU, and seal its stub data if the level is privacy.
+
+        The PDU is given an authentication verifier, whose auth padding aligns the stub data. When sealing, the stub
+        data and padding are encrypted in one pass into a new buffer, and the PDU's stub data is replaced with a view
+        into it; the original stub data is left as it was.
+
+        :param message: The PDU to protect. It must fit in a fragment together with `MAX_VERIFIER_LENGTH` bytes.
+        :return: None
+        """
+
+        stub_data = message.stub_data
+        stub_data_length = len(stub_data)
+        auth_verifier = AuthVerifier(
+            auth_level=self.auth_level,
+            auth_context_id=self.auth_context_id,
+            auth_value=bytes(_SIGNATURE_LENGTH),
+            auth_type=self.auth_type,
+            auth_padding=bytes(-stub_data_length % AuthVerifier.AUTH_PAD_ALIGNMENT)
+        )
+        message.auth_verifier = auth_verifier
+
+        sequence_number = self._send_sequence_number
+        self._send_sequence_number = (sequence_number + 1) & 0xFFFFFFFF
+
+        # The signature covers the entire PDU up to the signature, with the stub data and padding in plaintext.
+        signing_hmac = self._send_signing_hmac.copy()
+        signing_hmac.update(_UINT32_STRUCT.pack(sequence_number))
+        signing_hmac.update(message.buffers()[0])
+        signing_hmac.update(stub_data)
+        signing_hmac.update(auth_verifier.auth_padding)
+        signing_hmac.update(auth_verifier.sec_trailer())
+
+        if self.auth_level >= AuthLevel.RPC_C_AUTHN_LEVEL_PKT_PRIVACY:
+            sealed_data = memoryview(bytearray(stub_data_length + auth_verifier.auth_pad_length))
+            self._send_sealing_handle.process_into(stub_data, sealed_data[:stub_data_length])
+            self._send_sealing_handle.process_into(auth_verifier.auth_padding, sealed_data[stub_data_length:])
+            message.stub_data = sealed_data[:stub_data_length]
+            auth_verifier.auth_padding = sealed_data[stub_data_length:]
+
+        auth_verifier.auth_value = self._signature(
+            digest=signing_hmac.digest(),
+            sequence_number=sequence_number,
+            sealing_handle=self._send_sealing_handle
+        )
+
+    def unprotect(self, message: MSRPCHeader, fragment: memoryview) -> None:
+        """
+        Verify the signature of a received request, response or fault PDU, and unseal its stub data if the level is
+        privacy.
+
+        The stub data is unsealed in place, in the fragment from which the PDU was decoded.
+
+        :param message: The PDU decoded from the fragment.
+        :param fragment: A writable view of the fragment.
+        :return: None
+        """
+
+        auth_verifier: AuthVerifier | None = message.auth_verifier
+        if auth_verifier is None or len(auth_verifier.auth_value) != _SIGNATURE_LENGTH:
+            raise MessageIntegrityError('The PDU is not signed.')
+
+        sec_trailer_offset = len(fragment) - auth_verifier.auth_length - AuthVerifier.sec_trailer_size
+        stub_data_offset = sec_trailer_offset - auth_verifier.auth_pad_length - len(message.stub_data)
+
+        sequence_number = self._receive_sequence_number
+        self._receive_sequence_number = (sequence_number + 1) & 0xFFFFFFFF
+
+        if self.auth_level >= AuthLevel.RPC_C_AUTHN_LEVEL_PKT_PRIVACY:
+            self._receive_sealing_handle.process_in_place(fragment[stub_data_offset:sec_trailer_offset])
+            # A copied stub data, as that of a fault, is replaced with the unsealed bytes.
+            if not isinstance(message.stub_data, memoryview):
+                message.stub_data = fragment[stub_data_offset:stub_data_offset+len(message.stub_data)].tobytes()
+
+        signing_hmac = self._receive_signing_hmac.copy()
+        signing_hmac.update(_UINT32_STRUCT.pack(sequence_number))
+        signing_hmac.update(fragment[:sec_trailer_offset+AuthVerifier.sec_trailer_size])
+
+        expected_signature = self._signature(
+            digest=signing_hmac.digest(),
+            sequence_number=sequence_number,
+            sealing_handle=self._receive_sealing_handle
+        )
+        if not compare_digest(expected_signature, auth_verifier.auth_value):
+            raise MessageIntegrityError('The signature of the PDU is not valid.')
+
+
+class NTLMClientContext(_NTLMSecurityContext):
+    """
+    The client end of an NTLMv2 security context, which provides the tokens of the bind and `rpc_auth_3` PDUs and then
+    protects the calls of the association.
+    """
+
+    _IS_CLIENT: ClassVar[bool] = True
+
+    def __init__(
+        self,
+        user_name: str,
+        password: str,
+        domain_name: str = '',
+        workstation: str = '',
+        auth_level: AuthLevel = AuthLevel.RPC_C_AUTHN_LEVEL_PKT_PRIVACY,
+        auth_context_id: int = 0
+    ):
+        """
+        :param user_name: The user name of the account to authenticate as.
+        :param password: The password of the account.
+        :param domain_name: The domain of the account.
+        :param workstation: The name of the client's computer.
+        :param auth_level: The authentication level of the association.
+        :param auth_context_id: The id of the security context within the association.
+        """
+
+        super().__init__(auth_level=auth_level, auth_context_id=auth_context_id)
+
+        self.user_name = user_name
+        self.domain_name = domain_name
+        self.workstation = workstation
+        self._response_key_nt = nt_owf_v2(password=password, user_name=user_name, domain_name=domain_name)
+
+    def negotiate(self) -> bytes:
+        """
+        Make the NEGOTIATE message, the token of the bind PDU.
+
+        :return: The message.
+        """
+
+        self.negotiate_flags = DEFAULT_NEGOTIATE_FLAGS
+        return bytes(NegotiateMessage(negotiate_flags=self.negotiate_flags))
+
+    def authenticate(self, challenge: bytes | memoryview) -> bytes:
+        """
+        Answer the server's CHALLENGE message, the token of the bind_ack PDU, and establish the security context.
+
+        :param challenge: The CHALLENGE message.
+        :return: The AUTHENTICATE message, the token of the `rpc_auth_3` PDU.
+        """
+
+        challenge_message = ChallengeMessage.from_bytes(data=challenge)
+        if not challenge_message.negotiate_flags & NegotiateFlag.NTLMSSP_NEGOTIATE_EXTENDED_SESSIONSECURITY:
+            raise AuthenticationError('The server does not support NTLMv2 session security.')
+
+        self.negotiate_flags = challenge_message.negotiate_flags & DEFAULT_NEGOTIATE_FLAGS
+
+        # The server's timestamp is used if it provides one, in which case the LM response is omitted.
+        timestamp: bytes | None = unpack_av_pairs(data=challenge_message.target_info).get(AvId.MSV_AV_TIMESTAMP)
+        client_challenge = urandom(8)
+
+        temp = b''.join([
+            b'\x01\x01',
+            bytes(6),
+            timestamp or _filetime_now(),
+            client_challenge,
+            bytes(4),
+            challenge_message.target_info,
+            bytes(4)
+        ])
+        nt_proof_str = _hmac_md5(key=self._response_key_nt, data=challenge_message.server_challenge + temp)
+        session_base_key = _hmac_md5(key=self._response_key_nt, data=nt_proof_str)
+
+        if timestamp is not None:
+            lm_challenge_response = bytes(24)
+        else:
+            lm_challenge_response = _hmac_md5(
+                key=self._response_key_nt,
+                data=challenge_message.server_challenge + client_challenge
+            ) + client_challenge
+
+        # With NTLMv2, the key exchange key is the session base key.
+        if self.negotiate_flags & NegotiateFlag.NTLMSSP_NEGOTIATE_KEY_EXCH:
+            exported_session_key = urandom(16)
+            encrypted_random_session_key = RC4(key=session_base_key).process(exported_session_key)
+        else:
+            exported_session_key = session_base_key
+            encrypted_random_session_key = b''
+
+        self._derive_keys(exported_session_key=exported_session_key)
+
+        return bytes(
+            AuthenticateMessage(
+                negotiate_flags=self.negotiate_flags,
+                lm_challenge_response=lm_challenge_response,
+                nt_challenge_response=nt_proof_str + temp,
+                domain_name=self.domain_name,
+                user_name=self.user_name,
+                workstation=self.workstation,
+                encrypted_random_session_key=encrypted_random_session_key
+            )
+        )
+
+
+class NTLMServerContext(_NTLMSecurityContext):
+    """
+    The server end of an NTLMv2 security context, which authenticates the client against a set of credentials and then
+    protects the calls of the association.
+    """
+
+    _IS_CLIENT: ClassVar[bool] = False
+
+    def __init__(
+        self,
+        credentials: Mapping[str, str],
+        auth_level: AuthLevel,
+        auth_context_id: int,
+        domain_name: str = 'WORKGROUP',
+        computer_name: str = 'RPC'
+    ):
+        """
+        :param credentials: The passwords of the accounts that may authenticate, by user name. User names are compared
+            case-insensitively.
+        :param auth_level: The authentication level that the client requested.
+        :param auth_context_id: The id of the security context within the association.
+        :param domain_name: The NetBIOS name of the server's domain.
+        :param computer_name: The NetBIOS name of the server.
+        """
+
+        super().__init__(auth_level=auth_level, auth_context_id=auth_context_id)
+
+        self._user_name_to_password = {user_name.upper(): password for user_name, password in credentials.items()}
+        self.domain_name = domain_name
+        self.computer_name = computer_name
+        self.user_name: str | None = None
+
+        self._server_challenge: bytes | None = None
+        self._target_info: bytes | None = None
+
+    def challenge(self, negotiate: bytes | memoryview) -> bytes:
+        """
+        Answer the client's NEGOTIATE message, the token of the bind PDU.
+
+        :param negotiate: The NEGOTIATE message.
+        :return: The CHALLENGE message, the token of the bind_ack PDU.
+        """
+
+        negotiate_message = NegotiateMessage.from_bytes(data=negotiate)
+        if not negotiate_message.negotiate_flags & NegotiateFlag.NTLMSSP_NEGOTIATE_EXTENDED_SESSIONSECURITY:
+            raise AuthenticationError('The client does not support NTLMv2 session security.')
+
+        self.negotiate_flags = (
+            (negotiate_message.negotiate_flags & DEFAULT_NEGOTIATE_FLAGS)
+            | NegotiateFlag.NTLMSSP_NEGOTIATE_TARGET_INFO
+            | NegotiateFlag.NTLMSSP_TARGET_TYPE_DOMAIN
+        )
+        self._server_challenge = urandom(8)
+        self._target_info = pack_av_pairs(
+            av_pairs={
+                AvId.MSV_AV_NB_DOMAIN_NAME: self.domain_name.encode(encoding='utf-16-le'),
+                AvId.MSV_AV_NB_COMPUTER_NAME: self.computer_name.encode(encoding='utf-16-le'),
+                AvId.MSV_AV_TIMESTAMP: _filetime_now()
+            }
+        )
+
+        return bytes(
+            ChallengeMessage(
+                negotiate_flags=self.negotiate_flags,
+                server_challenge=self._server_challenge,
+                target_name=self.domain_name.encode(encoding='utf-16-le'),
+                target_info=self._target_info
+            )
+        )
+
+    def accept(self, authenticate: bytes | memoryview) -> None:
+        """
+        Verify the client's AUTHENTICATE message, the token of the `rpc_auth_3` PDU, and establish the security context.
+
+        :param authenticate: The AUTHENTICATE message.
+        :return: None
+        """
+
+        if self._server_challenge is None:
+            raise AuthenticationError('No CHALLENGE message has been sent.')
+
+        authenticate_message = AuthenticateMessage.from_bytes(data=authenticate)
+        nt_challenge_response = authenticate_message.nt_challenge_response
+        if len(nt_challenge_response) <= 16:
+            raise AuthenticationError('Only NTLMv2 responses are supported.')
+
+        if (password := self._user_name_to_password.get(authenticate_message.user_name.upper())) is None:
+            raise AuthenticationError(f'The user {authenticate_message.user_name!r} is not known.')
+
+        response_key_nt = nt_owf_v2(
+            password=password,
+            user_name=authenticate_message.user_name,
+            domain_name=authenticate_message.domain_name
+        )
+        nt_proof_str = _hmac_md5(key=response_key_nt, data=self._server_challenge + nt_challenge_response[16:])
+        if not compare_digest(nt_proof_str, nt_challenge_response[:16]):
+            raise AuthenticationError(f'The authentication of the user {authenticate_message.user_name!r} failed.')
+
+        session_base_key = _hmac_md5(key=response_key_nt, data=nt_proof_str)
+        if self.negotiate_flags & NegotiateFlag.NTLMSSP_NEGOTIATE_KEY_EXCH:
+            if len(authenticate_message.encrypted_random_session_key) != 16:
+                raise AuthenticationError('The AUTHENTICATE message lacks the encrypted session key.')
+            exported_session_key = RC4(key=session_base_key).process(authenticate_message.encrypted_random_session_key)
+        else:
+            exported_session_key = session_base_key
+
+        self.user_name = authenticate_message.user_name
+        self._derive_keys(exported_session_key=exported_session_key)
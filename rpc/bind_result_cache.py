@@ -0,0 +1,132 @@
+from __future__ import annotations
+from dataclasses import replace
+from typing import Hashable
+from collections import OrderedDict
+from uuid import UUID
+
+from rpc.structures.context_list import ContextList
+from rpc.structures.context_element import ContextElement
+from rpc.structures.result_list import ResultList
+from rpc.structures.context_negotiation_result import ContDefResult
+from rpc.structures.presentation_syntax import PresentationSyntax
+
+
+class BindResultCache:
+    """
+    A cache of the transfer syntaxes that servers have accepted for interfaces.
+
+    Servers are identified by a caller-chosen fingerprint -- e.g. the server's build -- so that servers known to
+    negotiate identically share entries. Binding with the cache proposes only the known-good transfer syntax for an
+    interface, which makes the bind PDU smaller.
+    """
+
+    def __init__(self, max_num_entries: int | None = 4096):
+        """
+        :param max_num_entries: The maximum number of entries, after which the least recently used ones are evicted.
+            `None` means no limit.
+        """
+
+        self._max_num_entries = max_num_entries
+        self._key_to_transfer_syntax: OrderedDict[tuple[Hashable, UUID, int], PresentationSyntax] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._key_to_transfer_syntax)
+
+    def get(self, server_fingerprint: Hashable, abstract_syntax: PresentationSyntax) -> PresentationSyntax | None:
+        """
+        Obtain the transfer syntax that a server accepted for an interface.
+
+        :param server_fingerprint: The fingerprint of the server.
+        :param abstract_syntax: The abstract syntax of the interface.
+        :return: The accepted transfer syntax, or `None` if it is not known.
+        """
+
+        key = (server_fingerprint, abstract_syntax.if_uuid, abstract_syntax.if_version)
+        if (transfer_syntax := self._key_to_transfer_syntax.get(key)) is not None:
+            self._key_to_transfer_syntax.move_to_end(key)
+
+        return transfer_syntax
+
+    def add(
+        self,
+        server_fingerprint: Hashable,
+        abstract_syntax: PresentationSyntax,
+        transfer_syntax: PresentationSyntax
+    ) -> None:
+        """
+        Record the transfer syntax that a server accepted for an interface.
+
+        :param server_fingerprint: The fingerprint of the server.
+        :param abstract_syntax: The abstract syntax of the interface.
+        :param transfer_syntax: The accepted transfer syntax.
+        :return: None
+        """
+
+        key = (server_fingerprint, abstract_syntax.if_uuid, abstract_syntax.if_version)
+        self._key_to_transfer_syntax[key] = transfer_syntax
+        self._key_to_transfer_syntax.move_to_end(key)
+
+        if self._max_num_entries is not None and len(self._key_to_transfer_syntax) > self._max_num_entries:
+            self._key_to_transfer_syntax.popitem(last=False)
+
+    def discard(self, server_fingerprint: Hashable, abstract_syntax: PresentationSyntax) -> None:
+        """
+        Forget the transfer syntax that a server accepted for an interface.
+
+        :param server_fingerprint: The fingerprint of the server.
+        :param abstract_syntax: The abstract syntax of the interface.
+        :return: None
+        """
+
+        key = (server_fingerprint, abstract_syntax.if_uuid, abstract_syntax.if_version)
+        self._key_to_transfer_syntax.pop(key, None)
+
+    def narrow_context_list(self, server_fingerprint: Hashable, presentation_context_list: ContextList) -> ContextList:
+        """
+        Reduce the transfer syntaxes of proposed presentation contexts to the ones known to be accepted.
+
+        :param server_fingerprint: The fingerprint of the server.
+        :param presentation_context_list: The presentation contexts to propose.
+        :return: The presentation contexts, each proposing only the known-good transfer syntax if there is one.
+        """
+
+        narrowed_context_elements: list[ContextElement] = []
+        for context_element in presentation_context_list:
+            transfer_syntax = self.get(
+                server_fingerprint=server_fingerprint,
+                abstract_syntax=context_element.abstract_syntax
+            )
+            if transfer_syntax is not None and transfer_syntax in context_element.transfer_syntaxes:
+                context_element = replace(context_element, transfer_syntaxes=(transfer_syntax,))
+            narrowed_context_elements.append(context_element)
+
+        return ContextList(narrowed_context_elements)
+
+    def update(
+        self,
+        server_fingerprint: Hashable,
+        presentation_context_list: ContextList,
+        result_list: ResultList
+    ) -> list[ContextElement]:
+        """
+        Record the outcome of a negotiation of presentation contexts.
+
+        :param server_fingerprint: The fingerprint of the server.
+        :param presentation_context_list: The proposed presentation contexts.
+        :param result_list: The server's results for the proposed presentation contexts, in the same order.
+        :return: The proposed presentation contexts that were rejected.
+        """
+
+        rejected_context_elements: list[ContextElement] = []
+        for context_element, context_negotiation_result in zip(presentation_context_list, result_list):
+            if context_negotiation_result.result is ContDefResult.ACCEPTANCE:
+                self.add(
+                    server_fingerprint=server_fingerprint,
+                    abstract_syntax=context_element.abstract_syntax,
+                    transfer_syntax=context_negotiation_result.transfer_syntax
+                )
+            else:
+                self.discard(server_fingerprint=server_fingerprint, abstract_syntax=context_element.abstract_syntax)
+                rejected_context_elements.append(context_element)
+
+        return rejected_context_elements
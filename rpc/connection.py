@@ -1,89 +1,795 @@
 from __future__ import annotations
-from typing import Callable, Awaitable, Iterator
-from asyncio import Queue as AsyncioQueue, Task, create_task, Future
-from itertools import count as itertools_count
+from dataclasses import dataclass
+from typing import Callable, Awaitable, Iterator, AsyncIterator, Sequence, Any, Hashable, TYPE_CHECKING
+from asyncio import Queue as AsyncioQueue, Task, create_task, Future, Semaphore, wait_for, get_running_loop, \
+    TimeoutError as AsyncioTimeoutError, TimerHandle
+from itertools import count as itertools_count, chain as itertools_chain
+from functools import partial
+from uuid import UUID
+from weakref import finalize
 
 from rpc.pdu_headers.base import MSRPCHeader
 from rpc.pdu_headers.bind import BindHeader
 from rpc.pdu_headers.bind_ack import BindAckHeader
+from rpc.pdu_headers.bind_nak import BindNakHeader
+from rpc.pdu_headers.alter_context import AlterContextHeader
+from rpc.pdu_headers.alter_context_resp import AlterContextRespHeader
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.pdu_headers.co_cancel import CoCancelHeader
+from rpc.pdu_headers.orphaned import OrphanedHeader
+from rpc.pdu_headers.fault import FaultHeader
+from rpc.pdu_headers.auth3 import Auth3Header
+from rpc.pdu_framer import PDUFramer, MAX_COPIED_STUB_DATA_LENGTH
+from rpc.fragmentation import fragment_message, StubDataReassembler
+from rpc.structures.pdu_type import PDUType
+from rpc.structures.pfc_flag import PfcFlag
 from rpc.structures.context_list import ContextList
+from rpc.structures.result_list import ResultList
+from rpc.structures.context_negotiation_result import ContDefResult
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.structures.context_element import NDR64_PRESENTATION_SYNTAX
+from rpc.structures.auth_verifier import AuthVerifier
+from rpc.exceptions import FaultError, BindNakError, AuthenticationError, UnexpectedPDUError, ConnectionClosedError
+
+if TYPE_CHECKING:
+    from rpc.bind_result_cache import BindResultCache
+    from rpc.auth.ntlm import NTLMClientContext
+
+
+@dataclass
+class ConnectionMetrics:
+    num_in_flight_calls: int
+    max_num_in_flight_calls: int
+    num_calls_waiting_for_window: int
+    num_queued_outgoing_messages: int
+    num_queued_incoming_messages: int
 
 
 class Connection:
-    def __init__(self, reader: Callable[[], Awaitable[bytes]], writer: Callable[[bytes], Awaitable[int]]):
-        self._read: Callable[[], Awaitable[bytes]] = reader
+    def __init__(
+        self,
+        reader: Callable[[], Awaitable[bytes | int]],
+        writer: Callable[[bytes], Awaitable[int]],
+        max_queued_incoming_messages: int = 64,
+        vectored_writer: Callable[[Sequence[bytes | memoryview]], Awaitable[Any]] | None = None,
+        max_in_flight_calls: int | None = None,
+        max_coalesced_write_size: int = 65536,
+        write_coalescing_delay: float = 0.0,
+        call_timeout: float | None = None,
+        pdu_framer: PDUFramer | None = None
+    ):
+        """
+        :param reader: A callable that reads bytes from the transport.
+        :param writer: A callable that writes bytes to the transport.
+        :param max_queued_incoming_messages: The maximum number of received messages waiting to be handled, after which
+            reading pauses.
+        :param vectored_writer: A callable that writes a sequence of buffers to the transport (scatter/gather). If
+            provided, it is used instead of `writer`, so that the stub data of a message is written without first
+            being copied together with its header.
+        :param max_in_flight_calls: The maximum number of calls that may await their response at the same time. Sending
+            a message when the window is full waits until a call completes. `None` means no limit.
+        :param max_coalesced_write_size: The number of bytes of queued outgoing messages after which they are written
+            rather than coalesced with more messages into one write.
+        :param write_coalescing_delay: The number of seconds to wait for more outgoing messages to coalesce into a
+            write once the queue has run empty. The default of zero writes as soon as the queue runs empty, so that a
+            single call gains no latency.
+        :param call_timeout: The default number of seconds to wait for the response to a call, after which the call is
+            failed with a timeout error and cancelled at the server. `None` means no timeout.
+        :param pdu_framer: A framer into which the transport receives bytes directly, as an `asyncio.BufferedProtocol`
+            can, sparing a copy. With it, `reader` returns the number of bytes received into the framer since it last
+            returned -- zero at the end of the stream -- rather than the bytes themselves.
+        """
+
+        self._read: Callable[[], Awaitable[bytes | int]] = reader
         self._write: Callable[[bytes], Awaitable[int]] = writer
+        self._write_vectored: Callable[[Sequence[bytes | memoryview]], Awaitable[Any]] | None = vectored_writer
+        self._max_coalesced_write_size = max_coalesced_write_size
+        self._write_coalescing_delay = write_coalescing_delay
+        self._call_timeout = call_timeout
 
         self._receive_message_responses_task: Task | None = None
         self._handle_incoming_bytes_task: Task | None = None
         self._handle_outgoing_bytes_task: Task | None = None
 
         # Data structures for handling incoming and outgoing messages.
-        self._incoming_messages_queue = AsyncioQueue()
+        self._incoming_messages_queue = AsyncioQueue(maxsize=max_queued_incoming_messages)
         self._outgoing_messages_queue = AsyncioQueue()
+        self._pdu_framer = pdu_framer if pdu_framer is not None else PDUFramer()
+        self._reader_fills_framer = pdu_framer is not None
 
         self.call_id_iterator: Iterator[int] = itertools_count(start=1)
         self._outstanding_message_call_id_to_future: dict[int, Future] = {}
+        self._call_id_to_stub_data_reassembler: dict[int, StubDataReassembler] = {}
+        self._call_id_to_fragment_queue: dict[int, AsyncioQueue] = {}
+        # The exception with which calls fail once the connection has been closed.
+        self._closed_exception: BaseException | None = None
+
+        # The window of calls awaiting their response.
+        self._in_flight_calls_semaphore: Semaphore | None = (
+            Semaphore(value=max_in_flight_calls) if max_in_flight_calls is not None else None
+        )
+        self._max_num_in_flight_calls = 0
+        self._num_calls_waiting_for_window = 0
+
+        # The maximum fragment length that can be sent, as negotiated during binding.
+        self.max_xmit_frag: int = BindHeader.max_xmit_frag
+
+        # The presentation contexts accepted by the server, as negotiated during binding and altering of the context.
+        self._abstract_syntax_to_context_id: dict[tuple[UUID, int], int] = {}
+        self.context_id_to_transfer_syntax: dict[int, PresentationSyntax] = {}
+
+        # The security context established during binding, which protects the calls if the level calls for it.
+        self._security_context: NTLMClientContext | None = None
+
+    @property
+    def closed(self) -> bool:
+        """Whether the connection has been closed, or has failed, so that no more calls can be made on it."""
+        return self._closed_exception is not None
+
+    @property
+    def num_in_flight_calls(self) -> int:
+        return len(self._outstanding_message_call_id_to_future) + len(self._call_id_to_fragment_queue)
+
+    def metrics(self) -> ConnectionMetrics:
+        """
+        Obtain a snapshot of the connection's call window and queue depths.
+
+        :return: The connection's metrics.
+        """
+
+        return ConnectionMetrics(
+            num_in_flight_calls=self.num_in_flight_calls,
+            max_num_in_flight_calls=self._max_num_in_flight_calls,
+            num_calls_waiting_for_window=self._num_calls_waiting_for_window,
+            num_queued_outgoing_messages=self._outgoing_messages_queue.qsize(),
+            num_queued_incoming_messages=self._incoming_messages_queue.qsize()
+        )
+
+    async def _acquire_call_slot(self) -> None:
+        """Wait until the window of in-flight calls has room for another call, and take up a slot in it."""
+
+        if self._in_flight_calls_semaphore is not None:
+            self._num_calls_waiting_for_window += 1
+            try:
+                await self._in_flight_calls_semaphore.acquire()
+            finally:
+                self._num_calls_waiting_for_window -= 1
+
+    def _release_call_slot(self, *_) -> None:
+        """Free up the slot of a completed call in the window of in-flight calls."""
+
+        if self._in_flight_calls_semaphore is not None:
+            self._in_flight_calls_semaphore.release()
+
+    def _abort_call(self, call_id: int, response_in_progress: bool) -> None:
+        """
+        Notify the server that the client has stopped waiting for the response to a call.
+
+        The fragments of a request are all put in the queue of outgoing messages at once, so the request has been
+        entirely transmitted by the time the notification is. A call whose response has started to arrive is orphaned;
+        any other call is cancelled.
+
+        :param call_id: The call id of the call to abort.
+        :param response_in_progress: Whether fragments of the response have been received.
+        :return: None
+        """
+
+        if self._closed_exception is not None or self._handle_outgoing_bytes_task is None:
+            return
+
+        self._outgoing_messages_queue.put_nowait(
+            OrphanedHeader(call_id=call_id) if response_in_progress else CoCancelHeader(call_id=call_id)
+        )
+
+    def _time_out_call(self, call_id: int) -> None:
+        """
+        Fail a call whose response has not arrived in time.
+
+        :param call_id: The call id of the call that timed out.
+        :return: None
+        """
+
+        if (response_message_future := self._outstanding_message_call_id_to_future.get(call_id)) is not None:
+            response_message_future.set_exception(AsyncioTimeoutError())
+
+    def _finish_call(
+        self,
+        response_message_future: Future,
+        call_id: int,
+        timeout_handle: TimerHandle | None,
+        is_request: bool
+    ) -> None:
+        """
+        Clean up after a call whose future is done, aborting the call if the future is done without a response.
+
+        :param response_message_future: The future of the call.
+        :param call_id: The call id of the call.
+        :param timeout_handle: The handle of the call's scheduled timeout.
+        :param is_request: Whether the call is a request call, which can be aborted.
+        :return: None
+        """
+
+        if timeout_handle is not None:
+            timeout_handle.cancel()
+
+        self._release_call_slot()
 
-    async def bind(self, presentation_context_list: ContextList, **optional_bind_header_kwargs) -> BindAckHeader:
+        # The future is removed before a response is set, so a future that is still present was timed out or cancelled.
+        if self._outstanding_message_call_id_to_future.get(call_id) is response_message_future:
+            del self._outstanding_message_call_id_to_future[call_id]
+            response_in_progress = self._call_id_to_stub_data_reassembler.pop(call_id, None) is not None
+            if is_request:
+                self._abort_call(call_id=call_id, response_in_progress=response_in_progress)
+
+    def _fail_outstanding_calls(self, exception: BaseException) -> None:
+        """
+        Fail all calls awaiting their response and mark the connection as closed.
+
+        :param exception: The exception with which to fail the calls.
+        :return: None
+        """
+
+        if self._closed_exception is None:
+            self._closed_exception = exception
+
+        outstanding_futures = list(self._outstanding_message_call_id_to_future.values())
+        self._outstanding_message_call_id_to_future.clear()
+        self._call_id_to_stub_data_reassembler.clear()
+        for response_message_future in outstanding_futures:
+            if not response_message_future.done():
+                response_message_future.set_exception(exception)
+
+        fragment_queues = list(self._call_id_to_fragment_queue.values())
+        self._call_id_to_fragment_queue.clear()
+        for fragment_queue in fragment_queues:
+            self._release_call_slot()
+            # The stream fails anyway, so make room for the exception.
+            while not fragment_queue.empty():
+                fragment_queue.get_nowait()
+            fragment_queue.put_nowait(exception)
+
+    def _enqueue_outgoing_message(self, message: MSRPCHeader) -> None:
+        """
+        Put a message -- as fragments, if it is a request message -- in the queue of outgoing messages.
+
+        The queue is unbounded, so the messages are put in it immediately and in the order in which they are sent.
+
+        :param message: The message to be put in the queue.
+        :return: None
+        """
+
+        if isinstance(message, RequestHeader):
+            security_context: NTLMClientContext | None = self._security_context
+            if security_context is not None and security_context.protects_messages:
+                # Room is left in each fragment for its verifier. The fragments are signed in the order in which they
+                # are queued, which is the order in which they are sent, as the sequence numbers require.
+                for fragment in fragment_message(
+                    message=message,
+                    max_frag_length=self.max_xmit_frag - security_context.MAX_VERIFIER_LENGTH
+                ):
+                    security_context.protect(message=fragment)
+                    self._outgoing_messages_queue.put_nowait(fragment)
+            else:
+                for fragment in fragment_message(message=message, max_frag_length=self.max_xmit_frag):
+                    self._outgoing_messages_queue.put_nowait(fragment)
+        else:
+            self._outgoing_messages_queue.put_nowait(message)
+
+        self._max_num_in_flight_calls = max(self._max_num_in_flight_calls, self.num_in_flight_calls)
+
+    def get_context_id(self, abstract_syntax: PresentationSyntax) -> int | None:
+        """
+        Obtain the id of the presentation context negotiated for an interface.
+
+        :param abstract_syntax: The abstract syntax of the interface.
+        :return: The id of the presentation context, or `None` if no context has been accepted for the interface.
+        """
+
+        return self._abstract_syntax_to_context_id.get((abstract_syntax.if_uuid, abstract_syntax.if_version))
+
+    def is_ndr64_context(self, context_id: int) -> bool:
+        """
+        Check whether the server accepted the NDR64 transfer syntax for a presentation context.
+
+        :param context_id: The id of the presentation context.
+        :return: Whether the stub data of the context is in the NDR64 transfer syntax.
+        """
+
+        return self.context_id_to_transfer_syntax.get(context_id) == NDR64_PRESENTATION_SYNTAX
+
+    def _add_presentation_contexts(self, presentation_context_list: ContextList, result_list: ResultList) -> None:
+        """
+        Record the presentation contexts that the server accepted.
+
+        :param presentation_context_list: The proposed presentation contexts.
+        :param result_list: The server's results for the proposed presentation contexts, in the same order.
+        :return: None
+        """
+
+        for context_element, context_negotiation_result in zip(presentation_context_list, result_list):
+            if context_negotiation_result.result is not ContDefResult.ACCEPTANCE:
+                continue
+
+            abstract_syntax: PresentationSyntax = context_element.abstract_syntax
+            self._abstract_syntax_to_context_id[(abstract_syntax.if_uuid, abstract_syntax.if_version)] = (
+                context_element.context_id
+            )
+            self.context_id_to_transfer_syntax[context_element.context_id] = context_negotiation_result.transfer_syntax
+
+    async def bind(
+        self,
+        presentation_context_list: ContextList,
+        bind_result_cache: BindResultCache | None = None,
+        server_fingerprint: Hashable = None,
+        security_context: NTLMClientContext | None = None,
+        **optional_bind_header_kwargs
+    ) -> BindAckHeader:
         """
         Perform the RPC binding operation.
 
+        Several interfaces can be negotiated at once by proposing a presentation context for each; the accepted ones
+        can then be looked up with `get_context_id`.
+
+        With a bind result cache, a presentation context proposes only the transfer syntax that the server is known to
+        accept. Should the server reject it nonetheless, the context is proposed again with all its transfer syntaxes
+        by altering the context.
+
         :param presentation_context_list:
+        :param bind_result_cache: A cache of the transfer syntaxes that servers have accepted for interfaces.
+        :param server_fingerprint: The fingerprint identifying the server in the bind result cache.
+        :param security_context: A security context with which to authenticate the association. Its token is sent in
+            the bind PDU, and the answer to the server's challenge in an `rpc_auth_3` PDU; the calls are then signed or
+            sealed according to its authentication level.
         :param optional_bind_header_kwargs:
         :return:
         """
 
-        bind_response: MSRPCHeader = await (
-            await self.send_message(
-                BindHeader(
-                    presentation_context_list=presentation_context_list, **optional_bind_header_kwargs
+        proposed_presentation_context_list: ContextList = (
+            bind_result_cache.narrow_context_list(
+                server_fingerprint=server_fingerprint,
+                presentation_context_list=presentation_context_list
+            )
+            if bind_result_cache is not None else presentation_context_list
+        )
+
+        if security_context is not None:
+            optional_bind_header_kwargs['auth_verifier'] = AuthVerifier(
+                auth_level=security_context.auth_level,
+                auth_context_id=security_context.auth_context_id,
+                auth_value=security_context.negotiate(),
+                auth_type=security_context.auth_type
+            )
+
+        bind_header = BindHeader(
+            presentation_context_list=proposed_presentation_context_list,
+            **optional_bind_header_kwargs
+        )
+
+        bind_response: MSRPCHeader = await (await self.send_message(bind_header))
+
+        if bind_response.pdu_type is not PDUType.BIND_ACK:
+            raise UnexpectedPDUError(f'The bind was answered with a {bind_response.pdu_type.name} PDU.')
+
+        # The server's `max_recv_frag` is the largest fragment it accepts, and thus the largest that can be sent.
+        self.max_xmit_frag = min(bind_header.max_xmit_frag, bind_response.max_recv_frag)
+
+        if security_context is not None:
+            if bind_response.auth_verifier is None:
+                raise AuthenticationError('The server did not answer the authentication request.')
+
+            # The server does not respond to the `rpc_auth_3` PDU. It is queued before any request, so the server has
+            # established its security context by the time it receives one.
+            self._enqueue_outgoing_message(
+                message=Auth3Header(
+                    call_id=bind_header.call_id,
+                    auth_verifier=AuthVerifier(
+                        auth_level=security_context.auth_level,
+                        auth_context_id=security_context.auth_context_id,
+                        auth_value=security_context.authenticate(challenge=bind_response.auth_verifier.auth_value),
+                        auth_type=security_context.auth_type
+                    )
                 )
             )
+            self._security_context = security_context
+
+        self._add_presentation_contexts(
+            presentation_context_list=proposed_presentation_context_list,
+            result_list=bind_response.result_list
         )
 
-        if not isinstance(bind_response, BindAckHeader):
-            # TODO: Use proper exception.
-            raise ValueError
+        if bind_result_cache is not None:
+            rejected_context_element_ids: set[int] = {
+                id(context_element)
+                for context_element in bind_result_cache.update(
+                    server_fingerprint=server_fingerprint,
+                    presentation_context_list=proposed_presentation_context_list,
+                    result_list=bind_response.result_list
+                )
+            }
+            # Contexts whose narrowed proposal was rejected -- the cached outcome being stale -- are proposed again.
+            stale_context_elements = [
+                context_element
+                for context_element, proposed_context_element in zip(
+                    presentation_context_list,
+                    proposed_presentation_context_list
+                )
+                if id(proposed_context_element) in rejected_context_element_ids
+                and proposed_context_element is not context_element
+            ]
+            if stale_context_elements:
+                stale_presentation_context_list = ContextList(stale_context_elements)
+                alter_context_response = await self.alter_context(
+                    presentation_context_list=stale_presentation_context_list
+                )
+                bind_result_cache.update(
+                    server_fingerprint=server_fingerprint,
+                    presentation_context_list=stale_presentation_context_list,
+                    result_list=alter_context_response.result_list
+                )
 
         return bind_response
 
-    async def send_message(self, message: MSRPCHeader, assign_call_id: bool = True) -> Awaitable[MSRPCHeader]:
+    async def alter_context(self, presentation_context_list: ContextList) -> AlterContextRespHeader:
+        """
+        Negotiate additional presentation contexts on the bound association.
+
+        The ids of the proposed contexts must not be in use already.
+
+        :param presentation_context_list: The presentation contexts to propose.
+        :return: The server's response to the alter-context request.
+        """
+
+        alter_context_header = AlterContextHeader(presentation_context_list=presentation_context_list)
+
+        alter_context_response: MSRPCHeader = await (await self.send_message(alter_context_header))
+
+        if alter_context_response.pdu_type is not PDUType.ALTER_CONTEXT_RESP:
+            raise UnexpectedPDUError(
+                f'The alter_context was answered with a {alter_context_response.pdu_type.name} PDU.'
+            )
+
+        self._add_presentation_contexts(
+            presentation_context_list=presentation_context_list,
+            result_list=alter_context_response.result_list
+        )
+
+        return alter_context_response
+
+    async def send_message(
+        self,
+        message: MSRPCHeader,
+        assign_call_id: bool = True,
+        timeout: float | None = None
+    ) -> Awaitable[MSRPCHeader]:
         """
         Send an RPC message.
 
+        A request message whose stub data does not fit in the negotiated maximum fragment length is sent as several
+        fragments. If the returned `Future` is cancelled or times out, a request call is cancelled at the server. If the
+        server answers with a FAULT, the `Future` fails with the corresponding `FaultError`.
+
         :param message: The message to be sent.
         :param assign_call_id: Whether to assign a call id to the message.
+        :param timeout: The number of seconds to wait for the response, after which the `Future` fails with a timeout
+            error. `None` means the connection's call timeout.
         :return: A `Future` that will resolve to the response to the message sent.
         """
 
+        if self._closed_exception is not None:
+            raise self._closed_exception
+
+        await self._acquire_call_slot()
+        # The connection may have been closed while waiting for room in the window.
+        if self._closed_exception is not None:
+            self._release_call_slot()
+            raise self._closed_exception
+
         if assign_call_id:
             message.call_id = next(self.call_id_iterator)
 
-        response_message_future = Future()
+        loop = get_running_loop()
+        timeout = timeout if timeout is not None else self._call_timeout
+
+        response_message_future = loop.create_future()
+        response_message_future.add_done_callback(
+            partial(
+                self._finish_call,
+                call_id=message.call_id,
+                timeout_handle=(
+                    loop.call_later(timeout, self._time_out_call, message.call_id) if timeout is not None else None
+                ),
+                is_request=isinstance(message, RequestHeader)
+            )
+        )
         self._outstanding_message_call_id_to_future[message.call_id] = response_message_future
-        create_task(self._outgoing_messages_queue.put(message))
+
+        self._enqueue_outgoing_message(message=message)
 
         return response_message_future
 
+    async def send_message_stream(
+        self,
+        message: RequestHeader,
+        max_queued_fragments: int = 16,
+        timeout: float | None = None
+    ) -> AsyncIterator[memoryview]:
+        """
+        Send an RPC request message and stream the stub data of the response fragments as they arrive.
+
+        When `max_queued_fragments` fragments have been received but not consumed, the connection stops reading until
+        the consumer catches up, which also holds back the responses of other calls on the connection. If the consumer
+        stops early, the call is aborted at the server.
+
+        :param message: The request message to be sent.
+        :param max_queued_fragments: The maximum number of received fragments waiting to be consumed.
+        :param timeout: The number of seconds to wait for each response fragment, after which the iteration fails with
+            a timeout error. `None` means the connection's call timeout.
+        :return: An asynchronous iterator of views of the stub data of each response fragment.
+        """
+
+        if self._closed_exception is not None:
+            raise self._closed_exception
+
+        await self._acquire_call_slot()
+        # The connection may have been closed while waiting for room in the window.
+        if self._closed_exception is not None:
+            self._release_call_slot()
+            raise self._closed_exception
+
+        message.call_id = next(self.call_id_iterator)
+
+        fragment_queue = AsyncioQueue(maxsize=max_queued_fragments)
+        self._call_id_to_fragment_queue[message.call_id] = fragment_queue
+
+        self._enqueue_outgoing_message(message=message)
+
+        stub_data_fragments = self._iterate_stub_data_fragments(
+            call_id=message.call_id,
+            fragment_queue=fragment_queue,
+            timeout=timeout if timeout is not None else self._call_timeout
+        )
+        # The iterator's own clean-up runs only if it has been iterated, so an iterator that is dropped without it
+        # would leave its fragments to fill the queue and hold back the receiving of messages.
+        finalize(
+            stub_data_fragments,
+            self._forget_stream,
+            call_id=message.call_id,
+            fragment_queue=fragment_queue
+        ).atexit = False
+
+        return stub_data_fragments
+
+    def _forget_stream(self, call_id: int, fragment_queue: AsyncioQueue, response_in_progress: bool = False) -> None:
+        """
+        Forget a streamed call whose consumer has stopped, and abort it at the server if it is still outstanding.
+
+        :param call_id: The call id of the call.
+        :param fragment_queue: The queue in which the response fragments of the call are put.
+        :param response_in_progress: Whether fragments of the response have been consumed.
+        :return: None
+        """
+
+        if self._call_id_to_fragment_queue.get(call_id) is fragment_queue:
+            del self._call_id_to_fragment_queue[call_id]
+            self._release_call_slot()
+            self._abort_call(call_id=call_id, response_in_progress=response_in_progress or not fragment_queue.empty())
+        # Discard the fragments that were not consumed, including any that is blocking the receiving of messages.
+        while not fragment_queue.empty():
+            fragment_queue.get_nowait()
+
+    async def _iterate_stub_data_fragments(
+        self,
+        call_id: int,
+        fragment_queue: AsyncioQueue,
+        timeout: float | None
+    ) -> AsyncIterator[memoryview]:
+        """
+        Yield the stub data of the response fragments of a call from its queue.
+
+        :param call_id: The call id of the call.
+        :param fragment_queue: The queue in which the response fragments of the call are put.
+        :param timeout: The number of seconds to wait for each response fragment.
+        :return: An asynchronous iterator of views of the stub data of each response fragment.
+        """
+
+        num_received_fragments = 0
+        is_last_fragment = False
+        try:
+            while not is_last_fragment:
+                fragment: MSRPCHeader | BaseException = await wait_for(fragment_queue.get(), timeout=timeout)
+                if isinstance(fragment, BaseException):
+                    raise fragment
+                if not isinstance(fragment, ResponseHeader):
+                    raise UnexpectedPDUError(f'The call was answered with a {fragment.pdu_type.name} PDU.')
+
+                num_received_fragments += 1
+                is_last_fragment = PfcFlag.PFC_LAST_FRAG in fragment.pfc_flags
+                yield memoryview(fragment.stub_data)
+        finally:
+            # If the consumer stops early, forget the call -- so that its remaining fragments are discarded -- and
+            # abort it at the server.
+            self._forget_stream(
+                call_id=call_id,
+                fragment_queue=fragment_queue,
+                response_in_progress=num_received_fragments != 0
+            )
+
+    async def _fail_call(self, call_id: int, exception: BaseException) -> None:
+        """
+        Fail a call that the server has ended without a response.
+
+        :param call_id: The call id of the call.
+        :param exception: The exception with which to fail the call.
+        :return: None
+        """
+
+        if (fragment_queue := self._call_id_to_fragment_queue.pop(call_id, None)) is not None:
+            self._release_call_slot()
+            # The exception is put after the fragments already received, so that those can still be consumed.
+            await fragment_queue.put(exception)
+            return
+
+        if (response_message_future := self._outstanding_message_call_id_to_future.pop(call_id, None)) is None:
+            # The call has been timed out or cancelled.
+            return
+
+        self._call_id_to_stub_data_reassembler.pop(call_id, None)
+        if not response_message_future.done():
+            response_message_future.set_exception(exception)
+
     async def _receive_message_responses(self) -> None:
-        """Receive message responses and resolve the corresponding future."""
+        """Receive message responses, reassemble fragmented ones, and resolve the corresponding future."""
 
         while True:
             incoming_message: MSRPCHeader = await self._incoming_messages_queue.get()
-            self._outstanding_message_call_id_to_future.pop(incoming_message.call_id).set_result(incoming_message)
+            call_id: int = incoming_message.call_id
+
+            if isinstance(incoming_message, FaultHeader):
+                await self._fail_call(
+                    call_id=call_id,
+                    exception=FaultError.from_status(
+                        status=incoming_message.status,
+                        call_id=call_id,
+                        did_not_execute=PfcFlag.PFC_DID_NOT_EXECUTE in incoming_message.pfc_flags
+                    )
+                )
+                continue
+
+            if isinstance(incoming_message, BindNakHeader):
+                # The server does not keep an association it has rejected, so no call on the connection can succeed.
+                self._fail_outstanding_calls(
+                    exception=BindNakError(
+                        provider_reject_reason=incoming_message.provider_reject_reason,
+                        versions=incoming_message.versions
+                    )
+                )
+                continue
+
+            if call_id in self._call_id_to_fragment_queue:
+                if PfcFlag.PFC_LAST_FRAG in incoming_message.pfc_flags:
+                    fragment_queue = self._call_id_to_fragment_queue.pop(call_id)
+                    self._release_call_slot()
+                else:
+                    fragment_queue = self._call_id_to_fragment_queue[call_id]
+
+                await fragment_queue.put(incoming_message)
+                continue
+
+            if call_id not in self._outstanding_message_call_id_to_future:
+                # The response belongs to a call that has been timed out or cancelled.
+                continue
+
+            is_fragment = isinstance(incoming_message, ResponseHeader) and (
+                (PfcFlag.PFC_FIRST_FRAG | PfcFlag.PFC_LAST_FRAG) & ~incoming_message.pfc_flags
+            )
+            if is_fragment:
+                if PfcFlag.PFC_FIRST_FRAG in incoming_message.pfc_flags:
+                    self._call_id_to_stub_data_reassembler[call_id] = StubDataReassembler(
+                        first_fragment=incoming_message
+                    )
+                elif (stub_data_reassembler := self._call_id_to_stub_data_reassembler.get(call_id)) is not None:
+                    stub_data_reassembler.add(fragment=incoming_message)
+                else:
+                    continue
+
+                if PfcFlag.PFC_LAST_FRAG not in incoming_message.pfc_flags:
+                    continue
+
+                incoming_message = self._call_id_to_stub_data_reassembler.pop(call_id).message()
+
+            # The future may have been timed out or cancelled before its done callback has removed it.
+            if not (response_message_future := self._outstanding_message_call_id_to_future.pop(call_id)).done():
+                response_message_future.set_result(incoming_message)
+
+    async def _collect_outgoing_messages(self) -> list[MSRPCHeader]:
+        """
+        Wait for an outgoing message and collect it together with the messages queued after it.
+
+        Messages are collected until the queue runs empty -- and stays empty for the coalescing delay -- or the
+        collected messages make up the maximum coalesced write size.
+
+        :return: The collected outgoing messages, in order.
+        """
+
+        outgoing_messages: list[MSRPCHeader] = [await self._outgoing_messages_queue.get()]
+        num_bytes: int = outgoing_messages[0].serialized_size()
+        deadline: float | None = None
+
+        while num_bytes < self._max_coalesced_write_size:
+            if not self._outgoing_messages_queue.empty():
+                outgoing_message: MSRPCHeader = self._outgoing_messages_queue.get_nowait()
+            elif self._write_coalescing_delay > 0:
+                loop = get_running_loop()
+                if deadline is None:
+                    deadline = loop.time() + self._write_coalescing_delay
+                if (timeout := deadline - loop.time()) <= 0:
+                    break
+                try:
+                    outgoing_message = await wait_for(self._outgoing_messages_queue.get(), timeout=timeout)
+                except AsyncioTimeoutError:
+                    break
+            else:
+                break
+
+            outgoing_messages.append(outgoing_message)
+            num_bytes += outgoing_message.serialized_size()
+
+        return outgoing_messages
 
     async def _handle_outgoing_bytes(self) -> None:
-        """Serialize outgoing messages and write them."""
+        """Serialize outgoing messages and write them, coalescing the messages queued together into one write."""
 
-        while True:
-            await self._write(bytes(await self._outgoing_messages_queue.get()))
+        try:
+            while True:
+                outgoing_messages: list[MSRPCHeader] = await self._collect_outgoing_messages()
+                if self._write_vectored is not None:
+                    await self._write_vectored(
+                        list(itertools_chain.from_iterable(message.buffers() for message in outgoing_messages))
+                    )
+                elif len(outgoing_messages) == 1:
+                    await self._write(bytes(outgoing_messages[0]))
+                else:
+                    await self._write(
+                        b''.join(itertools_chain.from_iterable(message.buffers() for message in outgoing_messages))
+                    )
+        except Exception as e:
+            # The connection cannot be written to anymore, so no responses to the calls will arrive.
+            closed_exception = ConnectionClosedError('The connection could not be written to.')
+            closed_exception.__cause__ = e
+            self._fail_outstanding_calls(exception=closed_exception)
 
     async def _handle_incoming_bytes(self) -> None:
-        """Read and deserialize incoming bytes into a message and put it in a queue."""
+        """Read incoming bytes, deserialize each complete fragment into a message, and put the messages in a queue."""
 
-        while True:
-            await self._incoming_messages_queue.put(MSRPCHeader.from_bytes(data=await self._read()))
+        try:
+            while True:
+                if not (data := await self._read()):
+                    raise ConnectionClosedError('The connection was closed by the peer.')
+                if not self._reader_fills_framer:
+                    self._pdu_framer.feed(data=data)
+                for fragment in self._pdu_framer.fragments():
+                    with fragment:
+                        message = MSRPCHeader.from_bytes(data=fragment)
+                        if self._security_context is not None and self._security_context.protects_messages and (
+                            isinstance(message, ResponseHeader)
+                            # A fault reporting a security error is not signed.
+                            or (isinstance(message, FaultHeader) and message.auth_verifier is not None)
+                        ):
+                            # The stub data is unsealed in place, in the framer's buffer.
+                            self._security_context.unprotect(message=message, fragment=fragment)
+                        if (
+                            isinstance(message, ResponseHeader)
+                            and len(message.stub_data) <= MAX_COPIED_STUB_DATA_LENGTH
+                        ):
+                            message.materialize_stub_data()
+                    await self._incoming_messages_queue.put(message)
+                # The stub data of the last message may be a view into the framer's buffer, which would have to be
+                # replaced rather than reused if the message were kept alive while reading.
+                message = None
+        except Exception as e:
+            # The connection cannot be read from anymore, so no responses will arrive.
+            self._fail_outstanding_calls(exception=e)
 
     async def __aenter__(self) -> Connection:
         self._receive_message_responses_task = create_task(coro=self._receive_message_responses())
@@ -96,3 +802,5 @@ class Connection:
         self._handle_incoming_bytes_task.cancel()
         self._handle_outgoing_bytes_task.cancel()
         self._receive_message_responses_task.cancel()
+
+        self._fail_outstanding_calls(exception=ConnectionClosedError('The connection was closed.'))
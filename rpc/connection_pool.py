@@ -0,0 +1,305 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Callable, Awaitable, AsyncContextManager, AsyncIterator, Hashable
+from asyncio import Condition, gather
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from collections import defaultdict, deque
+from time import monotonic
+
+from rpc.connection import Connection
+from rpc.pdu_headers.bind_ack import BindAckHeader
+from rpc.structures.context_list import ContextList
+from rpc.structures.context_element import ContextElement
+from rpc.structures.context_negotiation_result import ContDefResult, ProviderReason
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.exceptions import PresentationContextRejectedError, ConnectionPoolClosedError
+
+
+def _default_endpoint_to_host(endpoint: Hashable) -> Hashable:
+    return endpoint[0] if isinstance(endpoint, tuple) else endpoint
+
+
+@dataclass
+class _PooledConnection:
+    connection: Connection
+    exit_stack: AsyncExitStack
+    bind_ack: BindAckHeader
+    host: Hashable
+    last_used: float = field(default_factory=monotonic)
+
+
+class ConnectionPool:
+    """
+    A pool of bound RPC connections, keyed by endpoint and abstract syntax.
+
+    A connection is checked out by one caller at a time; when returned, it is kept bound so that the next caller
+    needing the same interface at the same endpoint skips both connecting and binding.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[Hashable], AsyncContextManager[Connection]],
+        max_connections_per_host: int = 8,
+        max_idle_time: float | None = 300.0,
+        health_check: Callable[[Connection], Awaitable[bool]] | None = None,
+        health_check_idle_time: float = 30.0,
+        endpoint_to_host: Callable[[Hashable], Hashable] = _default_endpoint_to_host
+    ):
+        """
+        :param connect: A callable that, given an endpoint, returns an asynchronous context manager that connects to the
+            endpoint and yields an entered `Connection`, and closes the connection on exit.
+        :param max_connections_per_host: The maximum number of connections -- checked out or idle -- to each host.
+        :param max_idle_time: The number of seconds after which an idle connection is closed rather than reused. `None`
+            means no limit.
+        :param health_check: A callable that checks whether an idle connection is still usable, e.g. by making a
+            cheap call on it.
+        :param health_check_idle_time: The number of seconds a connection must have been idle before it is
+            health-checked when checked out.
+        :param endpoint_to_host: A callable that maps an endpoint to the host whose connections are capped. By default,
+            the first element of a tuple endpoint, e.g. `(host, port)`, or else the endpoint itself.
+        """
+
+        self._connect = connect
+        self._max_connections_per_host = max_connections_per_host
+        self._max_idle_time = max_idle_time
+        self._health_check = health_check
+        self._health_check_idle_time = health_check_idle_time
+        self._endpoint_to_host = endpoint_to_host
+
+        self._condition = Condition()
+        self._key_to_idle_connections: defaultdict[tuple, deque[_PooledConnection]] = defaultdict(deque)
+        self._host_to_num_connections: defaultdict[Hashable, int] = defaultdict(int)
+        self._closed = False
+
+    @property
+    def num_idle_connections(self) -> int:
+        return sum(len(idle_connections) for idle_connections in self._key_to_idle_connections.values())
+
+    def _pop_idle_connection(self, key: tuple) -> _PooledConnection | None:
+        """
+        Take the most recently used idle connection for a key.
+
+        :param key: The endpoint and abstract syntax of the connection.
+        :return: An idle connection, or `None` if there is none.
+        """
+
+        if not (idle_connections := self._key_to_idle_connections.get(key)):
+            return None
+
+        pooled_connection = idle_connections.pop()
+        if not idle_connections:
+            del self._key_to_idle_connections[key]
+
+        return pooled_connection
+
+    def _pop_evictable_connection(self, host: Hashable) -> _PooledConnection | None:
+        """
+        Take the least recently used idle connection to a host, to make room for a connection for another interface.
+
+        :param host: The host of the connection.
+        :return: An idle connection to the host, or `None` if there is none.
+        """
+
+        candidates = [
+            (idle_connections[0].last_used, key)
+            for key, idle_connections in self._key_to_idle_connections.items()
+            if idle_connections[0].host == host
+        ]
+        if not candidates:
+            return None
+
+        _, key = min(candidates, key=lambda candidate: candidate[0])
+        idle_connections = self._key_to_idle_connections[key]
+        pooled_connection = idle_connections.popleft()
+        if not idle_connections:
+            del self._key_to_idle_connections[key]
+
+        return pooled_connection
+
+    async def _discard(self, pooled_connection: _PooledConnection) -> None:
+        """
+        Close a pooled connection and give up its place among the connections to its host.
+
+        :param pooled_connection: The connection to discard.
+        :return: None
+        """
+
+        try:
+            # The connection is being thrown away; failing to close it cleanly is of no consequence.
+            with suppress(Exception):
+                await pooled_connection.exit_stack.aclose()
+        finally:
+            async with self._condition:
+                self._host_to_num_connections[pooled_connection.host] -= 1
+                if self._host_to_num_connections[pooled_connection.host] == 0:
+                    del self._host_to_num_connections[pooled_connection.host]
+                self._condition.notify_all()
+
+    async def _is_usable(self, pooled_connection: _PooledConnection) -> bool:
+        """
+        Check whether an idle connection can be reused.
+
+        :param pooled_connection: The idle connection to check.
+        :return: Whether the connection can be reused.
+        """
+
+        if pooled_connection.connection.closed:
+            return False
+
+        idle_time = monotonic() - pooled_connection.last_used
+        if self._max_idle_time is not None and idle_time > self._max_idle_time:
+            return False
+
+        if self._health_check is not None and idle_time > self._health_check_idle_time:
+            try:
+                return await self._health_check(pooled_connection.connection)
+            except Exception:
+                return False
+
+        return True
+
+    async def _open(self, endpoint: Hashable, abstract_syntax: PresentationSyntax, host: Hashable) -> _PooledConnection:
+        """
+        Connect to an endpoint and bind the connection to an interface.
+
+        :param endpoint: The endpoint to connect to.
+        :param abstract_syntax: The abstract syntax of the interface to bind to.
+        :param host: The host of the endpoint.
+        :return: A bound connection.
+        """
+
+        exit_stack = AsyncExitStack()
+        try:
+            connection: Connection = await exit_stack.enter_async_context(self._connect(endpoint))
+
+            bind_ack: BindAckHeader = await connection.bind(
+                presentation_context_list=ContextList([ContextElement(context_id=0, abstract_syntax=abstract_syntax)])
+            )
+            if not bind_ack.result_list:
+                raise PresentationContextRejectedError(reason=ProviderReason.REASON_NOT_SPECIFIED)
+            if (result := bind_ack.result_list[0]).result is not ContDefResult.ACCEPTANCE:
+                raise PresentationContextRejectedError(reason=result.reason)
+        except BaseException:
+            await exit_stack.aclose()
+            raise
+
+        return _PooledConnection(connection=connection, exit_stack=exit_stack, bind_ack=bind_ack, host=host)
+
+    async def _check_out(self, endpoint: Hashable, abstract_syntax: PresentationSyntax) -> _PooledConnection:
+        """
+        Obtain a bound connection to an endpoint, reusing an idle one if possible.
+
+        :param endpoint: The endpoint to connect to.
+        :param abstract_syntax: The abstract syntax of the interface to bind to.
+        :return: A bound connection, checked out for the caller's exclusive use.
+        """
+
+        key = (endpoint, abstract_syntax.if_uuid, abstract_syntax.if_version)
+        host = self._endpoint_to_host(endpoint)
+
+        while True:
+            pooled_connection: _PooledConnection | None = None
+            evicted_connection: _PooledConnection | None = None
+
+            async with self._condition:
+                while True:
+                    if self._closed:
+                        raise ConnectionPoolClosedError('The connection pool is closed.')
+
+                    if (pooled_connection := self._pop_idle_connection(key=key)) is not None:
+                        break
+
+                    if self._host_to_num_connections[host] < self._max_connections_per_host:
+                        # Reserve the place of the connection that is to be opened.
+                        self._host_to_num_connections[host] += 1
+                        break
+
+                    if (evicted_connection := self._pop_evictable_connection(host=host)) is not None:
+                        break
+
+                    await self._condition.wait()
+
+            if evicted_connection is not None:
+                await self._discard(pooled_connection=evicted_connection)
+                continue
+
+            if pooled_connection is None:
+                try:
+                    return await self._open(endpoint=endpoint, abstract_syntax=abstract_syntax, host=host)
+                except BaseException:
+                    async with self._condition:
+                        self._host_to_num_connections[host] -= 1
+                        self._condition.notify_all()
+                    raise
+
+            if await self._is_usable(pooled_connection=pooled_connection):
+                return pooled_connection
+
+            await self._discard(pooled_connection=pooled_connection)
+
+    async def _check_in(
+        self,
+        endpoint: Hashable,
+        abstract_syntax: PresentationSyntax,
+        pooled_connection: _PooledConnection
+    ) -> None:
+        """
+        Return a checked-out connection to the pool, or discard it if it can no longer be used.
+
+        :param endpoint: The endpoint of the connection.
+        :param abstract_syntax: The abstract syntax of the interface the connection is bound to.
+        :param pooled_connection: The connection to return.
+        :return: None
+        """
+
+        if self._closed or pooled_connection.connection.closed:
+            await self._discard(pooled_connection=pooled_connection)
+            return
+
+        pooled_connection.last_used = monotonic()
+        async with self._condition:
+            self._key_to_idle_connections[(endpoint, abstract_syntax.if_uuid, abstract_syntax.if_version)].append(
+                pooled_connection
+            )
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def acquire(self, endpoint: Hashable, abstract_syntax: PresentationSyntax) -> AsyncIterator[Connection]:
+        """
+        Check out a connection to an endpoint that is bound to an interface.
+
+        :param endpoint: The endpoint to connect to.
+        :param abstract_syntax: The abstract syntax of the interface.
+        :return: An asynchronous context manager yielding the connection, which is returned to the pool on exit.
+        """
+
+        pooled_connection = await self._check_out(endpoint=endpoint, abstract_syntax=abstract_syntax)
+        try:
+            yield pooled_connection.connection
+        finally:
+            await self._check_in(
+                endpoint=endpoint,
+                abstract_syntax=abstract_syntax,
+                pooled_connection=pooled_connection
+            )
+
+    async def close(self) -> None:
+        """Close the idle connections and stop handing out connections; checked-out ones are closed when returned."""
+
+        async with self._condition:
+            self._closed = True
+            idle_connections = [
+                pooled_connection
+                for idle_connections in self._key_to_idle_connections.values()
+                for pooled_connection in idle_connections
+            ]
+            self._key_to_idle_connections.clear()
+            self._condition.notify_all()
+
+        await gather(*(self._discard(pooled_connection=pooled_connection) for pooled_connection in idle_connections))
+
+    async def __aenter__(self) -> ConnectionPool:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
@@ -0,0 +1,227 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import ClassVar, ByteString
+from enum import IntEnum
+from struct import Struct
+from uuid import UUID
+
+from rpc.connection import Connection as RPCConnection
+from rpc.structures.context_handle import ContextHandle
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.structures.protocol_tower import ProtocolTower
+from rpc.utils.client_protocol_message import ClientProtocolRequestBase, ClientProtocolResponseBase, obtain_response
+from rpc.exceptions import EndpointMapperError, NDR64NotSupportedError
+
+# The well-known port of the endpoint mapper.
+EPM_PORT = 135
+EPM_ABSTRACT_SYNTAX = PresentationSyntax(if_uuid=UUID('e1af8308-5d1f-11c9-91a4-08002b14a0fa'), if_version=3)
+
+_UINT32_STRUCT = Struct('<I')
+# The referent id of a unique pointer that is not null. The value is arbitrary, as long as it is not zero.
+_REFERENT_ID = 0x00020000
+
+
+class EndpointMapperOperation(IntEnum):
+    EPT_INSERT = 0
+    EPT_DELETE = 1
+    EPT_LOOKUP = 2
+    EPT_MAP = 3
+    EPT_LOOKUP_HANDLE_FREE = 4
+    EPT_INQ_OBJECT = 5
+    EPT_MGMT_DELETE = 6
+
+
+class EndpointMapperStatus(IntEnum):
+    RPC_S_OK = 0x00000000
+    EPT_S_INVALID_ENTRY = 0x16C9A0CC
+    EPT_S_CANT_PERFORM_OP = 0x16C9A0CD
+    EPT_S_NOT_REGISTERED = 0x16C9A0D6
+
+
+def _align(offset: int) -> int:
+    return (4 - (offset % 4)) % 4
+
+
+def _pack_tower(tower: ProtocolTower, offset: int) -> bytes:
+    """
+    Pack the referent of a pointer to a tower (`twr_t`): the conformance, the tower length, and the tower octets.
+
+    :param tower: The tower to pack.
+    :param offset: The offset in the stub data at which the tower starts, from which its padding is determined.
+    :return: The packed tower, padded to a four-byte boundary.
+    """
+
+    tower_bytes = bytes(tower)
+    tower_length = len(tower_bytes)
+    packed_length = 2 * _UINT32_STRUCT.size + tower_length
+
+    return b''.join([
+        _UINT32_STRUCT.pack(tower_length),
+        _UINT32_STRUCT.pack(tower_length),
+        tower_bytes,
+        bytes(_align(offset=offset + packed_length))
+    ])
+
+
+def _unpack_tower(data: ByteString | memoryview, offset: int) -> tuple[ProtocolTower, int]:
+    """
+    Unpack the referent of a pointer to a tower (`twr_t`).
+
+    :param data: The stub data.
+    :param offset: The offset of the tower in the stub data.
+    :return: The tower, and the offset following it and its padding.
+    """
+
+    tower_length: int = _UINT32_STRUCT.unpack_from(data, offset + _UINT32_STRUCT.size)[0]
+    tower_start = offset + 2 * _UINT32_STRUCT.size
+    tower_end = tower_start + tower_length
+
+    return ProtocolTower.from_bytes(data=data[tower_start:tower_end]), tower_end + _align(offset=tower_end)
+
+
+@dataclass
+class EptMapResponse(ClientProtocolResponseBase):
+    entry_handle: ContextHandle = field(default_factory=lambda: ContextHandle(0, UUID(int=0)))
+    towers: list[ProtocolTower] = field(default_factory=list)
+
+    def __bytes__(self) -> bytes:
+
+        num_towers = len(self.towers)
+        parts: list[bytes] = [
+            bytes(self.entry_handle),
+            _UINT32_STRUCT.pack(num_towers),
+            # The maximum count, offset and actual count of the conformant varying array of tower pointers.
+            _UINT32_STRUCT.pack(num_towers),
+            _UINT32_STRUCT.pack(0),
+            _UINT32_STRUCT.pack(num_towers),
+            b''.join(_UINT32_STRUCT.pack(_REFERENT_ID + i) for i in range(num_towers))
+        ]
+
+        offset = sum(len(part) for part in parts)
+        for tower in self.towers:
+            parts.append(packed_tower := _pack_tower(tower=tower, offset=offset))
+            offset += len(packed_tower)
+
+        parts.append(_UINT32_STRUCT.pack(self.return_code))
+
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: ByteString | memoryview, offset: int = 0, ndr64: bool = False) -> EptMapResponse:
+
+        if ndr64:
+            raise NDR64NotSupportedError(f'{cls.__name__} cannot be unpacked in the NDR64 transfer syntax.')
+
+        entry_handle = ContextHandle.from_bytes(data=data[offset:offset+ContextHandle.structure_size])
+        offset += ContextHandle.structure_size
+
+        # The number of towers is followed by the maximum count and offset of the array of tower pointers.
+        offset += 3 * _UINT32_STRUCT.size
+        actual_count: int = _UINT32_STRUCT.unpack_from(data, offset)[0]
+        offset += _UINT32_STRUCT.size
+
+        referent_ids: list[int] = [
+            _UINT32_STRUCT.unpack_from(data, offset + i * _UINT32_STRUCT.size)[0]
+            for i in range(actual_count)
+        ]
+        offset += actual_count * _UINT32_STRUCT.size
+
+        towers: list[ProtocolTower] = []
+        for referent_id in referent_ids:
+            if referent_id == 0:
+                continue
+            tower, offset = _unpack_tower(data=data, offset=offset)
+            towers.append(tower)
+
+        return cls(
+            entry_handle=entry_handle,
+            towers=towers,
+            return_code=_UINT32_STRUCT.unpack_from(data, offset)[0]
+        )
+
+
+@dataclass
+class EptMapRequest(ClientProtocolRequestBase):
+    OPERATION: ClassVar[EndpointMapperOperation] = EndpointMapperOperation.EPT_MAP
+    RESPONSE_CLASS: ClassVar[type[EptMapResponse]] = EptMapResponse
+    ABSTRACT_SYNTAX: ClassVar[PresentationSyntax] = EPM_ABSTRACT_SYNTAX
+
+    map_tower: ProtocolTower
+    object_uuid: UUID | None = None
+    entry_handle: ContextHandle = field(default_factory=lambda: ContextHandle(0, UUID(int=0)))
+    max_towers: int = 4
+
+    def __bytes__(self) -> bytes:
+
+        parts: list[bytes] = (
+            [_UINT32_STRUCT.pack(_REFERENT_ID), self.object_uuid.bytes_le] if self.object_uuid is not None
+            else [_UINT32_STRUCT.pack(0)]
+        )
+        parts.append(_UINT32_STRUCT.pack(_REFERENT_ID + 1))
+        parts.append(_pack_tower(tower=self.map_tower, offset=sum(len(part) for part in parts)))
+        parts.append(bytes(self.entry_handle))
+        parts.append(_UINT32_STRUCT.pack(self.max_towers))
+
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: ByteString | memoryview, offset: int = 0, ndr64: bool = False) -> EptMapRequest:
+
+        if ndr64:
+            raise NDR64NotSupportedError(f'{cls.__name__} cannot be unpacked in the NDR64 transfer syntax.')
+
+        object_uuid: UUID | None = None
+        if _UINT32_STRUCT.unpack_from(data, offset)[0] != 0:
+            object_uuid = UUID(bytes_le=bytes(data[offset+4:offset+20]))
+            offset += 16
+        offset += _UINT32_STRUCT.size
+
+        # The referent id of the tower pointer, which is not null.
+        offset += _UINT32_STRUCT.size
+        map_tower, offset = _unpack_tower(data=data, offset=offset)
+
+        entry_handle = ContextHandle.from_bytes(data=data[offset:offset+ContextHandle.structure_size])
+        offset += ContextHandle.structure_size
+
+        return cls(
+            map_tower=map_tower,
+            object_uuid=object_uuid,
+            entry_handle=entry_handle,
+            max_towers=_UINT32_STRUCT.unpack_from(data, offset)[0]
+        )
+
+
+EptMapResponse.REQUEST_CLASS = EptMapRequest
+
+
+async def ept_map(
+    rpc_connection: RPCConnection,
+    map_tower: ProtocolTower,
+    max_towers: int = 4,
+    object_uuid: UUID | None = None
+) -> list[ProtocolTower]:
+    """
+    Ask the endpoint mapper for the endpoints of an interface.
+
+    The connection must be bound to the endpoint mapper interface, `EPM_ABSTRACT_SYNTAX`.
+
+    :param rpc_connection: An RPC connection to the endpoint mapper.
+    :param map_tower: A tower describing the interface, transfer syntax and protocols of the sought endpoints.
+    :param max_towers: The maximum number of towers to obtain.
+    :param object_uuid: The object UUID of the sought endpoints.
+    :return: The towers of the endpoints, or an empty list if no endpoint is registered for the interface.
+    """
+
+    ept_map_response: EptMapResponse = await obtain_response(
+        rpc_connection=rpc_connection,
+        request=EptMapRequest(map_tower=map_tower, object_uuid=object_uuid, max_towers=max_towers),
+        raise_exception=False
+    )
+
+    if ept_map_response.return_code == EndpointMapperStatus.EPT_S_NOT_REGISTERED:
+        return []
+
+    if ept_map_response.return_code != EndpointMapperStatus.RPC_S_OK:
+        raise EndpointMapperError(status=ept_map_response.return_code)
+
+    return ept_map_response.towers
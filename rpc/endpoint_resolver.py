@@ -0,0 +1,205 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, AsyncContextManager, Hashable
+from asyncio import Task, create_task, shield
+from collections import OrderedDict
+from time import monotonic
+from uuid import UUID
+
+from rpc.connection import Connection
+from rpc.endpoint_mapper import EPM_PORT, EPM_ABSTRACT_SYNTAX, ept_map
+from rpc.transport import tcp_connection
+from rpc.structures.context_list import ContextList
+from rpc.structures.context_element import ContextElement, NDR_PRESENTATION_SYNTAX
+from rpc.structures.context_negotiation_result import ContDefResult
+from rpc.structures.fault_status import FaultStatus
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.structures.protocol_tower import ProtocolTower
+from rpc.structures.port_any import PortAny
+from rpc.exceptions import EndpointMapperError
+
+# The host, the interface UUID and version, and the transfer syntax UUID and version of a lookup.
+_CacheKey = tuple[Hashable, UUID, int, UUID, int]
+
+
+def _connect_to_endpoint_mapper(host: Hashable) -> AsyncContextManager[Connection]:
+    return tcp_connection(host=host, port=EPM_PORT)
+
+
+def _cache_key(host: Hashable, abstract_syntax: PresentationSyntax, transfer_syntax: PresentationSyntax) -> _CacheKey:
+    return (
+        host,
+        abstract_syntax.if_uuid,
+        abstract_syntax.if_version,
+        transfer_syntax.if_uuid,
+        transfer_syntax.if_version
+    )
+
+
+@dataclass
+class _CacheEntry:
+    endpoint: PortAny | None
+    expiry_time: float
+
+
+class EndpointResolver:
+    """
+    Resolve the endpoints of interfaces with the endpoint mapper, caching the results.
+
+    Both found and missing endpoints are cached, the latter for a shorter time, and concurrent resolutions of the same
+    interface and transfer syntax at the same host share one lookup.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[Hashable], AsyncContextManager[Connection]] = _connect_to_endpoint_mapper,
+        ttl: float = 300.0,
+        negative_ttl: float = 30.0,
+        max_num_entries: int | None = 4096
+    ):
+        """
+        :param connect: A callable that, given a host, returns an asynchronous context manager that connects to the
+            host's endpoint mapper and yields an entered `Connection`. By default, a TCP connection to port 135.
+        :param ttl: The number of seconds for which a found endpoint is cached.
+        :param negative_ttl: The number of seconds for which the absence of an endpoint is cached.
+        :param max_num_entries: The maximum number of cache entries, after which the least recently used ones are
+            evicted. `None` means no limit.
+        """
+
+        self._connect = connect
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._max_num_entries = max_num_entries
+
+        self._key_to_cache_entry: OrderedDict[_CacheKey, _CacheEntry] = OrderedDict()
+        self._key_to_lookup_task: dict[_CacheKey, Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._key_to_cache_entry)
+
+    def invalidate(
+        self,
+        host: Hashable,
+        abstract_syntax: PresentationSyntax,
+        transfer_syntax: PresentationSyntax = NDR_PRESENTATION_SYNTAX
+    ) -> None:
+        """
+        Forget the cached endpoint of an interface, e.g. when connecting to it has failed.
+
+        :param host: The host of the interface.
+        :param abstract_syntax: The abstract syntax of the interface.
+        :param transfer_syntax: The transfer syntax with which the endpoint was resolved.
+        :return: None
+        """
+
+        self._key_to_cache_entry.pop(
+            _cache_key(host=host, abstract_syntax=abstract_syntax, transfer_syntax=transfer_syntax),
+            None
+        )
+
+    def _cache(self, key: _CacheKey, endpoint: PortAny | None) -> None:
+        """
+        Record the outcome of a lookup.
+
+        :param key: The cache key of the lookup.
+        :param endpoint: The endpoint that was found, or `None` if none was.
+        :return: None
+        """
+
+        self._key_to_cache_entry[key] = _CacheEntry(
+            endpoint=endpoint,
+            expiry_time=monotonic() + (self._ttl if endpoint is not None else self._negative_ttl)
+        )
+        self._key_to_cache_entry.move_to_end(key)
+
+        if self._max_num_entries is not None and len(self._key_to_cache_entry) > self._max_num_entries:
+            self._key_to_cache_entry.popitem(last=False)
+
+    async def _look_up(
+        self,
+        key: _CacheKey,
+        host: Hashable,
+        abstract_syntax: PresentationSyntax,
+        transfer_syntax: PresentationSyntax
+    ) -> PortAny | None:
+        """
+        Ask a host's endpoint mapper for the endpoint of an interface, and cache the outcome.
+
+        :param key: The cache key of the lookup.
+        :param host: The host of the interface.
+        :param abstract_syntax: The abstract syntax of the interface.
+        :param transfer_syntax: The transfer syntax that the endpoint is to support.
+        :return: The endpoint of the interface, or `None` if none is registered.
+        """
+
+        async with self._connect(host) as connection:
+            bind_ack = await connection.bind(
+                presentation_context_list=ContextList([
+                    ContextElement(context_id=0, abstract_syntax=EPM_ABSTRACT_SYNTAX)
+                ])
+            )
+            if not bind_ack.result_list or bind_ack.result_list[0].result is not ContDefResult.ACCEPTANCE:
+                # The host does not serve the endpoint mapper interface.
+                raise EndpointMapperError(status=FaultStatus.RPC_S_UNKNOWN_IF)
+
+            towers: list[ProtocolTower] = await ept_map(
+                rpc_connection=connection,
+                map_tower=ProtocolTower.for_tcp(abstract_syntax=abstract_syntax, transfer_syntax=transfer_syntax)
+            )
+
+        endpoint: PortAny | None = next(
+            (tower.endpoint for tower in towers if tower.endpoint is not None),
+            None
+        )
+        self._cache(key=key, endpoint=endpoint)
+
+        return endpoint
+
+    def _forget_lookup(self, key: _CacheKey, lookup_task: Task) -> None:
+        """
+        Remove a finished lookup, so that a later resolution starts a new one if the outcome was not cached.
+
+        :param key: The cache key of the lookup.
+        :param lookup_task: The task of the lookup.
+        :return: None
+        """
+
+        if self._key_to_lookup_task.get(key) is lookup_task:
+            del self._key_to_lookup_task[key]
+
+        # The exception has been propagated to the waiting callers, if any are left.
+        if not lookup_task.cancelled():
+            lookup_task.exception()
+
+    async def resolve(
+        self,
+        host: Hashable,
+        abstract_syntax: PresentationSyntax,
+        transfer_syntax: PresentationSyntax = NDR_PRESENTATION_SYNTAX
+    ) -> PortAny | None:
+        """
+        Obtain the TCP endpoint of an interface at a host.
+
+        :param host: The host of the interface.
+        :param abstract_syntax: The abstract syntax of the interface.
+        :param transfer_syntax: The transfer syntax that the endpoint is to support.
+        :return: The endpoint -- the port spec being the port number -- or `None` if none is registered.
+        """
+
+        key = _cache_key(host=host, abstract_syntax=abstract_syntax, transfer_syntax=transfer_syntax)
+
+        if (cache_entry := self._key_to_cache_entry.get(key)) is not None:
+            if cache_entry.expiry_time > monotonic():
+                self._key_to_cache_entry.move_to_end(key)
+                return cache_entry.endpoint
+            del self._key_to_cache_entry[key]
+
+        if (lookup_task := self._key_to_lookup_task.get(key)) is None:
+            lookup_task = create_task(
+                self._look_up(key=key, host=host, abstract_syntax=abstract_syntax, transfer_syntax=transfer_syntax)
+            )
+            lookup_task.add_done_callback(lambda task: self._forget_lookup(key=key, lookup_task=task))
+            self._key_to_lookup_task[key] = lookup_task
+
+        # A caller that is cancelled does not cancel the lookup that the other callers are waiting for.
+        return await shield(lookup_task)
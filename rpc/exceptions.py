@@ -0,0 +1,159 @@
+from __future__ import annotations
+from typing import Type
+
+from rpc.structures.fault_status import FaultStatus
+from rpc.structures.reject_reason import RejectReason
+
+
+class RPCError(Exception):
+    pass
+
+
+class FaultError(RPCError):
+    """A call failed at the server, which answered it with a FAULT PDU."""
+
+    def __init__(self, status: int, call_id: int | None = None, did_not_execute: bool = False):
+        """
+        :param status: The status code of the fault.
+        :param call_id: The call id of the call that failed.
+        :param did_not_execute: Whether the server reported that the operation was not executed, so that the call can
+            safely be retried.
+        """
+
+        try:
+            status_name = FaultStatus(status).name
+        except ValueError:
+            status_name = 'unknown status'
+
+        super().__init__(f'The call failed with the fault status 0x{status:08X} ({status_name}).')
+
+        self.status = status
+        self.call_id = call_id
+        self.did_not_execute = did_not_execute
+
+    @classmethod
+    def from_status(cls, status: int, **kwargs) -> FaultError:
+        """
+        Create the exception corresponding to a fault status.
+
+        :param status: The status code of the fault.
+        :param kwargs: Further arguments to the exception.
+        :return: An instance of the `FaultError` subclass for the status, or of `FaultError` itself.
+        """
+
+        return _FAULT_STATUS_TO_EXCEPTION_CLASS.get(status, FaultError)(status=status, **kwargs)
+
+
+class OperationRangeError(FaultError):
+    """The server does not implement the operation number of the call."""
+
+
+class UnknownInterfaceError(FaultError):
+    """The server does not know the interface, or presentation context, of the call."""
+
+
+class AccessDeniedError(FaultError):
+    """The server denied the caller access to the operation."""
+
+
+class ServerTooBusyError(FaultError):
+    """The server is too busy to handle the call."""
+
+
+class CallCancelledError(FaultError):
+    """The call was cancelled at the server."""
+
+
+class ProtocolError(FaultError):
+    """The server considers the call to violate the protocol, e.g. by carrying malformed stub data."""
+
+
+_FAULT_STATUS_TO_EXCEPTION_CLASS: dict[int, Type[FaultError]] = {
+    FaultStatus.NCA_S_OP_RNG_ERROR: OperationRangeError,
+    FaultStatus.RPC_S_PROCNUM_OUT_OF_RANGE: OperationRangeError,
+    FaultStatus.NCA_S_UNK_IF: UnknownInterfaceError,
+    FaultStatus.RPC_S_UNKNOWN_IF: UnknownInterfaceError,
+    FaultStatus.NCA_S_INVALID_PRES_CONTEXT_ID: UnknownInterfaceError,
+    FaultStatus.ERROR_ACCESS_DENIED: AccessDeniedError,
+    FaultStatus.NCA_S_SERVER_TOO_BUSY: ServerTooBusyError,
+    FaultStatus.NCA_S_FAULT_CANCEL: CallCancelledError,
+    FaultStatus.RPC_S_CALL_CANCELLED: CallCancelledError,
+    FaultStatus.NCA_S_PROTO_ERROR: ProtocolError,
+    FaultStatus.RPC_X_BAD_STUB_DATA: ProtocolError,
+}
+
+
+class BindNakError(RPCError):
+    """The server rejected the association with a BIND_NAK PDU."""
+
+    def __init__(self, provider_reject_reason: RejectReason | int, versions: list[tuple[int, int]] | None = None):
+        """
+        :param provider_reject_reason: The reason for the rejection.
+        :param versions: The (major, minor) protocol versions that the server supports.
+        """
+
+        reason_name = (
+            provider_reject_reason.name if isinstance(provider_reject_reason, RejectReason) else 'unknown reason'
+        )
+        super().__init__(f'The server rejected the bind with the reason {int(provider_reject_reason)} ({reason_name}).')
+
+        self.provider_reject_reason = provider_reject_reason
+        self.versions = versions or []
+
+
+class EndpointMapperError(RPCError):
+    """The endpoint mapper failed to map an interface to an endpoint."""
+
+    def __init__(self, status: int):
+        """
+        :param status: The status code returned by the endpoint mapper.
+        """
+
+        super().__init__(f'The endpoint mapper failed with the status 0x{status:08X}.')
+
+        self.status = status
+
+
+class AuthenticationError(RPCError):
+    """The authentication of an association failed."""
+
+
+class MessageIntegrityError(RPCError):
+    """The signature of a received PDU did not match its contents, or a PDU that should have been signed was not."""
+
+
+class MalformedPDUError(RPCError):
+    """A received PDU, or a structure in it, could not be decoded."""
+
+
+class UnexpectedPDUError(RPCError):
+    """A PDU of a type that the protocol does not allow at that point was received."""
+
+
+class UnexpectedResponseError(RPCError):
+    """The response to a client protocol request did not decode into the message class expected for the request."""
+
+
+class NDR64NotSupportedError(RPCError):
+    """A value of a type that can only be marshalled in the NDR 2.0 transfer syntax was to be marshalled in NDR64."""
+
+
+class ConnectionClosedError(RPCError, ConnectionError):
+    """The connection was closed, so that no more PDUs can be sent or received on it."""
+
+
+class PresentationContextRejectedError(RPCError):
+    """The server rejected the presentation context proposed for an interface."""
+
+    def __init__(self, reason: int):
+        """
+        :param reason: The provider reason that the server gave for the rejection.
+        """
+
+        super().__init__(f'The server rejected the presentation context with the reason {reason}.')
+
+        self.reason = reason
+
+
+class ConnectionPoolClosedError(RPCError):
+    """A connection was requested from a connection pool that has been closed."""
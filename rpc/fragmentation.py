@@ -0,0 +1,108 @@
+from __future__ import annotations
+from dataclasses import replace
+from typing import Iterator
+
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.structures.pfc_flag import PfcFlag
+
+# The stub data in every fragment but the last is kept at a multiple of this, so that a trailer that follows it stays
+# aligned.
+STUB_DATA_FRAGMENT_ALIGNMENT = 8
+
+# The largest buffer preallocated for reassembling stub data. The allocation hint is the peer's to choose, so a larger
+# one is not trusted; the buffer grows as the fragments arrive instead.
+MAX_PREALLOCATED_STUB_DATA_LENGTH = 1024 * 1024
+
+
+def fragment_message(
+    message: RequestHeader | ResponseHeader,
+    max_frag_length: int
+) -> Iterator[RequestHeader | ResponseHeader]:
+    """
+    Split a message's stub data into fragments that are no larger than the maximum fragment length.
+
+    The fragments' stub data are views into the message's stub data, so no stub data is copied.
+
+    :param message: The message to fragment.
+    :param max_frag_length: The maximum fragment length, as negotiated during binding.
+    :return: An iterator of the fragments of the message, in order. If the message fits in one fragment, the message
+        itself is the only fragment.
+    """
+
+    if message.frag_length <= max_frag_length:
+        yield message
+        return
+
+    max_stub_data_length = max_frag_length - (message.frag_length - len(message.stub_data))
+    max_stub_data_length -= max_stub_data_length % STUB_DATA_FRAGMENT_ALIGNMENT
+    if max_stub_data_length <= 0:
+        raise ValueError(f'The maximum fragment length {max_frag_length} leaves no room for stub data.')
+
+    stub_data = memoryview(message.stub_data)
+    stub_data_length = len(stub_data)
+    base_pfc_flags = message.pfc_flags & ~(PfcFlag.PFC_FIRST_FRAG | PfcFlag.PFC_LAST_FRAG)
+
+    for offset in range(0, stub_data_length, max_stub_data_length):
+        pfc_flags = base_pfc_flags
+        if offset == 0:
+            pfc_flags |= PfcFlag.PFC_FIRST_FRAG
+        if offset + max_stub_data_length >= stub_data_length:
+            pfc_flags |= PfcFlag.PFC_LAST_FRAG
+
+        yield replace(
+            message,
+            pfc_flags=pfc_flags,
+            alloc_hint=stub_data_length - offset,
+            stub_data=stub_data[offset:offset+max_stub_data_length]
+        )
+
+
+class StubDataReassembler:
+    """Reassemble the stub data of a fragmented message into one buffer."""
+
+    def __init__(self, first_fragment: RequestHeader | ResponseHeader):
+        """
+        :param first_fragment: The first fragment of the message, whose `alloc_hint` is used to preallocate the
+            buffer, up to `MAX_PREALLOCATED_STUB_DATA_LENGTH` bytes.
+        """
+
+        self._first_fragment = first_fragment
+        self._buffer = bytearray(
+            max(min(first_fragment.alloc_hint, MAX_PREALLOCATED_STUB_DATA_LENGTH), len(first_fragment.stub_data))
+        )
+        self._length = 0
+
+        self.add(fragment=first_fragment)
+
+    def add(self, fragment: RequestHeader | ResponseHeader) -> None:
+        """
+        Append the stub data of a fragment to the buffer.
+
+        :param fragment: The fragment whose stub data to append.
+        :return: None
+        """
+
+        end = self._length + len(fragment.stub_data)
+        if end > len(self._buffer):
+            # The allocation hint was too small; grow geometrically to keep the total copying linear.
+            self._buffer.extend(bytes(max(end - len(self._buffer), len(self._buffer))))
+
+        self._buffer[self._length:end] = fragment.stub_data
+        self._length = end
+
+    def message(self) -> RequestHeader | ResponseHeader:
+        """
+        Produce the reassembled message.
+
+        :return: A message with the header of the first fragment and the stub data of all fragments.
+        """
+
+        del self._buffer[self._length:]
+
+        return replace(
+            self._first_fragment,
+            pfc_flags=self._first_fragment.pfc_flags | PfcFlag.PFC_LAST_FRAG,
+            alloc_hint=self._length,
+            stub_data=self._buffer
+        )
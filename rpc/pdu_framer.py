@@ -0,0 +1,159 @@
+from __future__ import annotations
+from typing import ClassVar, Iterator
+from struct import Struct
+
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.exceptions import MalformedPDUError
+
+# Stub data no longer than this is copied out of a decoded fragment rather than kept as a view into the receive buffer.
+# A retained view keeps the framer from reusing its buffer, and copying a small stub costs less than the new buffer.
+MAX_COPIED_STUB_DATA_LENGTH = 8192
+
+
+class PDUFramer:
+    """
+    Split a stream of bytes into complete PDU fragments.
+
+    The bytes are accumulated in a reusable receive buffer, and a fragment is handed out -- as a `memoryview` into the
+    buffer -- once the number of bytes indicated by the `frag_length` field of its common header is available. The bytes
+    of handed-out fragments are never overwritten while views into the buffer are alive; the framer continues in a new
+    buffer instead.
+    """
+
+    _FRAG_LENGTH_STRUCT: ClassVar[Struct] = Struct('<H')
+    _FRAG_LENGTH_OFFSET: ClassVar[int] = 8
+
+    def __init__(self, initial_buffer_size: int = 65536):
+        self._buffer = bytearray(initial_buffer_size)
+        # The start of the bytes that have not been handed out as fragments.
+        self._start = 0
+        # The end of the bytes that have been written to the buffer.
+        self._end = 0
+
+    @property
+    def num_buffered_bytes(self) -> int:
+        return self._end - self._start
+
+    def _buffer_is_exported(self) -> bool:
+        """
+        Check whether views into the receive buffer are alive.
+
+        A buffer that is exported cannot be resized, which is what the check relies on.
+
+        :return: Whether views into the receive buffer are alive.
+        """
+
+        try:
+            self._buffer.append(0)
+        except BufferError:
+            return True
+
+        del self._buffer[-1]
+        return False
+
+    def _make_room(self, size: int) -> None:
+        """
+        Make sure that at least `size` bytes can be written after the buffered bytes.
+
+        :param size: The number of bytes that are to be written.
+        :return: None
+        """
+
+        if len(self._buffer) - self._end >= size:
+            return
+
+        num_buffered_bytes = self.num_buffered_bytes
+
+        if self._buffer_is_exported():
+            # Handed-out fragments are still referenced -- e.g. by the stub data of decoded messages -- so the bytes
+            # in the buffer must be left as they are. Continue in a new buffer, leaving the old one to the views.
+            new_buffer = bytearray(max(len(self._buffer), num_buffered_bytes + size))
+            new_buffer[:num_buffered_bytes] = memoryview(self._buffer)[self._start:self._end]
+            self._buffer = new_buffer
+            self._start, self._end = 0, num_buffered_bytes
+            return
+
+        if self._start != 0:
+            buffer_view = memoryview(self._buffer)
+            buffer_view[:num_buffered_bytes] = buffer_view[self._start:self._end]
+            buffer_view.release()
+            self._start, self._end = 0, num_buffered_bytes
+
+        if (num_missing_bytes := size - (len(self._buffer) - self._end)) > 0:
+            self._buffer.extend(bytes(max(num_missing_bytes, len(self._buffer))))
+
+    def get_buffer(self, size_hint: int = -1) -> memoryview:
+        """
+        Obtain a writable view of the free part of the receive buffer.
+
+        The free part is offered as is as long as it is not empty; room for `size_hint` bytes is made only once no free
+        part remains, so that the buffer is reused rather than replaced. After writing to the view, the number of bytes
+        written must be reported with `buffer_updated`.
+
+        :param size_hint: The number of bytes to make room for if the buffer is full. A non-positive value means no
+            particular size.
+        :return: A writable view of the free part of the receive buffer.
+        """
+
+        if self._start == self._end != 0 and not self._buffer_is_exported():
+            # Nothing is buffered and no views into the buffer are alive, so it can be written from its start again.
+            self._start = self._end = 0
+
+        if self._end == len(self._buffer):
+            self._make_room(size=max(size_hint, 1))
+
+        return memoryview(self._buffer)[self._end:]
+
+    def buffer_updated(self, num_bytes: int) -> None:
+        """
+        Record that bytes have been written into a view obtained from `get_buffer`.
+
+        :param num_bytes: The number of bytes written.
+        :return: None
+        """
+
+        self._end += num_bytes
+
+    def feed(self, data: bytes | bytearray | memoryview) -> None:
+        """
+        Append bytes to the receive buffer.
+
+        :param data: The bytes to append.
+        :return: None
+        """
+
+        num_bytes = len(data)
+        if num_bytes == 0:
+            return
+
+        self._make_room(size=num_bytes)
+        with memoryview(self._buffer) as buffer_view:
+            buffer_view[self._end:self._end + num_bytes] = data
+        self.buffer_updated(num_bytes=num_bytes)
+
+    def fragments(self) -> Iterator[memoryview]:
+        """
+        Hand out the complete fragments in the receive buffer.
+
+        :return: An iterator of views of complete fragments, in the order in which they were received.
+        """
+
+        while self._end - self._start >= MSRPCHeader.structure_size:
+            frag_length: int = self._FRAG_LENGTH_STRUCT.unpack_from(
+                self._buffer,
+                self._start + self._FRAG_LENGTH_OFFSET
+            )[0]
+            if frag_length < MSRPCHeader.structure_size:
+                raise MalformedPDUError(f'The fragment length {frag_length} is shorter than that of a PDU header.')
+
+            fragment_start = self._start
+            fragment_end = fragment_start + frag_length
+            if fragment_end > self._end:
+                break
+
+            # The fragment is consumed before it is handed out, as bytes may be received -- and the buffer replaced --
+            # while the consumer holds it.
+            self._start = fragment_end
+
+            with memoryview(self._buffer) as buffer_view:
+                yield buffer_view[fragment_start:fragment_end]
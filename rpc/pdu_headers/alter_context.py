@@ -0,0 +1,15 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import ClassVar
+
+from rpc.pdu_headers.base import register_pdu_header
+from rpc.pdu_headers.bind import BindHeader
+from rpc.structures.pdu_type import PDUType
+
+
+@dataclass
+@register_pdu_header
+class AlterContextHeader(BindHeader):
+    """An alter_context PDU, which has the layout of a bind PDU."""
+
+    pdu_type: ClassVar[PDUType] = PDUType.ALTER_CONTEXT
@@ -0,0 +1,55 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import ClassVar
+from struct import Struct
+
+from rpc.pdu_headers.base import MSRPCHeader, register_pdu_header
+from rpc.structures.pdu_type import PDUType
+from rpc.structures.auth_verifier import AuthVerifier
+from rpc.structures.pfc_flag import PfcFlag
+from rpc.structures.data_representation_format import DataRepresentationFormat
+
+
+@dataclass
+@register_pdu_header
+class Auth3Header(MSRPCHeader):
+    pdu_type: ClassVar[PDUType] = PDUType.AUTH3
+    # The fields following the common header: four octets of padding.
+    _HEADER_STRUCT: ClassVar[Struct] = Struct(MSRPCHeader._COMMON_HEADER_FORMAT + '4x')
+    structure_size: ClassVar[int] = _HEADER_STRUCT.size
+
+    auth_verifier: AuthVerifier | None = None
+
+    @property
+    def frag_length(self) -> int:
+        return self.structure_size + (len(self.auth_verifier) if self.auth_verifier is not None else 0)
+
+    @property
+    def auth_length(self) -> int:
+        return self.auth_verifier.auth_length if self.auth_verifier is not None else 0
+
+    @classmethod
+    def _from_bytes(cls, data: bytes | memoryview) -> Auth3Header:
+
+        (
+            rpc_vers, rpc_vers_minor, _, pfc_flags, drep_first_octet, drep_second_octet, _, frag_length, auth_length,
+            call_id
+        ) = cls._unpack_header(data=data)
+
+        return cls(
+            rpc_vers=rpc_vers,
+            rpc_vers_minor=rpc_vers_minor,
+            pfc_flags=PfcFlag(pfc_flags),
+            packed_drep=DataRepresentationFormat.from_octets(
+                first_octet=drep_first_octet,
+                second_octet=drep_second_octet
+            ),
+            call_id=call_id,
+            auth_verifier=AuthVerifier.from_pdu_bytes(data=data, frag_length=frag_length, auth_length=auth_length)
+        )
+
+    def __bytes__(self) -> bytes:
+        if self.auth_verifier is not None:
+            return self._pack_header() + bytes(self.auth_verifier)
+        else:
+            return self._pack_header()
@@ -1,20 +1,42 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import ClassVar, Type, Any
+from typing import ClassVar, Type
 from abc import ABC, abstractmethod
-from struct import unpack as struct_unpack, pack as struct_pack
+from struct import Struct
 
 from rpc.structures.pdu_type import PDUType
 from rpc.structures.pfc_flag import PfcFlag
 from rpc.structures.data_representation_format import DataRepresentationFormat, CharacterRepresentation, \
     IntegerRepresentation, FloatingPointRepresentation
+from rpc.exceptions import MalformedPDUError, UnexpectedPDUError
+
+
+def _import_pdu_header_modules() -> None:
+    """Import the modules of the PDU header classes so that they are registered."""
+
+    import rpc.pdu_headers.alter_context
+    import rpc.pdu_headers.alter_context_resp
+    import rpc.pdu_headers.auth3
+    import rpc.pdu_headers.bind
+    import rpc.pdu_headers.bind_ack
+    import rpc.pdu_headers.bind_nak
+    import rpc.pdu_headers.co_cancel
+    import rpc.pdu_headers.fault
+    import rpc.pdu_headers.orphaned
+    import rpc.pdu_headers.request_header
+    import rpc.pdu_headers.response_header
 
 
 @dataclass
 class MSRPCHeader(ABC):
     pdu_type: ClassVar[PDUType] = NotImplemented
     pdu_type_to_class: ClassVar[dict[PDUType, Type[MSRPCHeader]]] = {}
-    structure_size: ClassVar[int] = 16
+    # The format of the common header: `rpc_vers`, `rpc_vers_minor`, `PTYPE`, `pfc_flags`, the two octets of
+    # `packed_drep` followed by its two reserved octets, `frag_length`, `auth_length`, and `call_id`.
+    _COMMON_HEADER_FORMAT: ClassVar[str] = '<BBBBBBHHHI'
+    # The fixed part of the PDU header, including the common header. Subclasses append their own fields.
+    _HEADER_STRUCT: ClassVar[Struct] = Struct(_COMMON_HEADER_FORMAT)
+    structure_size: ClassVar[int] = _HEADER_STRUCT.size
 
     rpc_vers: int = 5
     rpc_vers_minor: int = 0
@@ -26,19 +48,84 @@ class MSRPCHeader(ABC):
     )
     call_id: int = 0
 
-    @staticmethod
-    def _from_bytes(data: bytes) -> dict[str, int | PDUType | PfcFlag | DataRepresentationFormat]:
-        return dict(
-            rpc_vers=data[0],
-            rpc_vers_minor=data[1],
-            pdu_type=PDUType(data[2]),
-            pfc_flags=PfcFlag(data[3]),
-            packed_drep=DataRepresentationFormat.from_bytes(data=data[4:8]),
-            frag_length=struct_unpack('<H', data[8:10])[0],
-            auth_length=struct_unpack('<H', data[10:12])[0],
-            call_id=struct_unpack('<I', data[12:16])[0]
+    @classmethod
+    def _unpack_header(cls, data: bytes | memoryview) -> tuple:
+        """
+        Unpack the fixed part of the PDU header.
+
+        :param data: The bytes of the PDU.
+        :return: The values of the fixed part of the header, the first ten of which are those of the common header.
+        """
+
+        header_values: tuple = cls._HEADER_STRUCT.unpack_from(data)
+        if header_values[6] != 0:
+            raise MalformedPDUError('The reserved octets of the data representation format are not zero.')
+
+        return header_values
+
+    def _pack_header(self, *header_specific_values) -> bytes:
+        """
+        Pack the fixed part of the PDU header.
+
+        :param header_specific_values: The values of the fields that follow the common header.
+        :return: The bytes of the fixed part of the header.
+        """
+
+        packed_drep = self.packed_drep
+
+        return self._HEADER_STRUCT.pack(
+            self.rpc_vers,
+            self.rpc_vers_minor,
+            self.pdu_type,
+            self.pfc_flags,
+            packed_drep.first_octet,
+            packed_drep.second_octet,
+            0,
+            self.frag_length,
+            self.auth_length,
+            self.call_id,
+            *header_specific_values
         )
 
+    def serialized_size(self) -> int:
+        """
+        Obtain the number of bytes of the serialized PDU.
+
+        :return: The number of bytes of the serialized PDU.
+        """
+
+        return self.frag_length
+
+    def buffers(self) -> list[bytes | memoryview]:
+        """
+        Serialize the PDU into a sequence of buffers that together make up its bytes.
+
+        Subclasses that carry stub data return the stub data as a buffer of its own, so that it need not be copied
+        when the PDU is written with scatter/gather I/O.
+
+        :return: The buffers making up the serialized PDU, in order.
+        """
+
+        return [bytes(self)]
+
+    def pack_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Serialize the PDU into a buffer.
+
+        :param buffer: The buffer to write the serialized PDU into. It must be able to hold `serialized_size()` bytes
+            from `offset`.
+        :param offset: The offset in the buffer at which to start writing.
+        :return: The number of bytes written.
+        """
+
+        position = offset
+        for pdu_buffer in self.buffers():
+            pdu_buffer_length = len(pdu_buffer)
+            buffer[position:position+pdu_buffer_length] = pdu_buffer
+            position += pdu_buffer_length
+
+        return position - offset
+
     @property
     @abstractmethod
     def frag_length(self) -> int:
@@ -51,46 +138,28 @@ class MSRPCHeader(ABC):
 
     @abstractmethod
     def __bytes__(self) -> bytes:
-        return b''.join([
-            struct_pack('<B', self.rpc_vers),
-            struct_pack('<B', self.rpc_vers_minor),
-            struct_pack('<B', self.pdu_type),
-            struct_pack('<B', self.pfc_flags.value),
-            bytes(self.packed_drep),
-            struct_pack('<H', self.frag_length),
-            struct_pack('<H', self.auth_length),
-            struct_pack('<I', self.call_id)
-        ])
+        raise NotImplementedError
 
+    @classmethod
     @abstractmethod
-    def _from_bytes_and_parameters(self, data: bytes, base_parameters: dict[str, Any]):
+    def _from_bytes(cls, data: bytes | memoryview) -> MSRPCHeader:
         raise NotImplementedError
 
-    # TODO: Use dict method to find proper subtype.
-
     @classmethod
-    def from_bytes(cls, data: bytes) -> MSRPCHeader:
-
-        from rpc.pdu_headers.bind import BindHeader
-        from rpc.pdu_headers.bind_ack import BindAckHeader
-        from rpc.pdu_headers.request_header import RequestHeader
-        from rpc.pdu_headers.response_header import ResponseHeader
+    def from_bytes(cls, data: bytes | memoryview) -> MSRPCHeader:
 
-        base_parameters: dict[str, int | PDUType | PfcFlag, DataRepresentationFormat] = cls._from_bytes(
-            data=data
-        )
-        pdu_type = base_parameters.pop('pdu_type')
+        pdu_type: int = data[2]
 
-        if cls != MSRPCHeader:
+        if cls is not MSRPCHeader:
             if pdu_type != cls.pdu_type:
-                # TODO: Use proper exception.
-                raise ValueError
-            return cls._from_bytes_and_parameters(data=data, base_parameters=base_parameters)
-        else:
-            return cls.pdu_type_to_class[pdu_type]._from_bytes_and_parameters(
-                data=data,
-                base_parameters=base_parameters
-            )
+                raise UnexpectedPDUError(f'A {cls.pdu_type.name} PDU was expected, not one of the type {pdu_type}.')
+            return cls._from_bytes(data=data)
+
+        if (header_class := cls.pdu_type_to_class.get(pdu_type)) is None:
+            _import_pdu_header_modules()
+            header_class = cls.pdu_type_to_class[PDUType(pdu_type)]
+
+        return header_class._from_bytes(data=data)
 
 
 def register_pdu_header(cls: Type[MSRPCHeader]):
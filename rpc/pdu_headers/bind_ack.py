@@ -1,19 +1,24 @@
+from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import ClassVar, Any
-from struct import pack as struct_pack, unpack as struct_unpack
+from typing import ClassVar
+from struct import Struct
 
 from rpc.pdu_headers.base import MSRPCHeader, register_pdu_header
 from rpc.structures.pdu_type import PDUType
 from rpc.structures.port_any import PortAny
 from rpc.structures.result_list import ResultList
 from rpc.structures.auth_verifier import AuthVerifier
+from rpc.structures.pfc_flag import PfcFlag
+from rpc.structures.data_representation_format import DataRepresentationFormat
 
 
 @dataclass
 @register_pdu_header
 class BindAckHeader(MSRPCHeader):
     pdu_type: ClassVar[PDUType] = PDUType.BIND_ACK
-    structure_size: ClassVar[int] = MSRPCHeader.structure_size + 8
+    # The fields following the common header: `max_xmit_frag`, `max_recv_frag`, and `assoc_group_id`.
+    _HEADER_STRUCT: ClassVar[Struct] = Struct(MSRPCHeader._COMMON_HEADER_FORMAT + 'HHI')
+    structure_size: ClassVar[int] = _HEADER_STRUCT.size
 
     max_xmit_frag: int = 4280
     max_recv_frag: int = 4280
@@ -37,50 +42,54 @@ class BindAckHeader(MSRPCHeader):
             sec_addr_len,
             num_padding,
             self.result_list.byte_len(),
-            self.auth_length
+            len(self.auth_verifier) if self.auth_verifier is not None else 0
         ])
 
     @property
     def auth_length(self) -> int:
-        return len(self.auth_verifier) if self.auth_verifier is not None else 0
+        return self.auth_verifier.auth_length if self.auth_verifier is not None else 0
 
     @classmethod
-    def _from_bytes_and_parameters(cls, data: bytes, base_parameters: dict[str, Any]):
+    def _from_bytes(cls, data: bytes | memoryview) -> BindAckHeader:
 
-        header_specific_data = data[MSRPCHeader.structure_size:]
-
-        frag_length = base_parameters.pop('frag_length')
-        auth_length = base_parameters.pop('auth_length')
+        (
+            rpc_vers, rpc_vers_minor, _, pfc_flags, drep_first_octet, drep_second_octet, _, frag_length, auth_length,
+            call_id, max_xmit_frag, max_recv_frag, assoc_group_id
+        ) = cls._unpack_header(data=data)
 
         # TODO: Not sure how to deal with the fact that this is optional.
-        sec_addr = PortAny.from_bytes(data=header_specific_data[8:])
+        sec_addr = PortAny.from_bytes(data=data[cls.structure_size:])
 
         num_padding = (4 - (len(sec_addr) % 4)) % 4
-        result_list_offset = 8 + len(sec_addr) + num_padding
-        result_list = ResultList.from_bytes(data=header_specific_data[result_list_offset:])
-
-        # TODO: Support `auth_verifier`.
+        result_list_offset = cls.structure_size + len(sec_addr) + num_padding
+        result_list = ResultList.from_bytes(data=data[result_list_offset:])
 
         return cls(
-            **base_parameters,
-            max_xmit_frag=struct_unpack('<H', header_specific_data[:2])[0],
-            max_recv_frag=struct_unpack('<H', header_specific_data[2:4])[0],
-            assoc_group_id=struct_unpack('<I', header_specific_data[4:8])[0],
+            rpc_vers=rpc_vers,
+            rpc_vers_minor=rpc_vers_minor,
+            pfc_flags=PfcFlag(pfc_flags),
+            packed_drep=DataRepresentationFormat.from_octets(
+                first_octet=drep_first_octet,
+                second_octet=drep_second_octet
+            ),
+            call_id=call_id,
+            max_xmit_frag=max_xmit_frag,
+            max_recv_frag=max_recv_frag,
+            assoc_group_id=assoc_group_id,
             sec_addr=sec_addr,
-            result_list=result_list
+            result_list=result_list,
+            auth_verifier=AuthVerifier.from_pdu_bytes(data=data, frag_length=frag_length, auth_length=auth_length)
         )
 
     def __bytes__(self) -> bytes:
 
         # TODO: Deal with the optional case somehow.
         num_padding = (4 - (len(self.sec_addr) % 4)) % 4
-        # TODO: Deal with the `auth_verifier` case.
 
-        return super().__bytes__() + b''.join([
-            struct_pack('<H', self.max_xmit_frag),
-            struct_pack('<H', self.max_recv_frag),
-            struct_pack('<I', self.assoc_group_id),
+        return b''.join([
+            self._pack_header(self.max_xmit_frag, self.max_recv_frag, self.assoc_group_id),
             bytes(self.sec_addr),
             num_padding * b'\x00',
-            bytes(self.result_list)
+            bytes(self.result_list),
+            bytes(self.auth_verifier) if self.auth_verifier is not None else b''
         ])
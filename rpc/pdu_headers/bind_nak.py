@@ -0,0 +1,71 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import ClassVar
+from struct import Struct
+
+from rpc.pdu_headers.base import MSRPCHeader, register_pdu_header
+from rpc.structures.pdu_type import PDUType
+from rpc.structures.pfc_flag import PfcFlag
+from rpc.structures.reject_reason import RejectReason
+from rpc.structures.data_representation_format import DataRepresentationFormat
+
+
+@dataclass
+@register_pdu_header
+class BindNakHeader(MSRPCHeader):
+    pdu_type: ClassVar[PDUType] = PDUType.BIND_NAK
+    # The fields following the common header: `provider_reject_reason`, and the number of supported protocol versions.
+    _HEADER_STRUCT: ClassVar[Struct] = Struct(MSRPCHeader._COMMON_HEADER_FORMAT + 'HB')
+    structure_size: ClassVar[int] = _HEADER_STRUCT.size
+    # A supported protocol version: the major and minor version numbers.
+    _VERSION_STRUCT: ClassVar[Struct] = Struct('<BB')
+
+    provider_reject_reason: RejectReason | int = RejectReason.REASON_NOT_SPECIFIED
+    # The (major, minor) protocol versions that the server supports.
+    versions: list[tuple[int, int]] = field(default_factory=lambda: [(5, 0)])
+
+    @property
+    def frag_length(self) -> int:
+        return self.structure_size + len(self.versions) * self._VERSION_STRUCT.size
+
+    @property
+    def auth_length(self) -> int:
+        return 0
+
+    @classmethod
+    def _from_bytes(cls, data: bytes | memoryview) -> BindNakHeader:
+
+        (
+            rpc_vers, rpc_vers_minor, _, pfc_flags, drep_first_octet, drep_second_octet, _, frag_length, auth_length,
+            call_id, provider_reject_reason, n_protocols
+        ) = cls._unpack_header(data=data)
+
+        # Any signature and extended error information following the versions are not decoded.
+        versions: list[tuple[int, int]] = list(
+            cls._VERSION_STRUCT.iter_unpack(
+                data[cls.structure_size:cls.structure_size + n_protocols * cls._VERSION_STRUCT.size]
+            )
+        )
+
+        try:
+            provider_reject_reason = RejectReason(provider_reject_reason)
+        except ValueError:
+            pass
+
+        return cls(
+            rpc_vers=rpc_vers,
+            rpc_vers_minor=rpc_vers_minor,
+            pfc_flags=PfcFlag(pfc_flags),
+            packed_drep=DataRepresentationFormat.from_octets(
+                first_octet=drep_first_octet,
+                second_octet=drep_second_octet
+            ),
+            call_id=call_id,
+            provider_reject_reason=provider_reject_reason,
+            versions=versions
+        )
+
+    def __bytes__(self) -> bytes:
+        return self._pack_header(self.provider_reject_reason, len(self.versions)) + b''.join(
+            self._VERSION_STRUCT.pack(major, minor) for major, minor in self.versions
+        )
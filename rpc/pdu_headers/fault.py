@@ -0,0 +1,82 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import ClassVar
+from struct import Struct
+
+from rpc.pdu_headers.base import MSRPCHeader, register_pdu_header
+from rpc.structures.pdu_type import PDUType
+from rpc.structures.auth_verifier import AuthVerifier
+from rpc.structures.pfc_flag import PfcFlag
+from rpc.structures.data_representation_format import DataRepresentationFormat
+
+
+@dataclass
+@register_pdu_header
+class FaultHeader(MSRPCHeader):
+    pdu_type: ClassVar[PDUType] = PDUType.FAULT
+    # The fields following the common header: `alloc_hint`, `p_cont_id`, `cancel_count`, a reserved octet, `status`,
+    # and four reserved octets.
+    _HEADER_STRUCT: ClassVar[Struct] = Struct(MSRPCHeader._COMMON_HEADER_FORMAT + 'IHBxI4x')
+    structure_size: ClassVar[int] = _HEADER_STRUCT.size
+
+    pfc_flags: PfcFlag = PfcFlag.PFC_FIRST_FRAG | PfcFlag.PFC_LAST_FRAG | PfcFlag.PFC_DID_NOT_EXECUTE
+    alloc_hint: int = 0
+    context_id: int = 0
+    cancel_count: int = 0
+    status: int = 0
+    stub_data: bytes | memoryview = b''
+    auth_verifier: AuthVerifier | None = None
+
+    @property
+    def frag_length(self) -> int:
+        return (
+            self.structure_size
+            + len(self.stub_data)
+            + (len(self.auth_verifier) if self.auth_verifier is not None else 0)
+        )
+
+    @property
+    def auth_length(self) -> int:
+        return self.auth_verifier.auth_length if self.auth_verifier is not None else 0
+
+    @classmethod
+    def _from_bytes(cls, data: bytes | memoryview) -> FaultHeader:
+
+        (
+            rpc_vers, rpc_vers_minor, _, pfc_flags, drep_first_octet, drep_second_octet, _, frag_length, auth_length,
+            call_id, alloc_hint, context_id, cancel_count, status
+        ) = cls._unpack_header(data=data)
+
+        data = memoryview(data)
+        auth_verifier = AuthVerifier.from_pdu_bytes(data=data, frag_length=frag_length, auth_length=auth_length)
+        stub_data_end = frag_length - (len(auth_verifier) if auth_verifier is not None else 0)
+
+        return cls(
+            rpc_vers=rpc_vers,
+            rpc_vers_minor=rpc_vers_minor,
+            pfc_flags=PfcFlag(pfc_flags),
+            packed_drep=DataRepresentationFormat.from_octets(
+                first_octet=drep_first_octet,
+                second_octet=drep_second_octet
+            ),
+            call_id=call_id,
+            alloc_hint=alloc_hint,
+            context_id=context_id,
+            cancel_count=cancel_count,
+            status=status,
+            # The stub data is copied, as the fault outlives the buffer it is decoded from.
+            stub_data=data[cls.structure_size:stub_data_end].tobytes(),
+            auth_verifier=auth_verifier
+        )
+
+    def buffers(self) -> list[bytes | memoryview]:
+
+        header_bytes: bytes = self._pack_header(self.alloc_hint, self.context_id, self.cancel_count, self.status)
+
+        if self.auth_verifier is not None:
+            return [header_bytes, self.stub_data, bytes(self.auth_verifier)]
+        else:
+            return [header_bytes, self.stub_data]
+
+    def __bytes__(self) -> bytes:
+        return b''.join(self.buffers())
@@ -0,0 +1,15 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import ClassVar
+
+from rpc.pdu_headers.base import register_pdu_header
+from rpc.pdu_headers.co_cancel import CoCancelHeader
+from rpc.structures.pdu_type import PDUType
+
+
+@dataclass
+@register_pdu_header
+class OrphanedHeader(CoCancelHeader):
+    """An orphaned PDU, which has the layout of a co_cancel PDU."""
+
+    pdu_type: ClassVar[PDUType] = PDUType.ORPHANED
@@ -1,64 +1,88 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import ClassVar, Any
-from struct import unpack as struct_unpack, pack as struct_pack
+from typing import ClassVar
+from struct import Struct
 
 from rpc.pdu_headers.base import MSRPCHeader, register_pdu_header
 from rpc.structures.pdu_type import PDUType
 from rpc.structures.auth_verifier import AuthVerifier
+from rpc.structures.pfc_flag import PfcFlag
+from rpc.structures.data_representation_format import DataRepresentationFormat
 
 
 @dataclass
 @register_pdu_header
 class ResponseHeader(MSRPCHeader):
     pdu_type: ClassVar[PDUType] = PDUType.RESPONSE
-    structure_size: ClassVar[int] = MSRPCHeader.structure_size + 8
-    _reserved: ClassVar[bytes] = bytes(1)
+    # The fields following the common header: `alloc_hint`, `p_cont_id`, `cancel_count`, and a reserved octet.
+    _HEADER_STRUCT: ClassVar[Struct] = Struct(MSRPCHeader._COMMON_HEADER_FORMAT + 'IHBx')
+    structure_size: ClassVar[int] = _HEADER_STRUCT.size
 
     alloc_hint: int = 0
     context_id: int = 0
     cancel_count: int = 0
-    stub_data: bytes = b''
+    # When decoded, a view into the buffer the PDU was decoded from; see `materialize_stub_data`.
+    stub_data: bytes | memoryview = b''
     auth_verifier: AuthVerifier | None = None
 
     @property
     def frag_length(self) -> int:
-        return sum([
-            self.structure_size,
-            len(self.stub_data),
-            len(self.auth_verifier) if self.auth_verifier is not None else 0
-        ])
+        return (
+            self.structure_size
+            + len(self.stub_data)
+            + (len(self.auth_verifier) if self.auth_verifier is not None else 0)
+        )
 
     @property
     def auth_length(self) -> int:
-        return len(self.auth_verifier) if self.auth_verifier is not None else 0
+        return self.auth_verifier.auth_length if self.auth_verifier is not None else 0
 
     @classmethod
-    def _from_bytes_and_parameters(cls, data: bytes, base_parameters: dict[str, Any]) -> ResponseHeader:
+    def _from_bytes(cls, data: bytes | memoryview) -> ResponseHeader:
 
-        header_specific_data = data[MSRPCHeader.structure_size:]
+        (
+            rpc_vers, rpc_vers_minor, _, pfc_flags, drep_first_octet, drep_second_octet, _, frag_length, auth_length,
+            call_id, alloc_hint, context_id, cancel_count
+        ) = cls._unpack_header(data=data)
 
-        frag_length = base_parameters.pop('frag_length')
-        auth_length = base_parameters.pop('auth_length')
+        data = memoryview(data)
+        auth_verifier = AuthVerifier.from_pdu_bytes(data=data, frag_length=frag_length, auth_length=auth_length)
+        stub_data_end = frag_length - (len(auth_verifier) if auth_verifier is not None else 0)
 
         return cls(
-            **base_parameters,
-            alloc_hint=struct_unpack('<I', header_specific_data[:4])[0],
-            context_id=struct_unpack('<H', header_specific_data[4:6])[0],
-            cancel_count=struct_unpack('<B', header_specific_data[6:7])[0],
-            stub_data=header_specific_data[8:(-auth_length or None)],
-            auth_verifier=(
-                AuthVerifier.from_bytes(data=header_specific_data[-auth_length:])
-                if auth_length != 0 else None
-            )
+            rpc_vers=rpc_vers,
+            rpc_vers_minor=rpc_vers_minor,
+            pfc_flags=PfcFlag(pfc_flags),
+            packed_drep=DataRepresentationFormat.from_octets(
+                first_octet=drep_first_octet,
+                second_octet=drep_second_octet
+            ),
+            call_id=call_id,
+            alloc_hint=alloc_hint,
+            context_id=context_id,
+            cancel_count=cancel_count,
+            stub_data=data[cls.structure_size:stub_data_end],
+            auth_verifier=auth_verifier
         )
 
+    def buffers(self) -> list[bytes | memoryview]:
+
+        header_bytes: bytes = self._pack_header(self.alloc_hint, self.context_id, self.cancel_count)
+
+        if self.auth_verifier is not None:
+            return [header_bytes, self.stub_data, bytes(self.auth_verifier)]
+        else:
+            return [header_bytes, self.stub_data]
+
+    def materialize_stub_data(self) -> None:
+        """
+        Replace the stub data with a copy of it, so that the buffer it is a view into can be released.
+
+        :return: None
+        """
+
+        if isinstance(self.stub_data, memoryview):
+            self.stub_data = self.stub_data.tobytes()
+
     def __bytes__(self) -> bytes:
-        return super().__bytes__() + b''.join([
-            struct_pack('<I', self.alloc_hint),
-            struct_pack('<H', self.context_id),
-            struct_pack('<B', self.cancel_count),
-            struct_pack('<B', self._reserved),
-            self.stub_data,
-            bytes(self.auth_verifier) if self.auth_verifier is not None else b''
-        ])
+        return b''.join(self.buffers())
@@ -0,0 +1,534 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Awaitable, Type, Mapping
+from asyncio import StreamReader, StreamWriter, Server as AsyncioServer, Task, create_task, start_server, \
+    start_unix_server, CancelledError
+from itertools import count as itertools_count, chain as itertools_chain
+from contextlib import suppress
+from logging import getLogger
+from uuid import UUID
+
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.bind import BindHeader
+from rpc.pdu_headers.bind_ack import BindAckHeader
+from rpc.pdu_headers.bind_nak import BindNakHeader
+from rpc.pdu_headers.alter_context import AlterContextHeader
+from rpc.pdu_headers.alter_context_resp import AlterContextRespHeader
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.pdu_headers.co_cancel import CoCancelHeader
+from rpc.pdu_headers.orphaned import OrphanedHeader
+from rpc.pdu_headers.fault import FaultHeader
+from rpc.pdu_headers.auth3 import Auth3Header
+from rpc.pdu_framer import PDUFramer, MAX_COPIED_STUB_DATA_LENGTH
+from rpc.fragmentation import fragment_message, StubDataReassembler
+from rpc.structures.pdu_type import PDUType
+from rpc.structures.pfc_flag import PfcFlag
+from rpc.structures.port_any import PortAny
+from rpc.structures.context_list import ContextList
+from rpc.structures.result_list import ResultList
+from rpc.structures.context_element import NDR_PRESENTATION_SYNTAX
+from rpc.structures.context_negotiation_result import ContextNegotiationResult, ContDefResult, ProviderReason
+from rpc.structures.presentation_syntax import PresentationSyntax, NULL_PRESENTATION_SYNTAX
+from rpc.structures.fault_status import FaultStatus
+from rpc.structures.reject_reason import RejectReason
+from rpc.structures.auth_type import AuthType
+from rpc.structures.auth_verifier import AuthVerifier
+from rpc.auth.ntlm import NTLMServerContext
+from rpc.exceptions import FaultError, AuthenticationError, MessageIntegrityError
+from rpc.utils.client_protocol_message import ClientProtocolRequestBase, ClientProtocolResponseBase
+
+LOG = getLogger(__name__)
+
+Handler = Callable[[ClientProtocolRequestBase], Awaitable[ClientProtocolResponseBase]]
+
+
+@dataclass
+class ServerStats:
+    num_accepted_connections: int = 0
+    num_open_connections: int = 0
+    num_calls: int = 0
+    num_failed_calls: int = 0
+    num_received_bytes: int = 0
+    num_sent_bytes: int = 0
+
+
+class Server:
+    """
+    An RPC server that dispatches requests to handlers by interface and operation.
+
+    Each connection is served by its own task, and each call on a connection by its own task, so that a slow call
+    holds up neither other connections nor other calls on the same connection.
+    """
+
+    def __init__(
+        self,
+        max_recv_frag: int = 4280,
+        max_xmit_frag: int = 4280,
+        read_size: int = 65536,
+        credentials: Mapping[str, str] | None = None
+    ):
+        """
+        :param max_recv_frag: The largest fragment the server accepts.
+        :param max_xmit_frag: The largest fragment the server sends.
+        :param read_size: The maximum number of bytes to read from a connection at once.
+        :param credentials: The passwords of the accounts that may authenticate with NTLM, by user name. If provided,
+            only the calls of authenticated associations are handled; the others are faulted with access denied.
+        """
+
+        self.max_recv_frag = max_recv_frag
+        self.max_xmit_frag = max_xmit_frag
+        self._read_size = read_size
+        self.credentials = credentials
+
+        # The handlers of the operations of each interface, by the interface's UUID and version.
+        self._interface_to_opnum_to_handler: dict[
+            tuple[UUID, int],
+            dict[int, tuple[Type[ClientProtocolRequestBase], Handler]]
+        ] = {}
+        self._assoc_group_id_iterator = itertools_count(start=1)
+        self.stats = ServerStats()
+
+    def register_handler(
+        self,
+        request_class: Type[ClientProtocolRequestBase],
+        handler: Handler,
+        abstract_syntax: PresentationSyntax | None = None
+    ) -> None:
+        """
+        Register the handler of an operation.
+
+        :param request_class: The class of the operation's request messages, whose `OPERATION` gives the opnum.
+        :param handler: A callable that takes a request message and returns the response message. A handler may raise
+            a `FaultError` to answer the call with a FAULT of that status.
+        :param abstract_syntax: The abstract syntax of the operation's interface. By default, the `ABSTRACT_SYNTAX` of
+            the request class.
+        :return: None
+        """
+
+        if (abstract_syntax := abstract_syntax or request_class.ABSTRACT_SYNTAX) is None:
+            raise ValueError(f'The abstract syntax of {request_class.__name__} is not known.')
+
+        interface = (abstract_syntax.if_uuid, abstract_syntax.if_version)
+        self._interface_to_opnum_to_handler.setdefault(interface, {})[request_class.OPERATION.value] = (
+            request_class,
+            handler
+        )
+
+    def _negotiate_presentation_contexts(
+        self,
+        presentation_context_list: ContextList,
+        context_id_to_interface: dict[int, tuple[UUID, int]]
+    ) -> ResultList:
+        """
+        Accept the proposed presentation contexts whose interfaces have handlers and that propose NDR 2.0.
+
+        An interface has handlers only in the versions with which they were registered; a proposal of any other
+        version of it is rejected as an unsupported abstract syntax.
+
+        :param presentation_context_list: The proposed presentation contexts.
+        :param context_id_to_interface: The accepted presentation contexts of the connection, to add to.
+        :return: The results for the proposed presentation contexts, in the same order.
+        """
+
+        results: list[ContextNegotiationResult] = []
+
+        for context_element in presentation_context_list:
+            interface = (context_element.abstract_syntax.if_uuid, context_element.abstract_syntax.if_version)
+            if interface not in self._interface_to_opnum_to_handler:
+                results.append(
+                    ContextNegotiationResult(
+                        result=ContDefResult.PROVIDER_REJECTION,
+                        reason=ProviderReason.ABSTRACT_SYNTAX_NOT_SUPPORTED,
+                        transfer_syntax=NULL_PRESENTATION_SYNTAX
+                    )
+                )
+            elif NDR_PRESENTATION_SYNTAX not in context_element.transfer_syntaxes:
+                results.append(
+                    ContextNegotiationResult(
+                        result=ContDefResult.PROVIDER_REJECTION,
+                        reason=ProviderReason.PROPOSED_TRANSFER_SYNTAXES_NOT_SUPPORTED,
+                        transfer_syntax=NULL_PRESENTATION_SYNTAX
+                    )
+                )
+            else:
+                context_id_to_interface[context_element.context_id] = interface
+                results.append(
+                    ContextNegotiationResult(
+                        result=ContDefResult.ACCEPTANCE,
+                        reason=ProviderReason.REASON_NOT_SPECIFIED,
+                        transfer_syntax=NDR_PRESENTATION_SYNTAX
+                    )
+                )
+
+        return ResultList(results)
+
+    async def _dispatch(self, request: RequestHeader, interface: tuple[UUID, int] | None) -> ResponseHeader:
+        """
+        Decode a request, have it handled, and encode the response.
+
+        :param request: The (reassembled) request message.
+        :param interface: The UUID and version of the interface of the presentation context of the request.
+        :return: The response message.
+        """
+
+        if (opnum_to_handler := self._interface_to_opnum_to_handler.get(interface)) is None:
+            raise FaultError.from_status(
+                status=FaultStatus.NCA_S_UNK_IF,
+                call_id=request.call_id,
+                did_not_execute=True
+            )
+
+        if (request_class_and_handler := opnum_to_handler.get(request.opnum)) is None:
+            raise FaultError.from_status(
+                status=FaultStatus.NCA_S_OP_RNG_ERROR,
+                call_id=request.call_id,
+                did_not_execute=True
+            )
+
+        request_class, handler = request_class_and_handler
+
+        response: ClientProtocolResponseBase = await handler(request_class.from_bytes(data=request.stub_data))
+        stub_data = bytes(response)
+
+        return ResponseHeader(
+            call_id=request.call_id,
+            context_id=request.context_id,
+            alloc_hint=len(stub_data),
+            stub_data=stub_data
+        )
+
+    async def handle_connection(self, reader: StreamReader, writer: StreamWriter) -> None:
+        """
+        Serve a connection until the peer closes it.
+
+        Suitable as the client-connected callback of `asyncio.start_server`.
+
+        :param reader: The stream reader of the connection.
+        :param writer: The stream writer of the connection.
+        :return: None
+        """
+
+        self.stats.num_accepted_connections += 1
+        self.stats.num_open_connections += 1
+        try:
+            await _ServerConnection(server=self, reader=reader, writer=writer).serve()
+        finally:
+            self.stats.num_open_connections -= 1
+
+    async def start(self, host: str | None = None, port: int = 0, **start_server_kwargs) -> AsyncioServer:
+        """
+        Start serving on a TCP endpoint.
+
+        :param host: The host to listen on.
+        :param port: The port to listen on. Zero means any available port.
+        :param start_server_kwargs: Further keyword arguments to `asyncio.start_server`, e.g. `sock` or `reuse_port`.
+        :return: The asyncio server, which is serving.
+        """
+
+        return await start_server(self.handle_connection, host=host, port=port, **start_server_kwargs)
+
+    async def start_unix(self, path: str, **start_server_kwargs) -> AsyncioServer:
+        """
+        Start serving on a Unix socket, e.g. as a local stand-in for a remote server.
+
+        :param path: The path of the Unix socket.
+        :param start_server_kwargs: Further keyword arguments to `asyncio.start_unix_server`.
+        :return: The asyncio server, which is serving.
+        """
+
+        return await start_unix_server(self.handle_connection, path=path, **start_server_kwargs)
+
+
+class _ServerConnection:
+    """The state of a connection served by a `Server`."""
+
+    def __init__(self, server: Server, reader: StreamReader, writer: StreamWriter):
+        self._server = server
+        self._reader = reader
+        self._writer = writer
+
+        self._pdu_framer = PDUFramer()
+        self._context_id_to_interface: dict[int, tuple[UUID, int]] = {}
+        self._call_id_to_stub_data_reassembler: dict[int, StubDataReassembler] = {}
+        self._call_id_to_task: dict[int, Task] = {}
+        self._max_xmit_frag: int = server.max_xmit_frag
+        self._security_context: NTLMServerContext | None = None
+
+    def _write_message(self, message: MSRPCHeader) -> None:
+        """
+        Write a message -- as fragments, if it is a response message.
+
+        All fragments of a message are written at once, so that those of concurrent calls are not interleaved. On a
+        protected association, response and fault fragments are signed, and possibly sealed, as they are written, so
+        that their sequence numbers follow the order in which they are sent.
+
+        :param message: The message to write.
+        :return: None
+        """
+
+        security_context: NTLMServerContext | None = self._security_context
+        if not (
+            security_context is not None
+            and security_context.protects_messages
+            and isinstance(message, (ResponseHeader, FaultHeader))
+        ):
+            security_context = None
+
+        fragments = (
+            fragment_message(
+                message=message,
+                max_frag_length=self._max_xmit_frag - (
+                    security_context.MAX_VERIFIER_LENGTH if security_context is not None else 0
+                )
+            )
+            if isinstance(message, ResponseHeader) else (message,)
+        )
+        if security_context is not None:
+            fragments = list(fragments)
+            for fragment in fragments:
+                security_context.protect(message=fragment)
+        buffers = list(itertools_chain.from_iterable(fragment.buffers() for fragment in fragments))
+
+        self._server.stats.num_sent_bytes += sum(len(buffer) for buffer in buffers)
+        self._writer.writelines(buffers)
+
+    async def _handle_presentation_context_message(self, message: BindHeader | AlterContextHeader) -> None:
+        """
+        Answer a bind or alter-context message.
+
+        :param message: The bind or alter-context message.
+        :return: None
+        """
+
+        auth_verifier: AuthVerifier | None = None
+        if message.pdu_type is PDUType.BIND and message.auth_verifier is not None:
+            if (auth_verifier := self._start_authentication(bind_auth_verifier=message.auth_verifier)) is None:
+                self._write_message(
+                    message=BindNakHeader(
+                        call_id=message.call_id,
+                        provider_reject_reason=RejectReason.AUTHENTICATION_TYPE_NOT_RECOGNIZED
+                    )
+                )
+                await self._writer.drain()
+                return
+
+        result_list = self._server._negotiate_presentation_contexts(
+            presentation_context_list=message.presentation_context_list,
+            context_id_to_interface=self._context_id_to_interface
+        )
+
+        if message.pdu_type is PDUType.BIND:
+            self._max_xmit_frag = min(self._server.max_xmit_frag, message.max_recv_frag)
+
+            sockname = self._writer.get_extra_info('sockname')
+            self._write_message(
+                message=BindAckHeader(
+                    call_id=message.call_id,
+                    max_xmit_frag=self._max_xmit_frag,
+                    max_recv_frag=min(self._server.max_recv_frag, message.max_xmit_frag),
+                    assoc_group_id=message.assoc_group_id or next(self._server._assoc_group_id_iterator),
+                    sec_addr=PortAny(port_spec=str(sockname[1]) if isinstance(sockname, tuple) else ''),
+                    result_list=result_list,
+                    auth_verifier=auth_verifier
+                )
+            )
+        else:
+            self._write_message(
+                message=AlterContextRespHeader(
+                    call_id=message.call_id,
+                    max_xmit_frag=self._max_xmit_frag,
+                    max_recv_frag=self._server.max_recv_frag,
+                    assoc_group_id=message.assoc_group_id,
+                    sec_addr=PortAny(port_spec=''),
+                    result_list=result_list
+                )
+            )
+
+        await self._writer.drain()
+
+    def _start_authentication(self, bind_auth_verifier: AuthVerifier) -> AuthVerifier | None:
+        """
+        Start the authentication of the association with the NEGOTIATE message of a bind.
+
+        :param bind_auth_verifier: The authentication verifier of the bind message.
+        :return: The authentication verifier of the bind_ack message, carrying the CHALLENGE message, or `None` if the
+            authentication type is not supported.
+        """
+
+        if self._server.credentials is None or bind_auth_verifier.auth_type != AuthType.RPC_C_AUTHN_WINNT:
+            return None
+
+        security_context = NTLMServerContext(
+            credentials=self._server.credentials,
+            auth_level=bind_auth_verifier.auth_level,
+            auth_context_id=bind_auth_verifier.auth_context_id
+        )
+        try:
+            challenge: bytes = security_context.challenge(negotiate=bind_auth_verifier.auth_value)
+        except AuthenticationError:
+            LOG.warning('Rejecting a bind with a malformed NTLM token.', exc_info=True)
+            return None
+
+        self._security_context = security_context
+
+        return AuthVerifier(
+            auth_level=security_context.auth_level,
+            auth_context_id=security_context.auth_context_id,
+            auth_value=challenge,
+            auth_type=security_context.auth_type
+        )
+
+    def _finish_authentication(self, message: Auth3Header) -> None:
+        """
+        Complete the authentication of the association with the AUTHENTICATE message of an `rpc_auth_3` message.
+
+        The `rpc_auth_3` message is not answered. If the authentication fails, the association remains unauthenticated
+        and its calls are faulted with access denied.
+
+        :param message: The `rpc_auth_3` message.
+        :return: None
+        """
+
+        if self._security_context is None or message.auth_verifier is None:
+            LOG.warning('Ignoring an rpc_auth_3 message that does not follow an authenticated bind.')
+            return
+
+        try:
+            self._security_context.accept(authenticate=message.auth_verifier.auth_value)
+        except AuthenticationError as e:
+            LOG.warning(f'The authentication of an association failed: {e}')
+            self._security_context = None
+
+    def _handle_request_fragment(self, fragment: RequestHeader) -> None:
+        """
+        Reassemble a request and, once it is complete, start handling the call.
+
+        :param fragment: A request message or fragment.
+        :return: None
+        """
+
+        call_id: int = fragment.call_id
+
+        if (PfcFlag.PFC_FIRST_FRAG | PfcFlag.PFC_LAST_FRAG) & ~fragment.pfc_flags:
+            if PfcFlag.PFC_FIRST_FRAG in fragment.pfc_flags:
+                self._call_id_to_stub_data_reassembler[call_id] = StubDataReassembler(first_fragment=fragment)
+            elif (stub_data_reassembler := self._call_id_to_stub_data_reassembler.get(call_id)) is not None:
+                stub_data_reassembler.add(fragment=fragment)
+            else:
+                # The call has been cancelled.
+                return
+
+            if PfcFlag.PFC_LAST_FRAG not in fragment.pfc_flags:
+                return
+
+            fragment = self._call_id_to_stub_data_reassembler.pop(call_id).message()
+
+        self._server.stats.num_calls += 1
+        self._call_id_to_task[call_id] = create_task(self._handle_call(request=fragment))
+
+    async def _handle_call(self, request: RequestHeader) -> None:
+        """
+        Handle a call and write its response.
+
+        :param request: The (reassembled) request message of the call.
+        :return: None
+        """
+
+        try:
+            if self._server.credentials is not None and not (
+                self._security_context is not None and self._security_context.established
+            ):
+                raise FaultError.from_status(
+                    status=FaultStatus.ERROR_ACCESS_DENIED,
+                    call_id=request.call_id,
+                    did_not_execute=True
+                )
+
+            self._write_message(
+                message=await self._server._dispatch(
+                    request=request,
+                    interface=self._context_id_to_interface.get(request.context_id)
+                )
+            )
+            await self._writer.drain()
+        except CancelledError:
+            raise
+        except Exception as e:
+            self._server.stats.num_failed_calls += 1
+
+            if isinstance(e, FaultError):
+                status, did_not_execute = e.status, e.did_not_execute
+            else:
+                LOG.exception(f'Call {request.call_id} with opnum {request.opnum} failed.')
+                status, did_not_execute = FaultStatus.NCA_S_FAULT_UNSPEC, False
+
+            pfc_flags = PfcFlag.PFC_FIRST_FRAG | PfcFlag.PFC_LAST_FRAG
+            if did_not_execute:
+                pfc_flags |= PfcFlag.PFC_DID_NOT_EXECUTE
+
+            self._write_message(
+                message=FaultHeader(
+                    pfc_flags=pfc_flags,
+                    call_id=request.call_id,
+                    context_id=request.context_id,
+                    status=status
+                )
+            )
+            with suppress(ConnectionError):
+                await self._writer.drain()
+        finally:
+            self._call_id_to_task.pop(request.call_id, None)
+
+    def _cancel_call(self, call_id: int) -> None:
+        """
+        Stop handling a call that the client has cancelled or orphaned.
+
+        :param call_id: The call id of the call.
+        :return: None
+        """
+
+        self._call_id_to_stub_data_reassembler.pop(call_id, None)
+        if (task := self._call_id_to_task.pop(call_id, None)) is not None:
+            task.cancel()
+
+    async def serve(self) -> None:
+        """Read and handle messages until the peer closes the connection."""
+
+        try:
+            while data := await self._reader.read(self._server._read_size):
+                self._server.stats.num_received_bytes += len(data)
+                self._pdu_framer.feed(data=data)
+
+                for fragment in self._pdu_framer.fragments():
+                    with fragment:
+                        message = MSRPCHeader.from_bytes(data=fragment)
+                        if (
+                            isinstance(message, RequestHeader)
+                            and self._security_context is not None
+                            and self._security_context.protects_messages
+                        ):
+                            # The stub data is unsealed in place, in the framer's buffer.
+                            self._security_context.unprotect(message=message, fragment=fragment)
+                        if isinstance(message, RequestHeader) and len(message.stub_data) <= MAX_COPIED_STUB_DATA_LENGTH:
+                            message.materialize_stub_data()
+
+                    if isinstance(message, BindHeader):
+                        await self._handle_presentation_context_message(message=message)
+                    elif isinstance(message, Auth3Header):
+                        self._finish_authentication(message=message)
+                    elif isinstance(message, RequestHeader):
+                        self._handle_request_fragment(fragment=message)
+                    elif isinstance(message, (CoCancelHeader, OrphanedHeader)):
+                        self._cancel_call(call_id=message.call_id)
+                    else:
+                        LOG.warning(f'Ignoring a message of the unexpected type {message.pdu_type!r}.')
+        except ConnectionError:
+            pass
+        except MessageIntegrityError as e:
+            # The sequence numbers cannot be resynchronized, so the association cannot continue.
+            LOG.warning(f'Closing a connection on which a request failed verification: {e}')
+        finally:
+            for task in self._call_id_to_task.values():
+                task.cancel()
+            self._writer.close()
@@ -0,0 +1,295 @@
+from __future__ import annotations
+from dataclasses import dataclass, field, asdict, fields, replace
+from typing import Callable
+from asyncio import run as asyncio_run, sleep as asyncio_sleep
+from contextlib import suppress
+from multiprocessing import get_context
+from multiprocessing.process import BaseProcess
+from queue import Empty, Full
+from threading import Event
+from socket import socket, AF_INET, AF_INET6, SOCK_STREAM, SOL_SOCKET, SO_REUSEPORT
+from os import cpu_count, getpid
+from time import monotonic
+from logging import getLogger
+
+from rpc.server import Server, ServerStats
+
+LOG = getLogger(__name__)
+
+# The number of statistics reports per worker that the stats queue holds, after which the workers skip reporting.
+_STATS_QUEUE_SIZE_PER_WORKER = 4
+# The statistics that describe the current state of a worker's process rather than count events, and so are not carried
+# over when the process is restarted.
+_GAUGE_STATS_FIELD_NAMES = frozenset({'num_open_connections'})
+
+
+def _add_stats(stats: ServerStats, other_stats: ServerStats) -> ServerStats:
+    return ServerStats(**{
+        stats_field.name: getattr(stats, stats_field.name) + getattr(other_stats, stats_field.name)
+        for stats_field in fields(ServerStats)
+    })
+
+
+@dataclass
+class WorkerStatus:
+    pid: int | None = None
+    num_restarts: int = 0
+    last_exit_code: int | None = None
+    # The statistics of the worker, including the counts of its processes that have exited.
+    stats: ServerStats = field(default_factory=ServerStats)
+    # The counts of the worker's processes that have exited, to which the reports of the current process are added.
+    exited_processes_stats: ServerStats = field(default_factory=ServerStats)
+
+
+async def _serve_worker(
+    make_server: Callable[[], Server],
+    host: str,
+    port: int,
+    worker_id: int,
+    stats_queue,
+    stats_interval: float
+) -> None:
+    """
+    Serve on a shared port, periodically reporting the server's statistics.
+
+    A report is skipped if the stats queue is full, e.g. as the supervisor is not collecting the reports; since each
+    report holds the totals of the server, the next one that gets through makes up for it.
+
+    :param make_server: A callable that creates the server.
+    :param host: The host to listen on.
+    :param port: The port to listen on, shared with the other workers.
+    :param worker_id: The id of the worker, with which its statistics are reported.
+    :param stats_queue: The queue in which to put the statistics reports.
+    :param stats_interval: The number of seconds between the reports.
+    :return: None
+    """
+
+    server: Server = make_server()
+    asyncio_server = await server.start(host=host, port=port, reuse_port=True)
+
+    async with asyncio_server:
+        while True:
+            with suppress(Full):
+                stats_queue.put_nowait((worker_id, getpid(), asdict(server.stats)))
+            await asyncio_sleep(stats_interval)
+
+
+def _run_worker(
+    make_server: Callable[[], Server],
+    host: str,
+    port: int,
+    worker_id: int,
+    stats_queue,
+    stats_interval: float
+) -> None:
+    """The entry point of a worker process; see `_serve_worker`."""
+
+    try:
+        asyncio_run(
+            _serve_worker(
+                make_server=make_server,
+                host=host,
+                port=port,
+                worker_id=worker_id,
+                stats_queue=stats_queue,
+                stats_interval=stats_interval
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+class ServerSupervisor:
+    """
+    Run a server in several worker processes that share a listening port, restarting workers that exit.
+
+    Each worker process has its own event loop and `Server`, and listens on the same port with `SO_REUSEPORT`, so that
+    the kernel spreads incoming connections over the workers and the marshalling of calls is spread over the cores.
+    """
+
+    def __init__(
+        self,
+        make_server: Callable[[], Server],
+        host: str = '127.0.0.1',
+        port: int = 0,
+        num_workers: int | None = None,
+        stats_interval: float = 1.0,
+        restart_delay: float = 1.0
+    ):
+        """
+        :param make_server: A callable that creates the `Server` of a worker, with its handlers registered. It is
+            called in the worker process, and must be picklable if processes are spawned rather than forked.
+        :param host: The host to listen on.
+        :param port: The port to listen on. Zero means a port chosen by the supervisor, available as `port`.
+        :param num_workers: The number of worker processes. `None` means the number of CPUs.
+        :param stats_interval: The number of seconds between the reports of a worker's statistics.
+        :param restart_delay: The minimum number of seconds between restarts of the same worker.
+        """
+
+        self._make_server = make_server
+        self.host = host
+        self.port = port
+        self.num_workers = num_workers or cpu_count() or 1
+        self._stats_interval = stats_interval
+        self._restart_delay = restart_delay
+
+        self._multiprocessing_context = get_context()
+        self._stats_queue = self._multiprocessing_context.Queue(
+            maxsize=self.num_workers * _STATS_QUEUE_SIZE_PER_WORKER
+        )
+        self._worker_id_to_process: dict[int, BaseProcess] = {}
+        self._worker_id_to_start_time: dict[int, float] = {}
+        self.worker_id_to_status: dict[int, WorkerStatus] = {
+            worker_id: WorkerStatus() for worker_id in range(self.num_workers)
+        }
+
+        self._port_reservation_socket: socket | None = None
+        self._stopping = Event()
+
+    def _reserve_port(self) -> None:
+        """Choose a port that the workers can share, keeping it bound -- but not listening -- while they run."""
+
+        self._port_reservation_socket = socket(AF_INET6 if ':' in self.host else AF_INET, SOCK_STREAM)
+        self._port_reservation_socket.setsockopt(SOL_SOCKET, SO_REUSEPORT, 1)
+        self._port_reservation_socket.bind((self.host, 0))
+        self.port = self._port_reservation_socket.getsockname()[1]
+
+    def _start_worker(self, worker_id: int) -> None:
+        """
+        Start the process of a worker.
+
+        :param worker_id: The id of the worker.
+        :return: None
+        """
+
+        process = self._multiprocessing_context.Process(
+            target=_run_worker,
+            kwargs=dict(
+                make_server=self._make_server,
+                host=self.host,
+                port=self.port,
+                worker_id=worker_id,
+                stats_queue=self._stats_queue,
+                stats_interval=self._stats_interval
+            ),
+            daemon=True
+        )
+        process.start()
+
+        self._worker_id_to_process[worker_id] = process
+        self._worker_id_to_start_time[worker_id] = monotonic()
+        self.worker_id_to_status[worker_id].pid = process.pid
+
+    def _collect_stats(self) -> None:
+        """Record the statistics that the workers have reported since the last collection."""
+
+        while True:
+            try:
+                worker_id, pid, stats_dict = self._stats_queue.get_nowait()
+            except Empty:
+                break
+
+            worker_status = self.worker_id_to_status[worker_id]
+            if pid != worker_status.pid:
+                # A late report of a process of the worker that has since been restarted, whose counts are carried over.
+                continue
+
+            worker_status.stats = _add_stats(
+                stats=worker_status.exited_processes_stats,
+                other_stats=ServerStats(**stats_dict)
+            )
+
+    def _restart_exited_workers(self) -> None:
+        """Start the workers that have exited anew, once their restart delay has passed."""
+
+        for worker_id, process in self._worker_id_to_process.items():
+            if process.is_alive():
+                continue
+            if monotonic() - self._worker_id_to_start_time[worker_id] < self._restart_delay:
+                continue
+
+            worker_status = self.worker_id_to_status[worker_id]
+            worker_status.last_exit_code = process.exitcode
+            worker_status.num_restarts += 1
+            # Carry the counts of the exited process over to the new one. The counts since its last report are lost.
+            worker_status.exited_processes_stats = replace(
+                worker_status.stats,
+                **{stats_field_name: 0 for stats_field_name in _GAUGE_STATS_FIELD_NAMES}
+            )
+            worker_status.stats = worker_status.exited_processes_stats
+            LOG.warning(f'Worker {worker_id} (pid {process.pid}) exited with code {process.exitcode}; restarting it.')
+
+            self._start_worker(worker_id=worker_id)
+
+    def aggregate_stats(self) -> ServerStats:
+        """
+        Sum the statistics of all workers, including those of their processes that have exited.
+
+        :return: The statistics of the workers combined.
+        """
+
+        return ServerStats(**{
+            stats_field.name: sum(
+                getattr(worker_status.stats, stats_field.name)
+                for worker_status in self.worker_id_to_status.values()
+            )
+            for stats_field in fields(ServerStats)
+        })
+
+    def start(self) -> None:
+        """Start the worker processes."""
+
+        if self.port == 0:
+            self._reserve_port()
+
+        for worker_id in range(self.num_workers):
+            self._start_worker(worker_id=worker_id)
+
+    def supervise(self, poll_interval: float = 0.5) -> None:
+        """
+        Collect statistics and restart exited workers until `stop` is called.
+
+        :param poll_interval: The number of seconds between checks of the workers.
+        :return: None
+        """
+
+        while not self._stopping.wait(timeout=poll_interval):
+            self._collect_stats()
+            self._restart_exited_workers()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop supervising and terminate the worker processes.
+
+        :param timeout: The number of seconds to wait for each worker process to exit.
+        :return: None
+        """
+
+        self._stopping.set()
+
+        for process in self._worker_id_to_process.values():
+            process.terminate()
+        for process in self._worker_id_to_process.values():
+            process.join(timeout=timeout)
+
+        self._collect_stats()
+
+        if self._port_reservation_socket is not None:
+            self._port_reservation_socket.close()
+            self._port_reservation_socket = None
+
+    def run(self, poll_interval: float = 0.5) -> None:
+        """
+        Start the worker processes and supervise them until interrupted, or until `stop` is called.
+
+        :param poll_interval: The number of seconds between checks of the workers.
+        :return: None
+        """
+
+        self.start()
+        try:
+            self.supervise(poll_interval=poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
@@ -0,0 +1,11 @@
+from enum import IntEnum
+
+
+class AuthType(IntEnum):
+    RPC_C_AUTHN_NONE = 0x00
+    RPC_C_AUTHN_GSS_NEGOTIATE = 0x09
+    RPC_C_AUTHN_WINNT = 0x0A
+    RPC_C_AUTHN_GSS_SCHANNEL = 0x0E
+    RPC_C_AUTHN_GSS_KERBEROS = 0x10
+    RPC_C_AUTHN_NETLOGON = 0x44
+    RPC_C_AUTHN_DEFAULT = 0xFF
@@ -1,22 +1,105 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import ClassVar
+from struct import Struct
+
+from rpc.structures.auth_type import AuthType
+from rpc.structures.auth_level import AuthLevel
 
 
 @dataclass
 class AuthVerifier:
-    _auth_reserved: ClassVar[bytes] = bytes(1)
+    """
+    The authentication verifier at the end of a PDU: the auth padding, the security trailer (`sec_trailer`), and the
+    authentication value, e.g. a token of the authentication exchange or the signature of the PDU.
+
+    The `auth_length` field of the PDU header counts only the authentication value, whereas the `frag_length` field
+    counts the entire verifier.
+    """
+
+    # The security trailer: `auth_type`, `auth_level`, `auth_pad_length`, `auth_reserved`, and `auth_context_id`.
+    _SEC_TRAILER_STRUCT: ClassVar[Struct] = Struct('<BBBxI')
+    sec_trailer_size: ClassVar[int] = _SEC_TRAILER_STRUCT.size
+    # The boundary to which the stub data is padded when the PDU is signed or sealed.
+    AUTH_PAD_ALIGNMENT: ClassVar[int] = 16
 
-    auth_level: int
+    auth_level: AuthLevel | int
     auth_context_id: int
     auth_value: bytes
+    auth_type: AuthType | int = AuthType.RPC_C_AUTHN_WINNT
+    # The padding between the stub data and the security trailer. Sealed along with the stub data, when it is sealed.
+    auth_padding: bytes | memoryview = b''
+
+    @property
+    def auth_pad_length(self) -> int:
+        return len(self.auth_padding)
+
+    @property
+    def auth_length(self) -> int:
+        return len(self.auth_value)
+
+    def sec_trailer(self) -> bytes:
+        return self._SEC_TRAILER_STRUCT.pack(
+            self.auth_type,
+            self.auth_level,
+            self.auth_pad_length,
+            self.auth_context_id
+        )
 
     @classmethod
-    def from_bytes(cls, data: bytes) -> AuthVerifier:
-        raise NotImplementedError
+    def from_bytes(cls, data: bytes | memoryview, auth_padding: bytes | memoryview = b'') -> AuthVerifier:
+        """
+        Decode a security trailer and the authentication value that follows it.
+
+        :param data: The bytes from the security trailer to the end of the PDU.
+        :param auth_padding: The auth padding preceding the security trailer.
+        :return: The authentication verifier.
+        """
+
+        auth_type, auth_level, _, auth_context_id = cls._SEC_TRAILER_STRUCT.unpack_from(data)
+
+        try:
+            auth_type = AuthType(auth_type)
+        except ValueError:
+            pass
+
+        try:
+            auth_level = AuthLevel(auth_level)
+        except ValueError:
+            pass
+
+        return cls(
+            auth_level=auth_level,
+            auth_context_id=auth_context_id,
+            auth_value=bytes(data[cls.sec_trailer_size:]),
+            auth_type=auth_type,
+            auth_padding=bytes(auth_padding)
+        )
+
+    @classmethod
+    def from_pdu_bytes(cls, data: bytes | memoryview, frag_length: int, auth_length: int) -> AuthVerifier | None:
+        """
+        Decode the authentication verifier at the end of a PDU.
+
+        :param data: The bytes of the PDU.
+        :param frag_length: The `frag_length` of the PDU.
+        :param auth_length: The `auth_length` of the PDU.
+        :return: The authentication verifier, or `None` if the PDU has none.
+        """
+
+        if auth_length == 0:
+            return None
+
+        sec_trailer_offset = frag_length - auth_length - cls.sec_trailer_size
+        auth_pad_length: int = data[sec_trailer_offset + 2]
+
+        return cls.from_bytes(
+            data=data[sec_trailer_offset:frag_length],
+            auth_padding=data[sec_trailer_offset - auth_pad_length:sec_trailer_offset]
+        )
 
     def __bytes__(self) -> bytes:
-        raise NotImplementedError
+        return b''.join([self.auth_padding, self.sec_trailer(), self.auth_value])
 
     def __len__(self) -> int:
-        raise NotImplementedError
+        return self.auth_pad_length + self.sec_trailer_size + len(self.auth_value)
@@ -8,6 +8,9 @@ from rpc.structures.presentation_syntax import PresentationSyntax
 
 
 NDR_PRESENTATION_SYNTAX = PresentationSyntax(if_uuid=UUID('8a885d04-1ceb-11c9-9fe8-08002b104860'), if_version=2)
+NDR64_PRESENTATION_SYNTAX = PresentationSyntax(if_uuid=UUID('71710533-beba-4937-8319-b5dbef9ccc36'), if_version=1)
+# The transfer syntaxes to propose for a context in which NDR64 is preferred, should the server accept it.
+NDR64_AND_NDR_TRANSFER_SYNTAXES: tuple[PresentationSyntax, ...] = (NDR64_PRESENTATION_SYNTAX, NDR_PRESENTATION_SYNTAX)
 
 
 @dataclass
@@ -0,0 +1,28 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import ClassVar
+from struct import Struct
+from uuid import UUID
+
+
+@dataclass
+class ContextHandle:
+    structure: ClassVar[Struct] = Struct('<I16s')
+    structure_size: ClassVar[int] = structure.size
+
+    context_handle_attributes: int
+    context_handle_uuid: UUID
+
+    def __bytes__(self) -> bytes:
+        return self.structure.pack(self.context_handle_attributes, self.context_handle_uuid.bytes_le)
+
+    def __len__(self) -> int:
+        return self.structure_size
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> ContextHandle:
+        context_handle_attributes, context_handle_uuid_bytes = cls.structure.unpack_from(data)
+        return cls(
+            context_handle_attributes=context_handle_attributes,
+            context_handle_uuid=UUID(bytes_le=context_handle_uuid_bytes)
+        )
@@ -1,9 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import ClassVar
 from struct import unpack as struct_unpack, pack as struct_pack
 from enum import IntEnum
 
 from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.exceptions import MalformedPDUError
 
 
 class ContDefResult(IntEnum):
@@ -21,29 +23,38 @@ class ProviderReason(IntEnum):
 
 @dataclass
 class ContextNegotiationResult:
+    """
+    The result of the negotiation of a presentation context (`p_result_t`).
+
+    The transfer syntax is always present on the wire; it is zero-filled in a rejection, which is how a transfer syntax
+    of `None` is encoded.
+    """
+
+    structure_size: ClassVar[int] = 4 + PresentationSyntax.struture_size
+
     result: ContDefResult
     reason: ProviderReason
     transfer_syntax: PresentationSyntax | None
 
     def __len__(self) -> int:
-        return 4 + (self.transfer_syntax.struture_size if self.transfer_syntax is not None else 0)
+        return self.structure_size
 
     def __bytes__(self) -> bytes:
         return b''.join([
             struct_pack('<H', self.result.value),
             struct_pack('<H', self.reason.value),
-            bytes(self.transfer_syntax) if self.transfer_syntax is not None else b''
+            bytes(self.transfer_syntax) if self.transfer_syntax is not None else bytes(PresentationSyntax.struture_size)
         ])
 
     @classmethod
     def from_bytes(cls, data: bytes) -> ContextNegotiationResult:
-        result = ContDefResult(struct_unpack('<H', data[:2])[0])
+        if len(data) < cls.structure_size:
+            raise MalformedPDUError(
+                f'A context negotiation result is {cls.structure_size} bytes, but only {len(data)} bytes remain.'
+            )
 
         return cls(
-            result=result,
+            result=ContDefResult(struct_unpack('<H', data[:2])[0]),
             reason=ProviderReason(struct_unpack('<H', data[2:4])[0]),
-            transfer_syntax=(
-                PresentationSyntax.from_bytes(data=data[4:24]) if result is ContDefResult.ACCEPTANCE
-                else None
-            )
+            transfer_syntax=PresentationSyntax.from_bytes(data=data[4:cls.structure_size])
         )
@@ -4,6 +4,8 @@ from enum import IntEnum
 from typing import ClassVar
 from struct import pack as struct_pack
 
+from rpc.exceptions import MalformedPDUError
+
 
 class CharacterRepresentation(IntEnum):
     ASCII = 0
@@ -25,6 +27,7 @@ class FloatingPointRepresentation(IntEnum):
 @dataclass
 class DataRepresentationFormat:
     _reserved: ClassVar[bytes] = bytes(2)
+    _octets_to_instance: ClassVar[dict[tuple[int, int], DataRepresentationFormat]] = {}
 
     character_representation: CharacterRepresentation
     integer_representation: IntegerRepresentation
@@ -34,8 +37,7 @@ class DataRepresentationFormat:
     def from_bytes(cls, data: bytes) -> DataRepresentationFormat:
 
         if data[2:4] != cls._reserved:
-            # TODO: Use proper exception.
-            raise ValueError
+            raise MalformedPDUError(f'The reserved octets of the data representation format are {bytes(data[2:4])!r}.')
 
         return cls(
             character_representation=CharacterRepresentation(data[0] & 0b1111),
@@ -43,9 +45,35 @@ class DataRepresentationFormat:
             floating_point_representation=FloatingPointRepresentation(data[1])
         )
 
+    @classmethod
+    def from_octets(cls, first_octet: int, second_octet: int) -> DataRepresentationFormat:
+        """
+        Obtain the data representation format described by the first two octets of its serialization.
+
+        The instances are cached, so the same instance is returned for the same octets.
+
+        :param first_octet: The octet describing the character and integer representations.
+        :param second_octet: The octet describing the floating-point representation.
+        :return: The data representation format.
+        """
+
+        if (instance := cls._octets_to_instance.get((first_octet, second_octet))) is None:
+            instance = cls._octets_to_instance[(first_octet, second_octet)] = cls.from_bytes(
+                data=bytes((first_octet, second_octet)) + cls._reserved
+            )
+        return instance
+
+    @property
+    def first_octet(self) -> int:
+        return (self.integer_representation << 4) | self.character_representation
+
+    @property
+    def second_octet(self) -> int:
+        return int(self.floating_point_representation)
+
     def __bytes__(self) -> bytes:
         return b''.join([
-            struct_pack('<B', (self.integer_representation.value << 4) | self.character_representation.value),
-            struct_pack('<B', self.floating_point_representation.value),
+            struct_pack('<B', self.first_octet),
+            struct_pack('<B', self.second_octet),
             self._reserved
         ])
@@ -0,0 +1,55 @@
+from enum import IntEnum
+
+
+class FaultStatus(IntEnum):
+    NCA_S_FAULT_INT_DIV_BY_ZERO = 0x1C000001
+    NCA_S_FAULT_ADDR_ERROR = 0x1C000002
+    NCA_S_FAULT_FP_DIV_ZERO = 0x1C000003
+    NCA_S_FAULT_FP_UNDERFLOW = 0x1C000004
+    NCA_S_FAULT_FP_OVERFLOW = 0x1C000005
+    NCA_S_FAULT_INVALID_TAG = 0x1C000006
+    NCA_S_FAULT_INVALID_BOUND = 0x1C000007
+    NCA_S_RPC_VERSION_MISMATCH = 0x1C000008
+    NCA_S_UNSPEC_REJECT = 0x1C000009
+    NCA_S_BAD_ACTID = 0x1C00000A
+    NCA_S_WHO_ARE_YOU_FAILED = 0x1C00000B
+    NCA_S_MANAGER_NOT_ENTERED = 0x1C00000C
+    NCA_S_FAULT_CANCEL = 0x1C00000D
+    NCA_S_FAULT_ILL_INST = 0x1C00000E
+    NCA_S_FAULT_FP_ERROR = 0x1C00000F
+    NCA_S_FAULT_INT_OVERFLOW = 0x1C000010
+    NCA_S_FAULT_UNSPEC = 0x1C000012
+    NCA_S_FAULT_REMOTE_COMM_FAILURE = 0x1C000013
+    NCA_S_FAULT_PIPE_EMPTY = 0x1C000014
+    NCA_S_FAULT_PIPE_CLOSED = 0x1C000015
+    NCA_S_FAULT_PIPE_ORDER = 0x1C000016
+    NCA_S_FAULT_PIPE_DISCIPLINE = 0x1C000017
+    NCA_S_FAULT_PIPE_COMM_ERROR = 0x1C000018
+    NCA_S_FAULT_PIPE_MEMORY = 0x1C000019
+    NCA_S_FAULT_CONTEXT_MISMATCH = 0x1C00001A
+    NCA_S_FAULT_REMOTE_NO_MEMORY = 0x1C00001B
+    NCA_S_INVALID_PRES_CONTEXT_ID = 0x1C00001C
+    NCA_S_UNSUPPORTED_AUTHN_LEVEL = 0x1C00001D
+    NCA_S_INVALID_CHECKSUM = 0x1C00001F
+    NCA_S_INVALID_CRC = 0x1C000020
+    NCA_S_FAULT_USER_DEFINED = 0x1C000021
+    NCA_S_FAULT_TX_OPEN_FAILED = 0x1C000022
+    NCA_S_FAULT_CODESET_CONV_ERROR = 0x1C000023
+    NCA_S_FAULT_OBJECT_NOT_FOUND = 0x1C000024
+    NCA_S_FAULT_NO_CLIENT_STUB = 0x1C000025
+    NCA_S_COMM_FAILURE = 0x1C010001
+    NCA_S_OP_RNG_ERROR = 0x1C010002
+    NCA_S_UNK_IF = 0x1C010003
+    NCA_S_WRONG_BOOT_TIME = 0x1C010006
+    NCA_S_YOU_CRASHED = 0x1C010009
+    NCA_S_PROTO_ERROR = 0x1C01000B
+    NCA_S_OUT_ARGS_TOO_BIG = 0x1C010013
+    NCA_S_SERVER_TOO_BUSY = 0x1C010014
+    NCA_S_FAULT_STRING_TOO_LONG = 0x1C010015
+    NCA_S_UNSUPPORTED_TYPE = 0x1C010017
+    # Windows servers commonly fault with Win32 error codes rather than NCA status codes.
+    ERROR_ACCESS_DENIED = 0x00000005
+    RPC_S_PROCNUM_OUT_OF_RANGE = 0x000006D1
+    RPC_S_UNKNOWN_IF = 0x000006A5
+    RPC_S_CALL_CANCELLED = 0x0000071A
+    RPC_X_BAD_STUB_DATA = 0x000006F7
@@ -18,6 +18,7 @@ class PDUType(IntEnum):
     BIND_NAK = 13
     ALTER_CONTEXT = 14
     ALTER_CONTEXT_RESP = 15
+    AUTH3 = 16
     SHUTDOWN = 17
     CO_CANCEL = 18
     ORPHANED = 19
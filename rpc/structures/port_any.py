@@ -20,4 +20,4 @@ class PortAny:
     @classmethod
     def from_bytes(cls, data: bytes) -> PortAny:
         length: int = struct_unpack('<H', data[:2])[0]
-        return cls(port_spec=data[2:2+length-1].decode(encoding='ascii'))
+        return cls(port_spec=bytes(data[2:2+length-1]).decode(encoding='ascii'))
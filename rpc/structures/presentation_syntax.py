@@ -21,6 +21,10 @@ class PresentationSyntax:
     @classmethod
     def from_bytes(cls, data: bytes) -> PresentationSyntax:
         return cls(
-            if_uuid=UUID(bytes_le=data[:16]),
+            if_uuid=UUID(bytes_le=bytes(data[:16])),
             if_version=struct_unpack('<I', data[16:20])[0]
         )
+
+
+# The zero-filled presentation syntax that a rejected presentation context carries as its transfer syntax.
+NULL_PRESENTATION_SYNTAX = PresentationSyntax(if_uuid=UUID(int=0), if_version=0)
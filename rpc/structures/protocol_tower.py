@@ -0,0 +1,164 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import ClassVar
+from enum import IntEnum
+from struct import Struct
+from uuid import UUID
+from ipaddress import IPv4Address
+
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.structures.port_any import PortAny
+from rpc.exceptions import MalformedPDUError
+
+
+class ProtocolIdentifier(IntEnum):
+    CONNECTION_ORIENTED = 0x0B
+    UUID = 0x0D
+    TCP = 0x07
+    UDP = 0x08
+    IP = 0x09
+    NAMED_PIPE = 0x0F
+    NETBIOS = 0x11
+    HTTP = 0x1F
+
+
+@dataclass
+class TowerFloor:
+    _LENGTH_STRUCT: ClassVar[Struct] = Struct('<H')
+
+    # The left-hand side -- a protocol identifier followed by protocol-specific data -- and the right-hand side, the
+    # protocol's address data.
+    lhs: bytes
+    rhs: bytes
+
+    @property
+    def protocol_identifier(self) -> int:
+        return self.lhs[0]
+
+    def __len__(self) -> int:
+        return 2 * self._LENGTH_STRUCT.size + len(self.lhs) + len(self.rhs)
+
+    def __bytes__(self) -> bytes:
+        return b''.join([
+            self._LENGTH_STRUCT.pack(len(self.lhs)),
+            self.lhs,
+            self._LENGTH_STRUCT.pack(len(self.rhs)),
+            self.rhs
+        ])
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> TowerFloor:
+        lhs_length: int = cls._LENGTH_STRUCT.unpack_from(data)[0]
+        lhs_end = cls._LENGTH_STRUCT.size + lhs_length
+        rhs_length: int = cls._LENGTH_STRUCT.unpack_from(data, lhs_end)[0]
+        rhs_start = lhs_end + cls._LENGTH_STRUCT.size
+
+        return cls(lhs=bytes(data[cls._LENGTH_STRUCT.size:lhs_end]), rhs=bytes(data[rhs_start:rhs_start+rhs_length]))
+
+    @classmethod
+    def from_syntax(cls, syntax: PresentationSyntax) -> TowerFloor:
+        """
+        Make the floor identifying an interface or a transfer syntax.
+
+        :param syntax: The abstract or transfer syntax.
+        :return: The floor, with the major version on the left-hand side and the minor version on the right.
+        """
+
+        major_version, minor_version = syntax.if_version & 0xFFFF, syntax.if_version >> 16
+
+        return cls(
+            lhs=bytes([ProtocolIdentifier.UUID]) + syntax.if_uuid.bytes_le + major_version.to_bytes(2, 'little'),
+            rhs=minor_version.to_bytes(2, 'little')
+        )
+
+    def syntax(self) -> PresentationSyntax:
+        """
+        Obtain the interface or transfer syntax that the floor identifies.
+
+        :return: The syntax.
+        """
+
+        if self.protocol_identifier != ProtocolIdentifier.UUID:
+            raise MalformedPDUError(
+                f'The floor has the protocol identifier {self.protocol_identifier!r}, not that of a UUID.'
+            )
+
+        return PresentationSyntax(
+            if_uuid=UUID(bytes_le=self.lhs[1:17]),
+            if_version=int.from_bytes(self.lhs[17:19], 'little') | int.from_bytes(self.rhs[:2], 'little') << 16
+        )
+
+
+@dataclass
+class ProtocolTower:
+    """
+    The protocol tower describing an endpoint to the endpoint mapper: the interface, the transfer syntax, the RPC
+    protocol and the transport protocols, each in a floor.
+    """
+
+    _FLOOR_COUNT_STRUCT: ClassVar[Struct] = Struct('<H')
+
+    floors: list[TowerFloor] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return self._FLOOR_COUNT_STRUCT.size + sum(len(floor) for floor in self.floors)
+
+    def __bytes__(self) -> bytes:
+        return self._FLOOR_COUNT_STRUCT.pack(len(self.floors)) + b''.join(bytes(floor) for floor in self.floors)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> ProtocolTower:
+        floor_count: int = cls._FLOOR_COUNT_STRUCT.unpack_from(data)[0]
+
+        floors: list[TowerFloor] = []
+        offset = cls._FLOOR_COUNT_STRUCT.size
+        for _ in range(floor_count):
+            floor = TowerFloor.from_bytes(data=data[offset:])
+            floors.append(floor)
+            offset += len(floor)
+
+        return cls(floors=floors)
+
+    @classmethod
+    def for_tcp(
+        cls,
+        abstract_syntax: PresentationSyntax,
+        transfer_syntax: PresentationSyntax,
+        port: int = 0,
+        ip_address: str = '0.0.0.0'
+    ) -> ProtocolTower:
+        """
+        Make the tower of an ncacn_ip_tcp endpoint.
+
+        :param abstract_syntax: The abstract syntax of the interface.
+        :param transfer_syntax: The transfer syntax.
+        :param port: The TCP port. Zero when asking the endpoint mapper for the port.
+        :param ip_address: The IPv4 address.
+        :return: The tower.
+        """
+
+        return cls(
+            floors=[
+                TowerFloor.from_syntax(syntax=abstract_syntax),
+                TowerFloor.from_syntax(syntax=transfer_syntax),
+                TowerFloor(lhs=bytes([ProtocolIdentifier.CONNECTION_ORIENTED]), rhs=bytes(2)),
+                TowerFloor(lhs=bytes([ProtocolIdentifier.TCP]), rhs=port.to_bytes(2, 'big')),
+                TowerFloor(lhs=bytes([ProtocolIdentifier.IP]), rhs=IPv4Address(ip_address).packed)
+            ]
+        )
+
+    @property
+    def abstract_syntax(self) -> PresentationSyntax | None:
+        return self.floors[0].syntax() if self.floors else None
+
+    @property
+    def endpoint(self) -> PortAny | None:
+        """The port spec of the tower's endpoint: the port of a TCP endpoint, or the name of a named pipe."""
+
+        for floor in self.floors[3:]:
+            if floor.protocol_identifier in {ProtocolIdentifier.TCP, ProtocolIdentifier.UDP}:
+                return PortAny(port_spec=str(int.from_bytes(floor.rhs[:2], 'big')))
+            if floor.protocol_identifier == ProtocolIdentifier.NAMED_PIPE:
+                return PortAny(port_spec=floor.rhs.rstrip(b'\x00').decode(encoding='ascii'))
+
+        return None
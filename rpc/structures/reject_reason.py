@@ -0,0 +1,14 @@
+from enum import IntEnum
+
+
+class RejectReason(IntEnum):
+    REASON_NOT_SPECIFIED = 0
+    TEMPORARY_CONGESTION = 1
+    LOCAL_LIMIT_EXCEEDED = 2
+    CALLED_PADDR_UNKNOWN = 3
+    PROTOCOL_VERSION_NOT_SUPPORTED = 4
+    DEFAULT_CONTEXT_NOT_SUPPORTED = 5
+    USER_DATA_NOT_READABLE = 6
+    NO_PSAP_AVAILABLE = 7
+    AUTHENTICATION_TYPE_NOT_RECOGNIZED = 8
+    INVALID_CHECKSUM = 9
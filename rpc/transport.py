@@ -0,0 +1,319 @@
+from __future__ import annotations
+from typing import AsyncIterator, Sequence
+from asyncio import BufferedProtocol, Transport, Future, get_running_loop, set_event_loop_policy
+from contextlib import asynccontextmanager
+from functools import partial
+from socket import IPPROTO_TCP, TCP_NODELAY, SOL_SOCKET, SO_SNDBUF, SO_RCVBUF
+
+from rpc.connection import Connection
+from rpc.pdu_framer import PDUFramer
+from rpc.exceptions import ConnectionClosedError
+
+
+class RPCTransportProtocol(BufferedProtocol):
+    """
+    An asyncio protocol that receives bytes directly into the receive buffer of a `PDUFramer`.
+
+    Bytes are received with `recv_into` into the free part of the framer's buffer, so that they are not copied before
+    being framed and decoded. The protocol provides the reader and writers of a `Connection`.
+    """
+
+    def __init__(self, read_size: int = 65536, max_unread_bytes: int = 1048576):
+        """
+        :param read_size: The number of bytes of receive buffer to make room for once the buffer is full.
+        :param max_unread_bytes: The number of received bytes not yet handed to the reader after which the transport
+            stops reading.
+        """
+
+        self.pdu_framer = PDUFramer(initial_buffer_size=max(read_size, 65536))
+        self._read_size = read_size
+        self._max_unread_bytes = max_unread_bytes
+
+        self._transport: Transport | None = None
+        self._num_unread_bytes = 0
+        self._reading_paused = False
+        self._eof = False
+        self._connection_lost_exception: BaseException | None = None
+        self._read_waiter: Future | None = None
+        self._drain_waiter: Future | None = None
+        self._writing_paused = False
+
+    def connection_made(self, transport: Transport) -> None:
+        self._transport = transport
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        # The hint is ignored, as some event loops always ask for a large buffer; the framer offers the free part of its
+        # buffer as is, and makes room for `read_size` bytes only once none remains.
+        return self.pdu_framer.get_buffer(size_hint=self._read_size)
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self.pdu_framer.buffer_updated(num_bytes=nbytes)
+        self._num_unread_bytes += nbytes
+
+        if self._num_unread_bytes >= self._max_unread_bytes and not self._reading_paused:
+            self._reading_paused = True
+            self._transport.pause_reading()
+
+        self._wake_up_reader()
+
+    def eof_received(self) -> bool:
+        self._eof = True
+        self._wake_up_reader()
+        return False
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._eof = True
+        self._connection_lost_exception = exc
+        self._wake_up_reader()
+
+        if self._drain_waiter is not None and not self._drain_waiter.done():
+            self._drain_waiter.set_exception(exc or ConnectionResetError())
+
+    def pause_writing(self) -> None:
+        self._writing_paused = True
+
+    def resume_writing(self) -> None:
+        self._writing_paused = False
+        if self._drain_waiter is not None and not self._drain_waiter.done():
+            self._drain_waiter.set_result(None)
+
+    def _wake_up_reader(self) -> None:
+        if self._read_waiter is not None and not self._read_waiter.done():
+            self._read_waiter.set_result(None)
+
+    async def read(self) -> int:
+        """
+        Wait for bytes to be received into the framer.
+
+        :return: The number of bytes received since the last call, or zero at the end of the stream.
+        """
+
+        while self._num_unread_bytes == 0 and not self._eof:
+            self._read_waiter = get_running_loop().create_future()
+            try:
+                await self._read_waiter
+            finally:
+                self._read_waiter = None
+
+        if self._num_unread_bytes == 0 and self._connection_lost_exception is not None:
+            raise self._connection_lost_exception
+
+        num_bytes, self._num_unread_bytes = self._num_unread_bytes, 0
+
+        if self._reading_paused and not self._eof:
+            self._reading_paused = False
+            self._transport.resume_reading()
+
+        return num_bytes
+
+    async def _drain(self) -> None:
+        """Wait until the transport's write buffer has drained below its high-water mark."""
+
+        if self._transport.is_closing():
+            raise ConnectionClosedError('The transport is closing.')
+
+        while self._writing_paused:
+            self._drain_waiter = get_running_loop().create_future()
+            try:
+                await self._drain_waiter
+            finally:
+                self._drain_waiter = None
+
+    async def write(self, data: bytes) -> int:
+        """
+        Write bytes to the transport.
+
+        :param data: The bytes to write.
+        :return: The number of bytes written.
+        """
+
+        self._transport.write(data)
+        await self._drain()
+        return len(data)
+
+    async def write_vectored(self, buffers: Sequence[bytes | memoryview]) -> None:
+        """
+        Write a sequence of buffers to the transport, which may send them with one scatter/gather system call.
+
+        :param buffers: The buffers to write, in order.
+        :return: None
+        """
+
+        self._transport.writelines(buffers)
+        await self._drain()
+
+    def make_connection(self, **connection_kwargs) -> Connection:
+        """
+        Create an RPC connection that reads and writes with the protocol.
+
+        :param connection_kwargs: Further keyword arguments to `Connection`.
+        :return: The RPC connection, not yet entered.
+        """
+
+        return Connection(
+            reader=self.read,
+            writer=self.write,
+            vectored_writer=self.write_vectored,
+            pdu_framer=self.pdu_framer,
+            **connection_kwargs
+        )
+
+
+def _set_socket_options(
+    transport: Transport,
+    no_delay: bool | None,
+    send_buffer_size: int | None,
+    receive_buffer_size: int | None
+) -> None:
+    """
+    Set the options of a transport's socket.
+
+    :param transport: The transport whose socket to configure.
+    :param no_delay: Whether to disable Nagle's algorithm. `None` means to leave the option as it is.
+    :param send_buffer_size: The size of the socket's send buffer. `None` means the system default.
+    :param receive_buffer_size: The size of the socket's receive buffer. `None` means the system default.
+    :return: None
+    """
+
+    if (sock := transport.get_extra_info('socket')) is None:
+        return
+
+    if no_delay is not None:
+        sock.setsockopt(IPPROTO_TCP, TCP_NODELAY, int(no_delay))
+    if send_buffer_size is not None:
+        sock.setsockopt(SOL_SOCKET, SO_SNDBUF, send_buffer_size)
+    if receive_buffer_size is not None:
+        sock.setsockopt(SOL_SOCKET, SO_RCVBUF, receive_buffer_size)
+
+
+@asynccontextmanager
+async def _entered_connection(
+    transport: Transport,
+    protocol: RPCTransportProtocol,
+    connection_kwargs: dict
+) -> AsyncIterator[Connection]:
+    """
+    Enter an RPC connection over a connected transport, and close the transport on exit.
+
+    :param transport: The connected transport.
+    :param protocol: The protocol of the transport.
+    :param connection_kwargs: Further keyword arguments to `Connection`.
+    :return: An asynchronous context manager yielding the entered RPC connection.
+    """
+
+    try:
+        async with protocol.make_connection(**connection_kwargs) as connection:
+            yield connection
+    finally:
+        transport.close()
+
+
+@asynccontextmanager
+async def tcp_connection(
+    host: str,
+    port: int,
+    no_delay: bool = True,
+    send_buffer_size: int | None = None,
+    receive_buffer_size: int | None = None,
+    read_size: int = 65536,
+    **connection_kwargs
+) -> AsyncIterator[Connection]:
+    """
+    Connect to an ncacn_ip_tcp endpoint.
+
+    Suitable, bound to an endpoint, as the `connect` callable of a `ConnectionPool`.
+
+    :param host: The host to connect to.
+    :param port: The port to connect to.
+    :param no_delay: Whether to disable Nagle's algorithm, so that small PDUs are sent without delay.
+    :param send_buffer_size: The size of the socket's send buffer. `None` means the system default.
+    :param receive_buffer_size: The size of the socket's receive buffer. `None` means the system default.
+    :param read_size: The number of bytes of receive buffer to make room for once the buffer is full.
+    :param connection_kwargs: Further keyword arguments to `Connection`.
+    :return: An asynchronous context manager yielding the entered RPC connection, which is closed on exit.
+    """
+
+    transport, protocol = await get_running_loop().create_connection(
+        partial(RPCTransportProtocol, read_size=read_size),
+        host=host,
+        port=port
+    )
+
+    try:
+        _set_socket_options(
+            transport=transport,
+            no_delay=no_delay,
+            send_buffer_size=send_buffer_size,
+            receive_buffer_size=receive_buffer_size
+        )
+    except BaseException:
+        transport.close()
+        raise
+
+    async with _entered_connection(
+        transport=transport,
+        protocol=protocol,
+        connection_kwargs=connection_kwargs
+    ) as connection:
+        yield connection
+
+
+@asynccontextmanager
+async def unix_connection(
+    path: str,
+    send_buffer_size: int | None = None,
+    receive_buffer_size: int | None = None,
+    read_size: int = 65536,
+    **connection_kwargs
+) -> AsyncIterator[Connection]:
+    """
+    Connect to an RPC server listening on a Unix socket, e.g. a local stand-in for a remote server.
+
+    :param path: The path of the Unix socket.
+    :param send_buffer_size: The size of the socket's send buffer. `None` means the system default.
+    :param receive_buffer_size: The size of the socket's receive buffer. `None` means the system default.
+    :param read_size: The number of bytes of receive buffer to make room for once the buffer is full.
+    :param connection_kwargs: Further keyword arguments to `Connection`.
+    :return: An asynchronous context manager yielding the entered RPC connection, which is closed on exit.
+    """
+
+    transport, protocol = await get_running_loop().create_unix_connection(
+        partial(RPCTransportProtocol, read_size=read_size),
+        path=path
+    )
+
+    try:
+        _set_socket_options(
+            transport=transport,
+            no_delay=None,
+            send_buffer_size=send_buffer_size,
+            receive_buffer_size=receive_buffer_size
+        )
+    except BaseException:
+        transport.close()
+        raise
+
+    async with _entered_connection(
+        transport=transport,
+        protocol=protocol,
+        connection_kwargs=connection_kwargs
+    ) as connection:
+        yield connection
+
+
+def install_uvloop() -> bool:
+    """
+    Make asyncio use uvloop's event loop, if uvloop is installed.
+
+    Must be called before the event loop is created.
+
+    :return: Whether uvloop is used.
+    """
+
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
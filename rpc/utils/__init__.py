@@ -1,17 +1,26 @@
-from typing import ByteString, get_args, Any, Type, Deque, SupportsInt
+from typing import ByteString, get_args, get_origin, Annotated, Any, Type, Deque, SupportsInt, Callable
 from logging import getLogger
 from collections import deque
-from struct import pack
+from struct import Struct
 from inspect import isclass
+from uuid import UUID
+from functools import partial
 
 from ndr.structures import NDRType
 from ndr.structures.pointer import Pointer, NullPointer
 from ndr.utils import calculate_pad_length, pad as ndr_pad
 
-from rpc.utils.types import DWORD, LPDWORD, LPBYTE, LPBYTE_VAR, CTYPE_TO_STRUCT
+from rpc.utils.types import DWORD, WORD, ULONGLONG, BOOL, CONTEXT_HANDLE, FIXED_SIZE_TYPE_TO_STRUCT
+from rpc.utils.conformant_array import ConformantFixedSizeArray
+from rpc.exceptions import NDR64NotSupportedError
 
 LOG = getLogger(__name__)
 
+# In NDR64, pointers -- i.e. referent ids -- are 64-bit integers, aligned to eight bytes.
+_NDR64_POINTER_STRUCT = Struct('<Q')
+# The referent id with which non-null pointers are packed in NDR64.
+_NDR64_REFERENT_ID = 0x20000
+
 
 def unpack_structure(data: ByteString, structure: dict[str, tuple[Type, ...]], offset: int = 0) -> dict[str, Any]:
 
@@ -31,10 +40,10 @@ def unpack_structure(data: ByteString, structure: dict[str, tuple[Type, ...]], o
             except IndexError:
                 break
 
-            if item_type in {LPDWORD, LPBYTE, LPBYTE_VAR}:
+            if get_origin(item_type) is Annotated:
                 item_types_deque.extendleft(reversed(get_args(item_type)))
-            elif item_type in {DWORD}:
-                struct = CTYPE_TO_STRUCT[item_type.__supertype__]
+            elif item_type in {DWORD, WORD, ULONGLONG, BOOL}:
+                struct = FIXED_SIZE_TYPE_TO_STRUCT[item_type]
 
                 item_data = struct.unpack_from(buffer=item_data)[0]
                 offset += struct.size
@@ -42,6 +51,8 @@ def unpack_structure(data: ByteString, structure: dict[str, tuple[Type, ...]], o
                 pointer = Pointer.from_bytes(data=item_data)
                 item_data = pointer.representation
                 offset += Pointer.structure_size
+            elif isinstance(item_type, ConformantFixedSizeArray):
+                item_data, offset = item_type.from_bytes(data=data, offset=offset)
             else:
                 if isinstance(item_data, (ByteString, memoryview)):
                     item_data = item_type.from_bytes(item_data)
@@ -64,6 +75,7 @@ def unpack_structure(data: ByteString, structure: dict[str, tuple[Type, ...]], o
 def pack_structure(instance, structure: dict[str, tuple[Type, ...]]) -> bytes:
 
     structure_bytes: dict[str, bytes] = {}
+    offset = 0
 
     for value_name, item_types in structure.items():
 
@@ -72,6 +84,7 @@ def pack_structure(instance, structure: dict[str, tuple[Type, ...]]) -> bytes:
         value_name = value_name.removeprefix('__') if value_name.startswith('__') else value_name
 
         item_data = getattr(instance, value_name)
+        is_array_referent = False
 
         while True:
             try:
@@ -84,17 +97,589 @@ def pack_structure(instance, structure: dict[str, tuple[Type, ...]]) -> bytes:
             elif isclass(item_type) and issubclass(item_type, NullPointer):
                 item_data = bytes(4)
             elif isclass(item_type) and issubclass(item_type, NDRType):
-                item_data = ndr_pad(bytes(item_type(representation=item_data)))
-            elif item_type in {DWORD}:
-                item_data = pack('<I', int(item_data))
-            elif item_type in {LPDWORD, LPBYTE, LPBYTE_VAR}:
+                item_data = bytes(item_type(representation=item_data))
+                # The array applies its own alignment, and nothing follows its elements.
+                if not is_array_referent:
+                    item_data = ndr_pad(item_data)
+            elif item_type in {DWORD, WORD, ULONGLONG, BOOL}:
+                item_data = FIXED_SIZE_TYPE_TO_STRUCT[item_type].pack(int(item_data))
+            elif item_type is CONTEXT_HANDLE:
+                item_data = bytes(item_data)
+            elif get_origin(item_type) is Annotated:
                 item_types_deque.extendleft(reversed(get_args(item_type)))
+            elif isinstance(item_type, ConformantFixedSizeArray):
+                # The array is preceded by the referent ids of the pointers to it, which are packed after it.
+                num_pointers = sum(
+                    isclass(remaining_item_type) and issubclass(remaining_item_type, Pointer)
+                    for remaining_item_type in item_types_deque
+                )
+                item_data = item_type.to_bytes(
+                    elements=item_data,
+                    offset=offset + num_pointers * Pointer.structure_size
+                )
+                is_array_referent = True
             elif isinstance(item_type, SupportsInt):
                 item_data = int(item_data)
             else:
                 LOG.info(f'Item type {item_type} skipped for instance {instance}.')
 
         structure_bytes[value_name] = item_data
+        offset += len(item_data)
 
     return b''.join(list(structure_bytes.values()))
 
+
+def _resolve_item_type_order(item_types: tuple[Type, ...], from_left: bool) -> list[Type]:
+    """
+    Determine the order in which the item types of a structure value are handled.
+
+    The order does not depend on the data, so it can be resolved once instead of on every call. Pointer types -- any
+    `Annotated[Pointer, ...]` -- are expanded into their constituent types just as in `unpack_structure` and
+    `pack_structure`.
+
+    :param item_types: The item types of a structure value.
+    :param from_left: Whether the item types are consumed from the left, as when unpacking, or from the right, as when
+        packing.
+    :return: The item types in the order in which they are handled.
+    """
+
+    item_types_deque: Deque[Type] = deque(item_types)
+    ordered_item_types: list[Type] = []
+
+    while item_types_deque:
+        item_type = item_types_deque.popleft() if from_left else item_types_deque.pop()
+        if get_origin(item_type) is Annotated:
+            item_types_deque.extendleft(reversed(get_args(item_type)))
+        else:
+            ordered_item_types.append(item_type)
+
+    return ordered_item_types
+
+
+def _compile_unpack_step(item_type: Type, ndr64: bool = False) -> Callable[[Any], tuple[Any, int]]:
+    """
+    Compile the unpacking of one item type.
+
+    :param item_type: The item type to unpack.
+    :param ndr64: Whether to unpack the item type in the NDR64 transfer syntax.
+    :return: A function that takes the item data and returns the new item data and the number of bytes consumed.
+    """
+
+    if item_type in {DWORD, WORD, ULONGLONG, BOOL}:
+        struct = FIXED_SIZE_TYPE_TO_STRUCT[item_type]
+        struct_unpack_from = struct.unpack_from
+        struct_size = struct.size
+
+        def unpack_step(item_data):
+            return struct_unpack_from(item_data)[0], struct_size
+    elif item_type is Pointer and ndr64:
+        def unpack_step(item_data):
+            return item_data[_NDR64_POINTER_STRUCT.size:], _NDR64_POINTER_STRUCT.size
+    elif item_type is Pointer:
+        def unpack_step(item_data):
+            return Pointer.from_bytes(data=item_data).representation, Pointer.structure_size
+    else:
+        is_ndr_type = isclass(item_type) and issubclass(item_type, NDRType)
+        if is_ndr_type and ndr64:
+            # The NDR types of the `ndr` library are only available in the NDR 2.0 transfer syntax.
+            raise NDR64NotSupportedError(
+                f'The NDR type {item_type.__name__} cannot be unpacked in the NDR64 transfer syntax.'
+            )
+
+        def unpack_step(item_data):
+            if not isinstance(item_data, (ByteString, memoryview)):
+                return item_type(item_data), 0
+
+            item_data = item_type.from_bytes(item_data)
+            num_consumed = calculate_pad_length(length_unpadded=len(item_data)) if is_ndr_type else len(item_data)
+            if hasattr(item_data, 'representation'):
+                item_data = item_data.representation
+
+            return item_data, num_consumed
+
+    return unpack_step
+
+
+def _compile_value_unpacker(
+    item_types: tuple[Type, ...],
+    ndr64: bool = False
+) -> Callable[[memoryview, int], tuple[Any, int]]:
+    """
+    Compile the unpacking of a structure value.
+
+    :param item_types: The item types of the structure value.
+    :param ndr64: Whether to unpack the value in the NDR64 transfer syntax.
+    :return: A function that takes the data and the offset of the value and returns the value and the offset of the
+        next value.
+    """
+
+    # Conformant arrays are aligned relative to the start of the data, and so are unpacked from the data at an offset
+    # rather than from the item data.
+    unpack_steps: list[tuple[bool, Callable]] = [
+        (True, partial(item_type.from_bytes, ndr64=ndr64)) if isinstance(item_type, ConformantFixedSizeArray)
+        else (False, _compile_unpack_step(item_type=item_type, ndr64=ndr64))
+        for item_type in _resolve_item_type_order(item_types=item_types, from_left=True)
+    ]
+
+    if len(unpack_steps) == 1 and unpack_steps[0][0]:
+        unpack_value = unpack_steps[0][1]
+    elif len(unpack_steps) == 1:
+        unpack_step = unpack_steps[0][1]
+
+        def unpack_value(data: memoryview, offset: int) -> tuple[Any, int]:
+            item_data, num_consumed = unpack_step(data[offset:])
+            return item_data, offset + num_consumed
+    else:
+        def unpack_value(data: memoryview, offset: int) -> tuple[Any, int]:
+            item_data = data[offset:]
+            for is_array_step, unpack_step in unpack_steps:
+                if is_array_step:
+                    item_data, offset = unpack_step(data, offset)
+                else:
+                    item_data, num_consumed = unpack_step(item_data)
+                    offset += num_consumed
+            return item_data, offset
+
+    return unpack_value
+
+
+def _compile_pack_step(item_type: Type, ndr64: bool = False) -> Callable[[Any], Any]:
+    """
+    Compile the packing of one item type.
+
+    :param item_type: The item type to pack.
+    :param ndr64: Whether to pack the item type in the NDR64 transfer syntax.
+    :return: A function that takes the item data and returns the new item data.
+    """
+
+    if isclass(item_type) and issubclass(item_type, NullPointer):
+        null_pointer_bytes = bytes(_NDR64_POINTER_STRUCT.size if ndr64 else 4)
+
+        def pack_step(item_data):
+            return null_pointer_bytes
+    elif isclass(item_type) and issubclass(item_type, Pointer) and ndr64:
+        referent_id_bytes = _NDR64_POINTER_STRUCT.pack(_NDR64_REFERENT_ID)
+
+        def pack_step(item_data):
+            return referent_id_bytes + bytes(item_data)
+    elif isclass(item_type) and issubclass(item_type, NDRType) and ndr64:
+        # The NDR types of the `ndr` library are only available in the NDR 2.0 transfer syntax.
+        raise NDR64NotSupportedError(
+            f'The NDR type {item_type.__name__} cannot be packed in the NDR64 transfer syntax.'
+        )
+    elif isclass(item_type) and issubclass(item_type, NDRType):
+        def pack_step(item_data):
+            return ndr_pad(bytes(item_type(representation=item_data)))
+    elif item_type in {DWORD, WORD, ULONGLONG, BOOL}:
+        struct_pack = FIXED_SIZE_TYPE_TO_STRUCT[item_type].pack
+
+        def pack_step(item_data):
+            return struct_pack(int(item_data))
+    elif item_type is CONTEXT_HANDLE:
+        pack_step = bytes
+    elif isinstance(item_type, SupportsInt):
+        pack_step = int
+    else:
+        LOG.info(f'Item type {item_type} will be skipped when packing.')
+
+        def pack_step(item_data):
+            return item_data
+
+    return pack_step
+
+
+def _compile_pack_steps(item_types: tuple[Type, ...], ndr64: bool = False) -> list[tuple[int | None, Callable]]:
+    """
+    Compile the packing of the item types of a structure value.
+
+    :param item_types: The item types of the structure value.
+    :param ndr64: Whether to pack the item types in the NDR64 transfer syntax.
+    :return: The steps in the order in which they are applied, each with -- for a conformant array, which is aligned
+        relative to the start of the data -- the offset of the array relative to the value, or else `None`.
+    """
+
+    ordered_item_types = _resolve_item_type_order(item_types=item_types, from_left=False)
+    pointer_size = _NDR64_POINTER_STRUCT.size if ndr64 else Pointer.structure_size
+
+    pack_steps: list[tuple[int | None, Callable]] = []
+    array_preceded = False
+
+    for index, item_type in enumerate(ordered_item_types):
+        if isinstance(item_type, ConformantFixedSizeArray):
+            # The array is preceded by the referent ids of the pointers to it, which are packed after it.
+            num_pointers = sum(
+                isclass(following_item_type) and issubclass(following_item_type, Pointer)
+                for following_item_type in ordered_item_types[index+1:]
+            )
+            pack_steps.append((num_pointers * pointer_size, partial(item_type.to_bytes, ndr64=ndr64)))
+            array_preceded = True
+        elif array_preceded and not ndr64 and isclass(item_type) and issubclass(item_type, Pointer) \
+                and not issubclass(item_type, NullPointer):
+            # The array applies its own alignment, and nothing follows its elements.
+            pack_steps.append((None, lambda item_data, item_type=item_type: bytes(item_type(representation=item_data))))
+        else:
+            pack_steps.append((None, _compile_pack_step(item_type=item_type, ndr64=ndr64)))
+
+    return pack_steps
+
+
+def _compile_value_packer(item_types: tuple[Type, ...], ndr64: bool = False) -> Callable[[Any, int], bytes]:
+    """
+    Compile the packing of a structure value.
+
+    :param item_types: The item types of the structure value.
+    :param ndr64: Whether to pack the value in the NDR64 transfer syntax.
+    :return: A function that takes the value and the offset at which it starts, and returns its bytes.
+    """
+
+    pack_steps = _compile_pack_steps(item_types=item_types, ndr64=ndr64)
+    # A value that is an NDR type instance is serialized as is, in place of handling the first item type -- which is
+    # then not expanded -- after which the remaining item types are handled as usual.
+    ndr_type_value_pack_steps = _compile_pack_steps(item_types=item_types[:-1], ndr64=ndr64) if not ndr64 else None
+
+    def pack_value(item_data, offset: int) -> bytes:
+        if isinstance(item_data, NDRType):
+            if ndr64:
+                # The NDR types of the `ndr` library are only available in the NDR 2.0 transfer syntax.
+                raise NDR64NotSupportedError(
+                    f'The NDR type {type(item_data).__name__} cannot be packed in the NDR64 transfer syntax.'
+                )
+            item_data = ndr_pad(bytes(item_data))
+            value_pack_steps = ndr_type_value_pack_steps
+        else:
+            value_pack_steps = pack_steps
+
+        for array_offset, pack_step in value_pack_steps:
+            item_data = pack_step(item_data) if array_offset is None else pack_step(item_data, offset + array_offset)
+
+        return item_data
+
+    return pack_value
+
+
+def _ndr_alignment(item_type: Type) -> int:
+    """
+    Determine the NDR alignment of a fixed-size type.
+
+    :param item_type: A fixed-size type.
+    :return: The alignment, in bytes.
+    """
+
+    return 4 if item_type is CONTEXT_HANDLE else FIXED_SIZE_TYPE_TO_STRUCT[item_type].size
+
+
+class _FixedSizeValueRun:
+    """
+    Consecutive structure values of fixed size, which are unpacked or packed together with one `Struct`.
+
+    Each value is aligned to its NDR alignment relative to the start of the structure. As the offset at which a run
+    starts is only known when unpacking or packing, a `Struct` is compiled for each starting offset modulo 8 that is
+    encountered.
+    """
+
+    def __init__(self, values: list[tuple[str, Type, bool, list[Callable]]], ndr64: bool = False):
+        """
+        :param values: For each value, its name, its fixed-size type, whether it is preceded by a pointer, and the
+            steps to apply to it after unpacking or before packing.
+        :param ndr64: Whether the values are in the NDR64 transfer syntax, in which pointers take up eight bytes.
+        """
+
+        self.values = values
+        self._pointer_size = _NDR64_POINTER_STRUCT.size if ndr64 else 4
+        self._misalignment_to_struct: dict[int, Struct] = {}
+
+    def struct(self, offset: int) -> Struct:
+        """
+        Obtain the `Struct` with which to unpack or pack the run when it starts at an offset.
+
+        :param offset: The offset, relative to the start of the structure, at which the run starts.
+        :return: The `Struct` for the run, including the padding that precedes each value.
+        """
+
+        misalignment = offset % 8
+        if (struct := self._misalignment_to_struct.get(misalignment)) is not None:
+            return struct
+
+        position = misalignment
+        struct_format = '<'
+        for _, item_type, is_pointer_referent, _ in self.values:
+            if is_pointer_referent:
+                num_padding = -position % self._pointer_size
+                struct_format += f'{num_padding + self._pointer_size}x'
+                position += num_padding + self._pointer_size
+
+            item_struct = FIXED_SIZE_TYPE_TO_STRUCT[item_type]
+            num_padding = -position % _ndr_alignment(item_type=item_type)
+            struct_format += f'{num_padding}x{item_struct.format.lstrip("<")}'
+            position += num_padding + item_struct.size
+
+        struct = self._misalignment_to_struct[misalignment] = Struct(struct_format)
+        return struct
+
+    def unpack(self, data: memoryview, offset: int, structure_values: dict[str, Any]) -> int:
+        struct = self.struct(offset=offset)
+        struct_values = struct.unpack_from(data, offset)
+
+        index = 0
+        for value_name, item_type, _, unpack_steps in self.values:
+            if item_type is CONTEXT_HANDLE:
+                item_data = CONTEXT_HANDLE(
+                    context_handle_attributes=struct_values[index],
+                    context_handle_uuid=UUID(bytes_le=struct_values[index+1])
+                )
+                index += 2
+            else:
+                item_data = struct_values[index]
+                index += 1
+
+            for unpack_step in unpack_steps:
+                item_data, _ = unpack_step(item_data)
+
+            structure_values[value_name] = item_data
+
+        return offset + struct.size
+
+    def pack(self, instance, offset: int) -> bytes:
+        struct_values: list[Any] = []
+
+        for value_name, item_type, _, pack_steps in self.values:
+            item_data = getattr(instance, value_name)
+            for pack_step in pack_steps:
+                item_data = pack_step(item_data)
+
+            if item_type is CONTEXT_HANDLE:
+                struct_values.append(item_data.context_handle_attributes)
+                struct_values.append(item_data.context_handle_uuid.bytes_le)
+            else:
+                struct_values.append(int(item_data))
+
+        return self.struct(offset=offset).pack(*struct_values)
+
+
+def _is_variable_item_type(item_type: Type) -> bool:
+    """
+    Determine whether an item type consumes or produces data, so that it cannot be applied to a fixed-size value.
+
+    :param item_type: An item type.
+    :return: Whether the item type is a pointer, a fixed-size type or a conformant array.
+    """
+
+    return (
+        item_type is Pointer
+        or item_type in FIXED_SIZE_TYPE_TO_STRUCT
+        or isinstance(item_type, ConformantFixedSizeArray)
+    )
+
+
+def _fixed_size_unpack_value(
+    item_types: tuple[Type, ...],
+    ndr64: bool = False
+) -> tuple[Type, bool, list[Callable]] | None:
+    """
+    Determine whether a structure value can be unpacked as part of a run of fixed-size values.
+
+    :param item_types: The item types of the structure value.
+    :param ndr64: Whether the value is in the NDR64 transfer syntax.
+    :return: The fixed-size type, whether it is a pointer referent, and the steps to apply after unpacking it -- or
+        `None` if the value is not of fixed size.
+    """
+
+    ordered_item_types = _resolve_item_type_order(item_types=item_types, from_left=True)
+
+    is_pointer_referent = len(ordered_item_types) > 1 and ordered_item_types[0] is Pointer
+    fixed_size_type_index = 1 if is_pointer_referent else 0
+
+    if len(ordered_item_types) <= fixed_size_type_index:
+        return None
+    if (fixed_size_type := ordered_item_types[fixed_size_type_index]) not in FIXED_SIZE_TYPE_TO_STRUCT:
+        return None
+
+    remaining_item_types = ordered_item_types[fixed_size_type_index+1:]
+    if any(_is_variable_item_type(item_type=item_type) for item_type in remaining_item_types):
+        return None
+
+    return (
+        fixed_size_type,
+        is_pointer_referent,
+        [_compile_unpack_step(item_type=item_type, ndr64=ndr64) for item_type in remaining_item_types]
+    )
+
+
+def _fixed_size_pack_value(
+    item_types: tuple[Type, ...],
+    ndr64: bool = False
+) -> tuple[Type, bool, list[Callable]] | None:
+    """
+    Determine whether a structure value can be packed as part of a run of fixed-size values.
+
+    Pointers are not packed as part of runs, as their referent ids are chosen by the pointer type.
+
+    :param item_types: The item types of the structure value.
+    :param ndr64: Whether the value is in the NDR64 transfer syntax.
+    :return: The fixed-size type, `False`, and the steps to apply before packing it -- or `None` if the value is not of
+        fixed size.
+    """
+
+    ordered_item_types = _resolve_item_type_order(item_types=item_types, from_left=False)
+
+    if not ordered_item_types or (fixed_size_type := ordered_item_types[-1]) not in FIXED_SIZE_TYPE_TO_STRUCT:
+        return None
+
+    preceding_item_types = ordered_item_types[:-1]
+    if any(_is_variable_item_type(item_type=item_type) for item_type in preceding_item_types):
+        return None
+
+    return (
+        fixed_size_type,
+        False,
+        [_compile_pack_step(item_type=item_type, ndr64=ndr64) for item_type in preceding_item_types]
+    )
+
+
+class CompiledStructure:
+    """
+    A structure specification compiled into functions specialised for unpacking and packing it.
+
+    The structure specification is interpreted once, when compiled, rather than on every call. Consecutive fixed-size
+    values -- such as DWORDs, pointers to them, and return codes -- are unpacked and packed with one `Struct`, and are
+    aligned to their NDR alignment, as are pointers and the types of the `ndr` library. Apart from that alignment, which
+    is of no consequence for structures consisting of DWORDs and pointers, the result is the same as that of
+    `unpack_structure` and `pack_structure`. Conformant arrays align themselves relative to the start of the structure
+    in both.
+
+    A structure specification can also be compiled for the NDR64 transfer syntax, in which pointers and the conformance
+    of arrays are 64-bit integers. Only specifications that do not use the NDR types of the `ndr` library -- other than
+    pointers -- can be, as those types are only available in NDR 2.0.
+    """
+
+    def __init__(self, structure: dict[str, tuple[Type, ...]], ndr64: bool = False):
+        """
+        :param structure: The structure specification to compile.
+        :param ndr64: Whether to compile the structure specification for the NDR64 transfer syntax.
+        """
+
+        self.ndr64 = ndr64
+
+        self._unpackers: list[Callable[[memoryview, int, dict[str, Any]], int]] = []
+        self._packers: list[Callable[[Any, int], bytes]] = []
+
+        unpack_run_values: list[tuple[str, Type, bool, list[Callable]]] = []
+        pack_run_values: list[tuple[str, Type, bool, list[Callable]]] = []
+
+        for value_name, item_types in structure.items():
+            fixed_size_unpack_value = _fixed_size_unpack_value(item_types=item_types, ndr64=ndr64)
+            if fixed_size_unpack_value is not None:
+                unpack_run_values.append((value_name, *fixed_size_unpack_value))
+            else:
+                if unpack_run_values:
+                    self._unpackers.append(_FixedSizeValueRun(values=unpack_run_values, ndr64=ndr64).unpack)
+                    unpack_run_values = []
+                self._unpackers.append(
+                    self._make_value_unpacker(value_name=value_name, item_types=item_types, ndr64=ndr64)
+                )
+
+            packed_value_name = value_name.removeprefix('__')
+            if (fixed_size_pack_value := _fixed_size_pack_value(item_types=item_types, ndr64=ndr64)) is not None:
+                pack_run_values.append((packed_value_name, *fixed_size_pack_value))
+            else:
+                if pack_run_values:
+                    self._packers.append(_FixedSizeValueRun(values=pack_run_values, ndr64=ndr64).pack)
+                    pack_run_values = []
+                self._packers.append(
+                    self._make_value_packer(value_name=packed_value_name, item_types=item_types, ndr64=ndr64)
+                )
+
+        if unpack_run_values:
+            self._unpackers.append(_FixedSizeValueRun(values=unpack_run_values, ndr64=ndr64).unpack)
+        if pack_run_values:
+            self._packers.append(_FixedSizeValueRun(values=pack_run_values, ndr64=ndr64).pack)
+
+        # The names of the values that are not to be passed on when constructing an instance from the unpacked values.
+        self.private_value_names: tuple[str, ...] = tuple(
+            value_name for value_name in structure if value_name.startswith('__')
+        )
+
+    @staticmethod
+    def _alignment(item_types: tuple[Type, ...], ndr64: bool = False) -> int:
+        """
+        Determine the alignment of a value that is not part of a run of fixed-size values.
+
+        A value starting with a conformant array is not aligned here, as the array aligns itself.
+
+        :param item_types: The item types of the structure value.
+        :param ndr64: Whether the value is in the NDR64 transfer syntax.
+        :return: The alignment, in bytes: for a value starting with a pointer, eight in NDR64 and four in NDR 2.0, as
+            for a value of another NDR type of the `ndr` library in NDR 2.0; else one.
+        """
+
+        first_item_type = next(iter(_resolve_item_type_order(item_types=item_types, from_left=True)), None)
+        if isclass(first_item_type) and issubclass(first_item_type, Pointer):
+            return _NDR64_POINTER_STRUCT.size if ndr64 else Pointer.structure_size
+        if isclass(first_item_type) and issubclass(first_item_type, NDRType) and not ndr64:
+            return 4
+        return 1
+
+    @classmethod
+    def _make_value_unpacker(
+        cls,
+        value_name: str,
+        item_types: tuple[Type, ...],
+        ndr64: bool = False
+    ) -> Callable[[memoryview, int, dict[str, Any]], int]:
+
+        unpack_value = _compile_value_unpacker(item_types=item_types, ndr64=ndr64)
+        alignment = cls._alignment(item_types=item_types, ndr64=ndr64)
+
+        if alignment == 1:
+            def unpack_named_value(data: memoryview, offset: int, structure_values: dict[str, Any]) -> int:
+                structure_values[value_name], offset = unpack_value(data, offset)
+                return offset
+        else:
+            def unpack_named_value(data: memoryview, offset: int, structure_values: dict[str, Any]) -> int:
+                structure_values[value_name], offset = unpack_value(data, offset + (-offset % alignment))
+                return offset
+
+        return unpack_named_value
+
+    @classmethod
+    def _make_value_packer(
+        cls,
+        value_name: str,
+        item_types: tuple[Type, ...],
+        ndr64: bool = False
+    ) -> Callable[[Any, int], bytes]:
+
+        pack_value = _compile_value_packer(item_types=item_types, ndr64=ndr64)
+        alignment = cls._alignment(item_types=item_types, ndr64=ndr64)
+
+        if alignment == 1:
+            def pack_named_value(instance, offset: int) -> bytes:
+                return pack_value(getattr(instance, value_name), offset)
+        else:
+            def pack_named_value(instance, offset: int) -> bytes:
+                num_padding = -offset % alignment
+                return bytes(num_padding) + pack_value(getattr(instance, value_name), offset + num_padding)
+
+        return pack_named_value
+
+    def unpack(self, data: ByteString, offset: int = 0) -> dict[str, Any]:
+        data = memoryview(data)[offset:]
+        offset = 0
+
+        structure_values: dict[str, Any] = {}
+
+        for unpacker in self._unpackers:
+            offset = unpacker(data, offset, structure_values)
+
+        return structure_values
+
+    def pack(self, instance) -> bytes:
+        value_bytes_list: list[bytes] = []
+        offset = 0
+
+        for packer in self._packers:
+            value_bytes = packer(instance, offset)
+            value_bytes_list.append(value_bytes)
+            offset += len(value_bytes)
+
+        return b''.join(value_bytes_list)
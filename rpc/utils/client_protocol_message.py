@@ -2,9 +2,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 from abc import ABC
 from enum import IntEnum
-from typing import Type, ClassVar, ByteString, Any
+from typing import Type, ClassVar, ByteString, Any, AsyncIterator
 from contextlib import suppress
 from struct import Struct
+from concurrent.futures import Executor, ProcessPoolExecutor
+from asyncio import get_running_loop
+from functools import partial
 
 from msdsalgs.win32_error import Win32Error, Win32ErrorCode
 
@@ -12,25 +15,61 @@ from rpc.connection import Connection as RPCConnection
 from rpc.pdu_headers.base import MSRPCHeader
 from rpc.pdu_headers.request_header import RequestHeader
 from rpc.pdu_headers.response_header import ResponseHeader
-from rpc.utils import unpack_structure, pack_structure
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.utils import CompiledStructure
+from rpc.exceptions import UnexpectedPDUError, UnexpectedResponseError
 
 
 class ClientProtocolMessage(ABC):
 
+    @classmethod
+    def _compiled_structure(cls, ndr64: bool = False) -> CompiledStructure | None:
+        """
+        Obtain the compiled form of the class' structure specification, compiling it on first use.
+
+        :param ndr64: Whether to obtain the form compiled for the NDR64 transfer syntax.
+        :return: The compiled structure specification, or `None` if the class has no structure specification.
+        """
+
+        compiled_structure_name = '_COMPILED_NDR64_STRUCTURE' if ndr64 else '_COMPILED_STRUCTURE'
+
+        if (compiled_structure := cls.__dict__.get(compiled_structure_name)) is None:
+            if not (structure := getattr(cls, '_STRUCTURE', None)):
+                return None
+            compiled_structure = CompiledStructure(structure=structure, ndr64=ndr64)
+            setattr(cls, compiled_structure_name, compiled_structure)
+
+        return compiled_structure
+
     def __bytes__(self) -> bytes:
-        if structure := getattr(self, '_STRUCTURE', None):
-            return pack_structure(instance=self, structure=structure)
+        if compiled_structure := self._compiled_structure():
+            return compiled_structure.pack(instance=self)
+        else:
+            raise NotImplementedError
+
+    def to_bytes(self, ndr64: bool = False) -> bytes:
+        """
+        Serialize the message in a transfer syntax.
+
+        :param ndr64: Whether to serialize the message in the NDR64 transfer syntax rather than in NDR 2.0.
+        :return: The serialized message.
+        """
+
+        if not ndr64:
+            return bytes(self)
+
+        if compiled_structure := self._compiled_structure(ndr64=True):
+            return compiled_structure.pack(instance=self)
         else:
             raise NotImplementedError
 
     @classmethod
-    def from_bytes(cls, data: ByteString | memoryview, offset: int = 0) -> ClientProtocolMessage:
+    def from_bytes(cls, data: ByteString | memoryview, offset: int = 0, ndr64: bool = False) -> ClientProtocolMessage:
 
-        if structure := getattr(cls, '_STRUCTURE', None):
-            cls_kwargs: dict[str, Any] = unpack_structure(data=data, structure=structure, offset=offset)
-            delete_keys = [kwarg_name for kwarg_name in cls_kwargs if kwarg_name.startswith('__')]
-            for delete_key in delete_keys:
-                del cls_kwargs[delete_key]
+        if compiled_structure := cls._compiled_structure(ndr64=ndr64):
+            cls_kwargs: dict[str, Any] = compiled_structure.unpack(data=data, offset=offset)
+            for private_value_name in compiled_structure.private_value_names:
+                del cls_kwargs[private_value_name]
             return cls(**cls_kwargs)
         else:
             raise NotImplementedError
@@ -39,6 +78,8 @@ class ClientProtocolMessage(ABC):
 class ClientProtocolRequestBase(ClientProtocolMessage, ABC):
     OPERATION: IntEnum = NotImplemented
     RESPONSE_CLASS: Type[ClientProtocolResponseBase] = NotImplemented
+    # The abstract syntax of the interface of the operation, used to route the request to its presentation context.
+    ABSTRACT_SYNTAX: PresentationSyntax | None = None
 
 
 @dataclass
@@ -49,10 +90,84 @@ class ClientProtocolResponseBase(ClientProtocolMessage, ABC):
     _RETURN_CODE_STRUCT: ClassVar[Struct] = Struct('<I')
 
 
+def _request_context_id(
+    rpc_connection: RPCConnection,
+    request: ClientProtocolRequestBase,
+    context_id: int | None
+) -> int:
+    """
+    Determine the presentation context in which to send a client protocol request.
+
+    :param rpc_connection: The RPC connection with which the request is to be sent.
+    :param request: The client protocol request.
+    :param context_id: An explicitly chosen presentation context id.
+    :return: The explicitly chosen id, else the id of the context negotiated for the request's interface, else 0.
+    """
+
+    if context_id is not None:
+        return context_id
+
+    if request.ABSTRACT_SYNTAX is not None:
+        negotiated_context_id: int | None = rpc_connection.get_context_id(abstract_syntax=request.ABSTRACT_SYNTAX)
+        if negotiated_context_id is not None:
+            return negotiated_context_id
+
+    return 0
+
+
+def _decode_response(
+    response_class: Type[ClientProtocolResponseBase],
+    stub_data: ByteString | memoryview,
+    ndr64: bool
+) -> ClientProtocolResponseBase:
+    """
+    Decode the stub data of a response.
+
+    :param response_class: The class of the client protocol response message.
+    :param stub_data: The stub data of the response.
+    :param ndr64: Whether the stub data is in the NDR64 transfer syntax.
+    :return: The client protocol response message.
+    """
+
+    if ndr64:
+        return response_class.from_bytes(data=stub_data, ndr64=True)
+    else:
+        return response_class.from_bytes(data=stub_data)
+
+
+async def _decode_response_in_executor(
+    response_class: Type[ClientProtocolResponseBase],
+    stub_data: ByteString | memoryview,
+    ndr64: bool,
+    executor: Executor
+) -> ClientProtocolResponseBase:
+    """
+    Decode the stub data of a response in an executor, so as not to block the event loop.
+
+    :param response_class: The class of the client protocol response message. It must be picklable for a process pool.
+    :param stub_data: The stub data of the response.
+    :param ndr64: Whether the stub data is in the NDR64 transfer syntax.
+    :param executor: The executor in which to decode the stub data.
+    :return: The client protocol response message.
+    """
+
+    if isinstance(executor, ProcessPoolExecutor):
+        # A view cannot be pickled, so the stub data is handed to the worker process as bytes.
+        stub_data = bytes(stub_data)
+
+    return await get_running_loop().run_in_executor(
+        executor,
+        partial(_decode_response, response_class=response_class, stub_data=stub_data, ndr64=ndr64)
+    )
+
+
 async def obtain_response(
     rpc_connection: RPCConnection,
     request: ClientProtocolRequestBase,
-    raise_exception: bool = True
+    raise_exception: bool = True,
+    context_id: int | None = None,
+    decode_executor: Executor | None = None,
+    decode_executor_threshold: int = 1048576
 ) -> ClientProtocolResponseBase:
     """
 
@@ -60,26 +175,48 @@ async def obtain_response(
     :param request: The client protocol request to send.
     :param raise_exception: Whether to raise an exception in case the client response message's return code indicates
         error.
+    :param context_id: The id of the presentation context in which to send the request. By default, the context
+        negotiated for the request's interface.
+    :param decode_executor: An executor -- a thread pool or a process pool -- in which to decode large responses, so
+        that decoding them does not hold up other calls.
+    :param decode_executor_threshold: The length of stub data from which the response is decoded in the executor.
     :return: The client protocol response message corresponding to the request.
     """
 
+    context_id = _request_context_id(rpc_connection=rpc_connection, request=request, context_id=context_id)
+    ndr64: bool = rpc_connection.is_ndr64_context(context_id=context_id)
+
     rpc_response: MSRPCHeader = await (
         await rpc_connection.send_message(
             message=RequestHeader(
+                context_id=context_id,
                 opnum=request.OPERATION.value,
-                stub_data=bytes(request)
+                stub_data=request.to_bytes(ndr64=True) if ndr64 else bytes(request)
             )
         )
     )
 
     if not isinstance(rpc_response, ResponseHeader):
-        # TODO: Use proper exception.
-        raise ValueError
+        raise UnexpectedPDUError(f'The request was answered with a {rpc_response.pdu_type.name} PDU.')
 
-    client_protocol_response: ClientProtocolResponseBase = request.RESPONSE_CLASS.from_bytes(data=rpc_response.stub_data)
+    if decode_executor is not None and len(rpc_response.stub_data) >= decode_executor_threshold:
+        client_protocol_response: ClientProtocolResponseBase = await _decode_response_in_executor(
+            response_class=request.RESPONSE_CLASS,
+            stub_data=rpc_response.stub_data,
+            ndr64=ndr64,
+            executor=decode_executor
+        )
+    else:
+        client_protocol_response: ClientProtocolResponseBase = _decode_response(
+            response_class=request.RESPONSE_CLASS,
+            stub_data=rpc_response.stub_data,
+            ndr64=ndr64
+        )
     if not isinstance(client_protocol_response, request.RESPONSE_CLASS):
-        # TODO: Use proper exception
-        raise ValueError
+        raise UnexpectedResponseError(
+            f'The response was decoded as {type(client_protocol_response).__name__} rather than as '
+            f'{request.RESPONSE_CLASS.__name__}.'
+        )
 
     response_error: Win32Error | None = None
     # Only return codes indicating errors map to an error class. Return codes for successes result in a lookup error.
@@ -93,3 +230,39 @@ async def obtain_response(
         raise response_error
 
     return client_protocol_response
+
+
+async def obtain_response_stream(
+    rpc_connection: RPCConnection,
+    request: ClientProtocolRequestBase,
+    max_queued_fragments: int = 16,
+    context_id: int | None = None
+) -> AsyncIterator[memoryview]:
+    """
+    Send a client protocol request and stream the stub data of the response as its fragments arrive.
+
+    The stub data is not decoded into a client protocol response message, so that the consumer can decode it
+    incrementally without holding all of it in memory.
+
+    :param rpc_connection: The RPC connection with which to send the message.
+    :param request: The client protocol request to send.
+    :param max_queued_fragments: The maximum number of received fragments waiting to be consumed, after which reading
+        from the connection pauses.
+    :param context_id: The id of the presentation context in which to send the request. By default, the context
+        negotiated for the request's interface.
+    :return: An asynchronous iterator of views of the stub data of each response fragment.
+    """
+
+    context_id = _request_context_id(rpc_connection=rpc_connection, request=request, context_id=context_id)
+
+    return await rpc_connection.send_message_stream(
+        message=RequestHeader(
+            context_id=context_id,
+            opnum=request.OPERATION.value,
+            stub_data=(
+                request.to_bytes(ndr64=True) if rpc_connection.is_ndr64_context(context_id=context_id)
+                else bytes(request)
+            )
+        ),
+        max_queued_fragments=max_queued_fragments
+    )
@@ -0,0 +1,160 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import ClassVar, Any, Sequence
+from struct import Struct
+from array import array
+from sys import byteorder
+
+from rpc.exceptions import MalformedPDUError
+
+# The struct format characters supported for elements, and the NumPy type each corresponds to.
+_FORMAT_CHARACTER_TO_NUMPY_TYPE: dict[str, str] = {
+    'B': '<u1', 'H': '<u2', 'I': '<u4', 'Q': '<u8',
+    'b': '<i1', 'h': '<i2', 'i': '<i4', 'q': '<i8',
+    'x': 'V1'
+}
+
+
+@dataclass(frozen=True)
+class ConformantFixedSizeArray:
+    """
+    An NDR unidimensional conformant array whose elements are of a fixed size, for use in structure specifications.
+
+    The element format is a little-endian struct format of one or more integer format characters, without repeat
+    counts; any padding within an element is given with `x` characters. The elements are decoded in one operation
+    rather than one by one: arrays of a single integer type into an `array.array`, and arrays of fixed-size structures
+    into a list of tuples. Both are copies of the decoded data. Only with `use_numpy` are the elements not copied: they
+    are decoded into a NumPy (structured) array that is a view into the decoded data -- e.g. the receive buffer -- and
+    that keeps it alive.
+
+    The conformance is aligned to four bytes -- or, in NDR64, eight -- and the elements to the size of their largest
+    integer, both relative to the start of the stub data, which is why the array is decoded and encoded at an offset.
+    Nothing follows the elements; the next item applies its own alignment.
+    """
+
+    _MAX_COUNT_STRUCT: ClassVar[Struct] = Struct('<I')
+    # In NDR64, the conformance is a 64-bit integer.
+    _NDR64_MAX_COUNT_STRUCT: ClassVar[Struct] = Struct('<Q')
+
+    element_format: str
+    use_numpy: bool = False
+    _element_struct: Struct = field(init=False, repr=False, compare=False)
+    _element_alignment: int = field(init=False, repr=False, compare=False)
+    _array_typecode: str | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        element_struct = Struct(self.element_format)
+        object.__setattr__(self, '_element_struct', element_struct)
+        object.__setattr__(
+            self,
+            '_element_alignment',
+            max(Struct(f'<{format_character}').size for format_character in self.element_format.lstrip('<'))
+        )
+
+        array_typecode: str | None = None
+        if len(format_characters := self.element_format.lstrip('<')) == 1:
+            # `array` typecodes are of the platform's sizes, so pick the one whose size matches the element's.
+            array_typecode = next(
+                (
+                    typecode for typecode in (
+                        'BHILQ' if format_characters.isupper() else 'bhilq'
+                    )
+                    if array(typecode).itemsize == element_struct.size
+                ),
+                None
+            )
+        object.__setattr__(self, '_array_typecode', array_typecode)
+
+    @property
+    def element_size(self) -> int:
+        return self._element_struct.size
+
+    def _numpy_dtype(self):
+        from numpy import dtype
+
+        numpy_types = [
+            _FORMAT_CHARACTER_TO_NUMPY_TYPE[format_character]
+            for format_character in self.element_format.lstrip('<')
+        ]
+        if len(numpy_types) == 1:
+            return dtype(numpy_types[0])
+        return dtype([
+            (f'_{i}' if format_character == 'x' else f'f{i}', numpy_type)
+            for i, (format_character, numpy_type) in enumerate(zip(self.element_format.lstrip('<'), numpy_types))
+        ])
+
+    def from_bytes(self, data: bytes | memoryview, offset: int = 0, ndr64: bool = False) -> tuple[Any, int]:
+        """
+        Decode the array.
+
+        :param data: The stub data containing the array.
+        :param offset: The offset in the stub data at which the array starts, before the alignment of its conformance.
+        :param ndr64: Whether the array is in the NDR64 transfer syntax.
+        :return: The elements of the array -- a view into `data` with `use_numpy`, a copy otherwise -- and the offset in
+            the stub data at which its elements end.
+        """
+
+        max_count_struct = self._NDR64_MAX_COUNT_STRUCT if ndr64 else self._MAX_COUNT_STRUCT
+
+        offset += -offset % max_count_struct.size
+        max_count: int = max_count_struct.unpack_from(data, offset)[0]
+        offset += max_count_struct.size
+        offset += -offset % self._element_alignment
+
+        elements_end = offset + max_count * self.element_size
+        elements_data = memoryview(data)[offset:elements_end]
+        if len(elements_data) != max_count * self.element_size:
+            raise MalformedPDUError(f'The data ends before the {max_count} elements of the conformant array.')
+
+        if self.use_numpy:
+            from numpy import frombuffer
+            elements = frombuffer(elements_data, dtype=self._numpy_dtype(), count=max_count)
+        elif self._array_typecode is not None:
+            elements = array(self._array_typecode)
+            elements.frombytes(elements_data)
+            if byteorder == 'big':
+                elements.byteswap()
+        else:
+            elements = list(self._element_struct.iter_unpack(elements_data))
+
+        return elements, elements_end
+
+    def to_bytes(self, elements: Sequence, offset: int = 0, ndr64: bool = False) -> bytes:
+        """
+        Encode the array.
+
+        :param elements: The elements of the array: an `array.array`, a NumPy array, a sequence of integers, or -- for
+            structure elements -- a sequence of tuples.
+        :param offset: The offset in the stub data at which the array is to start.
+        :param ndr64: Whether to encode the array in the NDR64 transfer syntax.
+        :return: The encoded array, starting with the padding that aligns its conformance.
+        """
+
+        max_count_struct = self._NDR64_MAX_COUNT_STRUCT if ndr64 else self._MAX_COUNT_STRUCT
+
+        if self.use_numpy:
+            from numpy import asarray
+            elements_bytes = asarray(elements, dtype=self._numpy_dtype()).tobytes()
+        elif self._array_typecode is not None:
+            elements_array = (
+                elements if isinstance(elements, array) and elements.typecode == self._array_typecode
+                else array(self._array_typecode, elements)
+            )
+            if byteorder == 'big':
+                elements_array = array(self._array_typecode, elements_array)
+                elements_array.byteswap()
+            elements_bytes = elements_array.tobytes()
+        else:
+            elements_bytes = b''.join(self._element_struct.pack(*element) for element in elements)
+
+        max_count = len(elements_bytes) // self.element_size
+
+        num_conformance_padding = -offset % max_count_struct.size
+        elements_offset = offset + num_conformance_padding + max_count_struct.size
+
+        return b''.join([
+            bytes(num_conformance_padding),
+            max_count_struct.pack(max_count),
+            bytes(-elements_offset % self._element_alignment),
+            elements_bytes
+        ])
@@ -1,19 +1,38 @@
-from typing import Annotated, NewType
+from typing import Annotated, NewType, Type
 from struct import Struct
-from ctypes import c_ulong
+from ctypes import c_ulong, c_ushort, c_ulonglong, c_int
 
 from ndr.structures.pointer import Pointer
 from ndr.structures.unidimensional_conformant_array import UnidimensionalConformantArray
 from ndr.structures.unidimensional_conformant_varying_array import UnidimensionalConformantVaryingArray
 
+from rpc.structures.context_handle import ContextHandle
+from rpc.utils.conformant_array import ConformantFixedSizeArray
+
 
 CTYPE_TO_STRUCT = {
     c_ulong: Struct('<I')
 }
 
 DWORD = NewType('DWORD', c_ulong)
+WORD = NewType('WORD', c_ushort)
+ULONGLONG = NewType('ULONGLONG', c_ulonglong)
+BOOL = NewType('BOOL', c_int)
+CONTEXT_HANDLE = ContextHandle
 BYTE_ARRAY = UnidimensionalConformantArray
 BYTE_ARRAY_VAR = UnidimensionalConformantVaryingArray
 LPBYTE = Annotated[Pointer, BYTE_ARRAY]
 LPBYTE_VAR = Annotated[Pointer, BYTE_ARRAY_VAR]
 LPDWORD = Annotated[Pointer, DWORD]
+DWORD_ARRAY = ConformantFixedSizeArray(element_format='<I')
+LPDWORD_ARRAY = Annotated[Pointer, DWORD_ARRAY]
+
+# The types whose values have a fixed size and are unpacked and packed with a `Struct`. The types are used as keys,
+# rather than their ctypes supertypes, as some of those are aliases of each other depending on the platform.
+FIXED_SIZE_TYPE_TO_STRUCT: dict[Type, Struct] = {
+    DWORD: Struct('<I'),
+    WORD: Struct('<H'),
+    ULONGLONG: Struct('<Q'),
+    BOOL: Struct('<i'),
+    CONTEXT_HANDLE: ContextHandle.structure
+}
@@ -2,9 +2,14 @@ from setuptools import setup, find_packages
 setup(
     name='rpc',
     version='0.13',
-    packages=find_packages(),
+    packages=find_packages(exclude=('benchmarks', 'benchmarks.*')),
     install_requires=[
         'msdsalgs @ git+https://github.com/vphpersson/msdsalgs.git#egg=msdsalgs',
         'ndr @ git+https://github.com/vphpersson/ndr.git#egg=ndr'
-    ]
+    ],
+    extras_require={
+        'numpy': ['numpy'],
+        'uvloop': ['uvloop'],
+        'ntlm': ['cryptography']
+    }
 )
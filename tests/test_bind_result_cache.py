@@ -0,0 +1,202 @@
+from asyncio import Queue, wait_for
+from unittest import TestCase, IsolatedAsyncioTestCase
+from uuid import UUID
+
+from rpc.bind_result_cache import BindResultCache
+from rpc.connection import Connection
+from rpc.pdu_framer import PDUFramer
+from rpc.pdu_headers.alter_context import AlterContextHeader
+from rpc.pdu_headers.alter_context_resp import AlterContextRespHeader
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.bind import BindHeader
+from rpc.pdu_headers.bind_ack import BindAckHeader
+from rpc.structures.context_element import ContextElement, NDR_PRESENTATION_SYNTAX, NDR64_PRESENTATION_SYNTAX, \
+    NDR64_AND_NDR_TRANSFER_SYNTAXES
+from rpc.structures.context_list import ContextList
+from rpc.structures.context_negotiation_result import ContextNegotiationResult, ContDefResult, ProviderReason
+from rpc.structures.port_any import PortAny
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.structures.result_list import ResultList
+
+INTERFACE = PresentationSyntax(if_uuid=UUID('12345778-1234-abcd-ef00-0123456789ac'), if_version=1)
+OTHER_INTERFACE = PresentationSyntax(if_uuid=UUID('367abb81-9844-35f1-ad32-98f038001003'), if_version=2)
+THIRD_INTERFACE = PresentationSyntax(if_uuid=UUID('6bffd098-a112-3610-9833-46c3f87e345a'), if_version=1)
+
+ACCEPTANCE_OF_NDR64 = ContextNegotiationResult(
+    result=ContDefResult.ACCEPTANCE,
+    reason=ProviderReason.REASON_NOT_SPECIFIED,
+    transfer_syntax=NDR64_PRESENTATION_SYNTAX
+)
+ACCEPTANCE_OF_NDR = ContextNegotiationResult(
+    result=ContDefResult.ACCEPTANCE,
+    reason=ProviderReason.REASON_NOT_SPECIFIED,
+    transfer_syntax=NDR_PRESENTATION_SYNTAX
+)
+REJECTION = ContextNegotiationResult(
+    result=ContDefResult.PROVIDER_REJECTION,
+    reason=ProviderReason.PROPOSED_TRANSFER_SYNTAXES_NOT_SUPPORTED,
+    transfer_syntax=None
+)
+
+
+def _context_list(*abstract_syntaxes: PresentationSyntax) -> ContextList:
+    return ContextList([
+        ContextElement(
+            context_id=context_id,
+            abstract_syntax=abstract_syntax,
+            transfer_syntaxes=NDR64_AND_NDR_TRANSFER_SYNTAXES
+        )
+        for context_id, abstract_syntax in enumerate(abstract_syntaxes)
+    ])
+
+
+class BindResultCacheTestCase(TestCase):
+
+    def test_narrow_unknown(self):
+        presentation_context_list = _context_list(INTERFACE, OTHER_INTERFACE)
+
+        narrowed_context_list = BindResultCache().narrow_context_list(
+            server_fingerprint='build-1',
+            presentation_context_list=presentation_context_list
+        )
+
+        self.assertEqual(list(narrowed_context_list), list(presentation_context_list))
+
+    def test_update_and_narrow(self):
+        bind_result_cache = BindResultCache()
+        presentation_context_list = _context_list(INTERFACE, OTHER_INTERFACE, THIRD_INTERFACE)
+
+        rejected_context_elements = bind_result_cache.update(
+            server_fingerprint='build-1',
+            presentation_context_list=presentation_context_list,
+            result_list=ResultList([ACCEPTANCE_OF_NDR64, REJECTION, ACCEPTANCE_OF_NDR])
+        )
+
+        self.assertEqual(rejected_context_elements, [presentation_context_list[1]])
+        self.assertEqual(len(bind_result_cache), 2)
+        self.assertEqual(
+            [
+                context_element.transfer_syntaxes
+                for context_element in bind_result_cache.narrow_context_list(
+                    server_fingerprint='build-1',
+                    presentation_context_list=presentation_context_list
+                )
+            ],
+            [(NDR64_PRESENTATION_SYNTAX,), NDR64_AND_NDR_TRANSFER_SYNTAXES, (NDR_PRESENTATION_SYNTAX,)]
+        )
+        # The entries are those of the server with the fingerprint only.
+        self.assertIsNone(bind_result_cache.get(server_fingerprint='build-2', abstract_syntax=INTERFACE))
+
+    def test_rejection_discards_entry(self):
+        bind_result_cache = BindResultCache()
+        bind_result_cache.add(
+            server_fingerprint='build-1',
+            abstract_syntax=INTERFACE,
+            transfer_syntax=NDR64_PRESENTATION_SYNTAX
+        )
+
+        bind_result_cache.update(
+            server_fingerprint='build-1',
+            presentation_context_list=_context_list(INTERFACE),
+            result_list=ResultList([REJECTION])
+        )
+
+        self.assertIsNone(bind_result_cache.get(server_fingerprint='build-1', abstract_syntax=INTERFACE))
+
+    def test_least_recently_used_evicted(self):
+        bind_result_cache = BindResultCache(max_num_entries=2)
+        for abstract_syntax in (INTERFACE, OTHER_INTERFACE):
+            bind_result_cache.add(
+                server_fingerprint='build-1',
+                abstract_syntax=abstract_syntax,
+                transfer_syntax=NDR_PRESENTATION_SYNTAX
+            )
+
+        bind_result_cache.get(server_fingerprint='build-1', abstract_syntax=INTERFACE)
+        bind_result_cache.add(
+            server_fingerprint='build-1',
+            abstract_syntax=THIRD_INTERFACE,
+            transfer_syntax=NDR_PRESENTATION_SYNTAX
+        )
+
+        self.assertEqual(len(bind_result_cache), 2)
+        self.assertIsNone(bind_result_cache.get(server_fingerprint='build-1', abstract_syntax=OTHER_INTERFACE))
+        self.assertEqual(
+            bind_result_cache.get(server_fingerprint='build-1', abstract_syntax=INTERFACE),
+            NDR_PRESENTATION_SYNTAX
+        )
+
+
+class NDROnlyPeer:
+    """A peer that accepts a presentation context only if it proposes NDR 2.0, recording the proposals."""
+
+    def __init__(self):
+        self.incoming_queue: Queue[bytes] = Queue()
+        self.proposals: list[tuple[type, list[tuple[PresentationSyntax, ...]]]] = []
+        self._pdu_framer = PDUFramer()
+
+    async def write(self, data: bytes) -> int:
+        self._pdu_framer.feed(data=data)
+        for fragment in self._pdu_framer.fragments():
+            with fragment:
+                message = MSRPCHeader.from_bytes(data=bytes(fragment))
+            if not isinstance(message, BindHeader):
+                continue
+
+            self.proposals.append((
+                type(message),
+                [context_element.transfer_syntaxes for context_element in message.presentation_context_list]
+            ))
+            response_class = AlterContextRespHeader if isinstance(message, AlterContextHeader) else BindAckHeader
+            self.incoming_queue.put_nowait(
+                bytes(
+                    response_class(
+                        call_id=message.call_id,
+                        sec_addr=PortAny(port_spec='49667'),
+                        result_list=ResultList([
+                            ACCEPTANCE_OF_NDR if NDR_PRESENTATION_SYNTAX in context_element.transfer_syntaxes
+                            else REJECTION
+                            for context_element in message.presentation_context_list
+                        ])
+                    )
+                )
+            )
+        return len(data)
+
+
+class StaleBindResultTestCase(IsolatedAsyncioTestCase):
+
+    async def test_stale_context_proposed_again(self):
+        peer = NDROnlyPeer()
+        # The server accepted NDR64 once, but no longer does.
+        bind_result_cache = BindResultCache()
+        bind_result_cache.add(
+            server_fingerprint='build-1',
+            abstract_syntax=INTERFACE,
+            transfer_syntax=NDR64_PRESENTATION_SYNTAX
+        )
+
+        async with Connection(reader=peer.incoming_queue.get, writer=peer.write) as connection:
+            await wait_for(
+                connection.bind(
+                    presentation_context_list=_context_list(INTERFACE),
+                    bind_result_cache=bind_result_cache,
+                    server_fingerprint='build-1'
+                ),
+                timeout=5
+            )
+
+            self.assertEqual(connection.get_context_id(abstract_syntax=INTERFACE), 0)
+            self.assertFalse(connection.is_ndr64_context(context_id=0))
+
+        self.assertEqual(
+            peer.proposals,
+            [
+                (BindHeader, [(NDR64_PRESENTATION_SYNTAX,)]),
+                (AlterContextHeader, [NDR64_AND_NDR_TRANSFER_SYNTAXES])
+            ]
+        )
+        self.assertEqual(
+            bind_result_cache.get(server_fingerprint='build-1', abstract_syntax=INTERFACE),
+            NDR_PRESENTATION_SYNTAX
+        )
@@ -0,0 +1,157 @@
+from asyncio import Queue, TimeoutError as AsyncioTimeoutError, CancelledError, sleep, wait_for
+from unittest import IsolatedAsyncioTestCase
+
+from rpc.connection import Connection
+from rpc.pdu_framer import PDUFramer
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.co_cancel import CoCancelHeader
+from rpc.pdu_headers.orphaned import OrphanedHeader
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.structures.pfc_flag import PfcFlag
+from rpc.exceptions import ConnectionClosedError
+
+
+class HeldPeer:
+    """A peer that records the messages it receives and answers a request only when told to."""
+
+    def __init__(self):
+        self.incoming_queue: Queue[bytes] = Queue()
+        self.received_messages: list[MSRPCHeader] = []
+        self._pdu_framer = PDUFramer()
+
+    @property
+    def requests(self) -> list[RequestHeader]:
+        return [message for message in self.received_messages if isinstance(message, RequestHeader)]
+
+    async def read(self) -> bytes:
+        return await self.incoming_queue.get()
+
+    async def write(self, data: bytes) -> int:
+        self._pdu_framer.feed(data=data)
+        for fragment in self._pdu_framer.fragments():
+            with fragment:
+                self.received_messages.append(MSRPCHeader.from_bytes(data=bytes(fragment)))
+        return len(data)
+
+    def answer(
+        self,
+        request: RequestHeader,
+        stub_data: bytes = bytes(4),
+        pfc_flags: PfcFlag = PfcFlag.PFC_FIRST_FRAG | PfcFlag.PFC_LAST_FRAG
+    ) -> None:
+        self.incoming_queue.put_nowait(
+            bytes(ResponseHeader(pfc_flags=pfc_flags, call_id=request.call_id, stub_data=stub_data))
+        )
+
+    def received_message_types(self) -> list[type]:
+        return [type(message) for message in self.received_messages]
+
+
+class CallTimeoutTestCase(IsolatedAsyncioTestCase):
+
+    async def test_connection_call_timeout(self):
+        peer = HeldPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write, call_timeout=0.05) as connection:
+            response_future = await connection.send_message(message=RequestHeader(opnum=1))
+            with self.assertRaises(AsyncioTimeoutError):
+                await wait_for(response_future, timeout=5)
+            await sleep(0.01)
+
+            self.assertEqual(connection.num_in_flight_calls, 0)
+
+        self.assertEqual(peer.received_message_types(), [RequestHeader, CoCancelHeader])
+        self.assertEqual(peer.received_messages[1].call_id, peer.requests[0].call_id)
+
+    async def test_call_timeout(self):
+        peer = HeldPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write) as connection:
+            response_future = await connection.send_message(message=RequestHeader(opnum=1), timeout=0.05)
+            with self.assertRaises(AsyncioTimeoutError):
+                await wait_for(response_future, timeout=5)
+            await sleep(0.01)
+
+        self.assertEqual(peer.received_message_types(), [RequestHeader, CoCancelHeader])
+
+    async def test_late_response_dropped(self):
+        peer = HeldPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write) as connection:
+            response_future = await connection.send_message(message=RequestHeader(opnum=1), timeout=0.05)
+            with self.assertRaises(AsyncioTimeoutError):
+                await wait_for(response_future, timeout=5)
+
+            peer.answer(request=peer.requests[0], stub_data=b'late')
+            response_future = await connection.send_message(message=RequestHeader(opnum=2))
+            await sleep(0.01)
+            peer.answer(request=peer.requests[1], stub_data=b'good')
+
+            self.assertEqual(bytes((await wait_for(response_future, timeout=5)).stub_data), b'good')
+            self.assertEqual(connection.num_in_flight_calls, 0)
+
+
+class CallCancellationTestCase(IsolatedAsyncioTestCase):
+
+    async def test_cancelled_before_response(self):
+        peer = HeldPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write) as connection:
+            response_future = await connection.send_message(message=RequestHeader(opnum=1))
+            await sleep(0.01)
+            response_future.cancel()
+            with self.assertRaises(CancelledError):
+                await response_future
+            await sleep(0.01)
+
+        self.assertEqual(peer.received_message_types(), [RequestHeader, CoCancelHeader])
+
+    async def test_cancelled_waiting_caller(self):
+        peer = HeldPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write) as connection:
+            # A caller that gives up on the response cancels the call along with it.
+            with self.assertRaises(AsyncioTimeoutError):
+                await wait_for(await connection.send_message(message=RequestHeader(opnum=1)), timeout=0.05)
+            await sleep(0.01)
+
+        self.assertEqual(peer.received_message_types(), [RequestHeader, CoCancelHeader])
+
+    async def test_cancelled_during_response(self):
+        peer = HeldPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write) as connection:
+            response_future = await connection.send_message(message=RequestHeader(opnum=1))
+            await sleep(0.01)
+            peer.answer(request=peer.requests[0], stub_data=bytes(8), pfc_flags=PfcFlag.PFC_FIRST_FRAG)
+            await sleep(0.01)
+            response_future.cancel()
+            await sleep(0.01)
+
+            # The rest of the response is dropped.
+            peer.answer(request=peer.requests[0], stub_data=bytes(8), pfc_flags=PfcFlag.PFC_LAST_FRAG)
+            response_future = await connection.send_message(message=RequestHeader(opnum=2))
+            await sleep(0.01)
+            peer.answer(request=peer.requests[1], stub_data=b'good')
+            self.assertEqual(bytes((await wait_for(response_future, timeout=5)).stub_data), b'good')
+
+        self.assertEqual(peer.received_message_types(), [RequestHeader, OrphanedHeader, RequestHeader])
+
+
+class WriteFailureTestCase(IsolatedAsyncioTestCase):
+
+    async def test_outstanding_calls_fail(self):
+        incoming_queue: Queue[bytes] = Queue()
+
+        async def writer(data: bytes) -> int:
+            raise ConnectionResetError()
+
+        async with Connection(reader=incoming_queue.get, writer=writer) as connection:
+            with self.assertRaises(ConnectionClosedError) as context_manager:
+                await wait_for(await connection.send_message(message=RequestHeader(opnum=1)), timeout=5)
+
+            self.assertIsInstance(context_manager.exception.__cause__, ConnectionResetError)
+            self.assertTrue(connection.closed)
+            with self.assertRaises(ConnectionClosedError):
+                await connection.send_message(message=RequestHeader(opnum=2))
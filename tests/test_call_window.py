@@ -0,0 +1,128 @@
+from asyncio import Queue, create_task, gather, sleep, wait_for
+from unittest import IsolatedAsyncioTestCase
+
+from rpc.connection import Connection
+from rpc.pdu_framer import PDUFramer
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.co_cancel import CoCancelHeader
+from rpc.pdu_headers.fault import FaultHeader
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.structures.fault_status import FaultStatus
+from rpc.exceptions import ConnectionClosedError, OperationRangeError
+
+
+class HeldPeer:
+    """A peer that records the messages it receives and answers a request only when told to."""
+
+    def __init__(self):
+        self.incoming_queue: Queue[bytes] = Queue()
+        self.received_messages: list[MSRPCHeader] = []
+        self._pdu_framer = PDUFramer()
+
+    @property
+    def requests(self) -> list[RequestHeader]:
+        return [message for message in self.received_messages if isinstance(message, RequestHeader)]
+
+    async def read(self) -> bytes:
+        return await self.incoming_queue.get()
+
+    async def write(self, data: bytes) -> int:
+        self._pdu_framer.feed(data=data)
+        for fragment in self._pdu_framer.fragments():
+            with fragment:
+                self.received_messages.append(MSRPCHeader.from_bytes(data=bytes(fragment)))
+        return len(data)
+
+    def answer(self, request: RequestHeader, fault_status: int | None = None) -> None:
+        self.incoming_queue.put_nowait(
+            bytes(
+                FaultHeader(call_id=request.call_id, status=fault_status) if fault_status is not None
+                else ResponseHeader(call_id=request.call_id, stub_data=bytes(4))
+            )
+        )
+
+
+class CallWindowTestCase(IsolatedAsyncioTestCase):
+
+    async def test_window_limits_concurrent_calls(self):
+        peer = HeldPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write, max_in_flight_calls=2) as connection:
+            async def call() -> MSRPCHeader:
+                return await (await connection.send_message(message=RequestHeader(opnum=1)))
+
+            call_tasks = gather(*(call() for _ in range(5)))
+            await sleep(0.01)
+
+            self.assertEqual(len(peer.requests), 2)
+            metrics = connection.metrics()
+            self.assertEqual((metrics.num_in_flight_calls, metrics.num_calls_waiting_for_window), (2, 3))
+
+            # Each response frees up a slot for a waiting call.
+            num_answered_requests = 0
+            while num_answered_requests != 5:
+                self.assertLessEqual(len(peer.requests) - num_answered_requests, 2)
+                peer.answer(request=peer.requests[num_answered_requests])
+                num_answered_requests += 1
+                await sleep(0.01)
+
+            responses = await wait_for(call_tasks, timeout=5)
+
+            self.assertTrue(all(isinstance(response, ResponseHeader) for response in responses))
+            metrics = connection.metrics()
+            self.assertEqual(metrics.num_in_flight_calls, 0)
+            self.assertEqual(metrics.max_num_in_flight_calls, 2)
+            self.assertEqual(metrics.num_calls_waiting_for_window, 0)
+            self.assertEqual(metrics.num_queued_outgoing_messages, 0)
+            self.assertEqual(metrics.num_queued_incoming_messages, 0)
+
+    async def test_slot_released_on_fault(self):
+        peer = HeldPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write, max_in_flight_calls=1) as connection:
+            response_future = await connection.send_message(message=RequestHeader(opnum=99))
+            await sleep(0.01)
+            peer.answer(request=peer.requests[0], fault_status=FaultStatus.NCA_S_OP_RNG_ERROR)
+            with self.assertRaises(OperationRangeError):
+                await wait_for(response_future, timeout=5)
+
+            response_future = await wait_for(connection.send_message(message=RequestHeader(opnum=1)), timeout=5)
+            await sleep(0.01)
+            peer.answer(request=peer.requests[1])
+            self.assertIsInstance(await wait_for(response_future, timeout=5), ResponseHeader)
+            self.assertEqual(connection.metrics().num_in_flight_calls, 0)
+
+    async def test_slot_released_on_cancel(self):
+        peer = HeldPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write, max_in_flight_calls=1) as connection:
+            response_future = await connection.send_message(message=RequestHeader(opnum=1))
+            response_future.cancel()
+
+            response_future = await wait_for(connection.send_message(message=RequestHeader(opnum=2)), timeout=5)
+            await sleep(0.01)
+            self.assertEqual(connection.metrics().num_in_flight_calls, 1)
+            peer.answer(request=peer.requests[1])
+            self.assertIsInstance(await wait_for(response_future, timeout=5), ResponseHeader)
+
+        self.assertEqual(
+            [type(message) for message in peer.received_messages],
+            [RequestHeader, CoCancelHeader, RequestHeader]
+        )
+
+    async def test_waiting_call_fails_when_connection_closes(self):
+        peer = HeldPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write, max_in_flight_calls=1) as connection:
+            first_response_future = await connection.send_message(message=RequestHeader(opnum=1))
+            second_call_task = create_task(connection.send_message(message=RequestHeader(opnum=2)))
+            await sleep(0.01)
+            self.assertEqual(connection.metrics().num_calls_waiting_for_window, 1)
+
+        with self.assertRaises(ConnectionClosedError):
+            await wait_for(first_response_future, timeout=5)
+        # The call that was waiting for the window is not sent on the closed connection.
+        with self.assertRaises(ConnectionClosedError):
+            await wait_for(second_call_task, timeout=5)
+        self.assertEqual([request.opnum for request in peer.requests], [1])
@@ -0,0 +1,206 @@
+from asyncio import Queue, Event, gather, sleep, wait_for
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable
+from unittest import IsolatedAsyncioTestCase
+from uuid import UUID
+
+from rpc.connection import Connection
+from rpc.connection_pool import ConnectionPool
+from rpc.pdu_framer import PDUFramer
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.bind import BindHeader
+from rpc.pdu_headers.bind_ack import BindAckHeader
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.structures.context_element import NDR_PRESENTATION_SYNTAX
+from rpc.structures.context_negotiation_result import ContextNegotiationResult, ContDefResult, ProviderReason
+from rpc.structures.port_any import PortAny
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.structures.result_list import ResultList
+from rpc.exceptions import PresentationContextRejectedError, ConnectionPoolClosedError
+
+INTERFACE = PresentationSyntax(if_uuid=UUID('12345778-1234-abcd-ef00-0123456789ac'), if_version=1)
+OTHER_INTERFACE = PresentationSyntax(if_uuid=UUID('367abb81-9844-35f1-ad32-98f038001003'), if_version=2)
+UNKNOWN_INTERFACE = PresentationSyntax(if_uuid=UUID('12345778-1234-abcd-ef00-0123456789ab'), if_version=1)
+
+
+class ScriptedServer:
+    """A server that accepts binds to any interface but `UNKNOWN_INTERFACE`, and answers every request."""
+
+    def __init__(self):
+        self.num_connects = 0
+        self.num_binds = 0
+        self.num_closes = 0
+
+    @property
+    def num_open_connections(self) -> int:
+        return self.num_connects - self.num_closes
+
+    def _answer(self, message: MSRPCHeader) -> MSRPCHeader | None:
+        if isinstance(message, BindHeader):
+            self.num_binds += 1
+            accepted = message.presentation_context_list[0].abstract_syntax != UNKNOWN_INTERFACE
+            return BindAckHeader(
+                call_id=message.call_id,
+                sec_addr=PortAny(port_spec='49667'),
+                result_list=ResultList([
+                    ContextNegotiationResult(
+                        result=ContDefResult.ACCEPTANCE,
+                        reason=ProviderReason.REASON_NOT_SPECIFIED,
+                        transfer_syntax=NDR_PRESENTATION_SYNTAX
+                    ) if accepted else ContextNegotiationResult(
+                        result=ContDefResult.PROVIDER_REJECTION,
+                        reason=ProviderReason.ABSTRACT_SYNTAX_NOT_SUPPORTED,
+                        transfer_syntax=None
+                    )
+                ])
+            )
+
+        if isinstance(message, RequestHeader):
+            return ResponseHeader(call_id=message.call_id, stub_data=bytes(4))
+
+        return None
+
+    @asynccontextmanager
+    async def connect(self, endpoint: Hashable) -> AsyncIterator[Connection]:
+        self.num_connects += 1
+
+        incoming_queue: Queue[bytes] = Queue()
+        pdu_framer = PDUFramer()
+
+        async def writer(data: bytes) -> int:
+            pdu_framer.feed(data=data)
+            for fragment in pdu_framer.fragments():
+                with fragment:
+                    message = MSRPCHeader.from_bytes(data=bytes(fragment))
+                if (answer := self._answer(message=message)) is not None:
+                    incoming_queue.put_nowait(bytes(answer))
+            return len(data)
+
+        try:
+            async with Connection(reader=incoming_queue.get, writer=writer) as connection:
+                yield connection
+        finally:
+            self.num_closes += 1
+
+
+class ConnectionPoolTestCase(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.server = ScriptedServer()
+
+    async def _call(self, connection: Connection) -> None:
+        response = await wait_for(await connection.send_message(message=RequestHeader(opnum=1)), timeout=5)
+        self.assertIsInstance(response, ResponseHeader)
+
+    async def test_reuse(self):
+        async with ConnectionPool(connect=self.server.connect) as connection_pool:
+            for _ in range(3):
+                async with connection_pool.acquire(endpoint=('server', 49667), abstract_syntax=INTERFACE) as connection:
+                    await self._call(connection=connection)
+
+            self.assertEqual((self.server.num_connects, self.server.num_binds), (1, 1))
+            self.assertEqual(connection_pool.num_idle_connections, 1)
+
+        self.assertEqual(self.server.num_open_connections, 0)
+
+    async def test_keyed_by_interface(self):
+        async with ConnectionPool(connect=self.server.connect) as connection_pool:
+            async with connection_pool.acquire(endpoint=('server', 49667), abstract_syntax=INTERFACE):
+                pass
+            async with connection_pool.acquire(endpoint=('server', 49667), abstract_syntax=OTHER_INTERFACE):
+                pass
+
+            self.assertEqual(self.server.num_connects, 2)
+            self.assertEqual(connection_pool.num_idle_connections, 2)
+
+    async def test_concurrent_callers_get_distinct_connections(self):
+        async with ConnectionPool(connect=self.server.connect) as connection_pool:
+            checked_out_connections: list[Connection] = []
+            all_checked_out = Event()
+
+            async def check_out() -> None:
+                async with connection_pool.acquire(endpoint=('server', 49667), abstract_syntax=INTERFACE) as connection:
+                    checked_out_connections.append(connection)
+                    if len(checked_out_connections) == 3:
+                        all_checked_out.set()
+                    await all_checked_out.wait()
+
+            await wait_for(gather(*(check_out() for _ in range(3))), timeout=5)
+
+            self.assertEqual(len(set(map(id, checked_out_connections))), 3)
+
+    async def test_max_connections_per_host(self):
+        max_num_open_connections = 0
+
+        async with ConnectionPool(connect=self.server.connect, max_connections_per_host=2) as connection_pool:
+            async def call(port: int) -> None:
+                nonlocal max_num_open_connections
+                async with connection_pool.acquire(endpoint=('server', port), abstract_syntax=INTERFACE) as connection:
+                    max_num_open_connections = max(max_num_open_connections, self.server.num_open_connections)
+                    await sleep(0.01)
+                    await self._call(connection=connection)
+
+            # The limit applies to the host, whichever of its endpoints the connections are to.
+            await wait_for(gather(*(call(port=49667 + i % 3) for i in range(12))), timeout=5)
+
+        self.assertLessEqual(max_num_open_connections, 2)
+
+    async def test_idle_connection_evicted_for_other_interface(self):
+        async with ConnectionPool(connect=self.server.connect, max_connections_per_host=1) as connection_pool:
+            async with connection_pool.acquire(endpoint=('server', 49667), abstract_syntax=INTERFACE):
+                pass
+            async with connection_pool.acquire(endpoint=('server', 49667), abstract_syntax=OTHER_INTERFACE):
+                pass
+
+            self.assertEqual((self.server.num_connects, self.server.num_closes), (2, 1))
+
+    async def test_rejected_interface(self):
+        async with ConnectionPool(connect=self.server.connect, max_connections_per_host=1) as connection_pool:
+            with self.assertRaises(PresentationContextRejectedError) as context_manager:
+                async with connection_pool.acquire(endpoint=('server', 49667), abstract_syntax=UNKNOWN_INTERFACE):
+                    pass
+
+            self.assertEqual(context_manager.exception.reason, ProviderReason.ABSTRACT_SYNTAX_NOT_SUPPORTED)
+            self.assertEqual(self.server.num_open_connections, 0)
+
+            # The place of the rejected connection is given up.
+            async with connection_pool.acquire(endpoint=('server', 49667), abstract_syntax=INTERFACE) as connection:
+                await wait_for(self._call(connection=connection), timeout=5)
+
+    async def test_expired_idle_connection_replaced(self):
+        async with ConnectionPool(connect=self.server.connect, max_idle_time=0.0) as connection_pool:
+            for _ in range(2):
+                async with connection_pool.acquire(endpoint=('server', 49667), abstract_syntax=INTERFACE):
+                    pass
+                await sleep(0.01)
+
+            self.assertEqual((self.server.num_connects, self.server.num_closes), (2, 1))
+
+    async def test_unhealthy_idle_connection_replaced(self):
+        async def health_check(connection: Connection) -> bool:
+            return False
+
+        async with ConnectionPool(
+            connect=self.server.connect,
+            health_check=health_check,
+            health_check_idle_time=0.0
+        ) as connection_pool:
+            for _ in range(2):
+                async with connection_pool.acquire(endpoint=('server', 49667), abstract_syntax=INTERFACE):
+                    pass
+                await sleep(0.01)
+
+            self.assertEqual((self.server.num_connects, self.server.num_closes), (2, 1))
+
+    async def test_closed(self):
+        connection_pool = ConnectionPool(connect=self.server.connect)
+        async with connection_pool.acquire(endpoint=('server', 49667), abstract_syntax=INTERFACE):
+            pass
+
+        await connection_pool.close()
+
+        self.assertEqual(self.server.num_open_connections, 0)
+        with self.assertRaises(ConnectionPoolClosedError):
+            async with connection_pool.acquire(endpoint=('server', 49667), abstract_syntax=INTERFACE):
+                pass
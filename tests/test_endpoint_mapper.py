@@ -0,0 +1,365 @@
+from asyncio import Queue, gather, sleep
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable
+from unittest import TestCase, IsolatedAsyncioTestCase
+from uuid import UUID
+
+from rpc.connection import Connection
+from rpc.endpoint_mapper import EptMapRequest, EptMapResponse, EndpointMapperStatus, ept_map
+from rpc.endpoint_resolver import EndpointResolver
+from rpc.pdu_framer import PDUFramer
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.bind import BindHeader
+from rpc.pdu_headers.bind_ack import BindAckHeader
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.structures.context_element import NDR_PRESENTATION_SYNTAX, NDR64_PRESENTATION_SYNTAX
+from rpc.structures.context_negotiation_result import ContextNegotiationResult, ContDefResult, ProviderReason
+from rpc.structures.port_any import PortAny
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.structures.protocol_tower import ProtocolTower
+from rpc.structures.result_list import ResultList
+from rpc.utils.client_protocol_message import obtain_response
+from rpc.exceptions import EndpointMapperError, NDR64NotSupportedError, UnexpectedPDUError
+
+SAMR_ABSTRACT_SYNTAX = PresentationSyntax(if_uuid=UUID('12345778-1234-abcd-ef00-0123456789ac'), if_version=1)
+UNREGISTERED_ABSTRACT_SYNTAX = PresentationSyntax(if_uuid=UUID('12345778-1234-abcd-ef00-0123456789ab'), if_version=1)
+
+# The tower of an ncacn_ip_tcp endpoint of SAMR with the NDR 2.0 transfer syntax, with a port and an address of zero.
+SAMR_MAP_TOWER = bytes.fromhex(
+    '0500'  # floor count
+    '1300' '0d' '785734123412cdabef000123456789ac' '0100' '0200' '0000'  # SAMR, version 1.0
+    '1300' '0d' '045d888aeb1cc9119fe808002b104860' '0200' '0200' '0000'  # NDR 2.0, version 2.0
+    '0100' '0b' '0200' '0000'  # connection-oriented RPC
+    '0100' '07' '0200' '0000'  # TCP port
+    '0100' '09' '0400' '00000000'  # IP address
+)
+
+# The stub data of an ept_map request for `SAMR_MAP_TOWER`.
+SAMR_EPT_MAP_REQUEST = bytes.fromhex(
+    '00000000'  # null object UUID pointer
+    '01000200'  # referent id of the tower pointer
+    '4b000000' '4b000000'  # the conformance and the length of the tower
+    + SAMR_MAP_TOWER.hex()
+    + '00'  # padding to four bytes
+    '0000000000000000000000000000000000000000'  # null entry handle
+    '04000000'  # max_towers
+)
+
+# The stub data of an ept_map response, as sent by Windows, with one tower: SAMR at port 49667 of 10.0.0.5.
+SAMR_EPT_MAP_RESPONSE = bytes.fromhex(
+    '0000000000000000000000000000000000000000'  # entry handle
+    '01000000'  # num_towers
+    '04000000' '00000000' '01000000'  # maximum count, offset and actual count of the tower pointers
+    '03000000'  # referent id of the tower pointer
+    '4b000000' '4b000000'  # the conformance and the length of the tower
+    + SAMR_MAP_TOWER[:-16].hex()
+    + '0100' '07' '0200' 'c203'  # TCP port 49667
+    '0100' '09' '0400' '0a000005'  # IP address 10.0.0.5
+    '00'  # padding to four bytes
+    '00000000'  # status
+)
+
+
+class EndpointMapperMarshallingTestCase(TestCase):
+
+    def test_map_tower(self):
+        map_tower = ProtocolTower.for_tcp(
+            abstract_syntax=SAMR_ABSTRACT_SYNTAX,
+            transfer_syntax=NDR_PRESENTATION_SYNTAX
+        )
+
+        self.assertEqual(bytes(map_tower), SAMR_MAP_TOWER)
+        self.assertEqual(len(map_tower), len(SAMR_MAP_TOWER))
+        self.assertEqual(ProtocolTower.from_bytes(data=SAMR_MAP_TOWER), map_tower)
+        self.assertEqual(map_tower.abstract_syntax, SAMR_ABSTRACT_SYNTAX)
+        self.assertEqual(map_tower.floors[1].syntax(), NDR_PRESENTATION_SYNTAX)
+
+    def test_request(self):
+        request = EptMapRequest(
+            map_tower=ProtocolTower.for_tcp(
+                abstract_syntax=SAMR_ABSTRACT_SYNTAX,
+                transfer_syntax=NDR_PRESENTATION_SYNTAX
+            )
+        )
+
+        self.assertEqual(bytes(request), SAMR_EPT_MAP_REQUEST)
+        self.assertEqual(EptMapRequest.from_bytes(data=SAMR_EPT_MAP_REQUEST), request)
+
+    def test_request_with_object_uuid(self):
+        request = EptMapRequest(
+            map_tower=ProtocolTower.from_bytes(data=SAMR_MAP_TOWER),
+            object_uuid=UUID('6bffd098-a112-3610-9833-46c3f87e345a')
+        )
+
+        self.assertEqual(EptMapRequest.from_bytes(data=bytes(request)), request)
+
+    def test_response(self):
+        response = EptMapResponse.from_bytes(data=SAMR_EPT_MAP_RESPONSE)
+
+        self.assertEqual(response.return_code, EndpointMapperStatus.RPC_S_OK)
+        self.assertEqual(len(response.towers), 1)
+        self.assertEqual(response.towers[0].abstract_syntax, SAMR_ABSTRACT_SYNTAX)
+        self.assertEqual(response.towers[0].endpoint, PortAny(port_spec='49667'))
+        self.assertEqual(response.towers[0].floors[4].rhs, bytes([10, 0, 0, 5]))
+
+        self.assertEqual(EptMapResponse.from_bytes(data=bytes(response)), response)
+
+    def test_ndr64_not_supported(self):
+        with self.assertRaises(NDR64NotSupportedError):
+            EptMapResponse.from_bytes(data=SAMR_EPT_MAP_RESPONSE, ndr64=True)
+
+
+class EndpointMapperPeer:
+    """A peer that serves the endpoint mapper interface, mapping interfaces and transfer syntaxes to ports."""
+
+    def __init__(self, syntaxes_to_port: dict[tuple[UUID, UUID], int], accept_bind: bool = True):
+        self.syntaxes_to_port = syntaxes_to_port
+        self.accept_bind = accept_bind
+        self.num_connections = 0
+        self.map_towers: list[ProtocolTower] = []
+
+    def _answer(self, message: MSRPCHeader) -> MSRPCHeader | None:
+        if isinstance(message, BindHeader):
+            return BindAckHeader(
+                call_id=message.call_id,
+                sec_addr=PortAny(port_spec='135'),
+                result_list=ResultList([
+                    ContextNegotiationResult(
+                        result=ContDefResult.ACCEPTANCE,
+                        reason=ProviderReason.REASON_NOT_SPECIFIED,
+                        transfer_syntax=NDR_PRESENTATION_SYNTAX
+                    ) if self.accept_bind else ContextNegotiationResult(
+                        result=ContDefResult.PROVIDER_REJECTION,
+                        reason=ProviderReason.ABSTRACT_SYNTAX_NOT_SUPPORTED,
+                        transfer_syntax=None
+                    )
+                ])
+            )
+
+        if isinstance(message, RequestHeader):
+            map_tower = EptMapRequest.from_bytes(data=message.stub_data).map_tower
+            self.map_towers.append(map_tower)
+
+            port: int | None = self.syntaxes_to_port.get(
+                (map_tower.abstract_syntax.if_uuid, map_tower.floors[1].syntax().if_uuid)
+            )
+            if port is None:
+                response = EptMapResponse(return_code=EndpointMapperStatus.EPT_S_NOT_REGISTERED)
+            else:
+                response = EptMapResponse(
+                    return_code=EndpointMapperStatus.RPC_S_OK,
+                    towers=[
+                        ProtocolTower.for_tcp(
+                            abstract_syntax=map_tower.abstract_syntax,
+                            transfer_syntax=map_tower.floors[1].syntax(),
+                            port=port,
+                            ip_address='10.0.0.5'
+                        )
+                    ]
+                )
+
+            return ResponseHeader(call_id=message.call_id, stub_data=bytes(response))
+
+        return None
+
+    @asynccontextmanager
+    async def connect(self, host: Hashable) -> AsyncIterator[Connection]:
+        self.num_connections += 1
+
+        incoming_queue: Queue[bytes] = Queue()
+        pdu_framer = PDUFramer()
+
+        async def writer(data: bytes) -> int:
+            pdu_framer.feed(data=data)
+            for fragment in pdu_framer.fragments():
+                with fragment:
+                    message = MSRPCHeader.from_bytes(data=bytes(fragment))
+                if (answer := self._answer(message=message)) is not None:
+                    # Answer after a while, so that concurrent lookups overlap.
+                    await sleep(0.01)
+                    incoming_queue.put_nowait(bytes(answer))
+            return len(data)
+
+        async with Connection(reader=incoming_queue.get, writer=writer) as connection:
+            yield connection
+
+
+class EptMapTestCase(IsolatedAsyncioTestCase):
+
+    async def test_ept_map(self):
+        peer = EndpointMapperPeer(
+            syntaxes_to_port={(SAMR_ABSTRACT_SYNTAX.if_uuid, NDR_PRESENTATION_SYNTAX.if_uuid): 49667}
+        )
+
+        async with peer.connect(host='server') as connection:
+            towers = await ept_map(
+                rpc_connection=connection,
+                map_tower=ProtocolTower.from_bytes(data=SAMR_MAP_TOWER)
+            )
+
+        self.assertEqual([tower.endpoint for tower in towers], [PortAny(port_spec='49667')])
+
+    async def test_not_registered(self):
+        peer = EndpointMapperPeer(syntaxes_to_port={})
+
+        async with peer.connect(host='server') as connection:
+            towers = await ept_map(
+                rpc_connection=connection,
+                map_tower=ProtocolTower.from_bytes(data=SAMR_MAP_TOWER)
+            )
+
+        self.assertEqual(towers, [])
+
+    async def test_failure(self):
+        incoming_queue: Queue[bytes] = Queue()
+
+        async def writer(data: bytes) -> int:
+            request: RequestHeader = MSRPCHeader.from_bytes(data=bytes(data))
+            incoming_queue.put_nowait(
+                bytes(
+                    ResponseHeader(
+                        call_id=request.call_id,
+                        stub_data=bytes(EptMapResponse(return_code=EndpointMapperStatus.EPT_S_CANT_PERFORM_OP))
+                    )
+                )
+            )
+            return len(data)
+
+        async with Connection(reader=incoming_queue.get, writer=writer) as connection:
+            with self.assertRaises(EndpointMapperError) as context_manager:
+                await ept_map(rpc_connection=connection, map_tower=ProtocolTower.from_bytes(data=SAMR_MAP_TOWER))
+
+        self.assertEqual(context_manager.exception.status, EndpointMapperStatus.EPT_S_CANT_PERFORM_OP)
+
+    async def test_decode_executor(self):
+        incoming_queue: Queue[bytes] = Queue()
+
+        async def writer(data: bytes) -> int:
+            request: RequestHeader = MSRPCHeader.from_bytes(data=bytes(data))
+            incoming_queue.put_nowait(bytes(ResponseHeader(call_id=request.call_id, stub_data=SAMR_EPT_MAP_RESPONSE)))
+            return len(data)
+
+        class CountingExecutor(ThreadPoolExecutor):
+            num_submitted_calls = 0
+
+            def submit(self, *args, **kwargs):
+                self.num_submitted_calls += 1
+                return super().submit(*args, **kwargs)
+
+        request = EptMapRequest(map_tower=ProtocolTower.from_bytes(data=SAMR_MAP_TOWER))
+
+        with CountingExecutor(max_workers=1) as decode_executor:
+            async with Connection(reader=incoming_queue.get, writer=writer) as connection:
+                inline_response = await obtain_response(
+                    rpc_connection=connection,
+                    request=request,
+                    decode_executor=decode_executor
+                )
+                self.assertEqual(decode_executor.num_submitted_calls, 0)
+
+                executor_response = await obtain_response(
+                    rpc_connection=connection,
+                    request=request,
+                    decode_executor=decode_executor,
+                    decode_executor_threshold=16
+                )
+                self.assertEqual(decode_executor.num_submitted_calls, 1)
+
+        self.assertIsInstance(executor_response, EptMapResponse)
+        self.assertEqual(executor_response, inline_response)
+
+    async def test_unexpected_pdu(self):
+        incoming_queue: Queue[bytes] = Queue()
+
+        async def writer(data: bytes) -> int:
+            request: RequestHeader = MSRPCHeader.from_bytes(data=bytes(data))
+            incoming_queue.put_nowait(
+                bytes(
+                    BindAckHeader(call_id=request.call_id, sec_addr=PortAny(port_spec='135'), result_list=ResultList())
+                )
+            )
+            return len(data)
+
+        async with Connection(reader=incoming_queue.get, writer=writer) as connection:
+            with self.assertRaises(UnexpectedPDUError):
+                await ept_map(rpc_connection=connection, map_tower=ProtocolTower.from_bytes(data=SAMR_MAP_TOWER))
+
+
+class EndpointResolverTestCase(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.peer = EndpointMapperPeer(
+            syntaxes_to_port={
+                (SAMR_ABSTRACT_SYNTAX.if_uuid, NDR_PRESENTATION_SYNTAX.if_uuid): 49667,
+                (SAMR_ABSTRACT_SYNTAX.if_uuid, NDR64_PRESENTATION_SYNTAX.if_uuid): 49668
+            }
+        )
+        self.endpoint_resolver = EndpointResolver(connect=self.peer.connect)
+
+    async def test_cached(self):
+        for _ in range(3):
+            endpoint = await self.endpoint_resolver.resolve(host='server', abstract_syntax=SAMR_ABSTRACT_SYNTAX)
+            self.assertEqual(endpoint, PortAny(port_spec='49667'))
+
+        self.assertEqual(self.peer.num_connections, 1)
+
+    async def test_concurrent_resolutions_share_lookup(self):
+        endpoints = await gather(
+            *(self.endpoint_resolver.resolve(host='server', abstract_syntax=SAMR_ABSTRACT_SYNTAX) for _ in range(10))
+        )
+
+        self.assertEqual(set(endpoint.port_spec for endpoint in endpoints), {'49667'})
+        self.assertEqual(self.peer.num_connections, 1)
+
+    async def test_keyed_by_transfer_syntax(self):
+        ndr_endpoint = await self.endpoint_resolver.resolve(host='server', abstract_syntax=SAMR_ABSTRACT_SYNTAX)
+        ndr64_endpoint = await self.endpoint_resolver.resolve(
+            host='server',
+            abstract_syntax=SAMR_ABSTRACT_SYNTAX,
+            transfer_syntax=NDR64_PRESENTATION_SYNTAX
+        )
+
+        self.assertEqual((ndr_endpoint.port_spec, ndr64_endpoint.port_spec), ('49667', '49668'))
+        self.assertEqual(
+            [map_tower.floors[1].syntax() for map_tower in self.peer.map_towers],
+            [NDR_PRESENTATION_SYNTAX, NDR64_PRESENTATION_SYNTAX]
+        )
+
+    async def test_keyed_by_host(self):
+        await self.endpoint_resolver.resolve(host='server', abstract_syntax=SAMR_ABSTRACT_SYNTAX)
+        await self.endpoint_resolver.resolve(host='other-server', abstract_syntax=SAMR_ABSTRACT_SYNTAX)
+
+        self.assertEqual(self.peer.num_connections, 2)
+
+    async def test_missing_endpoint_cached(self):
+        for _ in range(2):
+            self.assertIsNone(
+                await self.endpoint_resolver.resolve(host='server', abstract_syntax=UNREGISTERED_ABSTRACT_SYNTAX)
+            )
+
+        self.assertEqual(self.peer.num_connections, 1)
+
+    async def test_invalidate(self):
+        await self.endpoint_resolver.resolve(host='server', abstract_syntax=SAMR_ABSTRACT_SYNTAX)
+        self.endpoint_resolver.invalidate(host='server', abstract_syntax=SAMR_ABSTRACT_SYNTAX)
+        await self.endpoint_resolver.resolve(host='server', abstract_syntax=SAMR_ABSTRACT_SYNTAX)
+
+        self.assertEqual(self.peer.num_connections, 2)
+
+    async def test_expiry(self):
+        endpoint_resolver = EndpointResolver(connect=self.peer.connect, ttl=0.0)
+
+        await endpoint_resolver.resolve(host='server', abstract_syntax=SAMR_ABSTRACT_SYNTAX)
+        await endpoint_resolver.resolve(host='server', abstract_syntax=SAMR_ABSTRACT_SYNTAX)
+
+        self.assertEqual(self.peer.num_connections, 2)
+
+    async def test_rejected_bind(self):
+        self.peer.accept_bind = False
+
+        with self.assertRaises(EndpointMapperError):
+            await self.endpoint_resolver.resolve(host='server', abstract_syntax=SAMR_ABSTRACT_SYNTAX)
+
+        self.assertEqual(len(self.endpoint_resolver), 0)
@@ -0,0 +1,129 @@
+from asyncio import Queue, wait_for
+from struct import pack_into
+from typing import Callable
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from rpc.connection import Connection
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.fault import FaultHeader
+from rpc.pdu_headers.bind_nak import BindNakHeader
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.structures.context_list import ContextList
+from rpc.structures.context_element import ContextElement
+from rpc.structures.fault_status import FaultStatus
+from rpc.structures.pfc_flag import PfcFlag
+from rpc.structures.reject_reason import RejectReason
+from rpc.endpoint_mapper import EPM_ABSTRACT_SYNTAX
+from rpc.exceptions import FaultError, OperationRangeError, AccessDeniedError, BindNakError, UnexpectedPDUError
+
+# A fault, as sent by Windows, for an operation number that the interface does not implement. The call id, at offset
+# 12, is filled in with that of the request.
+OPERATION_RANGE_FAULT = bytes.fromhex(
+    '05000323'  # rpc_vers, rpc_vers_minor, PTYPE, pfc_flags (first, last, did not execute)
+    '10000000'  # packed_drep
+    '20000000'  # frag_length, auth_length
+    '00000000'  # call_id
+    '00000000'  # alloc_hint
+    '0000' '00' '00'  # p_cont_id, cancel_count, reserved
+    'd1060000'  # status: RPC_S_PROCNUM_OUT_OF_RANGE
+    '00000000'  # reserved
+)
+
+# A bind_nak rejecting the protocol version, listing 5.0 as the one supported version.
+PROTOCOL_VERSION_BIND_NAK = bytes.fromhex(
+    '05000d03'  # rpc_vers, rpc_vers_minor, PTYPE, pfc_flags
+    '10000000'  # packed_drep
+    '15000000'  # frag_length, auth_length
+    '00000000'  # call_id
+    '0400'  # provider_reject_reason: PROTOCOL_VERSION_NOT_SUPPORTED
+    '01' '0500'  # n_protocols, and the supported version
+)
+
+
+def _answering_writer(incoming_queue: Queue[bytes], answer: Callable[[MSRPCHeader], bytes | None]):
+    async def writer(data: bytes) -> int:
+        message = MSRPCHeader.from_bytes(data=bytes(data))
+        if (answer_bytes := answer(message)) is not None:
+            answer_bytes = bytearray(answer_bytes)
+            pack_into('<I', answer_bytes, 12, message.call_id)
+            incoming_queue.put_nowait(bytes(answer_bytes))
+        return len(data)
+
+    return writer
+
+
+class FaultDecodingTestCase(TestCase):
+
+    def test_fault(self):
+        fault: FaultHeader = MSRPCHeader.from_bytes(data=OPERATION_RANGE_FAULT)
+
+        self.assertIsInstance(fault, FaultHeader)
+        self.assertEqual(fault.status, FaultStatus.RPC_S_PROCNUM_OUT_OF_RANGE)
+        self.assertIn(PfcFlag.PFC_DID_NOT_EXECUTE, fault.pfc_flags)
+        self.assertEqual(bytes(fault), OPERATION_RANGE_FAULT)
+
+    def test_fault_decoded_as_response(self):
+        with self.assertRaises(UnexpectedPDUError):
+            ResponseHeader.from_bytes(data=OPERATION_RANGE_FAULT)
+
+    def test_bind_nak(self):
+        bind_nak: BindNakHeader = MSRPCHeader.from_bytes(data=PROTOCOL_VERSION_BIND_NAK)
+
+        self.assertIsInstance(bind_nak, BindNakHeader)
+        self.assertIs(bind_nak.provider_reject_reason, RejectReason.PROTOCOL_VERSION_NOT_SUPPORTED)
+        self.assertEqual(bind_nak.versions, [(5, 0)])
+        self.assertEqual(bytes(bind_nak), PROTOCOL_VERSION_BIND_NAK)
+
+    def test_fault_error_from_status(self):
+        self.assertIs(type(FaultError.from_status(status=FaultStatus.NCA_S_OP_RNG_ERROR)), OperationRangeError)
+        self.assertIs(type(FaultError.from_status(status=FaultStatus.ERROR_ACCESS_DENIED)), AccessDeniedError)
+        self.assertIs(type(FaultError.from_status(status=0x12345678)), FaultError)
+
+
+class FaultedCallTestCase(IsolatedAsyncioTestCase):
+
+    async def test_fault(self):
+        incoming_queue: Queue[bytes] = Queue()
+
+        def answer(message: MSRPCHeader) -> bytes:
+            if message.opnum == 99:
+                return OPERATION_RANGE_FAULT
+            return bytes(ResponseHeader(stub_data=b'\x00' * 4))
+
+        async with Connection(
+            reader=incoming_queue.get,
+            writer=_answering_writer(incoming_queue=incoming_queue, answer=answer)
+        ) as connection:
+            with self.assertRaises(OperationRangeError) as context_manager:
+                await wait_for(await connection.send_message(message=RequestHeader(opnum=99)), timeout=5)
+
+            self.assertEqual(context_manager.exception.status, FaultStatus.RPC_S_PROCNUM_OUT_OF_RANGE)
+            self.assertTrue(context_manager.exception.did_not_execute)
+
+            # A fault fails only its own call.
+            response = await wait_for(await connection.send_message(message=RequestHeader(opnum=1)), timeout=5)
+            self.assertIsInstance(response, ResponseHeader)
+
+    async def test_bind_nak(self):
+        incoming_queue: Queue[bytes] = Queue()
+
+        def answer(message: MSRPCHeader) -> bytes:
+            return PROTOCOL_VERSION_BIND_NAK
+
+        async with Connection(
+            reader=incoming_queue.get,
+            writer=_answering_writer(incoming_queue=incoming_queue, answer=answer)
+        ) as connection:
+            with self.assertRaises(BindNakError) as context_manager:
+                await wait_for(
+                    connection.bind(
+                        presentation_context_list=ContextList([
+                            ContextElement(context_id=0, abstract_syntax=EPM_ABSTRACT_SYNTAX)
+                        ])
+                    ),
+                    timeout=5
+                )
+
+        self.assertIs(context_manager.exception.provider_reject_reason, RejectReason.PROTOCOL_VERSION_NOT_SUPPORTED)
+        self.assertEqual(context_manager.exception.versions, [(5, 0)])
@@ -0,0 +1,150 @@
+from asyncio import Queue
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from rpc.connection import Connection
+from rpc.fragmentation import fragment_message, StubDataReassembler, STUB_DATA_FRAGMENT_ALIGNMENT, \
+    MAX_PREALLOCATED_STUB_DATA_LENGTH
+from rpc.pdu_framer import PDUFramer
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.structures.pfc_flag import PfcFlag
+
+STUB_DATA = bytes(range(256)) * 40
+MAX_FRAG_LENGTH = 1000
+
+
+class FragmentMessageTestCase(TestCase):
+
+    def test_message_that_fits(self):
+        message = RequestHeader(call_id=1, stub_data=b'\x01' * 100)
+
+        self.assertEqual(list(fragment_message(message=message, max_frag_length=MAX_FRAG_LENGTH)), [message])
+
+    def test_fragments(self):
+        message = RequestHeader(
+            pfc_flags=PfcFlag.PFC_FIRST_FRAG | PfcFlag.PFC_LAST_FRAG | PfcFlag.PFC_MAYBE,
+            call_id=1,
+            opnum=5,
+            stub_data=STUB_DATA
+        )
+
+        fragments = list(fragment_message(message=message, max_frag_length=MAX_FRAG_LENGTH))
+
+        self.assertGreater(len(fragments), 1)
+        self.assertEqual(b''.join(bytes(fragment.stub_data) for fragment in fragments), STUB_DATA)
+
+        remaining_length = len(STUB_DATA)
+        for i, fragment in enumerate(fragments):
+            self.assertLessEqual(fragment.frag_length, MAX_FRAG_LENGTH)
+            self.assertEqual(fragment.alloc_hint, remaining_length)
+            self.assertEqual((fragment.call_id, fragment.opnum), (1, 5))
+            self.assertIn(PfcFlag.PFC_MAYBE, fragment.pfc_flags)
+            self.assertEqual(PfcFlag.PFC_FIRST_FRAG in fragment.pfc_flags, i == 0)
+            self.assertEqual(PfcFlag.PFC_LAST_FRAG in fragment.pfc_flags, i == len(fragments) - 1)
+            if i != len(fragments) - 1:
+                self.assertEqual(len(fragment.stub_data) % STUB_DATA_FRAGMENT_ALIGNMENT, 0)
+            remaining_length -= len(fragment.stub_data)
+
+    def test_no_room_for_stub_data(self):
+        message = RequestHeader(stub_data=STUB_DATA)
+
+        with self.assertRaises(ValueError):
+            list(fragment_message(message=message, max_frag_length=RequestHeader.structure_size + 4))
+
+
+class StubDataReassemblerTestCase(TestCase):
+
+    def _reassemble(self, fragments: list[ResponseHeader]) -> ResponseHeader:
+        stub_data_reassembler = StubDataReassembler(first_fragment=fragments[0])
+        for fragment in fragments[1:]:
+            stub_data_reassembler.add(fragment=fragment)
+        return stub_data_reassembler.message()
+
+    def test_reassembly(self):
+        message = ResponseHeader(call_id=3, context_id=1, stub_data=STUB_DATA)
+
+        reassembled_message = self._reassemble(
+            fragments=list(fragment_message(message=message, max_frag_length=MAX_FRAG_LENGTH))
+        )
+
+        self.assertEqual(bytes(reassembled_message.stub_data), STUB_DATA)
+        self.assertEqual(reassembled_message.alloc_hint, len(STUB_DATA))
+        self.assertEqual((reassembled_message.call_id, reassembled_message.context_id), (3, 1))
+        self.assertIn(PfcFlag.PFC_FIRST_FRAG, reassembled_message.pfc_flags)
+        self.assertIn(PfcFlag.PFC_LAST_FRAG, reassembled_message.pfc_flags)
+
+    def test_alloc_hint_too_small(self):
+        fragments = list(
+            fragment_message(message=ResponseHeader(stub_data=STUB_DATA), max_frag_length=MAX_FRAG_LENGTH)
+        )
+        # The allocation hint is only a hint; a sender may well leave it at zero.
+        for fragment in fragments:
+            fragment.alloc_hint = 0
+
+        reassembled_message = self._reassemble(fragments=fragments)
+
+        self.assertEqual(bytes(reassembled_message.stub_data), STUB_DATA)
+        self.assertEqual(reassembled_message.alloc_hint, len(STUB_DATA))
+
+    def test_alloc_hint_too_large(self):
+        fragments = list(
+            fragment_message(message=ResponseHeader(stub_data=STUB_DATA), max_frag_length=MAX_FRAG_LENGTH)
+        )
+        fragments[0].alloc_hint = 2 * len(STUB_DATA)
+
+        self.assertEqual(bytes(self._reassemble(fragments=fragments).stub_data), STUB_DATA)
+
+    def test_alloc_hint_not_trusted(self):
+        first_fragment = ResponseHeader(pfc_flags=PfcFlag.PFC_FIRST_FRAG, alloc_hint=0x1FFFFFFF, stub_data=b'\x01')
+
+        stub_data_reassembler = StubDataReassembler(first_fragment=first_fragment)
+
+        self.assertLessEqual(len(stub_data_reassembler._buffer), MAX_PREALLOCATED_STUB_DATA_LENGTH)
+        stub_data_reassembler.add(fragment=ResponseHeader(pfc_flags=PfcFlag.PFC_LAST_FRAG, stub_data=b'\x02'))
+        self.assertEqual(bytes(stub_data_reassembler.message().stub_data), b'\x01\x02')
+
+
+class FragmentedCallTestCase(IsolatedAsyncioTestCase):
+
+    async def test_fragmented_request_and_response(self):
+        incoming_queue: Queue[bytes] = Queue()
+        pdu_framer = PDUFramer()
+        received_request_fragments: list[RequestHeader] = []
+        stub_data_reassembler: StubDataReassembler | None = None
+
+        async def writer(data: bytes) -> int:
+            nonlocal stub_data_reassembler
+
+            pdu_framer.feed(data=data)
+            for fragment in pdu_framer.fragments():
+                with fragment:
+                    request: RequestHeader = MSRPCHeader.from_bytes(data=bytes(fragment))
+                received_request_fragments.append(request)
+
+                if PfcFlag.PFC_FIRST_FRAG in request.pfc_flags:
+                    stub_data_reassembler = StubDataReassembler(first_fragment=request)
+                else:
+                    stub_data_reassembler.add(fragment=request)
+
+                if PfcFlag.PFC_LAST_FRAG in request.pfc_flags:
+                    # Echo the stub data reversed, fragmented in the same way.
+                    response = ResponseHeader(
+                        call_id=request.call_id,
+                        stub_data=bytes(stub_data_reassembler.message().stub_data)[::-1]
+                    )
+                    for response_fragment in fragment_message(message=response, max_frag_length=MAX_FRAG_LENGTH):
+                        incoming_queue.put_nowait(bytes(response_fragment))
+
+            return len(data)
+
+        async with Connection(reader=incoming_queue.get, writer=writer) as connection:
+            connection.max_xmit_frag = MAX_FRAG_LENGTH
+            response: ResponseHeader = await (
+                await connection.send_message(message=RequestHeader(opnum=1, stub_data=STUB_DATA))
+            )
+
+        self.assertGreater(len(received_request_fragments), 1)
+        self.assertTrue(all(fragment.frag_length <= MAX_FRAG_LENGTH for fragment in received_request_fragments))
+        self.assertIsInstance(response, ResponseHeader)
+        self.assertEqual(bytes(response.stub_data), STUB_DATA[::-1])
@@ -0,0 +1,290 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import ClassVar, Type, Any
+from enum import IntEnum
+from unittest import TestCase, IsolatedAsyncioTestCase
+from unittest.mock import patch
+from uuid import UUID
+
+from msdsalgs.win32_error import Win32ErrorCode
+
+from rpc.auth import ntlm
+from rpc.auth.ntlm import NTLMClientContext, NTLMServerContext, ChallengeMessage, AuthenticateMessage, AvId, \
+    DEFAULT_NEGOTIATE_FLAGS, nt_owf_v2, pack_av_pairs
+from rpc.exceptions import AccessDeniedError, BindNakError, MessageIntegrityError
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.server import Server
+from rpc.structures.auth_level import AuthLevel
+from rpc.structures.auth_type import AuthType
+from rpc.structures.auth_verifier import AuthVerifier
+from rpc.structures.context_element import ContextElement
+from rpc.structures.context_list import ContextList
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.structures.reject_reason import RejectReason
+from rpc.transport import tcp_connection
+from rpc.utils.conformant_array import ConformantFixedSizeArray
+from rpc.utils.types import DWORD
+from rpc.utils.client_protocol_message import ClientProtocolRequestBase, ClientProtocolResponseBase, obtain_response
+
+# The values of the NTLMv2 examples of MS-NLMP section 4.2.4.
+USER_NAME = 'User'
+PASSWORD = 'Password'
+DOMAIN_NAME = 'Domain'
+SERVER_NAME = 'Server'
+WORKSTATION = 'COMPUTER'
+RANDOM_SESSION_KEY = bytes.fromhex('55' * 16)
+CLIENT_CHALLENGE = bytes.fromhex('aa' * 8)
+SERVER_CHALLENGE = bytes.fromhex('0123456789abcdef')
+PLAINTEXT = 'Plaintext'.encode(encoding='utf-16-le')
+
+RESPONSE_KEY_NT = bytes.fromhex('0c868a403bfd7a93a3001ef22ef02e3f')
+LM_CHALLENGE_RESPONSE = bytes.fromhex('86c35097ac9cec102554764a57cccc19aaaaaaaaaaaaaaaa')
+NT_PROOF_STR = bytes.fromhex('68cd0ab851e51c96aabc927bebef6a1c')
+ENCRYPTED_SESSION_KEY = bytes.fromhex('c5dad2544fc9799094ce1ce90bc9d03e')
+SEALED_PLAINTEXT = bytes.fromhex('54e50165bf1936dc996020c1811b0f06fb5f')
+PLAINTEXT_SIGNATURE = bytes.fromhex('010000007fb38ec5c55d497600000000')
+
+ECHO_ABSTRACT_SYNTAX = PresentationSyntax(if_uuid=UUID('5a9e2c41-0d7b-4f3e-8a61-c2b7e4d09f13'), if_version=1)
+BYTE_ARRAY = ConformantFixedSizeArray(element_format='<B')
+
+
+class EchoOperation(IntEnum):
+    ECHO = 0
+
+
+@dataclass
+class EchoResponse(ClientProtocolResponseBase):
+    data: Any
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {
+        'data': (BYTE_ARRAY,),
+        'return_code': (DWORD, Win32ErrorCode)
+    }
+
+
+@dataclass
+class EchoRequest(ClientProtocolRequestBase):
+    OPERATION: ClassVar[EchoOperation] = EchoOperation.ECHO
+    RESPONSE_CLASS: ClassVar[Type[ClientProtocolResponseBase]] = EchoResponse
+    ABSTRACT_SYNTAX: ClassVar[PresentationSyntax] = ECHO_ABSTRACT_SYNTAX
+
+    data: Any
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {'data': (BYTE_ARRAY,)}
+
+
+EchoResponse.REQUEST_CLASS = EchoRequest
+
+
+def authenticate_with_example_values(client_context: NTLMClientContext) -> AuthenticateMessage:
+    """Answer the example CHALLENGE message, with the example's client challenge, session key and time."""
+
+    client_context.negotiate()
+    challenge_message = ChallengeMessage(
+        negotiate_flags=DEFAULT_NEGOTIATE_FLAGS,
+        server_challenge=SERVER_CHALLENGE,
+        target_name=DOMAIN_NAME.encode(encoding='utf-16-le'),
+        target_info=pack_av_pairs(
+            av_pairs={
+                AvId.MSV_AV_NB_DOMAIN_NAME: DOMAIN_NAME.encode(encoding='utf-16-le'),
+                AvId.MSV_AV_NB_COMPUTER_NAME: SERVER_NAME.encode(encoding='utf-16-le')
+            }
+        )
+    )
+
+    with patch.object(ntlm, 'urandom', side_effect=[CLIENT_CHALLENGE, RANDOM_SESSION_KEY]), \
+            patch.object(ntlm, '_filetime_now', return_value=bytes(8)):
+        return AuthenticateMessage.from_bytes(data=client_context.authenticate(challenge=bytes(challenge_message)))
+
+
+def establish_security_contexts(auth_level: AuthLevel) -> tuple[NTLMClientContext, NTLMServerContext]:
+    client_context = NTLMClientContext(user_name=USER_NAME, password=PASSWORD, auth_level=auth_level)
+    server_context = NTLMServerContext(
+        credentials={USER_NAME: PASSWORD},
+        auth_level=auth_level,
+        auth_context_id=client_context.auth_context_id
+    )
+    challenge: bytes = server_context.challenge(negotiate=client_context.negotiate())
+    server_context.accept(authenticate=client_context.authenticate(challenge=challenge))
+
+    return client_context, server_context
+
+
+class NTLMv2ExampleTestCase(TestCase):
+
+    def setUp(self):
+        self.client_context = NTLMClientContext(
+            user_name=USER_NAME,
+            password=PASSWORD,
+            domain_name=DOMAIN_NAME,
+            workstation=WORKSTATION
+        )
+
+    def test_response_key(self):
+        self.assertEqual(nt_owf_v2(password=PASSWORD, user_name=USER_NAME, domain_name=DOMAIN_NAME), RESPONSE_KEY_NT)
+
+    def test_challenge_responses(self):
+        authenticate_message = authenticate_with_example_values(client_context=self.client_context)
+
+        self.assertEqual(authenticate_message.lm_challenge_response, LM_CHALLENGE_RESPONSE)
+        self.assertEqual(authenticate_message.nt_challenge_response[:16], NT_PROOF_STR)
+        self.assertEqual(authenticate_message.encrypted_random_session_key, ENCRYPTED_SESSION_KEY)
+
+    def test_seal_and_signature(self):
+        authenticate_with_example_values(client_context=self.client_context)
+
+        # The example seals and signs a bare message, rather than a PDU, with the sequence number zero.
+        signing_hmac = self.client_context._send_signing_hmac.copy()
+        signing_hmac.update(bytes(4) + PLAINTEXT)
+        sealing_handle = self.client_context._send_sealing_handle
+
+        self.assertEqual(sealing_handle.process(PLAINTEXT), SEALED_PLAINTEXT)
+        self.assertEqual(
+            self.client_context._signature(
+                digest=signing_hmac.digest(),
+                sequence_number=0,
+                sealing_handle=sealing_handle
+            ),
+            PLAINTEXT_SIGNATURE
+        )
+
+
+class MessageProtectionTestCase(TestCase):
+
+    def _protect_request(self, client_context: NTLMClientContext) -> bytearray:
+        request = RequestHeader(call_id=1, stub_data=PLAINTEXT)
+        client_context.protect(message=request)
+        return bytearray(bytes(request))
+
+    def _unprotect_request(self, server_context: NTLMServerContext, data: bytearray) -> RequestHeader:
+        fragment = memoryview(data)
+        request: RequestHeader = MSRPCHeader.from_bytes(data=fragment)
+        server_context.unprotect(message=request, fragment=fragment)
+        return request
+
+    def test_round_trip(self):
+        for auth_level in (AuthLevel.RPC_C_AUTHN_LEVEL_PKT_INTEGRITY, AuthLevel.RPC_C_AUTHN_LEVEL_PKT_PRIVACY):
+            with self.subTest(auth_level=auth_level):
+                client_context, server_context = establish_security_contexts(auth_level=auth_level)
+                data = self._protect_request(client_context=client_context)
+
+                self.assertEqual(
+                    PLAINTEXT in data,
+                    auth_level is AuthLevel.RPC_C_AUTHN_LEVEL_PKT_INTEGRITY
+                )
+                self.assertEqual(
+                    bytes(self._unprotect_request(server_context=server_context, data=data).stub_data),
+                    PLAINTEXT
+                )
+
+    def test_tampered_signature(self):
+        for auth_level in (AuthLevel.RPC_C_AUTHN_LEVEL_PKT_INTEGRITY, AuthLevel.RPC_C_AUTHN_LEVEL_PKT_PRIVACY):
+            with self.subTest(auth_level=auth_level):
+                client_context, server_context = establish_security_contexts(auth_level=auth_level)
+                data = self._protect_request(client_context=client_context)
+                # The last byte of the signature's checksum.
+                data[-5] ^= 0x01
+
+                with self.assertRaises(MessageIntegrityError):
+                    self._unprotect_request(server_context=server_context, data=data)
+
+    def test_tampered_stub_data(self):
+        client_context, server_context = establish_security_contexts(
+            auth_level=AuthLevel.RPC_C_AUTHN_LEVEL_PKT_PRIVACY
+        )
+        data = self._protect_request(client_context=client_context)
+        data[RequestHeader.structure_size] ^= 0x01
+
+        with self.assertRaises(MessageIntegrityError):
+            self._unprotect_request(server_context=server_context, data=data)
+
+    def test_replayed_request(self):
+        client_context, server_context = establish_security_contexts(
+            auth_level=AuthLevel.RPC_C_AUTHN_LEVEL_PKT_INTEGRITY
+        )
+        data = self._protect_request(client_context=client_context)
+        self._unprotect_request(server_context=server_context, data=bytearray(data))
+
+        with self.assertRaises(MessageIntegrityError):
+            self._unprotect_request(server_context=server_context, data=data)
+
+
+class AuthenticatedServerTestCase(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        async def handle_echo(request: EchoRequest) -> EchoResponse:
+            return EchoResponse(data=request.data, return_code=Win32ErrorCode.ERROR_SUCCESS)
+
+        server = Server(credentials={USER_NAME: PASSWORD})
+        server.register_handler(request_class=EchoRequest, handler=handle_echo)
+        self.asyncio_server = await server.start(host='127.0.0.1')
+        self.port: int = self.asyncio_server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.asyncio_server.close()
+        await self.asyncio_server.wait_closed()
+
+    async def test_echo(self):
+        data = bytes(range(256)) * 40
+        for auth_level in (
+            AuthLevel.RPC_C_AUTHN_LEVEL_CONNECT,
+            AuthLevel.RPC_C_AUTHN_LEVEL_PKT_INTEGRITY,
+            AuthLevel.RPC_C_AUTHN_LEVEL_PKT_PRIVACY
+        ):
+            with self.subTest(auth_level=auth_level):
+                async with tcp_connection(host='127.0.0.1', port=self.port) as connection:
+                    await connection.bind(
+                        presentation_context_list=ContextList([
+                            ContextElement(context_id=0, abstract_syntax=ECHO_ABSTRACT_SYNTAX)
+                        ]),
+                        security_context=NTLMClientContext(
+                            user_name=USER_NAME,
+                            password=PASSWORD,
+                            auth_level=auth_level
+                        )
+                    )
+
+                    # A short stub, and one that is fragmented in both directions.
+                    for stub_data in (data[:3], data):
+                        response: EchoResponse = await obtain_response(
+                            rpc_connection=connection,
+                            request=EchoRequest(data=stub_data)
+                        )
+                        self.assertEqual(bytes(response.data), stub_data)
+
+    async def test_bad_password(self):
+        async with tcp_connection(host='127.0.0.1', port=self.port) as connection:
+            await connection.bind(
+                presentation_context_list=ContextList([
+                    ContextElement(context_id=0, abstract_syntax=ECHO_ABSTRACT_SYNTAX)
+                ]),
+                security_context=NTLMClientContext(
+                    user_name=USER_NAME,
+                    password='Wrong' + PASSWORD,
+                    auth_level=AuthLevel.RPC_C_AUTHN_LEVEL_CONNECT
+                )
+            )
+
+            with self.assertRaises(AccessDeniedError):
+                await obtain_response(rpc_connection=connection, request=EchoRequest(data=b'data'))
+
+    async def test_unsupported_auth_type(self):
+        async with tcp_connection(host='127.0.0.1', port=self.port) as connection:
+            with self.assertRaises(BindNakError) as context_manager:
+                await connection.bind(
+                    presentation_context_list=ContextList([
+                        ContextElement(context_id=0, abstract_syntax=ECHO_ABSTRACT_SYNTAX)
+                    ]),
+                    auth_verifier=AuthVerifier(
+                        auth_level=AuthLevel.RPC_C_AUTHN_LEVEL_PKT_INTEGRITY,
+                        auth_context_id=0,
+                        auth_value=bytes(16),
+                        auth_type=AuthType.RPC_C_AUTHN_GSS_KERBEROS
+                    )
+                )
+
+        self.assertEqual(
+            context_manager.exception.provider_reject_reason,
+            RejectReason.AUTHENTICATION_TYPE_NOT_RECOGNIZED
+        )
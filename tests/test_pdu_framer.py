@@ -0,0 +1,127 @@
+from unittest import TestCase
+
+from rpc.pdu_framer import PDUFramer
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.exceptions import MalformedPDUError
+
+MESSAGES = [
+    RequestHeader(call_id=1, opnum=2, stub_data=bytes(range(24))),
+    ResponseHeader(call_id=1, stub_data=b'\xff' * 100),
+    RequestHeader(call_id=2, opnum=3, stub_data=b'')
+]
+MESSAGES_BYTES = [bytes(message) for message in MESSAGES]
+STREAM = b''.join(MESSAGES_BYTES)
+
+
+def _take_fragments(pdu_framer: PDUFramer) -> list[bytes]:
+    fragments: list[bytes] = []
+    for fragment in pdu_framer.fragments():
+        with fragment:
+            fragments.append(bytes(fragment))
+    return fragments
+
+
+class PDUFramerTestCase(TestCase):
+
+    def test_whole_stream(self):
+        pdu_framer = PDUFramer()
+        pdu_framer.feed(data=STREAM)
+
+        self.assertEqual(_take_fragments(pdu_framer=pdu_framer), MESSAGES_BYTES)
+        self.assertEqual(pdu_framer.num_buffered_bytes, 0)
+
+    def test_byte_by_byte(self):
+        pdu_framer = PDUFramer()
+
+        fragments: list[bytes] = []
+        for i in range(len(STREAM)):
+            pdu_framer.feed(data=STREAM[i:i+1])
+            fragments.extend(_take_fragments(pdu_framer=pdu_framer))
+
+        self.assertEqual(fragments, MESSAGES_BYTES)
+
+    def test_split_in_common_header(self):
+        pdu_framer = PDUFramer()
+
+        # The `frag_length` field, at offset 8, is not yet complete.
+        pdu_framer.feed(data=STREAM[:9])
+        self.assertEqual(_take_fragments(pdu_framer=pdu_framer), [])
+        self.assertEqual(pdu_framer.num_buffered_bytes, 9)
+
+        pdu_framer.feed(data=STREAM[9:])
+        self.assertEqual(_take_fragments(pdu_framer=pdu_framer), MESSAGES_BYTES)
+
+    def test_decoded_fragments(self):
+        pdu_framer = PDUFramer()
+        pdu_framer.feed(data=STREAM)
+
+        decoded_messages = [MSRPCHeader.from_bytes(data=fragment) for fragment in pdu_framer.fragments()]
+
+        self.assertEqual([type(message) for message in decoded_messages], [type(message) for message in MESSAGES])
+        self.assertEqual([bytes(message) for message in decoded_messages], MESSAGES_BYTES)
+
+    def test_get_buffer(self):
+        pdu_framer = PDUFramer(initial_buffer_size=64)
+
+        offset = 0
+        fragments: list[bytes] = []
+        while offset < len(STREAM):
+            # Write no more than 10 bytes at a time, as a transport would with little data available.
+            buffer = pdu_framer.get_buffer(size_hint=10)
+            num_bytes = min(len(buffer), 10, len(STREAM) - offset)
+            buffer[:num_bytes] = STREAM[offset:offset+num_bytes]
+            buffer.release()
+            pdu_framer.buffer_updated(num_bytes=num_bytes)
+            offset += num_bytes
+
+            fragments.extend(_take_fragments(pdu_framer=pdu_framer))
+
+        self.assertEqual(fragments, MESSAGES_BYTES)
+
+    def test_fragment_larger_than_buffer(self):
+        pdu_framer = PDUFramer(initial_buffer_size=32)
+        message_bytes = bytes(ResponseHeader(call_id=7, stub_data=bytes(range(256)) * 4))
+
+        pdu_framer.feed(data=message_bytes[:20])
+        pdu_framer.feed(data=message_bytes[20:])
+
+        self.assertEqual(_take_fragments(pdu_framer=pdu_framer), [message_bytes])
+
+    def test_buffer_reused(self):
+        pdu_framer = PDUFramer(initial_buffer_size=1024)
+        buffer = pdu_framer._buffer
+
+        for _ in range(100):
+            view = pdu_framer.get_buffer()
+            view[:len(STREAM)] = STREAM
+            view.release()
+            pdu_framer.buffer_updated(num_bytes=len(STREAM))
+
+            self.assertEqual(_take_fragments(pdu_framer=pdu_framer), MESSAGES_BYTES)
+
+        self.assertIs(pdu_framer._buffer, buffer)
+
+    def test_retained_fragment_not_overwritten(self):
+        pdu_framer = PDUFramer(initial_buffer_size=len(MESSAGES_BYTES[0]))
+        pdu_framer.feed(data=MESSAGES_BYTES[0])
+
+        retained_message: RequestHeader = MSRPCHeader.from_bytes(data=next(pdu_framer.fragments()))
+        self.assertIsInstance(retained_message.stub_data, memoryview)
+
+        for _ in range(10):
+            pdu_framer.feed(data=STREAM)
+            _take_fragments(pdu_framer=pdu_framer)
+
+        self.assertEqual(bytes(retained_message), MESSAGES_BYTES[0])
+
+    def test_frag_length_too_short(self):
+        pdu_framer = PDUFramer()
+
+        malformed = bytearray(MESSAGES_BYTES[0])
+        malformed[8:10] = (MSRPCHeader.structure_size - 1).to_bytes(2, 'little')
+        pdu_framer.feed(data=malformed)
+
+        with self.assertRaises(MalformedPDUError):
+            _take_fragments(pdu_framer=pdu_framer)
@@ -0,0 +1,95 @@
+from asyncio import Queue
+from struct import pack_into
+from unittest import TestCase, IsolatedAsyncioTestCase
+from uuid import UUID
+
+from rpc.connection import Connection
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.bind_ack import BindAckHeader
+from rpc.structures.context_element import ContextElement, NDR_PRESENTATION_SYNTAX, NDR64_PRESENTATION_SYNTAX, \
+    NDR64_AND_NDR_TRANSFER_SYNTAXES
+from rpc.structures.context_list import ContextList
+from rpc.structures.context_negotiation_result import ContDefResult, ProviderReason
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.structures.result_list import ResultList
+
+NDR64_INTERFACE = PresentationSyntax(if_uuid=UUID('12345778-1234-abcd-ef00-0123456789ac'), if_version=1)
+UNKNOWN_INTERFACE = PresentationSyntax(if_uuid=UUID('12345778-1234-abcd-ef00-0123456789ab'), if_version=1)
+NDR_INTERFACE = PresentationSyntax(if_uuid=UUID('367abb81-9844-35f1-ad32-98f038001003'), if_version=2)
+
+# A bind_ack, as sent by Windows, to a bind proposing NDR64 and NDR 2.0 for the first and third context and an unknown
+# interface in the second: NDR64 is accepted for the first, the second is rejected, and NDR 2.0 is accepted for the
+# third. The call id, at offset 12, is filled in with that of the bind.
+BIND_ACK_WITH_REJECTION = bytes.fromhex(
+    '05000c03'  # rpc_vers, rpc_vers_minor, PTYPE, pfc_flags
+    '10000000'  # packed_drep
+    '6c000000'  # frag_length, auth_length
+    '00000000'  # call_id
+    'b810b810'  # max_xmit_frag, max_recv_frag
+    '53f00000'  # assoc_group_id
+    '0400' '31333500' '0000'  # sec_addr "135", padded to four bytes
+    '03000000'  # n_results, reserved, reserved2
+    '0000' '0000' '33057171babe37498319b5dbef9ccc36' '01000000'  # acceptance of NDR64
+    '0200' '0100' '00000000000000000000000000000000' '00000000'  # provider rejection, abstract syntax not supported
+    '0000' '0000' '045d888aeb1cc9119fe808002b104860' '02000000'  # acceptance of NDR 2.0
+)
+
+PRESENTATION_CONTEXT_LIST = ContextList([
+    ContextElement(context_id=0, abstract_syntax=NDR64_INTERFACE, transfer_syntaxes=NDR64_AND_NDR_TRANSFER_SYNTAXES),
+    ContextElement(context_id=1, abstract_syntax=UNKNOWN_INTERFACE, transfer_syntaxes=NDR64_AND_NDR_TRANSFER_SYNTAXES),
+    ContextElement(context_id=2, abstract_syntax=NDR_INTERFACE, transfer_syntaxes=NDR64_AND_NDR_TRANSFER_SYNTAXES)
+])
+
+
+class BindAckDecodingTestCase(TestCase):
+
+    def test_results_after_rejection(self):
+        bind_ack: BindAckHeader = MSRPCHeader.from_bytes(data=BIND_ACK_WITH_REJECTION)
+
+        self.assertIsInstance(bind_ack, BindAckHeader)
+        self.assertEqual(bind_ack.sec_addr.port_spec, '135')
+        self.assertEqual(
+            [(result.result, result.reason) for result in bind_ack.result_list],
+            [
+                (ContDefResult.ACCEPTANCE, ProviderReason.REASON_NOT_SPECIFIED),
+                (ContDefResult.PROVIDER_REJECTION, ProviderReason.ABSTRACT_SYNTAX_NOT_SUPPORTED),
+                (ContDefResult.ACCEPTANCE, ProviderReason.REASON_NOT_SPECIFIED)
+            ]
+        )
+        self.assertEqual(bind_ack.result_list[0].transfer_syntax, NDR64_PRESENTATION_SYNTAX)
+        self.assertEqual(bind_ack.result_list[2].transfer_syntax, NDR_PRESENTATION_SYNTAX)
+
+    def test_round_trip(self):
+        bind_ack: BindAckHeader = MSRPCHeader.from_bytes(data=BIND_ACK_WITH_REJECTION)
+
+        self.assertEqual(bind_ack.frag_length, len(BIND_ACK_WITH_REJECTION))
+        self.assertEqual(bytes(bind_ack), BIND_ACK_WITH_REJECTION)
+
+    def test_rejection_encodes_zeroed_transfer_syntax(self):
+        result_list: ResultList = MSRPCHeader.from_bytes(data=BIND_ACK_WITH_REJECTION).result_list
+        result_list[1].transfer_syntax = None
+
+        self.assertEqual(bytes(result_list), BIND_ACK_WITH_REJECTION[32:])
+
+
+class BindTestCase(IsolatedAsyncioTestCase):
+
+    async def test_contexts_after_rejection(self):
+        incoming_queue: Queue[bytes] = Queue()
+
+        async def writer(data: bytes) -> int:
+            bind_ack = bytearray(BIND_ACK_WITH_REJECTION)
+            pack_into('<I', bind_ack, 12, MSRPCHeader.from_bytes(data=data).call_id)
+            incoming_queue.put_nowait(bytes(bind_ack))
+            return len(data)
+
+        async with Connection(reader=incoming_queue.get, writer=writer) as connection:
+            await connection.bind(presentation_context_list=PRESENTATION_CONTEXT_LIST)
+
+            self.assertEqual(connection.get_context_id(abstract_syntax=NDR64_INTERFACE), 0)
+            self.assertIsNone(connection.get_context_id(abstract_syntax=UNKNOWN_INTERFACE))
+            self.assertEqual(connection.get_context_id(abstract_syntax=NDR_INTERFACE), 2)
+
+            self.assertTrue(connection.is_ndr64_context(context_id=0))
+            self.assertFalse(connection.is_ndr64_context(context_id=2))
+            self.assertEqual(connection.context_id_to_transfer_syntax[2], NDR_PRESENTATION_SYNTAX)
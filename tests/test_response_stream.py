@@ -0,0 +1,123 @@
+from asyncio import Queue, sleep, wait_for
+from unittest import IsolatedAsyncioTestCase
+
+from rpc.connection import Connection
+from rpc.pdu_framer import PDUFramer
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.co_cancel import CoCancelHeader
+from rpc.pdu_headers.orphaned import OrphanedHeader
+from rpc.pdu_headers.request_header import RequestHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.structures.pfc_flag import PfcFlag
+
+STREAMED_OPNUM = 0
+NUM_STREAMED_FRAGMENTS = 8
+
+
+class ScriptedPeer:
+    """A peer that answers a request with `STREAMED_OPNUM` with several fragments and any other with one."""
+
+    def __init__(self):
+        self.incoming_queue: Queue[bytes] = Queue()
+        self.received_messages: list[MSRPCHeader] = []
+        self._pdu_framer = PDUFramer()
+
+    async def read(self) -> bytes:
+        return await self.incoming_queue.get()
+
+    async def write(self, data: bytes) -> int:
+        self._pdu_framer.feed(data=data)
+        for fragment in self._pdu_framer.fragments():
+            with fragment:
+                message = MSRPCHeader.from_bytes(data=bytes(fragment))
+            self.received_messages.append(message)
+
+            if not isinstance(message, RequestHeader):
+                continue
+
+            num_fragments = NUM_STREAMED_FRAGMENTS if message.opnum == STREAMED_OPNUM else 1
+            for i in range(num_fragments):
+                pfc_flags = PfcFlag(0)
+                if i == 0:
+                    pfc_flags |= PfcFlag.PFC_FIRST_FRAG
+                if i == num_fragments - 1:
+                    pfc_flags |= PfcFlag.PFC_LAST_FRAG
+                self.incoming_queue.put_nowait(
+                    bytes(ResponseHeader(pfc_flags=pfc_flags, call_id=message.call_id, stub_data=bytes([i]) * 8))
+                )
+
+        return len(data)
+
+    def received_message_types(self) -> list[type]:
+        return [type(message) for message in self.received_messages]
+
+
+class AbandonedStreamTestCase(IsolatedAsyncioTestCase):
+
+    async def _assert_connection_usable(self, connection: Connection) -> None:
+        async def call() -> ResponseHeader:
+            return await (await connection.send_message(message=RequestHeader(opnum=1)))
+
+        # Both a call slot that is not released and a fragment queue that is not drained make the call hang.
+        self.assertEqual(bytes((await wait_for(call(), timeout=5)).stub_data), bytes(8))
+
+    async def test_stream_never_iterated(self):
+        peer = ScriptedPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write, max_in_flight_calls=1) as connection:
+            stub_data_fragments = await connection.send_message_stream(
+                message=RequestHeader(opnum=STREAMED_OPNUM),
+                max_queued_fragments=2
+            )
+            # Let the response fill the fragment queue, which holds back the receiving of messages.
+            await sleep(0.05)
+            del stub_data_fragments
+
+            await self._assert_connection_usable(connection=connection)
+
+        self.assertIn(OrphanedHeader, peer.received_message_types())
+
+    async def test_stream_dropped_before_response(self):
+        peer = ScriptedPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write, max_in_flight_calls=1) as connection:
+            await connection.send_message_stream(message=RequestHeader(opnum=STREAMED_OPNUM), max_queued_fragments=2)
+
+            await self._assert_connection_usable(connection=connection)
+
+        self.assertIn(CoCancelHeader, peer.received_message_types())
+
+    async def test_stream_partially_iterated(self):
+        peer = ScriptedPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write, max_in_flight_calls=1) as connection:
+            stub_data_fragments = await connection.send_message_stream(
+                message=RequestHeader(opnum=STREAMED_OPNUM),
+                max_queued_fragments=2
+            )
+            self.assertEqual(bytes(await stub_data_fragments.__anext__()), bytes(8))
+            await sleep(0.05)
+            del stub_data_fragments
+
+            await self._assert_connection_usable(connection=connection)
+
+        self.assertIn(OrphanedHeader, peer.received_message_types())
+
+    async def test_stream_consumed(self):
+        peer = ScriptedPeer()
+
+        async with Connection(reader=peer.read, writer=peer.write, max_in_flight_calls=1) as connection:
+            stub_data_fragments = await connection.send_message_stream(
+                message=RequestHeader(opnum=STREAMED_OPNUM),
+                max_queued_fragments=2
+            )
+            self.assertEqual(
+                [bytes(stub_data) async for stub_data in stub_data_fragments],
+                [bytes([i]) * 8 for i in range(NUM_STREAMED_FRAGMENTS)]
+            )
+            del stub_data_fragments
+
+            await self._assert_connection_usable(connection=connection)
+
+        self.assertNotIn(CoCancelHeader, peer.received_message_types())
+        self.assertNotIn(OrphanedHeader, peer.received_message_types())
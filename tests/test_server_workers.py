@@ -0,0 +1,70 @@
+from dataclasses import asdict
+from queue import Queue
+from types import SimpleNamespace
+from unittest import TestCase
+
+from rpc.server import Server, ServerStats
+from rpc.server_workers import ServerSupervisor
+
+
+class FakeProcess(SimpleNamespace):
+
+    def is_alive(self) -> bool:
+        return self.exitcode is None
+
+
+class ServerSupervisorStatsTestCase(TestCase):
+
+    def setUp(self):
+        self.supervisor = ServerSupervisor(make_server=Server, num_workers=2, restart_delay=0.0)
+        # The reports are put in the queue by this process rather than by worker processes.
+        self.supervisor._stats_queue = Queue()
+        self.next_pid = 100
+
+        def start_worker(worker_id: int) -> None:
+            self.supervisor._worker_id_to_process[worker_id] = FakeProcess(pid=self.next_pid, exitcode=None)
+            self.supervisor._worker_id_to_start_time[worker_id] = 0.0
+            self.supervisor.worker_id_to_status[worker_id].pid = self.next_pid
+            self.next_pid += 1
+
+        self.supervisor._start_worker = start_worker
+        self.supervisor.start()
+
+    def _report(self, worker_id: int, stats: ServerStats) -> None:
+        pid = self.supervisor.worker_id_to_status[worker_id].pid
+        self.supervisor._stats_queue.put_nowait((worker_id, pid, asdict(stats)))
+
+    def _exit(self, worker_id: int) -> None:
+        self.supervisor._worker_id_to_process[worker_id].exitcode = 1
+
+    def test_totals_carried_across_restart(self):
+        self._report(worker_id=0, stats=ServerStats(num_accepted_connections=2, num_open_connections=2, num_calls=10))
+        self._report(worker_id=1, stats=ServerStats(num_accepted_connections=1, num_open_connections=1, num_calls=3))
+        self.supervisor._collect_stats()
+
+        self._exit(worker_id=0)
+        self.supervisor._restart_exited_workers()
+        self._report(worker_id=0, stats=ServerStats(num_accepted_connections=1, num_open_connections=1, num_calls=4))
+        self.supervisor._collect_stats()
+
+        self.assertEqual(self.supervisor.worker_id_to_status[0].num_restarts, 1)
+        self.assertEqual(
+            self.supervisor.worker_id_to_status[0].stats,
+            ServerStats(num_accepted_connections=3, num_open_connections=1, num_calls=14)
+        )
+        self.assertEqual(
+            self.supervisor.aggregate_stats(),
+            ServerStats(num_accepted_connections=4, num_open_connections=2, num_calls=17)
+        )
+
+    def test_late_report_of_exited_process_ignored(self):
+        self._report(worker_id=0, stats=ServerStats(num_calls=10))
+        self.supervisor._collect_stats()
+
+        exited_pid = self.supervisor.worker_id_to_status[0].pid
+        self._exit(worker_id=0)
+        self.supervisor._restart_exited_workers()
+        self.supervisor._stats_queue.put_nowait((0, exited_pid, asdict(ServerStats(num_calls=11))))
+        self.supervisor._collect_stats()
+
+        self.assertEqual(self.supervisor.worker_id_to_status[0].stats, ServerStats(num_calls=10))
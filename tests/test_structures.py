@@ -0,0 +1,169 @@
+from array import array
+from importlib.util import find_spec
+from types import SimpleNamespace
+from typing import Type
+from unittest import TestCase, skipUnless
+from uuid import UUID
+
+from msdsalgs.win32_error import Win32ErrorCode
+
+from rpc.structures.context_handle import ContextHandle
+from rpc.utils import CompiledStructure, unpack_structure, pack_structure
+from rpc.utils.types import DWORD, ULONGLONG, CONTEXT_HANDLE, LPDWORD, DWORD_ARRAY, LPDWORD_ARRAY
+from rpc.utils.conformant_array import ConformantFixedSizeArray
+from rpc.exceptions import MalformedPDUError
+
+CONTEXT_HANDLE_VALUE = ContextHandle(
+    context_handle_attributes=0,
+    context_handle_uuid=UUID('7f0e3a1b-5c2d-4e6f-8091-a2b3c4d5e6f7')
+)
+
+# Structures for which the compiled form is to produce the same result as `unpack_structure` and `pack_structure`, and
+# an instance of each.
+EQUIVALENT_STRUCTURES: list[tuple[str, dict[str, tuple[Type, ...]], SimpleNamespace]] = [
+    (
+        'fixed-size values',
+        {
+            'context_handle': (CONTEXT_HANDLE,),
+            'level': (DWORD,),
+            'resume_handle': (LPDWORD,),
+            'return_code': (DWORD, Win32ErrorCode)
+        },
+        SimpleNamespace(
+            context_handle=CONTEXT_HANDLE_VALUE,
+            level=2,
+            resume_handle=0x11223344,
+            return_code=Win32ErrorCode.ERROR_SUCCESS
+        )
+    ),
+    (
+        'conformant array',
+        {
+            'count': (DWORD,),
+            'values': (DWORD_ARRAY,),
+            'return_code': (DWORD, Win32ErrorCode)
+        },
+        SimpleNamespace(count=3, values=array('I', [1, 2, 0xFFFFFFFF]), return_code=Win32ErrorCode.ERROR_SUCCESS)
+    ),
+    (
+        'pointer to conformant array',
+        {
+            'count': (DWORD,),
+            'values': (LPDWORD_ARRAY,),
+            'return_code': (DWORD, Win32ErrorCode)
+        },
+        SimpleNamespace(count=5, values=array('I', range(5)), return_code=Win32ErrorCode.ERROR_SUCCESS)
+    )
+]
+
+
+class CompiledStructureEquivalenceTestCase(TestCase):
+
+    def test_pack(self):
+        for name, structure, instance in EQUIVALENT_STRUCTURES:
+            with self.subTest(name):
+                self.assertEqual(
+                    CompiledStructure(structure=structure).pack(instance=instance),
+                    pack_structure(instance=instance, structure=structure)
+                )
+
+    def test_unpack(self):
+        for name, structure, instance in EQUIVALENT_STRUCTURES:
+            with self.subTest(name):
+                data = pack_structure(instance=instance, structure=structure)
+
+                compiled_values = CompiledStructure(structure=structure).unpack(data=data)
+
+                self.assertEqual(compiled_values, unpack_structure(data=data, structure=structure))
+                self.assertEqual(compiled_values, vars(instance))
+
+    def test_unpack_at_offset(self):
+        _, structure, instance = EQUIVALENT_STRUCTURES[1]
+        data = b'\xaa' * 8 + pack_structure(instance=instance, structure=structure)
+
+        self.assertEqual(CompiledStructure(structure=structure).unpack(data=data, offset=8), vars(instance))
+
+
+class NDR64TestCase(TestCase):
+
+    def _assert_ndr64(self, structure: dict[str, tuple[Type, ...]], instance: SimpleNamespace, hex_data: str):
+        compiled_structure = CompiledStructure(structure=structure, ndr64=True)
+        data = bytes.fromhex(hex_data)
+
+        self.assertEqual(compiled_structure.pack(instance=instance), data)
+        self.assertEqual(compiled_structure.unpack(data=data), vars(instance))
+
+    def test_aligned_ulonglong(self):
+        self._assert_ndr64(
+            structure={'flags': (DWORD,), 'timestamp': (ULONGLONG,)},
+            instance=SimpleNamespace(flags=1, timestamp=0x0102030405060708),
+            hex_data='01000000' '00000000' '0807060504030201'
+        )
+
+    def test_pointer(self):
+        self._assert_ndr64(
+            structure={'level': (DWORD,), 'resume_handle': (LPDWORD,)},
+            instance=SimpleNamespace(level=1, resume_handle=0x11223344),
+            # The referent id is a 64-bit integer, aligned to eight bytes.
+            hex_data='01000000' '00000000' '0000020000000000' '44332211'
+        )
+
+    def test_conformant_array(self):
+        self._assert_ndr64(
+            structure={'count': (DWORD,), 'values': (DWORD_ARRAY,)},
+            instance=SimpleNamespace(count=2, values=array('I', [5, 6])),
+            # The conformance is a 64-bit integer, aligned to eight bytes; nothing pads the end of the elements.
+            hex_data='02000000' '00000000' '0200000000000000' '05000000' '06000000'
+        )
+
+    def test_pointer_to_conformant_array(self):
+        self._assert_ndr64(
+            structure={'values': (LPDWORD_ARRAY,), 'return_code': (DWORD,)},
+            instance=SimpleNamespace(values=array('I', [7]), return_code=0x57),
+            hex_data='0000020000000000' '0100000000000000' '07000000' '57000000'
+        )
+
+
+class ConformantFixedSizeArrayTestCase(TestCase):
+
+    def test_alignment_relative_to_stub_data(self):
+        conformant_array = ConformantFixedSizeArray(element_format='<Q')
+
+        data = conformant_array.to_bytes(elements=[1, 2], offset=6)
+
+        # The conformance is aligned to four bytes and the elements to eight, relative to the start of the stub data.
+        self.assertEqual(data.hex(), '0000' '02000000' '00000000' '0100000000000000' '0200000000000000')
+        self.assertEqual(conformant_array.from_bytes(data=bytes(6) + data, offset=6), (array('Q', [1, 2]), 32))
+
+    def test_structure_elements(self):
+        conformant_array = ConformantFixedSizeArray(element_format='<IHxx')
+        elements = [(1, 2), (3, 4)]
+
+        data = conformant_array.to_bytes(elements=elements)
+
+        self.assertEqual(conformant_array.from_bytes(data=data), (elements, len(data)))
+
+    def test_array_copied(self):
+        data = bytearray(DWORD_ARRAY.to_bytes(elements=[1, 2, 3]))
+
+        elements, _ = DWORD_ARRAY.from_bytes(data=data)
+        data[-4:] = bytes(4)
+
+        self.assertEqual(elements, array('I', [1, 2, 3]))
+
+    @skipUnless(find_spec('numpy'), 'NumPy is not installed.')
+    def test_numpy_array_is_view(self):
+        from numpy import frombuffer, shares_memory
+
+        data = bytearray(ConformantFixedSizeArray(element_format='<I').to_bytes(elements=[1, 2, 3]))
+
+        elements, _ = ConformantFixedSizeArray(element_format='<I', use_numpy=True).from_bytes(data=data)
+
+        self.assertEqual(elements.tolist(), [1, 2, 3])
+        self.assertTrue(shares_memory(elements, frombuffer(data, dtype='u1')))
+
+    def test_truncated(self):
+        data = DWORD_ARRAY.to_bytes(elements=[1, 2, 3])
+
+        with self.assertRaises(MalformedPDUError):
+            DWORD_ARRAY.from_bytes(data=data[:-1])
@@ -0,0 +1,230 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import ClassVar, Type, Any
+from enum import IntEnum
+from os import path as os_path
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+from uuid import UUID
+
+from msdsalgs.win32_error import Win32ErrorCode
+
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.response_header import ResponseHeader
+from rpc.server import Server
+from rpc.structures.context_element import ContextElement
+from rpc.structures.context_list import ContextList
+from rpc.structures.context_negotiation_result import ContDefResult, ProviderReason
+from rpc.structures.presentation_syntax import PresentationSyntax
+from rpc.transport import RPCTransportProtocol, tcp_connection, unix_connection
+from rpc.utils.conformant_array import ConformantFixedSizeArray
+from rpc.utils.types import DWORD
+from rpc.utils.client_protocol_message import ClientProtocolRequestBase, ClientProtocolResponseBase, obtain_response
+
+ECHO_ABSTRACT_SYNTAX = PresentationSyntax(if_uuid=UUID('5a9e2c41-0d7b-4f3e-8a61-c2b7e4d09f13'), if_version=1)
+ECHO_V2_ABSTRACT_SYNTAX = PresentationSyntax(if_uuid=ECHO_ABSTRACT_SYNTAX.if_uuid, if_version=2)
+BYTE_ARRAY = ConformantFixedSizeArray(element_format='<B')
+
+
+class EchoOperation(IntEnum):
+    ECHO = 0
+
+
+@dataclass
+class EchoResponse(ClientProtocolResponseBase):
+    data: Any
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {
+        'data': (BYTE_ARRAY,),
+        'return_code': (DWORD, Win32ErrorCode)
+    }
+
+
+@dataclass
+class EchoRequest(ClientProtocolRequestBase):
+    OPERATION: ClassVar[EchoOperation] = EchoOperation.ECHO
+    RESPONSE_CLASS: ClassVar[Type[ClientProtocolResponseBase]] = EchoResponse
+    ABSTRACT_SYNTAX: ClassVar[PresentationSyntax] = ECHO_ABSTRACT_SYNTAX
+
+    data: Any
+
+    _STRUCTURE: ClassVar[dict[str, tuple[Type, ...]]] = {'data': (BYTE_ARRAY,)}
+
+
+EchoResponse.REQUEST_CLASS = EchoRequest
+
+
+class FakeTransport:
+    """A transport that records the pausing and resuming of reading."""
+
+    def __init__(self):
+        self.num_pauses = 0
+        self.num_resumes = 0
+
+    def pause_reading(self) -> None:
+        self.num_pauses += 1
+
+    def resume_reading(self) -> None:
+        self.num_resumes += 1
+
+    def is_closing(self) -> bool:
+        return False
+
+
+class RPCTransportProtocolTestCase(IsolatedAsyncioTestCase):
+
+    def _receive(self, protocol: RPCTransportProtocol, data: bytes) -> None:
+        """Receive bytes as an event loop would, into the buffers offered by the protocol."""
+
+        data = memoryview(data)
+        while data:
+            buffer = protocol.get_buffer(sizehint=-1)
+            num_bytes = min(len(buffer), len(data))
+            buffer[:num_bytes] = data[:num_bytes]
+            protocol.buffer_updated(nbytes=num_bytes)
+            data = data[num_bytes:]
+
+    async def test_reading_paused_at_high_water_mark(self):
+        protocol = RPCTransportProtocol()
+        transport = FakeTransport()
+        protocol.connection_made(transport=transport)
+
+        fragment = bytes(ResponseHeader(stub_data=bytes(range(256)) * 16))
+        num_fragments = -(-1048576 // len(fragment))
+
+        self._receive(protocol=protocol, data=fragment * (num_fragments - 1))
+        self.assertEqual(transport.num_pauses, 0)
+        self._receive(protocol=protocol, data=fragment)
+        self.assertEqual(transport.num_pauses, 1)
+
+        self.assertEqual(await protocol.read(), num_fragments * len(fragment))
+        self.assertEqual(transport.num_resumes, 1)
+
+        num_received_fragments = 0
+        for received_fragment in protocol.pdu_framer.fragments():
+            with received_fragment:
+                self.assertEqual(bytes(MSRPCHeader.from_bytes(data=received_fragment)), fragment)
+            num_received_fragments += 1
+        self.assertEqual(num_received_fragments, num_fragments)
+
+    async def test_end_of_stream(self):
+        protocol = RPCTransportProtocol()
+        protocol.connection_made(transport=FakeTransport())
+
+        self._receive(protocol=protocol, data=b'\x05\x00')
+        protocol.eof_received()
+
+        self.assertEqual(await protocol.read(), 2)
+        self.assertEqual(await protocol.read(), 0)
+
+
+class LoopbackTestCase(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        async def handle_echo(request: EchoRequest) -> EchoResponse:
+            return EchoResponse(data=request.data, return_code=Win32ErrorCode.ERROR_SUCCESS)
+
+        self.server = Server()
+        self.server.register_handler(request_class=EchoRequest, handler=handle_echo)
+
+    async def _assert_echo(self, connection_context_manager) -> None:
+        # A response of several fragments, received into the framer of the connection.
+        data = bytes(range(256)) * 1024
+
+        with patch.object(
+            RPCTransportProtocol,
+            'buffer_updated',
+            autospec=True,
+            side_effect=RPCTransportProtocol.buffer_updated
+        ) as buffer_updated:
+            async with connection_context_manager as connection:
+                await connection.bind(
+                    presentation_context_list=ContextList([
+                        ContextElement(context_id=0, abstract_syntax=ECHO_ABSTRACT_SYNTAX)
+                    ])
+                )
+                response: EchoResponse = await obtain_response(
+                    rpc_connection=connection,
+                    request=EchoRequest(data=data)
+                )
+
+        self.assertEqual(bytes(response.data), data)
+        self.assertGreater(sum(call.args[1] for call in buffer_updated.call_args_list), len(data))
+
+    async def test_tcp(self):
+        asyncio_server = await self.server.start(host='127.0.0.1')
+        try:
+            await self._assert_echo(
+                connection_context_manager=tcp_connection(
+                    host='127.0.0.1',
+                    port=asyncio_server.sockets[0].getsockname()[1]
+                )
+            )
+        finally:
+            asyncio_server.close()
+            await asyncio_server.wait_closed()
+
+    async def test_unix(self):
+        with TemporaryDirectory() as directory:
+            socket_path = os_path.join(directory, 'rpc.sock')
+            asyncio_server = await self.server.start_unix(path=socket_path)
+            try:
+                await self._assert_echo(connection_context_manager=unix_connection(path=socket_path))
+            finally:
+                asyncio_server.close()
+                await asyncio_server.wait_closed()
+
+
+class InterfaceVersionTestCase(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        async def handle_echo(request: EchoRequest) -> EchoResponse:
+            return EchoResponse(data=request.data, return_code=Win32ErrorCode.ERROR_SUCCESS)
+
+        self.server = Server()
+        self.server.register_handler(request_class=EchoRequest, handler=handle_echo)
+        self.asyncio_server = await self.server.start(host='127.0.0.1')
+        self.port: int = self.asyncio_server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.asyncio_server.close()
+        await self.asyncio_server.wait_closed()
+
+    async def test_unsupported_version_rejected(self):
+        async with tcp_connection(host='127.0.0.1', port=self.port) as connection:
+            bind_response = await connection.bind(
+                presentation_context_list=ContextList([
+                    ContextElement(context_id=0, abstract_syntax=ECHO_V2_ABSTRACT_SYNTAX)
+                ])
+            )
+
+            self.assertEqual(bind_response.result_list[0].result, ContDefResult.PROVIDER_REJECTION)
+            self.assertEqual(bind_response.result_list[0].reason, ProviderReason.ABSTRACT_SYNTAX_NOT_SUPPORTED)
+            self.assertIsNone(connection.get_context_id(abstract_syntax=ECHO_V2_ABSTRACT_SYNTAX))
+
+    async def test_dispatched_by_version(self):
+        async def handle_reversing_echo(request: EchoRequest) -> EchoResponse:
+            return EchoResponse(data=bytes(request.data)[::-1], return_code=Win32ErrorCode.ERROR_SUCCESS)
+
+        self.server.register_handler(
+            request_class=EchoRequest,
+            handler=handle_reversing_echo,
+            abstract_syntax=ECHO_V2_ABSTRACT_SYNTAX
+        )
+
+        async with tcp_connection(host='127.0.0.1', port=self.port) as connection:
+            await connection.bind(
+                presentation_context_list=ContextList([
+                    ContextElement(context_id=0, abstract_syntax=ECHO_ABSTRACT_SYNTAX),
+                    ContextElement(context_id=1, abstract_syntax=ECHO_V2_ABSTRACT_SYNTAX)
+                ])
+            )
+
+            for context_id, expected_data in ((0, b'data'), (1, b'atad')):
+                response: EchoResponse = await obtain_response(
+                    rpc_connection=connection,
+                    request=EchoRequest(data=b'data'),
+                    context_id=context_id
+                )
+                self.assertEqual(bytes(response.data), expected_data)
@@ -0,0 +1,107 @@
+from asyncio import Queue, sleep
+from typing import Sequence
+from unittest import IsolatedAsyncioTestCase
+
+from rpc.connection import Connection
+from rpc.pdu_framer import PDUFramer
+from rpc.pdu_headers.base import MSRPCHeader
+from rpc.pdu_headers.request_header import RequestHeader
+
+STUB_DATA = bytes(range(100))
+
+
+def _decode_write(data: bytes) -> list[MSRPCHeader]:
+    pdu_framer = PDUFramer()
+    pdu_framer.feed(data=data)
+    messages: list[MSRPCHeader] = []
+    for fragment in pdu_framer.fragments():
+        with fragment:
+            messages.append(MSRPCHeader.from_bytes(data=bytes(fragment)))
+    return messages
+
+
+class WriteCoalescingTestCase(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.incoming_queue: Queue[bytes] = Queue()
+        self.writes: list[bytes] = []
+
+    async def _write(self, data: bytes) -> int:
+        self.writes.append(bytes(data))
+        return len(data)
+
+    async def test_messages_within_delay_coalesced(self):
+        async with Connection(
+            reader=self.incoming_queue.get,
+            writer=self._write,
+            write_coalescing_delay=0.1
+        ) as connection:
+            for opnum in range(3):
+                await connection.send_message(message=RequestHeader(opnum=opnum, stub_data=STUB_DATA))
+                # The writer collects the first message while waiting for more.
+                await sleep(0.01)
+            await sleep(0.2)
+
+        self.assertEqual(len(self.writes), 1)
+        self.assertEqual([message.opnum for message in _decode_write(data=self.writes[0])], [0, 1, 2])
+
+    async def test_messages_without_delay_written_when_queue_runs_empty(self):
+        async with Connection(reader=self.incoming_queue.get, writer=self._write) as connection:
+            for opnum in range(3):
+                await connection.send_message(message=RequestHeader(opnum=opnum, stub_data=STUB_DATA))
+                await sleep(0.01)
+
+        self.assertEqual(len(self.writes), 3)
+
+    async def test_max_coalesced_write_size(self):
+        message_size: int = RequestHeader(stub_data=STUB_DATA).serialized_size()
+
+        async with Connection(
+            reader=self.incoming_queue.get,
+            writer=self._write,
+            max_coalesced_write_size=2 * message_size
+        ) as connection:
+            for opnum in range(6):
+                await connection.send_message(message=RequestHeader(opnum=opnum, stub_data=STUB_DATA))
+            await sleep(0.01)
+
+        # Messages are collected only until they make up the maximum coalesced write size.
+        self.assertEqual([len(data) for data in self.writes], [2 * message_size] * 3)
+        self.assertEqual(
+            [message.opnum for data in self.writes for message in _decode_write(data=data)],
+            list(range(6))
+        )
+
+    async def test_vectored_writer(self):
+        vectored_writes: list[list[bytes | memoryview]] = []
+
+        async def vectored_writer(buffers: Sequence[bytes | memoryview]) -> None:
+            vectored_writes.append(list(buffers))
+
+        stub_data_buffers = [bytes([opnum]) * 64 for opnum in range(3)]
+
+        async with Connection(
+            reader=self.incoming_queue.get,
+            writer=self._write,
+            vectored_writer=vectored_writer
+        ) as connection:
+            for opnum, stub_data in enumerate(stub_data_buffers):
+                await connection.send_message(message=RequestHeader(opnum=opnum, stub_data=stub_data))
+            await sleep(0.01)
+
+        self.assertEqual(self.writes, [])
+        self.assertEqual(len(vectored_writes), 1)
+        # The stub data is handed to the writer as is, rather than copied together with the headers.
+        self.assertTrue(
+            all(
+                any(buffer is stub_data for buffer in vectored_writes[0])
+                for stub_data in stub_data_buffers
+            )
+        )
+        self.assertEqual(
+            [
+                (message.opnum, bytes(message.stub_data))
+                for message in _decode_write(data=b''.join(vectored_writes[0]))
+            ],
+            list(enumerate(stub_data_buffers))
+        )